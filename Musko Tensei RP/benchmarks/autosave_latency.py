@@ -0,0 +1,71 @@
+# autosave_latency.py - Latence des tours avec auto-sauvegarde synchrone ou en arrière-plan
+#
+# Utilisation: python benchmarks/autosave_latency.py [nombre de tours]
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+
+AUTOSAVE_INTERVAL = 10
+JOURNAL_SIZE = 20000
+
+class BenchmarkGame:
+    """État de jeu minimal mais volumineux (long journal, nombreuses relations)"""
+
+    def __init__(self):
+        self.player = {
+            "name": "Rudeus",
+            "age": 15,
+            "journal": [
+                {"type": "event", "day": i // 10, "content": f"Entrée {i}: rencontre à Buena, leçon de magie avec Roxy."}
+                for i in range(JOURNAL_SIZE)
+            ]
+        }
+        self.relationships = {f"npc_{i}": {"affinity": i % 100} for i in range(500)}
+        self.inventory = [{"id": f"item_{i}", "count": 1} for i in range(300)]
+
+    def play_turn(self, turn):
+        """Travail typique d'un tour: journal, relations, inventaire"""
+        self.player["journal"].append({"type": "action", "day": turn // 10, "content": f"Action du tour {turn}"})
+        npc = f"npc_{random.randrange(500)}"
+        self.relationships[npc]["affinity"] += 1
+        for _ in range(200):
+            random.choice(self.inventory)["count"] += 0
+
+def run(background, turns):
+    """Joue des tours et mesure la durée de chacun (auto-sauvegarde comprise) en ms"""
+    game = BenchmarkGame()
+    manager = SaveManager(game)
+    latencies = []
+    for turn in range(1, turns + 1):
+        start = time.perf_counter()
+        game.play_turn(turn)
+        if turn % AUTOSAVE_INTERVAL == 0:
+            manager.auto_save(background=background)
+        latencies.append((time.perf_counter() - start) * 1000)
+    manager.wait_for_autosave()
+    return latencies
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        print(f"{turns} tours, auto-sauvegarde tous les {AUTOSAVE_INTERVAL} tours")
+        print(f"{'Mode':<16}{'tours (p99)':>14}{'tours (max)':>14}{'tour de sauvegarde':>22}")
+        print("-" * 66)
+        for label, background in (("synchrone", False), ("arrière-plan", True)):
+            latencies = run(background, turns)
+            save_turns = [latency for turn, latency in enumerate(latencies, 1) if turn % AUTOSAVE_INTERVAL == 0]
+            other_turns = sorted(latency for turn, latency in enumerate(latencies, 1) if turn % AUTOSAVE_INTERVAL != 0)
+            p99 = other_turns[min(len(other_turns) - 1, int(len(other_turns) * 0.99))]
+            print(f"{label:<16}{p99:>11.2f} ms{other_turns[-1]:>11.2f} ms{statistics.median(save_turns):>19.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# autosave_policy.py - Auto-sauvegarde tous les N tours vs politique par événements avec détection des changements
+#
+# Utilisation: python benchmarks/autosave_policy.py [nombre de tours]
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+
+TURN_COUNT = 600
+
+class BenchmarkGame:
+    def __init__(self):
+        self.player = {"name": "Rudeus", "level": 1, "journal": [f"Entrée {i}: leçon de magie avec Roxy." for i in range(3000)]}
+        self.game_time = {"day": 1, "hour": 8, "minute": 0, "weather": "clear"}
+        self.relationships = {f"npc_{i}": {"affinity": 0} for i in range(300)}
+
+    def play_turn(self, turn, rng):
+        """
+        Un tour de jeu simulé: phases d'exploration et phases passives de 50 tours
+
+        Returns:
+            Événements du tour
+        """
+        if (turn // 50) % 2:
+            # Consulter le journal, les statistiques, la carte: rien ne change
+            return []
+        roll = rng.random()
+        self.game_time["minute"] += 20
+        if self.game_time["minute"] >= 60:
+            self.game_time["minute"] -= 60
+            self.game_time["hour"] += 1
+            if self.game_time["hour"] >= 24:
+                self.game_time["hour"] = 0
+                self.game_time["day"] += 1
+        self.relationships[f"npc_{rng.randrange(300)}"]["affinity"] += 1
+        events = []
+        if roll > 0.95:
+            # Combat, gagné avec montée de niveau et quête terminée dans le même tour
+            self.player["level"] += 1
+            events = ["combat_end", "level_up", "quest_completed"]
+        return events
+
+def run(policy, turns, seed=7):
+    """Joue une partie simulée et retourne (sauvegardes écrites, durée, statistiques de la politique)"""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(BenchmarkGame())
+
+        # Compter les écritures (les auto-sauvegardes d'une même seconde portent le même nom)
+        written = [0]
+        write_save = manager._write_save
+        def counted_write(job):
+            written[0] += 1
+            return write_save(job)
+        manager._write_save = counted_write
+
+        scheduler = manager.autosave_scheduler
+        scheduler.configure(actions_interval=10, game_minutes_interval=600, min_interval=0)
+        start = time.perf_counter()
+        for turn in range(1, turns + 1):
+            events = manager.game.play_turn(turn, rng)
+            if policy == "politique":
+                for event in events:
+                    scheduler.notify(event)
+                scheduler.record_action()
+                scheduler.tick()
+            else:
+                # Anciennes règles: tous les 10 tours, plus une sauvegarde par événement
+                if policy == "événements":
+                    for _ in events:
+                        manager.auto_save()
+                if turn % 10 == 0:
+                    manager.auto_save()
+            manager.wait_for_autosave()
+        elapsed = time.perf_counter() - start
+        os.chdir(project_path)
+        return written[0], elapsed, dict(scheduler.stats)
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else TURN_COUNT
+    print(f"{turns} tours simulés (une phase passive sur deux, combats avec montée de niveau et quête)")
+    print(f"{'Politique':<40}{'Sauvegardes':>12}{'Durée':>11}")
+    print("-" * 63)
+    for label, policy in (("Tous les 10 tours", "tours"),
+                          ("Tous les 10 tours + chaque événement", "événements"),
+                          ("Politique (regroupement + changements)", "politique")):
+        written, elapsed, stats = run(policy, turns)
+        print(f"{label:<40}{written:>12}{elapsed * 1000:>8.0f} ms")
+    print(f"Regroupées: {stats['coalesced']}, ignorées (état inchangé): {stats['skipped_unchanged']}")
+
+    # Coût de la détection des changements par rapport à une sauvegarde
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(BenchmarkGame())
+        start = time.perf_counter()
+        for _ in range(20):
+            manager.state_fingerprint()
+        fingerprint_ms = (time.perf_counter() - start) * 1000 / 20
+        start = time.perf_counter()
+        for i in range(20):
+            manager.save_game("bench", f"save_{i}")
+        save_ms = (time.perf_counter() - start) * 1000 / 20
+        os.chdir(project_path)
+    print(f"Empreinte de l'état: {fingerprint_ms:.2f} ms, sauvegarde complète: {save_ms:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# backup_dedup.py - Sauvegardes de secours: archive ZIP complète vs stockage dédupliqué
+#
+# Utilisation: python benchmarks/backup_dedup.py [nombre de sauvegardes] [fichiers modifiés entre deux sauvegardes]
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+
+SAVE_COUNT = 2000
+CHANGED_COUNT = 20
+SLOT_COUNT = 20
+
+class BenchmarkGame:
+    def __init__(self, seed):
+        self.player = {"name": "Rudeus", "seed": seed, "journal": [f"Entrée {i}-{seed}" for i in range(300)]}
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+def zip_backup(manager, backup_path):
+    """Ancienne méthode: archive ZIP de tous les fichiers à chaque sauvegarde de secours"""
+    with zipfile.ZipFile(backup_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for rel_path in manager._list_save_files():
+            zipf.write(os.path.join(manager.save_directory, rel_path), rel_path)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else SAVE_COUNT
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else CHANGED_COUNT
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(None)
+        manager.max_saves_per_slot = count
+        for i in range(count):
+            manager.game = BenchmarkGame(i)
+            manager.save_game(f"slot_{i % SLOT_COUNT:02d}", f"save_{i:05d}")
+        rel_paths = manager._list_save_files()
+        print(f"{len(rel_paths)} sauvegardes, {directory_size(manager.save_directory) / 1024 / 1024:.1f} Mo")
+
+        def modify():
+            for i in range(changed):
+                manager.game = BenchmarkGame(count + i)
+                manager.save_game(f"slot_{i % SLOT_COUNT:02d}", f"save_{i:05d}")
+
+        # Ancienne méthode: deux archives complètes
+        os.makedirs("zip_backups")
+        start = time.perf_counter()
+        zip_backup(manager, "zip_backups/first.zip")
+        zip_first = time.perf_counter() - start
+        modify()
+        start = time.perf_counter()
+        zip_backup(manager, "zip_backups/second.zip")
+        zip_second = time.perf_counter() - start
+        zip_size = os.path.getsize("zip_backups/second.zip")
+
+        # Stockage dédupliqué
+        backup_dir = os.path.join(manager.save_directory, "backup")
+        start = time.perf_counter()
+        first = manager.create_backup()
+        store_first = time.perf_counter() - start
+        size_first = directory_size(backup_dir)
+        modify()
+        start = time.perf_counter()
+        second = manager.create_backup()
+        store_second = time.perf_counter() - start
+        size_second = directory_size(backup_dir) - size_first
+
+        print(f"{changed} fichiers modifiés entre les deux sauvegardes de secours")
+        print(f"{'Méthode':<24}{'1re':>10}{'2e':>10}{'Disque (2e)':>14}")
+        print("-" * 58)
+        print(f"{'Archive ZIP complète':<24}{zip_first * 1000:>7.0f} ms{zip_second * 1000:>7.0f} ms{zip_size / 1024:>11.0f} Ko")
+        print(f"{'Stockage dédupliqué':<24}{store_first * 1000:>7.0f} ms{store_second * 1000:>7.0f} ms{size_second / 1024:>11.0f} Ko")
+        print(f"2e sauvegarde: {second['new_files']} copiés, {second['reused_files']} réutilisés")
+
+        start = time.perf_counter()
+        restored = manager.restore_backup(first["backup_path"])
+        print(f"Restauration complète: {restored['restored_files']} fichiers en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# backup_parallel.py - Sauvegarde de secours, restauration et exportation: un thread vs groupe de threads
+#
+# Utilisation: python benchmarks/backup_parallel.py [nombre de fichiers] [nombre de threads]
+import os
+import sys
+import shutil
+import tempfile
+import time
+import zipfile
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+
+FILE_COUNT = 10000
+SLOT_COUNT = 50
+DEFAULT_WORKERS = 8
+
+class BenchmarkGame:
+    def __init__(self):
+        self.player = {"name": "Rudeus", "journal": [f"Entrée {i}: leçon de magie avec Roxy." for i in range(400)]}
+
+def build_tree(manager, count):
+    """
+    Crée l'arborescence de test en dupliquant une vraie sauvegarde (contenu unique par fichier)
+
+    Les fichiers sont écrits directement: save_game mettrait à jour le catalogue à chaque fichier.
+    Le premier slot est daté d'hier pour la restauration par date.
+    """
+    manager.game = BenchmarkGame()
+    template_path = manager.save_game("template", "template")["save_path"]
+    with open(template_path, "rb") as f:
+        template = f.read()
+    shutil.rmtree(os.path.dirname(template_path))
+
+    yesterday = time.time() - 86400
+    for i in range(count):
+        slot = i % SLOT_COUNT
+        slot_dir = os.path.join(manager.save_directory, f"slot_{slot:02d}")
+        os.makedirs(slot_dir, exist_ok=True)
+        path = os.path.join(slot_dir, f"save_{i:05d}.mkrp")
+        with open(path, "wb") as f:
+            f.write(template + i.to_bytes(4, "little"))
+        if slot == 0:
+            os.utime(path, (yesterday, yesterday))
+    manager.catalog.invalidate()
+    return len(template) + 4
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else FILE_COUNT
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WORKERS
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(None)
+        manager.max_saves_per_slot = count
+        file_size = build_tree(manager, count)
+        total_mb = count * file_size / 1024 / 1024
+        print(f"{count} sauvegardes dans {SLOT_COUNT} slots, {total_mb:.1f} Mo, {workers} threads")
+
+        backup_dir = os.path.join(manager.save_directory, "backup")
+        legacy_zip = os.path.join(temp_dir, "backup_legacy.zip")
+        with zipfile.ZipFile(legacy_zip, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for rel_path in manager._list_save_files():
+                zipf.write(os.path.join(manager.save_directory, rel_path), rel_path)
+
+        yesterday_end = time.strftime("%Y-%m-%d", time.localtime(time.time() - 86400)) + " 23:59:59"
+        rows = []
+        for label, threads in (("1 thread", 1), (f"{workers} threads", workers)):
+            shutil.rmtree(backup_dir, ignore_errors=True)
+            cases = [
+                ("Sauvegarde de secours", lambda: manager.create_backup(workers=threads)),
+                ("Restauration complète", lambda: manager.restore_backup(backup["backup_path"], workers=threads)),
+                ("Restauration de 5 slots", lambda: manager.restore_backup(
+                    backup["backup_path"], slots=[f"slot_{i:02d}" for i in range(5)], workers=threads)),
+                ("Restauration par date", lambda: manager.restore_backup(
+                    backup["backup_path"], until=yesterday_end, workers=threads)),
+                ("Restauration ZIP (ancienne)", lambda: manager.restore_backup(legacy_zip, workers=threads)),
+                ("Exportation d'un slot", lambda: manager.export_slot(
+                    "slot_01", os.path.join(temp_dir, "export.zip"), workers=threads)),
+                ("Importation d'un slot", lambda: manager.import_save(
+                    os.path.join(temp_dir, "export.zip"), f"imported_{threads}", workers=threads))
+            ]
+            for case, function in cases:
+                elapsed, result = timed(function)
+                if not result["success"]:
+                    raise RuntimeError(result["message"])
+                if case == "Sauvegarde de secours":
+                    backup = result
+                    files = result["new_files"] + result["reused_files"]
+                else:
+                    files = result.get("restored_files", result.get("file_count", result.get("imported_files", 0)))
+                rows.append((case, label, elapsed, files))
+            shutil.rmtree(os.path.join(manager.save_directory, f"imported_{threads}"))
+
+        print(f"{'Opération':<30}{'Threads':>12}{'Durée':>11}{'Fichiers':>10}{'Fichiers/s':>12}{'Mo/s':>9}")
+        print("-" * 84)
+        order = [case for case, _ in cases]
+        for case, label, elapsed, files in sorted(rows, key=lambda row: order.index(row[0])):
+            print(f"{case:<30}{label:>12}{elapsed * 1000:>8.0f} ms{files:>10}"
+                  f"{files / elapsed:>12.0f}{files * file_size / 1024 / 1024 / elapsed:>9.1f}")
+
+if __name__ == "__main__":
+    main()
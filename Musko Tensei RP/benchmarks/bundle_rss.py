@@ -0,0 +1,103 @@
+# bundle_rss.py - Compare la mémoire (RSS/PSS) de 16 processus: fichiers JSON analysés vs paquet mmap
+#
+# Utilisation: python benchmarks/bundle_rss.py [nombre de processus]
+# Linux uniquement (lecture de /proc/self/status et /proc/self/smaps_rollup).
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+data_dir = os.path.join(project_path, "data")
+
+from data_bundle import DataBundle
+
+PROCESS_COUNT = 16
+
+# Nombre d'enregistrements consultés par section dans le mode paquet
+LOOKUPS_PER_SECTION = 20
+
+def read_memory():
+    """RSS et PSS du processus courant (en Ko)"""
+    memory = {"rss": 0, "pss": 0}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                memory["rss"] = int(line.split()[1])
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    memory["pss"] = int(line.split()[1])
+    except OSError:
+        pass
+    return memory
+
+def worker(mode, bundle_path):
+    """Processus fils: charge les données, signale qu'il est prêt puis mesure sa mémoire à la demande"""
+    data = None
+    if mode == "json":
+        data = {}
+        for filename in sorted(os.listdir(data_dir)):
+            if filename.endswith(".json"):
+                with open(os.path.join(data_dir, filename), "r", encoding="utf-8") as f:
+                    data[filename[:-5]] = json.load(f)
+    elif mode == "bundle":
+        data = DataBundle(bundle_path)
+        rng = random.Random(os.getpid())
+        for section in data.sections.values():
+            keys = list(section)
+            for key in rng.sample(keys, min(LOOKUPS_PER_SECTION, len(keys))):
+                section[key]
+
+    print("ready", flush=True)
+    sys.stdin.readline()
+    print(json.dumps(read_memory()), flush=True)
+
+def run(mode, bundle_path, count):
+    """Lance les processus d'un mode et retourne leurs mesures, prises quand tous sont chargés"""
+    processes = [
+        subprocess.Popen([sys.executable, __file__, "--worker", mode, bundle_path],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(count)
+    ]
+    for process in processes:
+        process.stdout.readline()
+
+    results = []
+    for process in processes:
+        process.stdin.write("measure\n")
+        process.stdin.flush()
+        results.append(json.loads(process.stdout.readline()))
+    for process in processes:
+        process.stdin.close()
+        process.wait()
+    return results
+
+def main():
+    if not os.path.exists("/proc/self/status"):
+        print("Ce benchmark nécessite Linux (/proc).")
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PROCESS_COUNT
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filenames = sorted(name for name in os.listdir(data_dir) if name.endswith(".json"))
+        bundle_path = DataBundle.build(data_dir, filenames, os.path.join(temp_dir, "game_data.bundle"))
+
+        print(f"{count} processus, paquet de {os.path.getsize(bundle_path) / 1024:.0f} Ko")
+        print(f"{'Mode':<10}{'RSS moyen':>14}{'RSS total':>14}{'PSS total':>14}")
+        print("-" * 52)
+        for mode in ("base", "json", "bundle"):
+            results = run(mode, bundle_path, count)
+            rss = sum(result["rss"] for result in results)
+            pss = sum(result["pss"] for result in results)
+            print(f"{mode:<10}{rss / count / 1024:>11.1f} Mo{rss / 1024:>11.1f} Mo{pss / 1024:>11.1f} Mo")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,89 @@
+# concurrent_saves.py - Plusieurs sessions qui écrivent en même temps dans le même slot d'auto-sauvegarde
+#
+# Utilisation: python benchmarks/concurrent_saves.py [processus] [sauvegardes par processus]
+#
+# Chaque processus est une session de jeu avec son propre SaveManager. Les auto-sauvegardes
+# d'une même seconde reçoivent le même nom horodaté: sans nommage unique, elles s'écrasent.
+# La seconde phase élague le slot en parallèle: il doit rester exactement max_auto_saves sauvegardes.
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+from save_fsck import fsck_tree
+
+PROCESSES = 4
+SAVES_PER_PROCESS = 25
+MAX_AUTO_SAVES = 5
+
+class BenchmarkGame:
+    def __init__(self, session):
+        self.player = {
+            "name": f"Rudeus {session}",
+            "level": 12,
+            "journal": [{"type": "event", "day": i // 10, "content": f"Entrée {i}: leçon de magie avec Roxy."} for i in range(500)]
+        }
+        self.relationships = {f"npc_{i}": {"affinity": i % 100} for i in range(50)}
+
+def session(task):
+    """Une session: save_count auto-sauvegardes dans le slot partagé"""
+    save_directory, session_id, save_count, limit = task
+    manager = SaveManager(BenchmarkGame(session_id), save_directory=save_directory)
+    manager.max_auto_saves = manager.max_saves_per_slot = limit
+    names = []
+    start = time.perf_counter()
+    for _ in range(save_count):
+        result = manager.auto_save()
+        assert result["success"], result["message"]
+        names.append(result["save_name"])
+    return names, time.perf_counter() - start, manager.slot_locks.summary()
+
+def run(save_directory, processes, save_count, limit):
+    tasks = [(save_directory, session_id, save_count, limit) for session_id in range(processes)]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(session, tasks)
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else PROCESSES
+    save_count = int(sys.argv[2]) if len(sys.argv) > 2 else SAVES_PER_PROCESS
+    with tempfile.TemporaryDirectory() as temp_dir:
+        save_directory = os.path.join(temp_dir, "saves")
+        auto_dir = os.path.join(save_directory, "auto")
+        print(f"{processes} processus x {save_count} auto-sauvegardes, {os.cpu_count()} processeur(s)")
+
+        print(f"{'Phase':<24}{'Attendues':>10}{'Présentes':>11}{'Durée':>10}{'Verrou moy.':>13}{'max':>9}{'Attentes':>10}{'Renommées':>11}")
+        print("-" * 98)
+        for label, limit in (("Sans élagage", processes * save_count * 2), (f"Élagage à {MAX_AUTO_SAVES}", MAX_AUTO_SAVES)):
+            results = run(save_directory, processes, save_count, limit)
+            names = [name for names, _, _ in results for name in names]
+            # Un nom élagué peut être réutilisé: les noms publiés ne sont tous distincts que sans élagage
+            if limit >= len(names):
+                assert len(set(names)) == len(names), "deux sessions ont publié le même nom"
+            renamed = sum(1 for name in names if name.count("_") > 2)
+            present = len([name for name in os.listdir(auto_dir) if name.endswith(".mkrp")])
+            leftovers = [name for name in os.listdir(auto_dir) if name.endswith(".tmp")]
+            assert not leftovers, leftovers
+            expected = len(names) if limit >= len(names) else limit
+            assert present == expected, (present, expected)
+
+            duration = max(duration for _, duration, _ in results)
+            acquired = sum(stats["acquired"] for _, _, stats in results)
+            hold_ms = sum(stats["hold_time"] for _, _, stats in results) * 1000 / max(1, acquired)
+            max_hold_ms = max(stats["max_hold_time"] for _, _, stats in results) * 1000
+            contended = sum(stats["contended"] for _, _, stats in results)
+            print(f"{label:<24}{expected:>10}{present:>11}{duration * 1000:>7.0f} ms{hold_ms:>10.2f} ms{max_hold_ms:>6.1f} ms{contended:>10}{renamed:>11}")
+
+            summary = fsck_tree(save_directory, workers=1)
+            assert summary["ok"] == summary["total"], summary["problems"]
+            for name in os.listdir(auto_dir):
+                os.remove(os.path.join(auto_dir, name))
+
+        print("fsck: toutes les sauvegardes sont intactes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# list_saves.py - Listage des sauvegardes: lecture de chaque en-tête vs catalogue persistant
+#
+# Utilisation: python benchmarks/list_saves.py [nombre de sauvegardes]
+import os
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+
+SAVE_COUNT = 3000
+SLOT_COUNT = 30
+
+class BenchmarkGame:
+    def __init__(self):
+        self.player = {"name": "Rudeus", "level": 12, "journal": [f"Entrée {i}" for i in range(200)]}
+
+def scan_headers(manager):
+    """Ancien listage: parcourir les slots et lire l'en-tête de chaque fichier"""
+    saves_info = []
+    for slot_name in os.listdir(manager.save_directory):
+        slot_path = os.path.join(manager.save_directory, slot_name)
+        if not os.path.isdir(slot_path):
+            continue
+        for file_name in os.listdir(slot_path):
+            if file_name.endswith(".mkrp"):
+                saves_info.append(manager._get_save_info(os.path.join(slot_path, file_name)))
+    saves_info.sort(key=lambda x: x.get("metadata", {}).get("last_save_time", ""), reverse=True)
+    return saves_info
+
+def timed(function, repeat=5):
+    """Meilleure durée (ms) sur plusieurs exécutions"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else SAVE_COUNT
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(BenchmarkGame())
+
+        # Un fichier modèle copié sous plusieurs noms (les métadonnées restent lisibles)
+        template = manager.save_game("template", "template")["save_path"]
+        with open(template, "rb") as f:
+            content = f.read()
+        for i in range(count):
+            slot_dir = os.path.join(manager.save_directory, f"slot_{i % SLOT_COUNT:02d}")
+            os.makedirs(slot_dir, exist_ok=True)
+            with open(os.path.join(slot_dir, f"save_{i:05d}.mkrp"), "wb") as f:
+                f.write(content)
+
+        print(f"{count} sauvegardes dans {SLOT_COUNT} slots")
+        headers_ms, _ = timed(lambda: scan_headers(manager))
+        print(f"Lecture de chaque en-tête:     {headers_ms:8.1f} ms")
+
+        manager.catalog.invalidate()
+        start = time.perf_counter()
+        manager.list_saves()
+        print(f"Catalogue (construction):      {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        cached_ms, _ = timed(manager.list_saves)
+        print(f"Catalogue (en mémoire):        {cached_ms:8.1f} ms")
+
+        cold_ms, _ = timed(lambda: SaveManager(BenchmarkGame()).list_saves())
+        print(f"Catalogue (relu depuis disque): {cold_ms:7.1f} ms")
+        print(f"Accélération: x{headers_ms / cold_ms:.1f} (nouveau processus), x{headers_ms / cached_ms:.1f} (en mémoire)")
+
+if __name__ == "__main__":
+    main()
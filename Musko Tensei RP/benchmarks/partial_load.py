@@ -0,0 +1,84 @@
+# partial_load.py - Lecture complète d'une sauvegarde vs lecture de quelques sections (format v2)
+#
+# Utilisation: python benchmarks/partial_load.py [nombre d'entrées du journal]
+import os
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+
+JOURNAL_SIZE = 20000
+
+class BenchmarkAI:
+    """Mémoire de l'IA volumineuse (souvenirs par personnage)"""
+
+    def __init__(self):
+        self.conversation_history = [{"role": "assistant", "content": "Roxy sourit. " * 40} for _ in range(20)]
+        self.memory_by_character = {
+            f"npc_{i}": [f"Souvenir {j} avec le personnage {i} à Buena." for j in range(40)]
+            for i in range(400)
+        }
+        self.world_state_memory = {"events": [f"Événement {i}" for i in range(2000)]}
+        self.player_personality = {"kindness": 7}
+
+class BenchmarkGame:
+    def __init__(self, journal_size):
+        self.player = {
+            "name": "Rudeus",
+            "level": 12,
+            "journal": [
+                {"type": "event", "day": i // 10, "content": f"Entrée {i}: leçon de magie avec Roxy."}
+                for i in range(journal_size)
+            ]
+        }
+        self.current_location = "Buena"
+        self.relationships = {f"npc_{i}": {"affinity": i % 100} for i in range(400)}
+        self.active_quests = [{"id": f"quest_{i}"} for i in range(50)]
+        self.ai_manager = BenchmarkAI()
+
+def timed(function, repeat=5):
+    """Meilleure durée (ms) sur plusieurs exécutions"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    journal_size = int(sys.argv[1]) if len(sys.argv) > 1 else JOURNAL_SIZE
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(BenchmarkGame(journal_size))
+
+        manager.sectioned_saves = False
+        single_path = manager.save_game("bench", "single_block")["save_path"]
+        manager.sectioned_saves = True
+        sectioned_path = manager.save_game("bench", "sectioned")["save_path"]
+
+        print(f"Sauvegarde v1: {os.path.getsize(single_path) / 1024:.0f} Ko, v2: {os.path.getsize(sectioned_path) / 1024:.0f} Ko")
+        full_ms = timed(lambda: manager._read_save_file(single_path))
+        print(f"{'Lecture':<38}{'Durée':>10}{'Gain':>8}")
+        print("-" * 56)
+        print(f"{'v1 complète (un seul bloc)':<38}{full_ms:>7.1f} ms{'':>8}")
+        cases = [
+            ("v2 complète", None),
+            ("v2 player", ["player"]),
+            ("v2 world_state", ["world_state"]),
+            ("v2 player + quests + relationships", ["player", "quests", "relationships"]),
+            ("v2 tout sauf ai_memory", ["player", "world_state", "quests", "relationships", "journal", "core"])
+        ]
+        for label, sections in cases:
+            if sections is None:
+                elapsed = timed(lambda: manager._read_save_file(sectioned_path))
+            else:
+                elapsed = timed(lambda: manager.load_sections(sectioned_path, sections))
+            print(f"{label:<38}{elapsed:>7.1f} ms{full_ms / elapsed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
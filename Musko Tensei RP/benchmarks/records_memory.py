@@ -0,0 +1,65 @@
+# records_memory.py - Mesure (tracemalloc) de la mémoire des données brutes et des enregistrements compacts
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+data_dir = os.path.join(project_path, "data")
+
+from records import build_npc_table
+from item_catalog import ItemCatalog
+from skill_catalog import SkillCatalog
+from world_map import WorldMap
+
+def load(name):
+    with open(os.path.join(data_dir, f"{name}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def build_npcs():
+    return build_npc_table(load("npcs"))
+
+def build_items():
+    return ItemCatalog(load("items")).items
+
+def build_skills():
+    return SkillCatalog(load("progression"), load("skills")).skills
+
+def build_locations():
+    return WorldMap(load("locations")).locations
+
+DATASETS = [
+    ("npcs", lambda: load("npcs"), build_npcs),
+    ("items", lambda: load("items"), build_items),
+    ("skills", lambda: (load("progression")["skills"], load("skills")), build_skills),
+    ("locations", lambda: load("locations"), build_locations)
+]
+
+def measure(factory):
+    """Mémoire retenue (en octets) par le résultat d'une fonction, une fois les temporaires libérés"""
+    gc.collect()
+    tracemalloc.start()
+    result = factory()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained
+
+def main():
+    print(f"{'Données':<12}{'JSON brut':>14}{'Enregistrements':>18}{'Économie':>12}")
+    print("-" * 56)
+    total_raw = total_records = 0
+    for name, raw_factory, record_factory in DATASETS:
+        raw = measure(raw_factory)
+        records = measure(record_factory)
+        total_raw += raw
+        total_records += records
+        print(f"{name:<12}{raw / 1024:>11.1f} Ko{records / 1024:>15.1f} Ko{(1 - records / raw) * 100:>11.1f}%")
+    print("-" * 56)
+    print(f"{'total':<12}{total_raw / 1024:>11.1f} Ko{total_records / 1024:>15.1f} Ko{(1 - total_records / total_raw) * 100:>11.1f}%")
+
+if __name__ == "__main__":
+    main()
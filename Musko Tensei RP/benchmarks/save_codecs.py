@@ -0,0 +1,69 @@
+# save_codecs.py - Compare le temps d'encodage et la taille des sauvegardes selon le codec
+#
+# Utilisation: python benchmarks/save_codecs.py [nombre d'entrées de journal]
+import gzip
+import json
+import os
+import sys
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_codecs import SaveCodec
+
+KEY = b"musko_tensei_rp"
+REPEAT = 5
+
+def make_save_data(journal_size):
+    """Données de sauvegarde représentatives d'une longue partie"""
+    return {
+        "metadata": {"save_name": "benchmark", "play_time": 123456, "game_version": "1.0.0"},
+        "player": {
+            "name": "Rudeus",
+            "age": 15,
+            "stats": {"force": 12, "intelligence": 18, "agilité": 10},
+            "journal": [
+                {"type": "event", "day": i // 10, "content": f"Entrée {i}: rencontre à Buena, discussion avec Roxy sur la magie de l'eau."}
+                for i in range(journal_size)
+            ],
+            "completed_events": [f"event_{i}" for i in range(journal_size // 20)]
+        },
+        "relationships": {f"npc_{i}": {"affinity": i % 100, "met": True} for i in range(500)},
+        "inventory": [{"id": f"item_{i}", "count": i % 7 + 1} for i in range(300)]
+    }
+
+def legacy_encode(data):
+    """Ancienne implémentation: json.dumps complet, gzip niveau 9 puis XOR octet par octet"""
+    compressed = gzip.compress(json.dumps(data).encode("utf-8"), compresslevel=9)
+    encrypted = bytearray(len(compressed))
+    for i in range(len(compressed)):
+        encrypted[i] = compressed[i] ^ KEY[i % len(KEY)]
+    return bytes(encrypted)
+
+def timed(function, data):
+    """Meilleur temps (en ms) sur plusieurs exécutions et taille du résultat"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(result)
+
+def main():
+    journal_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = make_save_data(journal_size)
+    print(f"JSON: {len(json.dumps(data)) / 1024:.0f} Ko")
+    print(f"{'Codec':<24}{'Temps':>12}{'Taille':>14}")
+    print("-" * 50)
+
+    elapsed, size = timed(legacy_encode, data)
+    print(f"{'ancien (gzip 9 + XOR)':<24}{elapsed:>9.1f} ms{size / 1024:>11.1f} Ko")
+
+    for compression, level in [("gzip", 9), ("zlib", 1), ("zlib", 6), ("zlib", 9), ("lzma", 0), ("lzma", 6), ("none", 0)]:
+        codec = SaveCodec(compression, level, True, KEY)
+        elapsed, size = timed(codec.encode, data)
+        print(f"{compression + ' ' + str(level):<24}{elapsed:>9.1f} ms{size / 1024:>11.1f} Ko")
+
+if __name__ == "__main__":
+    main()
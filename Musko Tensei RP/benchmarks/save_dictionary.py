@@ -0,0 +1,166 @@
+# save_dictionary.py - Petites auto-sauvegardes: gzip 9 vs zlib vs dictionnaire préchargé (zdict)
+#
+# Utilisation: python benchmarks/save_dictionary.py [nombre de sauvegardes] [--corpus DOSSIER]
+#
+# Le corpus part des auto-sauvegardes livrées (saves/auto) et simule des débuts de partie
+# avec les données du jeu (PNJ, lieux, objets). Les textes libres (résumé du personnage)
+# sont propres à chaque sauvegarde: le dictionnaire ne peut pas les apprendre. La moitié du corpus sert à entraîner
+# un dictionnaire, l'autre moitié (jamais vue) à le mesurer. --corpus écrit le corpus dans
+# un dossier de sauvegardes (entraînement du dictionnaire livré: modules/save_dictionary.py).
+import copy
+import glob
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+from save_codecs import SaveCodec, iter_json
+from save_sections import split_sections
+from save_migrations import migrations
+from save_dictionary import train_dictionary, dictionaries
+
+SAVE_COUNT = 200
+REPEAT = 3
+
+def load_templates():
+    """Auto-sauvegardes livrées, migrées vers la version actuelle"""
+    manager = SaveManager.__new__(SaveManager)
+    manager.encryption_key = "musko_tensei_rp"
+    templates = []
+    for path in sorted(glob.glob(os.path.join(project_path, "saves", "auto", "*.mkrp"))):
+        templates.append(migrations.migrate(SaveManager._read_save_file(manager, path)))
+    return templates
+
+def load_game_data():
+    data = {}
+    for name in ("npcs", "locations", "items"):
+        with open(os.path.join(project_path, "data", f"{name}.json"), "r", encoding="utf-8") as f:
+            data[name] = json.load(f)
+    return data
+
+def make_corpus(count, seed=7):
+    """Sauvegardes de début de partie: quelques PNJ rencontrés, lieux, objets et entrées de journal"""
+    rng = random.Random(seed)
+    templates = load_templates()
+    game_data = load_game_data()
+    npcs = list(game_data["npcs"])
+    descriptions = [text for npc in game_data["npcs"].values() for text in npc.get("description", {}).values()]
+    locations = [region for continent in game_data["locations"].values() for region in continent.get("regions", {})]
+    items = [item for category in game_data["items"].get("consumables", {}).values() if isinstance(category, dict) for item in category]
+    corpus = []
+    for i in range(count):
+        save_data = copy.deepcopy(rng.choice(templates))
+        progress = rng.randint(0, 10)
+        save_data["metadata"].update({
+            "save_name": f"autosave_202506{rng.randint(10, 30)}_{rng.randint(0, 235959):06d}",
+            "play_time": rng.uniform(30, 20000),
+            "turn": progress * rng.randint(5, 30)
+        })
+        save_data["player"]["level"] = 1 + progress // 3
+        save_data["player"]["exp"] = rng.randint(0, 99)
+        if "character_summary" in save_data["player"]:
+            save_data["player"]["character_summary"] = " ".join(rng.sample(descriptions, min(len(descriptions), 3)))
+        for stat in save_data["player"]["stats"]:
+            save_data["player"]["stats"][stat] += rng.randint(0, progress)
+        save_data["player"]["journal"] = [
+            {"type": "event", "day": day, "content": f"Jour {day}: visite de {rng.choice(locations)} avec {game_data['npcs'][rng.choice(npcs)]['name']}."}
+            for day in range(progress * 2)
+        ]
+        world = save_data["world_state"]
+        world["discovered_locations"] = rng.sample(locations, min(len(locations), progress))
+        world["current_location"] = rng.choice(world["discovered_locations"] or [world["current_location"]])
+        world["day_count"] = world["game_time"]["day"] = 1 + progress * 3
+        world["game_time"]["hour"] = rng.randint(0, 23)
+        save_data["relationships"] = {
+            npc: {"affinity": rng.randint(-20, 60), "met": True, "last_seen_day": rng.randint(1, world["day_count"])}
+            for npc in rng.sample(npcs, min(len(npcs), progress))
+        }
+        save_data["inventory"] = [{"id": item, "quantity": rng.randint(1, 5)} for item in rng.sample(items, min(len(items), progress))]
+        save_data["stats"]["distance_traveled"] = rng.randint(0, 500) * progress
+        save_data["save_timestamp"] = save_data["metadata"]["last_save_time"]
+        corpus.append(save_data)
+    return corpus
+
+def samples_of(save_data):
+    """Exemples d'entraînement: les métadonnées et chaque section, comme le codec les compresse"""
+    values = [save_data["metadata"]] + list(split_sections(save_data).values())
+    return ["".join(iter_json(value)).encode("utf-8") for value in values]
+
+def measure(manager, codec, sectioned, corpus):
+    """Taille moyenne des fichiers et durées moyennes (écriture, lecture) en ms"""
+    manager.codec = codec
+    manager.sectioned_saves = sectioned
+    sizes, write_ms, read_ms = [], [], []
+    os.makedirs(os.path.join(manager.save_directory, "bench"), exist_ok=True)
+    for index, save_data in enumerate(corpus):
+        path = os.path.join(manager.save_directory, "bench", f"save_{index}.mkrp")
+        best_write = best_read = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            manager._write_save_file(path, save_data, catalog=False)
+            best_write = min(best_write, time.perf_counter() - start)
+            start = time.perf_counter()
+            assert manager._read_save_file(path) == save_data
+            best_read = min(best_read, time.perf_counter() - start)
+        sizes.append(os.path.getsize(path))
+        write_ms.append(best_write * 1000)
+        read_ms.append(best_read * 1000)
+    return sum(sizes) / len(sizes), sum(write_ms) / len(write_ms), sum(read_ms) / len(read_ms)
+
+def main():
+    args = sys.argv[1:]
+    corpus_dir = None
+    if "--corpus" in args:
+        corpus_dir = os.path.abspath(args[args.index("--corpus") + 1])
+        del args[args.index("--corpus"):args.index("--corpus") + 2]
+    save_count = int(args[0]) if args else SAVE_COUNT
+
+    corpus = make_corpus(save_count)
+    train, test = corpus[:save_count // 2], corpus[save_count // 2:]
+    key = b"musko_tensei_rp"
+
+    start = time.perf_counter()
+    dictionary = train_dictionary([sample for save_data in train for sample in samples_of(save_data)])
+    train_ms = (time.perf_counter() - start) * 1000
+    dictionaries.register(dictionary)
+    json_size = sum(len(json.dumps(save_data)) for save_data in test) / len(test)
+    print(f"{len(train)} sauvegardes d'entraînement, {len(test)} de test (JSON moyen: {json_size:.0f} octets)")
+    print(f"Dictionnaire: {len(dictionary)} octets, entraîné en {train_ms:.0f} ms")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(None)
+        print(f"{'Codec':<34}{'Taille moy.':>12}{'Écriture':>11}{'Lecture':>10}")
+        print("-" * 67)
+        rows = [
+            ("gzip 9, un seul bloc", SaveCodec("gzip", 9, True, key), False),
+            ("gzip 9, sections", SaveCodec("gzip", 9, True, key), True),
+            ("zlib 6, sections", SaveCodec("zlib", 6, True, key), True),
+            ("zdict 9 (entraîné, test)", SaveCodec("zdict", 9, True, key, dictionary), True)
+        ]
+        shipped = dictionaries.default()
+        if shipped:
+            rows.append(("zdict 9 (dictionnaire livré)", SaveCodec("zdict", 9, True, key, shipped), True))
+        baseline = None
+        for label, codec, sectioned in rows:
+            size, write_ms, read_ms = measure(manager, codec, sectioned, test)
+            baseline = baseline or size
+            print(f"{label:<34}{size:>8.0f} o {write_ms:>7.2f} ms{read_ms:>7.2f} ms  ({size / baseline:.0%})")
+
+        if corpus_dir:
+            manager = SaveManager(None, save_directory=corpus_dir)
+            manager.codec = SaveCodec("zlib", 6, True, key)
+            os.makedirs(os.path.join(corpus_dir, "corpus"), exist_ok=True)
+            for index, save_data in enumerate(corpus):
+                manager._write_save_file(os.path.join(corpus_dir, "corpus", f"save_{index:04d}.mkrp"), save_data, catalog=False)
+            print(f"Corpus écrit dans {corpus_dir}")
+        os.chdir(project_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# save_fsck.py - Vérification d'une arborescence de sauvegardes: sommes de contrôle vs décodage complet
+#
+# Utilisation: python benchmarks/save_fsck.py [nombre de sauvegardes]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+from save_fsck import fsck_tree
+from save_codecs import SECTIONED_VERSION, CHECKSUMMED_VERSION
+from save_sections import split_sections, encode_sections
+
+SAVE_COUNT = 400
+
+class BenchmarkGame:
+    def __init__(self):
+        self.player = {
+            "name": "Rudeus",
+            "level": 12,
+            "journal": [{"type": "event", "day": i // 10, "content": f"Entrée {i}: leçon de magie avec Roxy."} for i in range(4000)]
+        }
+        self.relationships = {f"npc_{i}": {"affinity": i % 100, "memories": [f"Souvenir {j}" for j in range(10)]} for i in range(300)}
+
+def timed(function, repeat=5):
+    """Meilleure durée (ms) sur plusieurs exécutions"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    save_count = int(sys.argv[1]) if len(sys.argv) > 1 else SAVE_COUNT
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(BenchmarkGame())
+
+        # Coût des sommes de contrôle à l'encodage: v2 (sans) vs v3 (avec)
+        sections = split_sections(manager._get_save_data())
+        v2_ms = timed(lambda: encode_sections(manager.codec, sections, b"", SECTIONED_VERSION))
+        v3_ms = timed(lambda: encode_sections(manager.codec, sections, b"", CHECKSUMMED_VERSION))
+        print(f"Encodage d'une sauvegarde: v2 {v2_ms:.1f} ms, v3 avec CRC32 {v3_ms:.1f} ms")
+        source_path = manager.save_game("bench", "source")["save_path"]
+
+        # Arborescence: save_count copies réparties en 20 emplacements
+        for i in range(save_count):
+            slot_dir = os.path.join("saves", f"slot_{i % 20}")
+            os.makedirs(slot_dir, exist_ok=True)
+            shutil.copyfile(source_path, os.path.join(slot_dir, f"save_{i}.mkrp"))
+        size_mb = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk("saves") for name in files) / 1024 / 1024
+        print(f"{save_count} sauvegardes, {size_mb:.1f} Mo, {os.cpu_count()} processeur(s)")
+
+        print(f"{'Vérification':<36}{'Durée':>10}{'Débit':>14}")
+        print("-" * 60)
+        for label, workers, deep in (("Sommes de contrôle, 1 processus", 1, False),
+                                     ("Sommes de contrôle, groupe", None, False),
+                                     ("Décodage complet, 1 processus", 1, True),
+                                     ("Décodage complet, groupe", None, True)):
+            summary = fsck_tree("saves", workers, deep)
+            assert summary["ok"] == summary["total"]
+            print(f"{label:<36}{summary['duration'] * 1000:>7.0f} ms{summary['mb_per_second']:>9.1f} Mo/s")
+        os.chdir(project_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# save_retention.py - Taille des sauvegardes au fil d'une longue partie, avec et sans rétention
+#
+# Utilisation: python benchmarks/save_retention.py [nombre de tours]
+#
+# Chaque tour enregistre un événement dans la mémoire de l'IA (comme AIManager.record_event:
+# mémoire du monde par type et événements du personnage concerné) et un échange de conversation.
+# Toutes les 1000 parties de tours, la sauvegarde est écrite avec et sans les politiques de
+# rétention: taille encodée, durée d'écriture et coût de la rétention.
+import os
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+from save_retention import SaveRetention
+
+TURNS = 10000
+STEP = 2000
+EVENT_TYPES = ("combat", "quest", "relationship", "discovery", "trade")
+CHARACTERS = [f"npc_{i}" for i in range(30)]
+LOCATIONS = ("Buena", "Roa", "Sharia", "Millis", "Asura")
+
+class BenchmarkAI:
+    def __init__(self):
+        self.conversation_history = []
+        self.memory_by_character = {}
+        self.world_state_memory = {}
+        self.player_personality = {"brave": 0.6, "curious": 0.8}
+
+    def record_event(self, event_type, event_data):
+        # Même structure que AIManager.record_event
+        event_data["timestamp"] = time.time()
+        self.world_state_memory.setdefault(event_type, []).append(event_data)
+        character_id = event_data.get("character_id")
+        if character_id:
+            memory = self.memory_by_character.setdefault(character_id, {"conversations": [], "relationships": {}, "events": []})
+            memory["events"].append({"type": event_type, "data": event_data, "timestamp": event_data["timestamp"]})
+
+class BenchmarkGame:
+    def __init__(self):
+        self.player = {"name": "Rudeus", "level": 12, "journal": []}
+        self.ai_manager = BenchmarkAI()
+
+def play(game, turn):
+    ai = game.ai_manager
+    ai.record_event(EVENT_TYPES[turn % len(EVENT_TYPES)], {
+        "character_id": CHARACTERS[turn % len(CHARACTERS)],
+        "location": LOCATIONS[turn % len(LOCATIONS)],
+        "description": f"Tour {turn}: Rudeus croise un voyageur et échange quelques nouvelles du royaume."
+    })
+    ai.conversation_history.append({"role": "user", "content": f"Tour {turn}: je continue ma route."})
+    ai.conversation_history = ai.conversation_history[-20:]
+
+def save(manager, name):
+    """(taille encodée en Ko, durée d'écriture en ms)"""
+    start = time.perf_counter()
+    result = manager.save_game(name)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert result["success"], result["message"]
+    return os.path.getsize(result["save_path"]) / 1024, elapsed
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else TURNS
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        game = BenchmarkGame()
+        managers = {
+            "sans": SaveManager(game, save_directory="without"),
+            "avec": SaveManager(game, save_directory="with")
+        }
+        managers["sans"].retention = SaveRetention(policies={})
+
+        print(f"{'Tours':>8}{'Sans rétention':>17}{'écriture':>12}{'Avec rétention':>17}{'écriture':>12}{'rétention':>12}{'retirées':>10}")
+        print("-" * 88)
+        for turn in range(1, turns + 1):
+            play(game, turn)
+            if turn % STEP and turn != turns:
+                continue
+            without_size, without_ms = save(managers["sans"], f"tour_{turn}")
+            with_size, with_ms = save(managers["avec"], f"tour_{turn}")
+            save_data = managers["avec"]._get_save_data()
+            start = time.perf_counter()
+            _, report = managers["avec"].retention.apply(save_data)
+            retention_ms = (time.perf_counter() - start) * 1000
+            print(f"{turn:>8}{without_size:>14.1f} Ko{without_ms:>9.1f} ms{with_size:>14.1f} Ko{with_ms:>9.1f} ms"
+                  f"{retention_ms:>9.2f} ms{sum(report.values()):>10}")
+
+        report = managers["avec"].save_size_report()
+        print(f"\nRépartition avec rétention: {report['message']}")
+        for name, size in report["sections"].items():
+            print(f"  {name:<16}{size['json'] / 1024:>10.1f} Ko JSON{size['encoded'] / 1024:>10.1f} Ko encodés")
+        os.chdir(project_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# save_storage.py - Stockage des sauvegardes: un fichier .mkrp par sauvegarde vs base SQLite
+#
+# Utilisation: python benchmarks/save_storage.py [nombre de sauvegardes] [nombre de slots]
+#
+# Les deux stockages reçoivent les mêmes sauvegardes (petites parties en cours, niveaux variés),
+# réparties entre les slots. Mesures: écriture, liste complète (catalogue froid et chaud),
+# liste d'un slot, élagage de PRUNED_SLOTS slots, lecture partielle et recherche par niveau.
+import os
+import sys
+import tempfile
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+
+SAVE_COUNT = 100000
+SLOT_COUNT = 1000
+PRUNED_SLOTS = 50
+
+class BenchmarkGame:
+    def __init__(self):
+        self.player = {
+            "name": "Rudeus",
+            "level": 1,
+            "journal": [{"type": "event", "day": i // 10, "content": f"Entrée {i}: leçon de magie avec Roxy."} for i in range(40)]
+        }
+        self.relationships = {f"npc_{i}": {"affinity": i % 100} for i in range(20)}
+
+def timed(function, repeat=3):
+    """Meilleure durée (ms) sur plusieurs exécutions et résultat de la dernière"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def saves(manager, save_count, slot_count):
+    """(slot, nom, date, données) de chaque sauvegarde"""
+    template = manager._get_save_data()
+    now = time.time()
+    for i in range(save_count):
+        if i % 10000 == 0:
+            print(f"\r🔄 {manager.storage}: {i}/{save_count} sauvegardes écrites", end="", flush=True)
+        save_data = dict(template, player=dict(template["player"], level=1 + i % 100))
+        save_data["metadata"] = dict(template["metadata"], save_name=f"save_{i:06d}",
+                                     last_save_time=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now - save_count + i)))
+        yield f"slot_{i % slot_count:04d}", f"save_{i:06d}", now - save_count + i, save_data
+
+def directory_size(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(directory) for name in files)
+
+def main():
+    save_count = int(sys.argv[1]) if len(sys.argv) > 1 else SAVE_COUNT
+    slot_count = int(sys.argv[2]) if len(sys.argv) > 2 else SLOT_COUNT
+    print(f"{save_count} sauvegardes dans {slot_count} slots")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        results = {}
+        for storage in ("files", "sqlite"):
+            manager = SaveManager(BenchmarkGame(), save_directory=storage)
+            manager.set_storage(storage)
+            rows = results[storage] = {}
+
+            start = time.perf_counter()
+            if manager.database:
+                with manager.database.transaction():
+                    for slot, name, saved_at, save_data in saves(manager, save_count, slot_count):
+                        manager.database.write(slot, name, manager.codec, save_data, saved_at=saved_at)
+            else:
+                # Les fichiers sont écrits comme par save_game (fichier temporaire, fsync, renommage)
+                with manager._metadata_batch():
+                    for slot, name, saved_at, save_data in saves(manager, save_count, slot_count):
+                        save_path = os.path.join(manager.save_directory, slot, f"{name}.mkrp")
+                        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                        manager._write_save_file(save_path, save_data, catalog=False)
+                        os.utime(save_path, (saved_at, saved_at))
+            rows["Écriture (par sauvegarde)"] = (time.perf_counter() - start) * 1000 / save_count
+            print("\r" + " " * 60 + "\r", end="")
+            if manager.database:
+                manager.database.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            rows["Taille sur le disque (Mo)"] = directory_size(storage) / 1024 / 1024
+
+            if not manager.database:
+                manager.catalog.invalidate()
+                rows["Liste complète, catalogue froid"], _ = timed(manager.list_saves, repeat=1)
+            rows["Liste complète"], listed = timed(manager.list_saves)
+            assert len(listed) == save_count, len(listed)
+            rows["Liste d'un slot"], _ = timed(lambda: manager.list_saves("slot_0007"), repeat=20)
+            target = manager.list_saves("slot_0007")[-1]["path"]
+            rows["Lecture partielle (player)"], partial = timed(lambda: manager.load_sections(target, ["player"]), repeat=20)
+            assert partial["success"], partial["message"]
+            rows["Chargement complet"], loaded = timed(lambda: manager._load_chain(target), repeat=20)
+
+            if manager.database:
+                rows["Recherche niveau 100"], found = timed(lambda: manager.database.list(min_level=100), repeat=5)
+            else:
+                rows["Recherche niveau 100"], found = timed(
+                    lambda: [save for save in manager.list_saves() if manager.load_sections(save["path"], ["player"])["sections"]["player"]["level"] >= 100],
+                    repeat=1)
+            assert len(found) == (save_count + 1) // 100, len(found)
+
+            # Élagage de quelques slots: avec les fichiers, chaque élagage réécrit le catalogue
+            pruned = min(slot_count, PRUNED_SLOTS)
+            start = time.perf_counter()
+            for slot in range(pruned):
+                manager._prune_saves(os.path.join(manager.save_directory, f"slot_{slot:04d}"), 3)
+            rows["Élagage à 3 (par slot)"] = (time.perf_counter() - start) * 1000 / pruned
+            assert len(manager.list_saves("slot_0007")) == min(3, len(listed) // slot_count)
+            if manager.database:
+                manager.database.close()
+
+        print(f"{'Opération':<36}{'Fichiers':>14}{'SQLite':>14}")
+        print("-" * 64)
+        for label in results["sqlite"]:
+            unit = "" if "Mo" in label else " ms"
+            files = results["files"].get(label)
+            files_text = f"{files:.2f}{unit}" if files is not None else "-"
+            print(f"{label:<36}{files_text:>14}{results['sqlite'][label]:>11.2f}{unit}")
+        print(f"{'Liste complète, catalogue froid':<36}{results['files']['Liste complète, catalogue froid']:>11.2f} ms{'-':>14}")
+        os.chdir(project_path)
+
+if __name__ == "__main__":
+    main()
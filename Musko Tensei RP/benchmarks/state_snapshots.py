@@ -0,0 +1,161 @@
+# state_snapshots.py - Instantanés de l'état: copie complète (marshal) vs état suivi à partage de structure
+#
+# Utilisation: python benchmarks/state_snapshots.py [nombre de PNJ]
+#
+# Chaque tour enregistre aussi un événement dans une grande mémoire de l'IA (AI_EVENTS événements,
+# même structure que AIManager). La ligne "mémoire de l'IA non suivie" correspond à l'état suivi
+# avant que les mémoires d'AIManager soient des TrackedAttribute.
+import marshal
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+from game_state import TrackedAttribute
+
+NPC_COUNT = 2000
+TURNS = 50
+AI_EVENTS = 20000
+EVENT_TYPES = ("combat", "quest", "relationship", "discovery", "trade")
+
+def build_state(npc_count):
+    return {
+        "player": {
+            "name": "Rudeus",
+            "level": 12,
+            "states": {"faim": 80, "fatigue": 10},
+            "journal": [{"type": "event", "content": f"Entrée {i}: leçon de magie avec Roxy."} for i in range(5000)]
+        },
+        "game_time": {"day": 1, "hour": 8, "minute": 0},
+        "relationships": {f"npc_{i}": {"affinity": i % 100, "memories": [f"Souvenir {j}" for j in range(10)]} for i in range(npc_count)}
+    }
+
+class PlainAI:
+    def __init__(self):
+        self.conversation_history = [{"role": "user", "content": f"Message {i}"} for i in range(20)]
+        self.memory_by_character = {}
+        self.world_state_memory = {}
+        self.player_personality = {"kindness": 0.2, "boldness": 0.5}
+        for i in range(AI_EVENTS):
+            self.record_event(EVENT_TYPES[i % len(EVENT_TYPES)], {
+                "character_id": f"npc_{i % 200}",
+                "description": f"Événement {i}: Rudeus croise un voyageur sur la route de Roa."
+            })
+
+    def record_event(self, event_type, event_data):
+        # Même structure que AIManager.record_event
+        event_data["timestamp"] = time.time()
+        if event_type not in self.world_state_memory:
+            self.world_state_memory[event_type] = []
+        self.world_state_memory[event_type].append(event_data)
+        character_id = event_data.get("character_id")
+        if character_id:
+            if character_id not in self.memory_by_character:
+                self.memory_by_character[character_id] = {"conversations": [], "relationships": {}, "events": []}
+            self.memory_by_character[character_id]["events"].append({
+                "type": event_type, "data": event_data, "timestamp": event_data["timestamp"]
+            })
+
+class TrackedAI(PlainAI):
+    conversation_history = TrackedAttribute()
+    memory_by_character = TrackedAttribute()
+    world_state_memory = TrackedAttribute()
+    player_personality = TrackedAttribute()
+
+class PlainGame:
+    def __init__(self, npc_count, ai_class=PlainAI):
+        state = build_state(npc_count)
+        self.player = state["player"]
+        self.game_time = state["game_time"]
+        self.relationships = state["relationships"]
+        self.ai_manager = ai_class()
+        self.turn_count = 0
+
+class TrackedGame(PlainGame):
+    player = TrackedAttribute()
+    game_time = TrackedAttribute()
+    relationships = TrackedAttribute()
+
+def play_turn(game, turn):
+    """Un tour: le temps avance, une entrée de journal, une relation change, l'IA retient un événement"""
+    game.turn_count = turn
+    game.game_time["minute"] = (game.game_time["minute"] + 20) % 60
+    game.player["states"]["faim"] -= 1
+    game.player["journal"].append({"type": "event", "content": f"Tour {turn}"})
+    game.relationships[f"npc_{turn % len(game.relationships)}"]["affinity"] += 1
+    game.ai_manager.record_event("combat", {"character_id": f"npc_{turn % 200}", "description": f"Tour {turn}"})
+    game.ai_manager.conversation_history.append({"role": "user", "content": f"Tour {turn}"})
+    game.ai_manager.conversation_history = game.ai_manager.conversation_history[-20:]
+
+def measure(game, snapshot):
+    """Durée moyenne d'un instantané et mémoire d'un anneau de TURNS instantanés"""
+    ring = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for turn in range(1, TURNS + 1):
+        play_turn(game, turn)
+        ring.append(snapshot())
+    elapsed = (time.perf_counter() - start) / TURNS
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed * 1000, memory / 1024 / 1024
+
+def main():
+    npc_count = int(sys.argv[1]) if len(sys.argv) > 1 else NPC_COUNT
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        print(f"{npc_count} PNJ, journal de 5000 entrées, mémoire de l'IA de {AI_EVENTS} événements, anneau de {TURNS} tours")
+        print(f"{'Instantané':<44}{'Durée/tour':>12}{'Mémoire anneau':>16}")
+        print("-" * 72)
+
+        # Ancienne méthode: copie profonde marshal de l'état à chaque tour
+        plain = SaveManager(PlainGame(npc_count))
+        copy_ms, copy_mb = measure(plain.game, lambda: marshal.dumps(plain._get_save_data()))
+        print(f"{'Copie complète (marshal)':<44}{copy_ms:>9.2f} ms{copy_mb:>13.1f} Mo")
+
+        partial = SaveManager(TrackedGame(npc_count, PlainAI))
+        partial.record_turn()
+        partial_ms, partial_mb = measure(partial.game, partial._get_save_data)
+        label = "État suivi, mémoire de l'IA non suivie"
+        print(f"{label:<44}{partial_ms:>9.2f} ms{partial_mb:>13.1f} Mo")
+
+        tracked = SaveManager(TrackedGame(npc_count, TrackedAI))
+        tracked.record_turn()
+        shared_ms, shared_mb = measure(tracked.game, tracked._get_save_data)
+        print(f"{'État suivi (partage de structure)':<44}{shared_ms:>9.2f} ms{shared_mb:>13.1f} Mo")
+        print(f"Gain: {copy_ms / shared_ms:.0f}x plus rapide")
+
+        # Sauvegarde et chargement rapides: mémoire vs disque
+        start = time.perf_counter()
+        tracked.quick_save()
+        quick_save_ms = (time.perf_counter() - start) * 1000
+        tracked.wait_for_autosave()
+        start = time.perf_counter()
+        tracked.quick_load()
+        quick_load_ms = (time.perf_counter() - start) * 1000
+        tracked.timeline.quick = None
+        start = time.perf_counter()
+        tracked.quick_load()
+        disk_load_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        tracked.save_game("bench", "disk")
+        disk_save_ms = (time.perf_counter() - start) * 1000
+        for turn in range(TURNS + 1, TURNS + 4):
+            play_turn(tracked.game, turn)
+            tracked.record_turn()
+        start = time.perf_counter()
+        tracked.rewind(3)
+        rewind_ms = (time.perf_counter() - start) * 1000
+
+        print(f"Sauvegarde rapide: {quick_save_ms:.1f} ms (disque: {disk_save_ms:.1f} ms)")
+        print(f"Chargement rapide: {quick_load_ms:.1f} ms (disque: {disk_load_ms:.1f} ms)")
+        print(f"Retour de 3 tours en arrière: {rewind_ms:.1f} ms")
+        os.chdir(project_path)
+
+if __name__ == "__main__":
+    main()
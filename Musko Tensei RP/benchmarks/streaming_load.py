@@ -0,0 +1,105 @@
+# streaming_load.py - Chargement d'une grosse sauvegarde: lecture complète vs lecture en flux
+#
+# Utilisation: python benchmarks/streaming_load.py [taille du JSON en Mo]
+#
+# La sauvegarde synthétique (journal et mémoire du monde de l'IA) est écrite avec chaque codec.
+# "Lecture complète" reproduit l'ancien chargement de chaque section: lecture du bloc entier,
+# XOR sur tout le bloc, décompression en un appel puis json.loads. "Lecture en flux" est
+# _read_save_file: morceaux lus par readinto, désobfusqués, décompressés et analysés au fil
+# de l'eau.
+# Pic mémoire mesuré par tracemalloc (allocations Python: octets, texte et arbre JSON).
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from save_manager import SaveManager
+from save_codecs import read_header, SECTIONED_VERSION
+from save_sections import read_toc, read_section_blob, join_sections
+from save_retention import SaveRetention
+
+SAVE_SIZE_MB = 50
+CODECS = ("zlib", "zdict", "lzma")
+
+WORDS = ("Rudeus", "Roxy", "Eris", "Sylphiette", "Ghislaine", "Paul", "Zenith", "magie", "épée", "forêt",
+         "Buena", "Roa", "loup", "steppes", "leçon", "voyage", "auberge", "marché", "combat", "victoire")
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length)) + f" {rng.randrange(10 ** 6)}."
+
+class BenchmarkAI:
+    def __init__(self, world_state_memory):
+        self.world_state_memory = world_state_memory
+
+class BenchmarkGame:
+    def __init__(self, size_mb):
+        # Texte peu répétitif (mots tirés au hasard): taux de compression proche d'une vraie partie
+        rng = random.Random(42)
+        entry = {"type": "event", "day": 0, "content": sentence(rng, 16)}
+        count = size_mb * 1024 * 1024 // len(json.dumps(entry))
+        self.player = {
+            "name": "Rudeus",
+            "level": 42,
+            "journal": [{"type": "event", "day": i // 10, "content": sentence(rng, 16)} for i in range(count // 2)]
+        }
+        self.ai_manager = BenchmarkAI({"combat": [{"type": "combat", "turn": i, "content": sentence(rng, 15)} for i in range(count // 2)]})
+
+def full_read(manager, save_path):
+    """Ancien chargement: chaque section lue puis décodée en un seul bloc"""
+    with open(save_path, "rb") as f:
+        codec, meta_size, _, version = read_header(f, manager.encryption_key.encode("utf-8"))
+        assert version >= SECTIONED_VERSION
+        encoded_metadata = f.read(meta_size)
+        toc, _ = read_toc(f, version, encoded_metadata)
+        metadata = json.loads(codec.decode_bytes(encoded_metadata))
+        sections = {name: json.loads(codec.decode_bytes(read_section_blob(f, name, entry)))
+                    for name, entry in sorted(toc.items(), key=lambda item: item[1][0])}
+    return join_sections(metadata, sections)
+
+def measure(function):
+    """(meilleure durée en ms sur 3 exécutions, pic mémoire en Mo)"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else SAVE_SIZE_MB
+    game = BenchmarkGame(size_mb)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        manager = SaveManager(game, save_directory="saves")
+        # Toute la mémoire du monde est écrite (pas de politique de rétention)
+        manager.retention = SaveRetention(policies={})
+        json_size = len(json.dumps(manager._get_save_data())) / 1024 / 1024
+        print(f"Sauvegarde synthétique: {json_size:.1f} Mo de JSON")
+        print(f"{'Codec':<8}{'Fichier':>10}{'Complète':>12}{'pic':>10}{'En flux':>12}{'pic':>10}")
+        print("-" * 62)
+        for codec in CODECS:
+            manager.set_codec(codec)
+            result = manager.save_game(f"big_{codec}")
+            assert result["success"], result["message"]
+            save_path = result["save_path"]
+            assert full_read(manager, save_path) == manager._read_save_file(save_path)
+
+            full_ms, full_peak = measure(lambda: full_read(manager, save_path))
+            stream_ms, stream_peak = measure(lambda: manager._read_save_file(save_path))
+            file_mb = os.path.getsize(save_path) / 1024 / 1024
+            print(f"{codec:<8}{file_mb:>7.1f} Mo{full_ms:>9.0f} ms{full_peak:>7.0f} Mo{stream_ms:>9.0f} ms{stream_peak:>7.0f} Mo")
+        os.chdir(project_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# xp_levels.py - Montées de niveau: boucle niveau par niveau vs bisection dans les seuils cumulés
+#
+# Utilisation: python benchmarks/xp_levels.py [nombre d'attributions simulées]
+#
+# "Boucle" reproduit l'ancien award_xp (un appel à calculate_xp_for_level par niveau gagné),
+# sur les mêmes seuils (experience_table de progression.json, formule au-delà). "Bisection"
+# est level_for_xp. La simulation résout N attributions avec award_xp_bulk (numpy si disponible).
+import os
+import random
+import sys
+import time
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+import character_progression
+from character_progression import CharacterProgression
+
+SIMULATED_GRANTS = 1000000
+GRANTS = (
+    ("Combat (100 XP, niveau 5)", 1000, 100),
+    ("Quête (20 000 XP, niveau 20)", 19000, 20000),
+    ("Saut dans le temps (10 M XP)", 0, 10 ** 7),
+    ("Triche (1 G XP)", 0, 10 ** 9)
+)
+
+def loop_level(progression, level, xp):
+    """Ancienne résolution: niveau par niveau"""
+    while xp >= progression.calculate_xp_for_level(level + 1):
+        level += 1
+    return level
+
+def timed(function, repeat):
+    """Meilleure durée par appel (µs) sur 3 séries"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        elapsed = (time.perf_counter() - start) * 1000000 / repeat
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    grants = int(sys.argv[1]) if len(sys.argv) > 1 else SIMULATED_GRANTS
+    os.chdir(project_path)
+    progression = CharacterProgression()
+
+    print(f"{'Attribution':<32}{'Niveaux':>9}{'Boucle':>14}{'Bisection':>14}")
+    print("-" * 69)
+    for label, start_xp, amount in GRANTS:
+        start_level = progression.level_for_xp(start_xp)
+        new_level = progression.level_for_xp(start_xp + amount)
+        assert loop_level(progression, start_level, start_xp + amount) == new_level
+        repeat = 20 if new_level - start_level > 1000 else 2000
+        loop_us = timed(lambda: loop_level(progression, start_level, start_xp + amount), repeat)
+        bisect_us = timed(lambda: progression.level_for_xp(start_xp + amount), 2000)
+        print(f"{label:<32}{new_level - start_level:>9}{loop_us:>11.2f} µs{bisect_us:>11.2f} µs")
+
+    rng = random.Random(42)
+    amounts = [rng.randrange(0, 5000) for _ in range(grants)]
+    start = time.perf_counter()
+    result = progression.award_xp_bulk(amounts, cumulative=True)
+    bulk_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    level, xp = 1, 0
+    for amount in amounts:
+        xp += amount
+        level = loop_level(progression, level, xp)
+    loop_ms = (time.perf_counter() - start) * 1000
+    assert int(result["levels"][-1]) == level
+    backend = "numpy" if character_progression.np is not None else "bisect"
+    print(f"\nSimulation: {grants} attributions successives, niveau final {level}")
+    print(f"  boucle {loop_ms:.0f} ms, award_xp_bulk ({backend}) {bulk_ms:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 import sys
 import os
 import time
+import io
+import contextlib
 import json
 import importlib
 import random
@@ -147,7 +149,7 @@ class SaveManagerSimple:
         logger.info(f"Chargement du jeu depuis {save_path}")
         return {"success": True}
         
-    def auto_save(self):
+    def auto_save(self, background=False):
         logger.info("Auto-sauvegarde effectuée")
         return {"success": True}
         
@@ -240,18 +242,51 @@ SaveManager = safe_import("save_manager", "SaveManager") or SaveManagerSimple
 AIManager = safe_import("ai_manager", "AIManager") or AIManagerSimple
 CharacterProgression = safe_import("character_progression", "CharacterProgression") or CharacterProgressionSimple
 InterfaceCLI = safe_import("interface_cli", "InterfaceCLI") or InterfaceCLISimple
+WorldMap = safe_import("world_map", "WorldMap")
+ItemCatalog = safe_import("item_catalog", "ItemCatalog")
+EventIndex = safe_import("event_index", "EventIndex")
+DataStore = safe_import("data_store", "DataStore")
+build_npc_table = safe_import("records", "build_npc_table")
+ActionJournal = safe_import("action_journal", "ActionJournal")
+ReplayDivergence = safe_import("action_journal", "ReplayDivergence")
+TrackedAttribute = safe_import("game_state", "TrackedAttribute")
 # Fin BLOC 2: Classes et Fonctions d'Importation
 
 # BLOC 3: Classe principale MuskoTenseiRP - Initialisation
 class MuskoTenseiRP:
     """Classe principale du jeu MUSKO TENSEI RP"""
     
+    # État suivi: un instantané (sauvegarde, retour en arrière) ne copie que ce qui a changé
+    if TrackedAttribute:
+        player = TrackedAttribute()
+        game_flags = TrackedAttribute()
+        game_time = TrackedAttribute()
+        player_inventory = TrackedAttribute()
+    
     def __init__(self):
         self.version = "1.0.0"
         logger.info(f"Initialisation du jeu Musko Tensei RP...")
         
         # Initialiser les gestionnaires
         self.save_manager = SaveManager(self)
+        
+        # Auto-sauvegarde en arrière-plan: tous les N tours (0 pour désactiver), toutes les
+        # 10 heures de jeu, après les événements marquants et avant les événements risqués
+        self.autosave_interval = 10
+        self.turns_since_autosave = 0
+        self.autosave_status = "idle"
+        self.autosave_scheduler = getattr(self.save_manager, "autosave_scheduler", None)
+        if self.autosave_scheduler:
+            self.autosave_scheduler.configure(actions_interval=self.autosave_interval, game_minutes_interval=600)
+        if hasattr(self.save_manager, "add_autosave_listener"):
+            self.save_manager.add_autosave_listener(self._on_autosave_status)
+        
+        # Journal des tours joués depuis la dernière sauvegarde (reprise après un arrêt brutal)
+        self.turn_count = 0
+        self.pending_save_name = None
+        self.pending_rewind = 0
+        save_directory = getattr(self.save_manager, "save_directory", "saves")
+        self.action_journal = ActionJournal(os.path.join(save_directory, "action_journal.jsonl")) if ActionJournal else None
         self.ai_manager = AIManager(self)
         self.character_progression = CharacterProgression(self)
         self.interface = InterfaceCLI(self)
@@ -371,6 +406,20 @@ class MuskoTenseiRP:
     
     def load_game_data(self):
         """Charge les données du jeu depuis les fichiers JSON avec gestion d'erreur robuste"""
+        # Liste des fichiers de données à charger
+        data_files = [
+            "locations.json", 
+            "npcs.json", 
+            "items.json", 
+            "skills.json",
+            "quests.json", 
+            "combat.json",
+            "interactions.json",
+            "events.json",
+            "progression.json",
+            "mature.json"
+        ]
+        
         try:
             data_dir = os.path.join(project_path, "data")
             
@@ -379,64 +428,169 @@ class MuskoTenseiRP:
                 logger.info("Création du dossier data...")
                 os.makedirs(data_dir)
             
-            # Liste des fichiers de données à charger
-            data_files = [
-                "locations.json", 
-                "npcs.json", 
-                "items.json", 
-                "skills.json",
-                "quests.json", 
-                "combat.json",
-                "interactions.json",
-                "events.json",
-                "progression.json",
-                "mature.json"
-            ]
-            
-            # Charger chaque fichier
+            # Charger chaque fichier dans le stockage partagé
+            # Un paquet game_data.bundle (python modules/data_bundle.py) est partagé entre les processus
+            bundle_path = os.path.join(data_dir, "game_data.bundle")
+            self.data_store = DataStore(data_dir, data_files, bundle_path)
             for filename in data_files:
-                file_path = os.path.join(data_dir, filename)
                 name = filename.split(".")[0]  # Enlève l'extension
+                self._set_game_data(name)
                 
-                if not os.path.exists(file_path):
-                    logger.warning(f"⚠️ Le fichier {filename} n'existe pas.")
-                    setattr(self, f"{name}_data", {})
-                    continue
-                
-                try:
-                    # Vérifier le contenu du fichier
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read().strip()
-                        
-                    if not content:
-                        logger.warning(f"⚠️ Le fichier {filename} est vide.")
-                        setattr(self, f"{name}_data", {})
-                        continue
-                        
-                    # Parser le JSON avec gestion d'erreur
-                    try:
-                        data = json.loads(content)
-                        setattr(self, f"{name}_data", data)
-                        logger.info(f"✅ Données {name} chargées.")
-                    except json.JSONDecodeError as e:
-                        logger.error(f"❌ Erreur JSON dans {filename}: {e}")
-                        logger.debug(f"   Début du fichier: {repr(content[:50])}")
-                        # Créer un dictionnaire vide pour éviter les erreurs plus tard
-                        setattr(self, f"{name}_data", {})
-                        
-                except Exception as e:
-                    logger.error(f"❌ Erreur lors du chargement de {filename}: {e}")
-                    setattr(self, f"{name}_data", {})
+                # Les fichiers rechargés à chaud remplacent l'attribut correspondant
+                self.data_store.subscribe(name, lambda old, new, name=name: self._set_game_data(name))
             
             logger.info("Chargement des données terminé.")
         except Exception as e:
             logger.error(f"❌ Erreur générale lors du chargement des données: {e}")
+            self.data_store = None
+            
+            # Sans stockage partagé, chaque fichier non chargé reste un dictionnaire vide
+            for filename in data_files:
+                name = filename.split(".")[0]
+                if not hasattr(self, f"{name}_data"):
+                    setattr(self, f"{name}_data", {})
+        
+        self._build_world_map()
+        self._build_item_catalog()
+        self._build_event_index()
+        self._build_npc_records()
+        self._share_game_data()
+        
+        # Index dérivés à reconstruire quand leurs fichiers sources changent
+        if self.data_store:
+            self.data_store.subscribe("locations", self._on_locations_reloaded)
+            self.data_store.subscribe("items", self._on_items_reloaded)
+            self.data_store.subscribe("npcs", self._on_npcs_reloaded)
+            self.data_store.subscribe("events", lambda old, new: self._build_event_index())
+            self.data_store.subscribe("skills", lambda old, new: self._on_skills_reloaded(skills_data=new))
+            self.data_store.subscribe("progression", lambda old, new: self._on_skills_reloaded(progression_data=new))
+            self.data_store.start_watching()
+    
+    def _set_game_data(self, name):
+        """
+        Expose les données d'un fichier dans l'attribut {name}_data
+        
+        Le jeu modifie ces attributs (environnement des lieux, lieux par défaut...): une section
+        du paquet, en lecture seule, est exposée à travers une vue modifiable.
+        """
+        setattr(self, f"{name}_data", self.data_store.get_writable(name))
+    
+    def _source_data(self, name):
+        """Données d'origine d'un fichier (section du paquet non décodée) pour construire les index"""
+        if getattr(self, "data_store", None):
+            return self.data_store.get(name)
+        return getattr(self, f"{name}_data", {})
+    
+    def _share_game_data(self):
+        """Transmet au gestionnaire d'IA les données et index du jeu (il n'en garde pas de copie)"""
+        if hasattr(self.ai_manager, "use_game_data"):
+            self.ai_manager.use_game_data(self)
+    
+    def _release_source_data(self, name):
+        """Libère le contenu brut d'un fichier de données remplacé par son index"""
+        if getattr(self, "data_store", None):
+            self.data_store.release(name)
+    
+    def apply_data_changes(self):
+        """Applique les fichiers de données modifiés depuis le dernier tour (rechargement à chaud)"""
+        if not getattr(self, "data_store", None):
+            return []
+        return self.data_store.apply_pending()
+    
+    def _on_locations_reloaded(self, old_data, new_data):
+        """Reconstruit la carte et n'invalide que les descriptions des lieux modifiés"""
+        old_map = self.world_map
+        self._build_world_map()
+        
+        self._share_game_data()
+        if hasattr(self.ai_manager, "invalidate_location_descriptions"):
+            if old_map and self.world_map:
+                touched = old_map.changed_locations(self.world_map)
+                removed = self.ai_manager.invalidate_location_descriptions(touched)
+                logger.info(f"{len(touched)} lieux modifiés, {removed} descriptions retirées du cache.")
+    
+    def _on_items_reloaded(self, old_data, new_data):
+        """Reconstruit les catalogues d'objets"""
+        self._build_item_catalog()
+        self._share_game_data()
+    
+    def _on_npcs_reloaded(self, old_data, new_data):
+        """Reconstruit la table des PNJ et la transmet au gestionnaire d'IA"""
+        self._build_npc_records()
+        self._share_game_data()
+    
+    def _on_skills_reloaded(self, progression_data=None, skills_data=None):
+        """Reconstruit le catalogue et le graphe des compétences"""
+        if hasattr(self.character_progression, "reload_data"):
+            self.character_progression.reload_data(progression_data, skills_data)
+    
+    def _build_world_map(self):
+        """Construit le graphe de voyage à partir des données des lieux"""
+        self.world_map = None
+        if WorldMap is None:
+            return
+        
+        try:
+            self.world_map = WorldMap(self._source_data("locations"))
+            self.world_map.precompute_routes()
+            logger.info(f"✅ Carte du monde construite ({len(self.world_map.locations)} lieux).")
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la construction de la carte du monde: {e}")
+            self.world_map = None
+    
+    def _build_item_catalog(self):
+        """Construit le catalogue plat des objets et ses index"""
+        self.item_catalog = None
+        if ItemCatalog is None:
+            return
+        
+        try:
+            self.item_catalog = ItemCatalog(self._source_data("items"))
+            logger.info(f"✅ Catalogue des objets construit ({len(self.item_catalog)} objets).")
+            
+            # Le catalogue (objets par ID) remplace le contenu brut de items.json
+            self.items_data = self.item_catalog.items
+            self._release_source_data("items")
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la construction du catalogue des objets: {e}")
+            self.item_catalog = None
+    
+    def _build_npc_records(self):
+        """Construit la table compacte (lecture seule) des PNJ, qui remplace le contenu brut de npcs.json"""
+        npcs_data = self._source_data("npcs")
+        if build_npc_table is None:
+            self.character_data = npcs_data
+            return
+        
+        try:
+            self.character_data = build_npc_table(npcs_data)
+            self.npcs_data = self.character_data
+            self._release_source_data("npcs")
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la construction de la table des PNJ: {e}")
+            self.character_data = npcs_data
+    
+    def _build_event_index(self):
+        """Construit l'index des événements scénarisés (tranches d'âge et prérequis)"""
+        self.event_index = None
+        self.event_tracker = None
+        self._event_tracker_player = None
+        if EventIndex is None:
+            return
+        
+        try:
+            self.event_index = EventIndex(self._source_data("events"))
+            logger.info(f"✅ Index des événements construit ({len(self.event_index)} événements).")
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la construction de l'index des événements: {e}")
+            self.event_index = None
 # Fin BLOC 4: Méthodes de gestion des données du jeu
 
 # BLOC 5: Menu Principal et Navigation
     def start(self):
         """Démarre le jeu"""
         self._display_welcome()
+        self._offer_session_recovery()
         self.main_menu()
     
     def _display_welcome(self):
@@ -526,7 +680,10 @@ class MuskoTenseiRP:
                 logger.error(f"Erreur lors de la génération de l'introduction: {e}")
                 print("\nVotre aventure commence maintenant...\n")
             
-            # Démarrage du jeu
+            # Démarrage du jeu (le journal d'une partie précédente ne s'applique plus)
+            self.turn_count = 0
+            if self.action_journal:
+                self.action_journal.clear()
             self.game_loop()
             
         except Exception as e:
@@ -1884,6 +2041,7 @@ class MuskoTenseiRP:
                     skill["exp"] -= exp_needed  # Garder l'excédent
                     
                     logger.info(f"\n✨ Votre compétence '{skill_name}' a atteint le niveau {skill['level']} !")
+                    self._autosave_event("level_up")
                     
                     # Ajouter un bonus aux statistiques appropriées en fonction de la compétence
                     self._apply_skill_stat_bonus(skill_name, skill["level"])
@@ -2305,6 +2463,9 @@ class MuskoTenseiRP:
                     result = self.save_manager.load_game(save.get("path", ""))
                     if result.get("success", False):
                         logger.info("Sauvegarde chargée avec succès.")
+                        # Le journal d'une autre partie ne doit pas être rejoué sur celle-ci
+                        if self.action_journal:
+                            self.action_journal.start(save.get("path", ""), self.turn_count)
                         self.game_loop()
                     else:
                         logger.error("Erreur lors du chargement de la sauvegarde.")
@@ -2336,93 +2497,50 @@ class MuskoTenseiRP:
             # Génération de la description initiale adaptée à l'âge
             self._generate_initial_scene()
             
+            # Une nouvelle partie sans sauvegarde n'a pas encore de base pour le journal des actions
+            if self.action_journal and self.action_journal.read()["base"] is None:
+                self.save_manager.auto_save(background=True)
+            
+            # Point de départ de la ligne de temps (retour en arrière)
+            if hasattr(self.save_manager, "record_turn"):
+                self.save_manager.record_turn()
+            
             # Boucle de jeu principale
             playing = True
             while playing:
-                # Mise à jour de l'état du monde et du personnage
-                self._update_player_state()
-                current_environment = self._simulate_environment()
-                
-                # Si le personnage dort, générer un rêve et faire avancer le temps
-                if self.player.get("states", {}).get("activité_actuelle") == "sommeil":
-                    self._generate_dream()
-                    # Avancer le temps (sommeil)
-                    hours_slept = 8 if self.player.get("age", 0) > 3 else 12
-                    self._advance_time_hours(hours_slept)
-                    self.player["states"]["activité_actuelle"] = "éveillé"
-                    self.player["states"]["fatigue"] = max(0, self.player["states"]["fatigue"] - 80)
-                    print("\nVous vous réveillez, reposé et prêt à affronter une nouvelle journée.")
-                
-                # Vérifier les événements narratifs en cours
-                active_arcs = self.player.get("narrative_arcs", {}).get("active", [])
-                if active_arcs:
-                    # 20% de chance de progression dans un arc narratif
-                    if random.random() < 0.2:
-                        self._progress_narrative_arc(random.choice(active_arcs))
-                
-                # Afficher les informations contextuelles
-                self._display_contextual_information()
-                
-                # Générer et afficher les choix adaptés
-                actions = self._generate_contextual_choices()
-                
-                # Afficher les choix
-                print("\n" + "-"*60)
-                print("Que souhaitez-vous faire?")
-                
-                # D'abord les actions contextuelles
-                for i, action in enumerate(actions):
-                    print(f"{i+1}. {action}")
-                    
-                # Ensuite les options spéciales
-                special_options = [
-                    "📊 Voir mes statistiques et compétences",
-                    "♥ Voir mes relations",
-                    "📖 Consulter mon journal",
-                    "💾 Sauvegarder la partie",
-                    "🔙 Retourner au menu principal"
-                ]
+                # Prendre en compte les fichiers de données modifiés pendant la partie
+                self.apply_data_changes()
                 
-                for i, option in enumerate(special_options):
-                    print(f"{len(actions)+i+1}. {option}")
+                # Auto-sauvegarde périodique, écrite en arrière-plan
+                self._autosave_tick()
                 
-                # Traiter le choix du joueur
+                # Jouer un tour en l'enregistrant dans le journal des actions
+                if self.action_journal:
+                    self.action_journal.begin_turn(self.turn_count + 1)
                 try:
-                    action_choice = int(input("\nVotre choix: "))
-                    
-                    # Traiter les choix contextuels
-                    if 1 <= action_choice <= len(actions):
-                        result = self._handle_player_action(action_choice-1, actions)
-                        if result is False:  # Si l'action demande de quitter la boucle
-                            playing = False
-                    
-                    # Traiter les options spéciales
-                    elif len(actions) < action_choice <= len(actions) + len(special_options):
-                        special_idx = action_choice - len(actions) - 1
-                        
-                        if special_idx == 0:  # Statistiques
-                            self.show_character_stats()
-                        elif special_idx == 1:  # Relations
-                            self.show_relationships()
-                        elif special_idx == 2:  # Journal
-                            self.show_journal()
-                        elif special_idx == 3:  # Sauvegarder
-                            self.save_game()
-                        elif special_idx == 4:  # Menu principal
-                            playing = False
-                            logger.info("\nRetour au menu principal...")
-                    else:
-                        print("Choix invalide. Veuillez réessayer.")
-                except ValueError:
-                    print("Veuillez entrer un nombre.")
+                    playing = self._play_turn()
+                except Exception:
+                    # Un tour interrompu par une erreur ne doit pas être rejoué
+                    if self.action_journal:
+                        self.action_journal.cancel_turn()
+                    raise
+                if self.action_journal:
+                    self.action_journal.end_turn()
+                self.turn_count += 1
                 
-                # Vérification des événements de développement après chaque action
-                if self.player.get("age", 0) < 13:  # Pour les jeunes personnages
-                    self._check_development_milestone()
+                # Retour en arrière demandé pendant le tour: appliqué une fois le tour terminé
+                if self.pending_rewind:
+                    self._apply_rewind()
+                elif hasattr(self.save_manager, "record_turn"):
+                    self.save_manager.record_turn()
                 
-                # Possibilité d'événement aléatoire entre les actions (10% de chance)
-                if random.random() < 0.1:
-                    self._generate_random_event()
+                # Sauvegarde demandée pendant le tour: écrite une fois le tour terminé
+                if self.pending_save_name:
+                    self._write_requested_save()
+            
+            # Terminer l'écriture d'une auto-sauvegarde en cours avant de quitter la partie
+            if hasattr(self.save_manager, "wait_for_autosave"):
+                self.save_manager.wait_for_autosave(timeout=30)
                 
         except Exception as e:
             logger.error(f"\n❌ Une erreur s'est produite dans la boucle de jeu: {e}")
@@ -2432,28 +2550,263 @@ class MuskoTenseiRP:
             input("\nAppuyez sur Entrée pour continuer...")
             return
     
+    def _play_turn(self):
+        """
+        Joue un tour: mise à jour du monde, choix du joueur et événements
+        
+        Returns:
+            False si le joueur quitte la partie
+        """
+        playing = True
+        
+        # Mise à jour de l'état du monde et du personnage
+        self._update_player_state()
+        current_environment = self._simulate_environment()
+        
+        # Si le personnage dort, générer un rêve et faire avancer le temps
+        if self.player.get("states", {}).get("activité_actuelle") == "sommeil":
+            self._generate_dream()
+            # Avancer le temps (sommeil)
+            hours_slept = 8 if self.player.get("age", 0) > 3 else 12
+            self._advance_time_hours(hours_slept)
+            self.player["states"]["activité_actuelle"] = "éveillé"
+            self.player["states"]["fatigue"] = max(0, self.player["states"]["fatigue"] - 80)
+            print("\nVous vous réveillez, reposé et prêt à affronter une nouvelle journée.")
+        
+        # Vérifier les événements narratifs en cours
+        active_arcs = self.player.get("narrative_arcs", {}).get("active", [])
+        if active_arcs:
+            # 20% de chance de progression dans un arc narratif
+            if random.random() < 0.2:
+                self._progress_narrative_arc(random.choice(active_arcs))
+        
+        # Afficher les informations contextuelles
+        self._display_contextual_information()
+        
+        # Générer et afficher les choix adaptés
+        actions = self._generate_contextual_choices()
+        
+        # Afficher les choix
+        print("\n" + "-"*60)
+        if self.autosave_status == "saving":
+            print("💾 Sauvegarde automatique en cours…")
+        print("Que souhaitez-vous faire?")
+        
+        # D'abord les actions contextuelles
+        for i, action in enumerate(actions):
+            print(f"{i+1}. {action}")
+            
+        # Ensuite les options spéciales
+        special_options = [
+            "📊 Voir mes statistiques et compétences",
+            "♥ Voir mes relations",
+            "📖 Consulter mon journal",
+            "🧭 Voyager vers un autre lieu",
+            "💾 Sauvegarder la partie",
+            "🔙 Retourner au menu principal",
+            "⏪ Annuler le tour précédent"
+        ]
+        
+        for i, option in enumerate(special_options):
+            print(f"{len(actions)+i+1}. {option}")
+        
+        # Traiter le choix du joueur
+        try:
+            action_choice = int(input("\nVotre choix: "))
+            
+            # Traiter les choix contextuels
+            if 1 <= action_choice <= len(actions):
+                result = self._handle_player_action(action_choice-1, actions)
+                if result is False:  # Si l'action demande de quitter la boucle
+                    playing = False
+            
+            # Traiter les options spéciales
+            elif len(actions) < action_choice <= len(actions) + len(special_options):
+                special_idx = action_choice - len(actions) - 1
+                
+                if special_idx == 0:  # Statistiques
+                    self.show_character_stats()
+                elif special_idx == 1:  # Relations
+                    self.show_relationships()
+                elif special_idx == 2:  # Journal
+                    self.show_journal()
+                elif special_idx == 3:  # Voyager
+                    self._travel_menu()
+                elif special_idx == 4:  # Sauvegarder
+                    self.save_game()
+                elif special_idx == 5:  # Menu principal
+                    playing = False
+                    logger.info("\nRetour au menu principal...")
+                elif special_idx == 6:  # Retour en arrière
+                    self.pending_rewind = 1
+            else:
+                print("Choix invalide. Veuillez réessayer.")
+        except ValueError:
+            print("Veuillez entrer un nombre.")
+        
+        # Vérification des événements de développement après chaque action
+        if self.player.get("age", 0) < 13:  # Pour les jeunes personnages
+            self._check_development_milestone()
+        
+        # Possibilité d'événement aléatoire entre les actions (10% de chance)
+        if random.random() < 0.1:
+            self._generate_random_event()
+        
+        return playing
+    
+    def _autosave_tick(self):
+        """Compte les tours et programme une auto-sauvegarde en arrière-plan si un déclencheur s'est produit"""
+        if self.autosave_scheduler:
+            self.autosave_scheduler.record_action()
+            self.autosave_scheduler.tick()
+            return
+        
+        self.turns_since_autosave += 1
+        if self.autosave_interval <= 0 or self.turns_since_autosave < self.autosave_interval:
+            return
+        
+        self.turns_since_autosave = 0
+        result = self.save_manager.auto_save(background=True)
+        if not result.get("success", False):
+            logger.error(f"❌ Auto-sauvegarde impossible: {result.get('message')}")
+    
+    def _autosave_event(self, event):
+        """Signale un événement marquant (montée de niveau, fin de combat...) à la politique d'auto-sauvegarde"""
+        if self.autosave_scheduler:
+            self.autosave_scheduler.notify(event)
+    
+    def _autosave_before_risky(self, reason):
+        """Fige l'état dans une auto-sauvegarde avant un événement risqué"""
+        if not self.autosave_scheduler:
+            return
+        if self.action_journal:
+            # Au milieu d'un tour enregistré, l'état d'avant l'événement se retrouve déjà en
+            # rejouant le journal des actions (un instantané à mi-tour ne pourrait pas servir de
+            # base au rejeu): sauvegarder dès la fin du tour, sans fenêtre de regroupement
+            self.autosave_scheduler.notify(f"before_{reason}", urgent=True)
+        else:
+            self.autosave_scheduler.before_risky(reason)
+    
+    def _on_autosave_status(self, status, result):
+        """Suit l'état de l'auto-sauvegarde (appelé depuis le thread d'arrière-plan)"""
+        self.autosave_status = status
+        if status == "saved" and result:
+            logger.info(f"💾 Auto-sauvegarde écrite: {result.get('save_path')}")
+            
+            # Les tours contenus dans la sauvegarde n'ont plus besoin d'être rejoués
+            if self.action_journal:
+                self.action_journal.mark_saved(result["save_path"], result.get("turn", 0))
+    
     def save_game(self):
-        """Sauvegarde la partie actuelle"""
+        """Demande le nom de la sauvegarde, écrite à la fin du tour en cours"""
         logger.info("\nSauvegarde de la partie...")
+        save_name = input("Nom de la sauvegarde (ou Entrée pour utiliser la date actuelle): ")
+        if not save_name:
+            # Utiliser la date et l'heure actuelles comme nom de sauvegarde
+            current_time = time.strftime("%Y-%m-%d_%H-%M-%S")
+            save_name = f"{self.player['name']}_{current_time}"
+        
+        # La sauvegarde correspond ainsi exactement à un nombre de tours terminés
+        self.pending_save_name = save_name
+    
+    def _write_requested_save(self):
+        """Écrit la sauvegarde demandée pendant le tour"""
+        save_name, self.pending_save_name = self.pending_save_name, None
         try:
-            save_name = input("Nom de la sauvegarde (ou Entrée pour utiliser la date actuelle): ")
-            if not save_name:
-                # Utiliser la date et l'heure actuelles comme nom de sauvegarde
-                current_time = time.strftime("%Y-%m-%d_%H-%M-%S")
-                save_name = f"{self.player['name']}_{current_time}"
-            
             result = self.save_manager.save_game("autosave", save_name)
             if result.get("success", False):
                 logger.info(f"Partie sauvegardée avec succès sous '{save_name}'")
                 print(f"Partie sauvegardée avec succès sous '{save_name}'")
+                if self.action_journal and result.get("save_path"):
+                    self.action_journal.mark_saved(result["save_path"], self.turn_count)
+                if self.autosave_scheduler:
+                    self.autosave_scheduler.mark_saved()
             else:
                 logger.error("Erreur lors de la sauvegarde.")
                 print("Erreur lors de la sauvegarde.")
         except Exception as e:
             logger.error(f"❌ Erreur lors de la sauvegarde: {e}")
             print(f"❌ Erreur lors de la sauvegarde: {e}")
+    
+    def _apply_rewind(self):
+        """
+        Revient à la fin du tour précédant celui où le retour en arrière a été demandé
         
-        input("\nAppuyez sur Entrée pour continuer...")
+        Le tour de la demande et le tour précédent sont annulés; l'état est restauré
+        depuis la ligne de temps en mémoire, sans lire le disque.
+        """
+        steps, self.pending_rewind = self.pending_rewind, 0
+        if not hasattr(self.save_manager, "rewind"):
+            return
+        
+        # La ligne de temps s'arrête au tour précédent: le tour de la demande n'y est pas encore
+        result = self.save_manager.rewind(steps)
+        if not result.get("success", False):
+            print(f"\n{result.get('message')}")
+            self.save_manager.record_turn()
+            return
+        
+        self.turn_count = result["turn"]
+        print(f"\n⏪ {result['message']}")
+        logger.info(f"⏪ Retour en arrière: tour {result['turn']}")
+        
+        # Les tours annulés ne doivent plus être rejoués: le journal repart d'une nouvelle base
+        if self.action_journal:
+            self.action_journal.clear()
+            self.save_manager.auto_save(background=True)
+        if self.autosave_scheduler:
+            self.autosave_scheduler.mark_saved()
+    
+    def recover_session(self):
+        """
+        Reprend une partie interrompue: recharge la dernière sauvegarde puis rejoue
+        les tours enregistrés dans le journal des actions
+        
+        Returns:
+            True si la partie a été restaurée
+        """
+        journal = self.action_journal.resume()
+        result = self.save_manager.load_game(journal["base"])
+        if not result.get("success", False):
+            logger.error(f"❌ Impossible de recharger la sauvegarde de base: {result.get('message')}")
+            return False
+        
+        # Rejouer sans affichage, avec les mêmes graines aléatoires et les mêmes saisies
+        replayed = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for entry in journal["entries"]:
+                self.action_journal.begin_replay(entry)
+                try:
+                    self._play_turn()
+                except ReplayDivergence:
+                    pass
+                finally:
+                    identical = self.action_journal.end_replay()
+                self.pending_save_name = None
+                
+                if not identical:
+                    # La suite du journal ne correspond plus à l'état rejoué
+                    self.action_journal.truncate(entry["turn"] - 1)
+                    break
+                self.turn_count = entry["turn"]
+                replayed += 1
+        
+        logger.info(f"✅ Partie restaurée: {replayed} tour(s) rejoué(s) depuis {os.path.basename(journal['base'])}")
+        print(f"\nPartie restaurée: {replayed} tour(s) rejoué(s) depuis la dernière sauvegarde.")
+        return True
+    
+    def _offer_session_recovery(self):
+        """Propose de reprendre une partie interrompue avant le menu principal"""
+        if not self.action_journal or not self.action_journal.has_pending():
+            return
+        
+        pending_turns = len(self.action_journal.read()["entries"])
+        answer = input(f"\nUne partie interrompue a été détectée ({pending_turns} tour(s) non sauvegardé(s)). Reprendre? (o/n) ")
+        if answer.strip().lower() in ("o", "oui", "y", "yes"):
+            if self.recover_session():
+                self.game_loop()
+        else:
+            self.action_journal.clear()
             
     def _get_display_race_name(self, race):
         """Retourne le nom d'affichage correct d'une race"""
@@ -2998,6 +3351,71 @@ class MuskoTenseiRP:
         logger.debug(f"Avancement du temps: {hours} heures")
         self._advance_time_minutes(hours * 60)
     
+    def travel_to(self, destination):
+        """
+        Voyage vers une destination en suivant l'itinéraire le plus rapide
+        
+        Args:
+            destination: ID ou nom du lieu de destination
+            
+        Returns:
+            True si le voyage a eu lieu, False sinon
+        """
+        if not self.world_map:
+            print("\nLa carte du monde n'est pas disponible.")
+            return False
+        
+        destination_id = self.world_map.resolve(destination)
+        if not destination_id:
+            print(f"\nLieu inconnu: {destination}")
+            return False
+        
+        if destination_id == self.current_location:
+            print("\nVous êtes déjà à cet endroit.")
+            return False
+        
+        route = self.world_map.shortest_path(self.current_location, destination_id)
+        if not route:
+            print("\nAucun itinéraire connu ne mène à cet endroit.")
+            return False
+        
+        # Afficher les étapes du voyage
+        print("\nItinéraire:")
+        for step in route["steps"]:
+            print(f"  → {step['name']} ({step['minutes']} min)")
+        
+        self._advance_time_minutes(route["minutes"])
+        self.current_location = destination_id
+        
+        destination_name = self.world_map.get_location(destination_id).get("name", destination_id)
+        self._add_journal_entry("travel", f"Voyage jusqu'à {destination_name}.")
+        logger.info(f"Voyage vers {destination_id} ({len(route['steps'])} étapes, {route['minutes']} minutes)")
+        return True
+    
+    def _travel_menu(self):
+        """Propose les destinations accessibles depuis le lieu actuel"""
+        if not self.world_map:
+            print("\nLa carte du monde n'est pas disponible.")
+            return
+        
+        neighbors = self.world_map.get_neighbors(self.current_location)
+        destinations = sorted(neighbors.items(), key=lambda item: item[1])
+        
+        print("\nDestinations proches:")
+        for i, (location_id, minutes) in enumerate(destinations):
+            name = self.world_map.get_location(location_id).get("name", location_id)
+            print(f"{i+1}. {name} ({minutes} min)")
+        print("Ou saisissez le nom d'un lieu plus lointain (vide pour annuler).")
+        
+        choice = input("\nDestination: ").strip()
+        if not choice:
+            return
+        
+        if choice.isdigit() and 1 <= int(choice) <= len(destinations):
+            self.travel_to(destinations[int(choice) - 1][0])
+        else:
+            self.travel_to(choice)
+    
     def _generate_random_event(self):
         """Génère un événement aléatoire adapté à l'âge et au contexte"""
         
@@ -3070,6 +3488,7 @@ class MuskoTenseiRP:
                 )
             elif chosen_type == "combat":
                 if self.player.get("class") in ["Guerrier", "Mage", "Rôdeur", "Paladin", "Assassin"]:
+                    self._autosave_before_risky("combat")
                     prompt = (
                         f"Génère une brève escarmouche pour {self.player['name']}, un {self.player.get('class')} à {self.locations_data.get(current_location, {}).get('name', 'ce lieu')}. "
                         f"Un adversaire de niveau approprié apparaît, décris l'affrontement et sa conclusion. "
@@ -3099,6 +3518,8 @@ class MuskoTenseiRP:
             print("-"*70)
             print(event_description)
             print("*"*70)
+            if chosen_type == "combat":
+                self._autosave_event("combat_end")
             
             # Possible impact sur les compétences ou le personnage
             if random.random() < 0.5:  # 50% de chance
@@ -3442,7 +3863,10 @@ class MuskoTenseiRP:
         """Affiche les informations contextuelles pertinentes"""
         
         current_location = self.current_location
-        location_data = self.locations_data.get(current_location, {})
+        if self.world_map:
+            location_data = self.world_map.get_location(current_location)
+        else:
+            location_data = self.locations_data.get(current_location, {})
         location_name = location_data.get("name", "lieu inconnu")
         time_of_day = "jour" if 6 <= self.game_time["hour"] <= 18 else "nuit"
         player_age = self.player.get("age", 0)
@@ -3471,10 +3895,17 @@ class MuskoTenseiRP:
                 print(f"Type d'environnement: {location_data['type']}")
                 
             # Informations sur les connexions
-            if "connections" in location_data and location_data["connections"]:
+            if self.world_map:
+                connections = list(self.world_map.get_neighbors(current_location))
+            else:
+                connections = location_data.get("connections", [])
+            if connections:
                 connections_names = []
-                for conn_id in location_data["connections"]:
-                    conn_name = self.locations_data.get(conn_id, {}).get("name", conn_id)
+                for conn_id in connections:
+                    if self.world_map:
+                        conn_name = self.world_map.get_location(conn_id).get("name", conn_id)
+                    else:
+                        conn_name = self.locations_data.get(conn_id, {}).get("name", conn_id)
                     connections_names.append(conn_name)
                 print(f"Lieux accessibles: {', '.join(connections_names)}")
             
@@ -3575,6 +4006,31 @@ class MuskoTenseiRP:
         
         return True
     
+    def get_eligible_story_events(self):
+        """
+        Retourne les événements scénarisés pouvant se déclencher maintenant
+        
+        Returns:
+            Liste des données des événements, triés par âge minimum
+        """
+        if not self.event_index:
+            return []
+        
+        # Le suivi est recréé lorsqu'une autre partie est chargée
+        if self.event_tracker is None or self._event_tracker_player is not self.player:
+            self.event_tracker = self.event_index.create_tracker()
+            self._event_tracker_player = self.player
+        
+        attributes = dict(self.player.get("stats", {}))
+        attributes.update(self.player.get("attributes", {}))
+        self.event_tracker.sync(self.player.get("completed_events", []), attributes)
+        
+        event_ids = self.event_tracker.eligible(self.player.get("age", 0))
+        return [
+            self.event_index.get(event_id)
+            for event_id in sorted(event_ids, key=lambda event_id: self.event_index.windows[event_id])
+        ]
+    
     def _check_development_milestone(self):
         """Vérifie si un jalon de développement est atteint pour les jeunes personnages"""
         
@@ -3778,13 +4234,8 @@ class MuskoTenseiRP:
             # Si ce n'est pas un membre de la famille, l'afficher
             if not is_family:
                 other_shown = True
-                npc_name = npc_id  # Par défaut
-                
-                # Essayer de trouver le nom réel du PNJ
-                for character_id, character_data in self.character_data.items():
-                    if character_id == npc_id:
-                        npc_name = character_data.get("name", npc_id)
-                        break
+                # Nom réel du PNJ (ID par défaut)
+                npc_name = self.character_data.get(npc_id, {}).get("name", npc_id)
                 
                 affinity = relation.get("affinity", 50)
                 trust = relation.get("trust", 50)
@@ -3,6 +3,16 @@ from modules.save_manager import SaveManager
 from .ai_manager import AIManager
 from .character_progression import CharacterProgression
 from .interface_cli import InterfaceCLI
+from .world_map import WorldMap
+from .item_catalog import ItemCatalog
+from .skill_catalog import SkillCatalog
+from .event_index import EventIndex
+from .data_store import DataStore
+from .data_bundle import DataBundle
+from .save_codecs import SaveCodec
+from .action_journal import ActionJournal
+from .records import Record, RecordTable, NPCRecord, ItemRecord, SkillRecord, LocationRecord
 
 # Pour s'assurer que ces modules sont disponibles lorsqu'on importe modules
-__all__ = ['SaveManager', 'AIManager', 'CharacterProgression', 'InterfaceCLI']
\ No newline at end of file
+__all__ = ['SaveManager', 'AIManager', 'CharacterProgression', 'InterfaceCLI', 'WorldMap', 'ItemCatalog', 'SkillCatalog', 'EventIndex', 'DataStore', 'DataBundle', 'SaveCodec', 'ActionJournal',
+           'Record', 'RecordTable', 'NPCRecord', 'ItemRecord', 'SkillRecord', 'LocationRecord']
\ No newline at end of file
@@ -0,0 +1,244 @@
+# action_journal.py - Journal des actions depuis la dernière sauvegarde pour MUSKO TENSEI RP
+import builtins
+import json
+import os
+import random
+import threading
+from typing import Dict, List, Any
+import logging
+
+logger = logging.getLogger("musko_tensei")
+
+class ReplayDivergence(Exception):
+    """Le rejeu demande une saisie qui n'a pas été enregistrée (la partie a divergé)"""
+
+
+class ActionJournal:
+    """
+    Journal en ajout seul des tours joués depuis la dernière sauvegarde
+
+    Chaque tour est enregistré avec la graine aléatoire utilisée et les saisies du joueur:
+    en rechargeant la sauvegarde de base puis en rejouant les tours avec les mêmes graines
+    et les mêmes saisies, on retrouve l'état de la partie à la fin du dernier tour terminé.
+
+    Format (une ligne JSON par entrée):
+        {"base": chemin de la sauvegarde, "turn": tour de la sauvegarde, "session": id}   (en-tête)
+        {"turn": n, "seed": graine, "inputs": [saisies]}                                  (un tour)
+
+    La session identifie la ligne de temps en cours (nouvelle partie, sauvegarde chargée):
+    les tours d'une autre session ne sont jamais rejoués sur la nouvelle base.
+    """
+
+    def __init__(self, journal_path: str, sync: bool = True):
+        """
+        Initialise le journal
+
+        Args:
+            journal_path: Chemin du fichier journal
+            sync: Force l'écriture sur disque (fsync) à chaque tour
+        """
+        self.journal_path = journal_path
+        self.sync = sync
+        # Réentrant: mark_saved et truncate gardent le verrou de la lecture à la réécriture
+        self.lock = threading.RLock()
+
+        # Ligne de temps en cours (voir start, clear et resume)
+        self.session = self._new_session()
+
+        # Tour en cours d'enregistrement ou de rejeu
+        self.current_turn = None
+        self.replay_inputs = None
+        self.diverged = False
+        self.original_input = None
+
+    def read(self) -> Dict[str, Any]:
+        """
+        Lit le journal
+
+        Une dernière ligne incomplète (arrêt brutal pendant l'écriture) est ignorée.
+
+        Returns:
+            {"base": sauvegarde de base ou None, "turn": tour de la sauvegarde, "entries": tours enregistrés}
+        """
+        journal = {"base": None, "turn": 0, "session": None, "entries": []}
+        if not os.path.exists(self.journal_path):
+            return journal
+
+        with self.lock:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if "base" in entry:
+                journal["base"] = entry["base"]
+                journal["turn"] = entry.get("turn", 0)
+                journal["session"] = entry.get("session")
+            elif "seed" in entry:
+                journal["entries"].append(entry)
+        return journal
+
+    def has_pending(self) -> bool:
+        """Indique si des tours joués depuis une sauvegarde peuvent être rejoués"""
+        journal = self.read()
+        return journal["base"] is not None and bool(journal["entries"])
+
+    def mark_saved(self, save_path: str, turn: int) -> None:
+        """
+        Prend une sauvegarde écrite comme nouvelle base et oublie les tours qu'elle contient
+
+        Args:
+            save_path: Chemin de la sauvegarde écrite
+            turn: Nombre de tours joués au moment de la sauvegarde
+        """
+        # Appelé par le thread d'auto-sauvegarde: un tour ajouté par end_turn entre la lecture
+        # et la réécriture serait perdu
+        with self.lock:
+            journal = self.read()
+
+            # Tours joués pendant l'écriture (auto-sauvegarde en arrière-plan): seulement s'ils
+            # appartiennent à la partie en cours, pas à une autre partie ou une autre ligne de temps
+            entries = []
+            if journal["session"] == self.session:
+                entries = [entry for entry in journal["entries"] if entry["turn"] > turn]
+            self._rewrite(save_path, turn, entries)
+
+    def start(self, save_path: str, turn: int) -> None:
+        """
+        Commence une nouvelle ligne de temps à partir d'une sauvegarde chargée
+
+        Args:
+            save_path: Chemin de la sauvegarde chargée
+            turn: Tour de la sauvegarde
+        """
+        self.session = self._new_session()
+        self._rewrite(save_path, turn, [])
+
+    def resume(self) -> Dict[str, Any]:
+        """
+        Reprend la ligne de temps du journal existant (reprise après un arrêt brutal)
+
+        Returns:
+            Contenu du journal (voir read)
+        """
+        journal = self.read()
+        if journal["session"]:
+            self.session = journal["session"]
+        elif journal["base"] is not None:
+            # Journal écrit sans session: il est rattaché à la session en cours
+            self._rewrite(journal["base"], journal["turn"], journal["entries"])
+        return journal
+
+    @staticmethod
+    def _new_session() -> str:
+        return os.urandom(8).hex()
+
+    def _rewrite(self, base: str, turn: int, entries: List[Dict[str, Any]]) -> None:
+        """Réécrit le journal de façon atomique (fichier temporaire puis remplacement)"""
+        lines = [json.dumps({"base": base, "turn": turn, "session": self.session})]
+        lines.extend(json.dumps(entry, ensure_ascii=False) for entry in entries)
+
+        with self.lock:
+            temp_path = self.journal_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
+
+    def clear(self) -> None:
+        """Vide le journal et commence une nouvelle ligne de temps, sans sauvegarde de base"""
+        self.session = self._new_session()
+        self._rewrite(None, 0, [])
+
+    def begin_turn(self, turn: int) -> None:
+        """
+        Commence l'enregistrement d'un tour: fixe la graine aléatoire et capture les saisies
+
+        Args:
+            turn: Numéro du tour
+        """
+        seed = random.randrange(2 ** 32)
+        random.seed(seed)
+        self.current_turn = {"turn": turn, "seed": seed, "inputs": []}
+        self._install_input(self._recording_input)
+
+    def end_turn(self) -> None:
+        """Termine le tour et l'ajoute au journal"""
+        self._restore_input()
+        entry, self.current_turn = self.current_turn, None
+        if entry is None:
+            return
+
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                if self.sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def cancel_turn(self) -> None:
+        """Abandonne le tour en cours sans l'enregistrer"""
+        self._restore_input()
+        self.current_turn = None
+
+    def begin_replay(self, entry: Dict[str, Any]) -> None:
+        """
+        Prépare le rejeu d'un tour: même graine aléatoire, saisies fournies par le journal
+
+        Args:
+            entry: Tour enregistré
+        """
+        random.seed(entry["seed"])
+        self.replay_inputs = list(entry["inputs"])
+        self.diverged = False
+        self._install_input(self._replay_input)
+
+    def end_replay(self) -> bool:
+        """
+        Termine le rejeu d'un tour
+
+        Returns:
+            True si le tour a été rejoué à l'identique (toutes les saisies consommées, aucune manquante)
+        """
+        self._restore_input()
+        remaining, self.replay_inputs = self.replay_inputs, None
+        return not remaining and not self.diverged
+
+    def truncate(self, last_turn: int) -> None:
+        """Supprime les tours après last_turn (par exemple après une divergence du rejeu)"""
+        with self.lock:
+            journal = self.read()
+            if journal["base"] is None:
+                self.clear()
+                return
+            entries = [entry for entry in journal["entries"] if entry["turn"] <= last_turn]
+            self._rewrite(journal["base"], journal["turn"], entries)
+
+    def _install_input(self, function) -> None:
+        if self.original_input is None:
+            self.original_input = builtins.input
+        builtins.input = function
+
+    def _restore_input(self) -> None:
+        if self.original_input is not None:
+            builtins.input = self.original_input
+            self.original_input = None
+
+    def _recording_input(self, prompt: str = "") -> str:
+        """Remplace input() pendant un tour et enregistre la réponse"""
+        answer = self.original_input(prompt)
+        if self.current_turn is not None:
+            self.current_turn["inputs"].append(answer)
+        return answer
+
+    def _replay_input(self, prompt: str = "") -> str:
+        """Remplace input() pendant un rejeu et fournit la réponse enregistrée"""
+        if not self.replay_inputs:
+            self.diverged = True
+            raise ReplayDivergence(f"Saisie non enregistrée: {prompt!r}")
+        return self.replay_inputs.pop(0)
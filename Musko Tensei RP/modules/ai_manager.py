@@ -7,7 +7,20 @@ import requests
 from typing import Dict, List, Any, Optional, Tuple
 import re
 
+try:
+    from .item_catalog import ItemCatalog
+    from .game_state import TrackedAttribute
+except ImportError:
+    from item_catalog import ItemCatalog
+    from game_state import TrackedAttribute
+
 class AIManager:
+    # Mémoire suivie: l'instantané de chaque tour (retour en arrière) ne copie que ce qui a changé
+    conversation_history = TrackedAttribute()
+    memory_by_character = TrackedAttribute()
+    world_state_memory = TrackedAttribute()
+    player_personality = TrackedAttribute()
+    
     def __init__(self, game_instance=None, model_name="mistral-7b-instruct-v0.2", lm_studio_api_url="http://127.0.0.1:1234/v1"):
         """
         Initialise le gestionnaire d'IA pour MUSKO TENSEI RP.
@@ -22,12 +35,19 @@ class AIManager:
         self.model_name = model_name
         self.lm_studio_api_url = lm_studio_api_url
         
-        # Charger les données
-        self.interaction_data = self._load_data("interactions")
-        self.mature_data = self._load_data("mature")
-        self.character_data = self._load_data("npcs")
-        self.location_data = self._load_data("locations")
-        self.item_data = self._load_data("items")
+        # Charger les données (un jeu transmet les siennes par use_game_data, sans copie)
+        if game_instance is None:
+            self.interaction_data = self._load_data("interactions")
+            self.mature_data = self._load_data("mature")
+            self.character_data = self._load_data("npcs")
+            self.location_data = self._load_data("locations")
+            self.item_catalog = ItemCatalog(self._load_data("items"))
+        else:
+            self.interaction_data = {}
+            self.mature_data = {}
+            self.character_data = {}
+            self.location_data = {}
+            self.item_catalog = ItemCatalog()
         
         # Système d'historique et de mémoire
         self.conversation_history = []
@@ -44,6 +64,7 @@ class AIManager:
         
         # Cache pour les descriptions générées
         self.description_cache = {}
+        self.description_keys_by_location = {}
         
         # Limite de l'historique de conversation par personnage
         self.history_limit = 20
@@ -131,6 +152,21 @@ class AIManager:
             print(f"Erreur lors du chargement de {data_name}.json: {e}")
             return {}
     
+    def use_game_data(self, game) -> None:
+        """
+        Utilise les données et index chargés par le jeu
+
+        Args:
+            game: Instance du jeu (interactions_data, mature_data, locations_data,
+                  character_data, item_catalog)
+        """
+        self.interaction_data = getattr(game, "interactions_data", self.interaction_data)
+        self.mature_data = getattr(game, "mature_data", self.mature_data)
+        self.location_data = getattr(game, "locations_data", self.location_data)
+        self.character_data = getattr(game, "character_data", self.character_data)
+        if getattr(game, "item_catalog", None) is not None:
+            self.item_catalog = game.item_catalog
+    
     def _trim_history(self, history: List, limit: int = None) -> List:
         """Limite la taille de l'historique"""
         if limit is None:
@@ -512,9 +548,27 @@ class AIManager:
         
         # Mettre en cache pour réutilisation future
         self.description_cache[cache_key] = description
+        self.description_keys_by_location.setdefault(location_id, set()).add(cache_key)
         
         return description
     
+    def invalidate_location_descriptions(self, location_ids: List[str]) -> int:
+        """
+        Retire du cache les descriptions des lieux indiqués
+        
+        Args:
+            location_ids: IDs des lieux modifiés
+            
+        Returns:
+            Nombre de descriptions retirées
+        """
+        removed = 0
+        for location_id in location_ids:
+            for cache_key in self.description_keys_by_location.pop(location_id, ()):
+                if self.description_cache.pop(cache_key, None) is not None:
+                    removed += 1
+        return removed
+    
     def _get_weather_time_description(self, weather, time_of_day):
         """Génère une description simple en fonction de la météo et de l'heure"""
         weather_desc = {
@@ -662,9 +716,9 @@ class AIManager:
         merchant_data = self.character_data.get(merchant_id, {})
         merchant_name = merchant_data.get("name", "marchand")
         
-        item_data = self.item_data.get(item_id, {})
+        item_data = self.item_catalog.get(item_id)
         item_name = item_data.get("name", "objet")
-        base_price = item_data.get("price", 100)
+        base_price = self.item_catalog.price_of(item_id, 100)
         
         # Calculer le prix ajusté selon la réputation et le charisme
         charisma_mod = player_data.get("stats", {}).get("charisme", 10) / 10
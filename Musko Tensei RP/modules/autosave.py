@@ -0,0 +1,117 @@
+# autosave.py - Auto-sauvegarde en arrière-plan pour MUSKO TENSEI RP
+import threading
+from typing import Dict, Any, Callable, Optional
+import logging
+
+logger = logging.getLogger("musko_tensei")
+
+class AutoSaveWorker:
+    def __init__(self, write_function: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        """
+        Initialise le thread d'auto-sauvegarde
+
+        Args:
+            write_function: Fonction écrivant une tâche de sauvegarde (SaveManager._write_save)
+        """
+        self.write_function = write_function
+
+        # Une tâche en attente par slot: un instantané plus récent remplace le précédent du même slot
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.in_flight = False
+        self.condition = threading.Condition()
+
+        # État affichable: "idle", "saving", "saved" ou "error"
+        self.status = "idle"
+        self.last_result = None
+        self.replaced_count = 0
+
+        self.listeners = []
+        self.thread = None
+        self.stopping = False
+
+    def add_listener(self, callback: Callable[[str, Optional[Dict[str, Any]]], None]) -> None:
+        """Enregistre une fonction appelée à chaque changement d'état (état, résultat)"""
+        self.listeners.append(callback)
+
+    def _set_status(self, status: str, result: Dict[str, Any] = None) -> None:
+        self.status = status
+        for callback in list(self.listeners):
+            try:
+                callback(status, result)
+            except Exception as e:
+                logger.error(f"❌ Erreur dans un observateur de l'auto-sauvegarde: {e}")
+
+    def submit(self, job: Dict[str, Any]) -> None:
+        """
+        Programme l'écriture d'un instantané
+
+        Args:
+            job: Tâche de sauvegarde dont les données sont déjà figées
+        """
+        # Annoncer l'état avant de confier la tâche au thread, qui annoncera la fin
+        self._set_status("saving")
+        with self.condition:
+            if job["slot_name"] in self.pending:
+                self.replaced_count += 1
+            self.pending[job["slot_name"]] = job
+            self.stopping = False
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def _run(self) -> None:
+        """Boucle du thread: écrit la tâche en attente la plus récente"""
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                job = self.pending.pop(next(iter(self.pending)))
+                self.in_flight = True
+
+            try:
+                result = self.write_function(job)
+            except Exception as e:
+                result = {"success": False, "message": f"Erreur lors de la sauvegarde: {str(e)}"}
+
+            with self.condition:
+                self.in_flight = False
+                self.last_result = result
+                more_pending = bool(self.pending)
+                self.condition.notify_all()
+
+            if not result.get("success", False):
+                logger.error(f"❌ Échec de l'auto-sauvegarde: {result.get('message')}")
+                self._set_status("error", result)
+            elif not more_pending:
+                self._set_status("saved", result)
+
+    def is_busy(self) -> bool:
+        """Indique si une sauvegarde est en attente ou en cours d'écriture"""
+        with self.condition:
+            return bool(self.pending) or self.in_flight
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Attend que toutes les sauvegardes programmées soient écrites
+
+        Args:
+            timeout: Délai maximum en secondes (aucun si None)
+
+        Returns:
+            True si plus aucune sauvegarde n'est en attente
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.in_flight, timeout)
+
+    def stop(self, timeout: float = None) -> None:
+        """Écrit les sauvegardes en attente puis arrête le thread"""
+        self.flush(timeout)
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+            self.thread = None
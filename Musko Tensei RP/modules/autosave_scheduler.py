@@ -0,0 +1,194 @@
+# autosave_scheduler.py - Politique de déclenchement des auto-sauvegardes pour MUSKO TENSEI RP
+import time
+from typing import Dict, Any, Callable, List, Optional
+import logging
+
+logger = logging.getLogger("musko_tensei")
+
+# Événements du jeu qui déclenchent une auto-sauvegarde par défaut
+DEFAULT_EVENT_TRIGGERS = ("level_up", "combat_end", "quest_completed", "story_event")
+
+class AutoSaveScheduler:
+    """
+    Décide quand écrire une auto-sauvegarde
+
+    Déclencheurs configurables:
+        - temps de jeu écoulé (game_minutes_interval minutes de jeu)
+        - nombre d'actions du joueur (actions_interval)
+        - événements du jeu (event_triggers: montée de niveau, fin de combat, quête terminée...)
+        - avant un événement risqué (before_risky: sauvegarde immédiate)
+
+    Les déclencheurs d'un même tour sont regroupés en une seule sauvegarde, écrite à la
+    fin du tour (tick), et au plus une fois toutes les min_interval secondes réelles. Une
+    sauvegarde est ignorée si l'état du jeu n'a pas changé depuis la précédente.
+    """
+
+    def __init__(self, save_function: Callable[[List[str]], Dict[str, Any]],
+                 fingerprint_function: Callable[[], Any] = None,
+                 clock: Callable[[], int] = None):
+        """
+        Initialise la politique d'auto-sauvegarde
+
+        Args:
+            save_function: Fonction écrivant l'auto-sauvegarde (reçoit les raisons du déclenchement)
+            fingerprint_function: Empreinte de l'état du jeu, comparable avec ==
+                                  (aucune détection des changements si None)
+            clock: Temps de jeu actuel en minutes (déclencheur de temps de jeu désactivé si None)
+        """
+        self.save_function = save_function
+        self.fingerprint_function = fingerprint_function
+        self.clock = clock
+
+        # Configuration (0 désactive un déclencheur)
+        self.enabled = True
+        self.game_minutes_interval = 600
+        self.actions_interval = 10
+        self.event_triggers = set(DEFAULT_EVENT_TRIGGERS)
+        self.min_interval = 30.0
+
+        # État depuis la dernière sauvegarde
+        self.pending_reasons: List[str] = []
+        self.urgent = False
+        self.actions_since_save = 0
+        self.last_save_minutes = None
+        self.last_save_time = None
+        self.last_fingerprint = None
+
+        self.stats = {"saved": 0, "skipped_unchanged": 0, "coalesced": 0, "deferred": 0}
+
+    def configure(self, **options) -> None:
+        """
+        Modifie la configuration
+
+        Args:
+            options: enabled, game_minutes_interval, actions_interval, event_triggers, min_interval
+
+        Raises:
+            ValueError: Si une option est inconnue
+        """
+        for name, value in options.items():
+            if name not in ("enabled", "game_minutes_interval", "actions_interval", "event_triggers", "min_interval"):
+                raise ValueError(f"Option d'auto-sauvegarde inconnue: {name}")
+            setattr(self, name, set(value) if name == "event_triggers" else value)
+
+    def _request(self, reason: str) -> None:
+        """Ajoute une raison de sauvegarder (une sauvegarde déjà demandée absorbe les suivantes)"""
+        if self.pending_reasons:
+            self.stats["coalesced"] += 1
+        if reason not in self.pending_reasons:
+            self.pending_reasons.append(reason)
+
+    def record_action(self, count: int = 1) -> None:
+        """Compte les actions du joueur"""
+        self.actions_since_save += count
+        if self.actions_interval > 0 and self.actions_since_save >= self.actions_interval:
+            if "actions" not in self.pending_reasons:
+                self._request("actions")
+
+    def notify(self, event: str, urgent: bool = False) -> None:
+        """
+        Signale un événement du jeu; la sauvegarde éventuelle est écrite au prochain tick
+
+        Args:
+            event: Nom de l'événement ("level_up", "combat_end", "quest_completed", ...)
+            urgent: Sauvegarde au prochain tick même si l'événement n'est pas un déclencheur
+                    configuré et sans attendre la fin de la fenêtre de regroupement
+        """
+        if urgent or event in self.event_triggers:
+            self._request(event)
+            self.urgent = self.urgent or urgent
+
+    def _game_time_elapsed(self) -> bool:
+        if not self.clock or self.game_minutes_interval <= 0:
+            return False
+        now = self.clock()
+        if self.last_save_minutes is None:
+            self.last_save_minutes = now
+            return False
+        return now - self.last_save_minutes >= self.game_minutes_interval
+
+    def tick(self) -> Optional[Dict[str, Any]]:
+        """
+        Fin de tour: écrit l'auto-sauvegarde si un déclencheur s'est produit
+
+        Returns:
+            Résultat de la sauvegarde, ou None si aucune sauvegarde n'a été tentée
+        """
+        if not self.enabled:
+            self.pending_reasons = []
+            self.urgent = False
+            return None
+        if self._game_time_elapsed() and "game_time" not in self.pending_reasons:
+            self._request("game_time")
+        if not self.pending_reasons:
+            return None
+
+        # Fenêtre de regroupement: les déclencheurs rapprochés attendent la fin de la fenêtre
+        if (not self.urgent and self.last_save_time is not None
+                and time.monotonic() - self.last_save_time < self.min_interval):
+            self.stats["deferred"] += 1
+            return None
+        return self._save()
+
+    def before_risky(self, reason: str = "risky") -> Optional[Dict[str, Any]]:
+        """
+        Sauvegarde immédiatement avant un événement risqué (sans attendre la fenêtre de regroupement)
+
+        Args:
+            reason: Nature de l'événement (combat, voyage dangereux...)
+
+        Returns:
+            Résultat de la sauvegarde, ou None si l'auto-sauvegarde est désactivée
+        """
+        if not self.enabled:
+            return None
+        self._request(f"before_{reason}")
+        return self._save()
+
+    def _current_fingerprint(self) -> Any:
+        if not self.fingerprint_function:
+            return None
+        try:
+            return self.fingerprint_function()
+        except Exception as e:
+            logger.warning(f"⚠️ Empreinte de l'état impossible, sauvegarde sans comparaison: {e}")
+            return None
+
+    def _reset(self, fingerprint: Any) -> None:
+        """Repart de zéro après une sauvegarde (écrite ou inutile)"""
+        self.pending_reasons = []
+        self.urgent = False
+        self.actions_since_save = 0
+        self.last_save_time = time.monotonic()
+        if self.clock:
+            self.last_save_minutes = self.clock()
+        self.last_fingerprint = fingerprint
+
+    def _save(self) -> Dict[str, Any]:
+        """Écrit l'auto-sauvegarde demandée, sauf si l'état n'a pas changé"""
+        reasons = self.pending_reasons
+        fingerprint = self._current_fingerprint()
+        if fingerprint is not None and fingerprint == self.last_fingerprint:
+            self.stats["skipped_unchanged"] += 1
+            logger.debug(f"Auto-sauvegarde inutile (état inchangé): {', '.join(reasons)}")
+            self._reset(fingerprint)
+            return {
+                "success": True,
+                "message": "Auto-sauvegarde inutile: aucun changement depuis la dernière sauvegarde",
+                "skipped": True,
+                "reasons": reasons
+            }
+
+        result = self.save_function(reasons)
+        if result.get("success", False):
+            self.stats["saved"] += 1
+            self._reset(fingerprint)
+        else:
+            # Réessayer au prochain tour
+            logger.error(f"❌ Auto-sauvegarde impossible: {result.get('message')}")
+        result["reasons"] = reasons
+        return result
+
+    def mark_saved(self) -> None:
+        """Signale une sauvegarde écrite par ailleurs (sauvegarde manuelle): les compteurs repartent de zéro"""
+        self._reset(self._current_fingerprint())
@@ -0,0 +1,283 @@
+# backup_store.py - Sauvegardes de secours dédupliquées (stockage adressé par contenu) pour MUSKO TENSEI RP
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger("musko_tensei")
+
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class BackupStore:
+    """
+    Stockage des sauvegardes de secours
+
+    Chaque fichier est stocké une seule fois sous le nom de l'empreinte de son contenu
+    (objects/ab/cdef...). Une sauvegarde de secours n'est qu'un petit manifeste
+    (manifests/backup_*.json) associant chaque chemin relatif à une empreinte: seuls
+    les fichiers nouveaux ou modifiés sont copiés.
+
+    Les empreintes du manifeste précédent sont réutilisées pour les fichiers dont la
+    taille et la date n'ont pas changé: un fichier inchangé n'est même pas relu.
+
+    Format du manifeste:
+        {"version": 1, "created": date, "files": {chemin relatif: {"hash", "size", "mtime_ns"}}}
+    """
+
+    def __init__(self, backup_dir: str):
+        """
+        Initialise le stockage
+
+        Args:
+            backup_dir: Répertoire des sauvegardes de secours (saves/backup)
+        """
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, "objects")
+        self.manifests_dir = os.path.join(backup_dir, "manifests")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """Empreinte BLAKE2b (hexadécimale) du contenu d'un fichier"""
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _store_object(self, file_path: str, digest: str) -> bool:
+        """
+        Copie un fichier dans le stockage s'il n'y est pas déjà
+
+        Returns:
+            True si un nouvel objet a été écrit
+        """
+        object_path = self._object_path(digest)
+        if os.path.exists(object_path):
+            return False
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        # Nom temporaire propre au thread: deux fichiers identiques peuvent être copiés en même temps
+        temp_path = f"{object_path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(file_path, temp_path)
+        os.replace(temp_path, object_path)
+        return True
+
+    def list_manifests(self) -> List[str]:
+        """Liste les manifestes, du plus ancien au plus récent"""
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        return sorted(
+            os.path.join(self.manifests_dir, name)
+            for name in os.listdir(self.manifests_dir) if name.endswith(".json")
+        )
+
+    def resolve_manifest(self, manifest: str) -> str:
+        """Chemin d'un manifeste à partir de son chemin ou du nom de la sauvegarde de secours (backup_...)"""
+        if os.path.exists(manifest):
+            return manifest
+        name = os.path.basename(manifest)
+        return os.path.join(self.manifests_dir, name if name.endswith(".json") else f"{name}.json")
+
+    def read_manifest(self, manifest_path: str) -> Dict[str, Any]:
+        """
+        Lit un manifeste
+
+        Args:
+            manifest_path: Chemin du manifeste ou nom de la sauvegarde de secours (backup_...)
+
+        Raises:
+            ValueError: Si le manifeste est introuvable ou invalide
+        """
+        try:
+            with open(self.resolve_manifest(manifest_path), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Manifeste de sauvegarde illisible: {e}")
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Version de manifeste non prise en charge: {manifest.get('version')}")
+        return manifest
+
+    def _backup_file(self, source_dir: str, rel_path: str, previous: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Ajoute un fichier au stockage (exécuté par les threads de travail)
+
+        Returns:
+            (entrée du manifeste, nouvel objet écrit) ou None si le fichier a disparu
+        """
+        file_path = os.path.join(source_dir, rel_path)
+        try:
+            stat = os.stat(file_path)
+            known = previous.get(rel_path)
+            if (known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns
+                    and os.path.exists(self._object_path(known["hash"]))):
+                digest = known["hash"]
+            else:
+                digest = self.hash_file(file_path)
+            written = self._store_object(file_path, digest)
+        except FileNotFoundError:
+            # Fichier supprimé pendant la sauvegarde de secours
+            return None
+        return {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, written
+
+    def create(self, source_dir: str, files: List[str], name: str = None, workers: int = None) -> Dict[str, Any]:
+        """
+        Crée une sauvegarde de secours
+
+        Les fichiers sont lus, hachés et copiés par un groupe de threads (la lecture,
+        l'écriture et le hachage libèrent le GIL).
+
+        Args:
+            source_dir: Répertoire de référence des chemins relatifs
+            files: Chemins relatifs des fichiers à inclure
+            name: Nom de la sauvegarde de secours (date/heure si non fourni)
+            workers: Nombre de threads (valeur par défaut de ThreadPoolExecutor si None)
+
+        Returns:
+            Bilan: chemin du manifeste, fichiers copiés ou réutilisés, octets écrits
+        """
+        name = name or f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        manifests = self.list_manifests()
+        previous = {}
+        if manifests:
+            try:
+                previous = self.read_manifest(manifests[-1]).get("files", {})
+            except ValueError as e:
+                logger.warning(f"⚠️ Dernier manifeste ignoré: {e}")
+
+        entries = {}
+        summary = {"new_files": 0, "reused_files": 0, "bytes_written": 0}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda rel_path: self._backup_file(source_dir, rel_path, previous), files)
+            for rel_path, result in zip(files, results):
+                if result is None:
+                    continue
+                entry, written = result
+                if written:
+                    summary["new_files"] += 1
+                    summary["bytes_written"] += entry["size"]
+                else:
+                    summary["reused_files"] += 1
+                entries[rel_path] = entry
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "files": entries
+        }
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        manifest_path = os.path.join(self.manifests_dir, f"{name}.json")
+        suffix = 1
+        while os.path.exists(manifest_path):
+            suffix += 1
+            manifest_path = os.path.join(self.manifests_dir, f"{name}_{suffix}.json")
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, manifest_path)
+
+        summary["manifest_path"] = manifest_path
+        summary["file_count"] = len(entries)
+        return summary
+
+    def _restore_file(self, rel_path: str, entry: Dict[str, Any], dest_dir: str) -> bool:
+        """Copie un objet à son emplacement final (exécuté par les threads de travail)"""
+        object_path = self._object_path(entry["hash"])
+        if not os.path.exists(object_path):
+            raise ValueError(f"Objet manquant pour {rel_path}: {entry['hash']}")
+
+        dest_root = os.path.abspath(dest_dir)
+        dest_path = os.path.abspath(os.path.join(dest_root, rel_path))
+        if not dest_path.startswith(dest_root + os.sep):
+            logger.warning(f"⚠️ Chemin ignoré (hors du répertoire des sauvegardes): {rel_path}")
+            return False
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        temp_path = f"{dest_path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(object_path, temp_path)
+        os.utime(temp_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        os.replace(temp_path, dest_path)
+        return True
+
+    def restore(self, manifest_path: str, dest_dir: str,
+                select: Callable[[str, Dict[str, Any]], bool] = None, workers: int = None) -> List[str]:
+        """
+        Restaure les fichiers d'un manifeste directement à leur emplacement final
+
+        Chaque fichier est écrit dans un fichier temporaire puis renommé; sa date de
+        modification d'origine est rétablie (ordre des versions et des auto-sauvegardes).
+
+        Args:
+            manifest_path: Manifeste (chemin ou nom de la sauvegarde de secours)
+            dest_dir: Répertoire de destination des chemins relatifs
+            select: Filtre (chemin relatif, entrée du manifeste) -> bool (tous les fichiers si None)
+            workers: Nombre de threads (valeur par défaut de ThreadPoolExecutor si None)
+
+        Returns:
+            Chemins relatifs restaurés
+
+        Raises:
+            ValueError: Si le manifeste est invalide ou qu'un objet manque
+        """
+        manifest = self.read_manifest(manifest_path)
+        selected = [
+            (rel_path, entry) for rel_path, entry in manifest["files"].items()
+            if select is None or select(rel_path, entry)
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda item: self._restore_file(item[0], item[1], dest_dir), selected))
+        return [rel_path for (rel_path, _), restored in zip(selected, results) if restored]
+
+    def delete(self, manifest_path: str) -> int:
+        """
+        Supprime une sauvegarde de secours et les objets qu'elle seule utilisait
+
+        Returns:
+            Nombre d'objets supprimés
+        """
+        manifest = self.read_manifest(manifest_path)
+        os.remove(self.resolve_manifest(manifest_path))
+        candidates = {entry["hash"] for entry in manifest["files"].values()}
+        return self.collect_garbage(candidates)
+
+    def collect_garbage(self, candidates: Optional[set] = None) -> int:
+        """
+        Supprime les objets qui ne sont plus référencés par aucun manifeste
+
+        Args:
+            candidates: Empreintes à examiner (tous les objets si None)
+
+        Returns:
+            Nombre d'objets supprimés
+        """
+        referenced = set()
+        for manifest_path in self.list_manifests():
+            try:
+                referenced.update(entry["hash"] for entry in self.read_manifest(manifest_path)["files"].values())
+            except ValueError:
+                # Un manifeste illisible peut encore référencer des objets: ne rien supprimer
+                return 0
+
+        if candidates is None:
+            candidates = set()
+            if os.path.isdir(self.objects_dir):
+                for prefix in os.listdir(self.objects_dir):
+                    for rest in os.listdir(os.path.join(self.objects_dir, prefix)):
+                        if not rest.endswith(".tmp"):
+                            candidates.add(prefix + rest)
+
+        removed = 0
+        for digest in candidates - referenced:
+            object_path = self._object_path(digest)
+            if os.path.exists(object_path):
+                os.remove(object_path)
+                removed += 1
+        return removed
@@ -1,10 +1,25 @@
 # character_progression.py
+import bisect
+import itertools
 import json
 import os
 import random
 import math
 from typing import Dict, List, Any, Tuple, Optional
 
+try:
+    from .skill_catalog import SkillCatalog
+except ImportError:
+    from skill_catalog import SkillCatalog
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Nombre minimal de niveaux dont le seuil d'XP est précalculé (la table s'étend au besoin)
+PRECOMPUTED_LEVELS = 200
+
 class CharacterProgression:
     def __init__(self, game_instance=None):
         """
@@ -24,10 +39,43 @@ class CharacterProgression:
         self.attribute_costs = self.progression_data.get("attribute_costs", {})
         self.skill_categories = self.progression_data.get("skill_categories", {})
         
+        # Catalogue unifié des compétences (progression.json + skills.json)
+        self.skill_catalog = SkillCatalog(self.progression_data, self.skills_data)
+        
+        # Suivi incrémental des compétences disponibles pour le joueur actuel
+        self.skill_tracker = None
+        self._tracked_player = None
+        
+        # Seuils d'XP totale par niveau (index 0 = niveau 1): experience_table puis formule
+        self.xp_thresholds = []
+        self._xp_array = None
+        self._build_xp_thresholds()
+        
         # Cache pour les calculs fréquents
-        self.level_requirements_cache = {}
         self.skill_unlock_cache = {}
         
+    def reload_data(self, progression_data: Dict = None, skills_data: Dict = None) -> None:
+        """
+        Remplace les données de progression et/ou de compétences et reconstruit le catalogue
+        
+        Args:
+            progression_data: Nouveau contenu de progression.json (None pour conserver l'actuel)
+            skills_data: Nouveau contenu de skills.json (None pour conserver l'actuel)
+        """
+        if progression_data is not None:
+            self.progression_data = progression_data
+            self.xp_curve = self.progression_data.get("xp_curve", {})
+            self.attribute_costs = self.progression_data.get("attribute_costs", {})
+            self.skill_categories = self.progression_data.get("skill_categories", {})
+            self._build_xp_thresholds()
+        if skills_data is not None:
+            self.skills_data = skills_data
+        
+        self.skill_catalog = SkillCatalog(self.progression_data, self.skills_data)
+        self.skill_tracker = None
+        self._tracked_player = None
+        self.skill_unlock_cache = {}
+    
     def _load_data(self, data_name: str) -> Dict:
         """Charge un fichier de données JSON"""
         try:
@@ -40,6 +88,65 @@ class CharacterProgression:
             print(f"Erreur lors du chargement de {data_name}.json: {e}")
             return {}
     
+    def _formula_xp(self, level: int) -> float:
+        """XP totale d'un niveau selon la courbe xp_curve (valeurs par défaut si elle est absente)"""
+        base_xp = self.xp_curve.get("base_xp", 100)
+        scaling = self.xp_curve.get("scaling", 1.5)
+        exponent = self.xp_curve.get("exponent", 1.8)
+        
+        return base_xp * (level ** exponent) * scaling
+    
+    def _build_xp_thresholds(self) -> None:
+        """
+        Reconstruit les seuils d'XP à partir de experience_table ("level_N": XP totale)
+        
+        Les niveaux absents entre deux entrées de la table suivent la forme de la formule,
+        ajustée pour passer par les deux entrées; au-delà de la dernière entrée, la formule
+        continue à partir de celle-ci. Sans table, la formule seule est utilisée.
+        """
+        self.xp_table = {}
+        for key, xp in self.progression_data.get("experience_table", {}).items():
+            try:
+                level = int(str(key).replace("level_", ""))
+            except ValueError:
+                continue
+            if level >= 1 and isinstance(xp, (int, float)):
+                self.xp_table[level] = xp
+        self.xp_table_levels = sorted(self.xp_table)
+        
+        self.xp_thresholds = []
+        self._xp_array = None
+        self._extend_xp_thresholds(max(PRECOMPUTED_LEVELS, self.xp_table_levels[-1] if self.xp_table_levels else 0))
+    
+    def _table_xp(self, level: int) -> int:
+        """XP totale d'un niveau d'après la table (formule pour les niveaux qu'elle ne définit pas)"""
+        table, levels = self.xp_table, self.xp_table_levels
+        if not levels:
+            return int(self._formula_xp(level))
+        if level in table:
+            return int(table[level])
+        
+        position = bisect.bisect_left(levels, level)
+        if position == len(levels):
+            last = levels[-1]
+            return int(table[last] + self._formula_xp(level) - self._formula_xp(last))
+        if position == 0:
+            first = levels[0]
+            return int(table[first] * self._formula_xp(level) / self._formula_xp(first))
+        
+        low, high = levels[position - 1], levels[position]
+        ratio = (self._formula_xp(level) - self._formula_xp(low)) / (self._formula_xp(high) - self._formula_xp(low))
+        return int(table[low] + (table[high] - table[low]) * ratio)
+    
+    def _extend_xp_thresholds(self, max_level: int) -> None:
+        """Calcule les seuils jusqu'au niveau max_level (croissants: la bisection en dépend)"""
+        thresholds = self.xp_thresholds
+        previous = thresholds[-1] if thresholds else 0
+        for level in range(len(thresholds) + 1, max_level + 1):
+            previous = max(previous, self._table_xp(level))
+            thresholds.append(previous)
+        self._xp_array = None
+    
     def calculate_xp_for_level(self, level: int) -> int:
         """
         Calcule l'XP nécessaire pour atteindre un niveau
@@ -50,19 +157,26 @@ class CharacterProgression:
         Returns:
             XP totale nécessaire pour ce niveau
         """
-        if level in self.level_requirements_cache:
-            return self.level_requirements_cache[level]
-            
-        base_xp = self.xp_curve.get("base_xp", 100)
-        scaling = self.xp_curve.get("scaling", 1.5)
-        exponent = self.xp_curve.get("exponent", 1.8)
-        
-        xp_required = base_xp * (level ** exponent) * scaling
-        
-        # Mise en cache
-        self.level_requirements_cache[level] = int(xp_required)
+        if level < 1:
+            return 0
+        if level > len(self.xp_thresholds):
+            self._extend_xp_thresholds(level)
+        return self.xp_thresholds[level - 1]
+    
+    def level_for_xp(self, xp: int) -> int:
+        """
+        Niveau atteint avec une XP totale (bisection dans les seuils, O(log n))
         
-        return int(xp_required)
+        Args:
+            xp: XP totale
+            
+        Returns:
+            Niveau correspondant (au moins 1)
+        """
+        # Les seuils s'étendent par doublement: une très grosse attribution reste logarithmique
+        while self.xp_thresholds[-1] <= xp:
+            self._extend_xp_thresholds(len(self.xp_thresholds) * 2)
+        return max(1, bisect.bisect_right(self.xp_thresholds, xp))
     
     def get_next_level_xp(self, current_level: int) -> Tuple[int, int]:
         """
@@ -100,28 +214,14 @@ class CharacterProgression:
         new_xp = current_xp + xp_amount
         player["xp"] = new_xp
         
-        # Vérifier si le joueur monte de niveau
-        levels_gained = 0
-        attribute_points_gained = 0
-        skill_points_gained = 0
-        new_level = current_level
+        # Nouveau niveau en une recherche, quel que soit le nombre de niveaux gagnés
+        # (le niveau ne descend jamais)
+        new_level = max(current_level, self.level_for_xp(new_xp))
+        levels_gained = new_level - current_level
         
-        # Continuer à monter de niveau tant que l'XP est suffisante
-        next_level_xp = self.calculate_xp_for_level(new_level + 1)
-        
-        while new_xp >= next_level_xp:
-            new_level += 1
-            levels_gained += 1
-            
-            # Attribuer des points
-            attribute_pts = self.progression_data.get("attribute_points_per_level", 3)
-            skill_pts = self.progression_data.get("skill_points_per_level", 2)
-            
-            attribute_points_gained += attribute_pts
-            skill_points_gained += skill_pts
-            
-            # Vérifier le niveau suivant
-            next_level_xp = self.calculate_xp_for_level(new_level + 1)
+        # Attribuer des points
+        attribute_points_gained = levels_gained * self.progression_data.get("attribute_points_per_level", 3)
+        skill_points_gained = levels_gained * self.progression_data.get("skill_points_per_level", 2)
         
         # Mettre à jour le joueur si des niveaux ont été gagnés
         if levels_gained > 0:
@@ -144,10 +244,98 @@ class CharacterProgression:
                 "new_skills_available": new_skills
             }
         
+        level_xp, next_level_xp = self.get_next_level_xp(new_level)
         return {
             "success": True,
             "levels_gained": 0,
-            "message": f"Gained {xp_amount} XP. Progress: {new_xp - next_level_xp + self.calculate_xp_for_level(new_level)}/{next_level_xp} to next level."
+            "message": f"Gained {xp_amount} XP. Progress: {new_xp - level_xp}/{next_level_xp - level_xp} to next level."
+        }
+    
+    def award_xp_bulk(self, xp_amounts, current_xp=0, current_levels=None, cumulative: bool = False) -> Dict[str, Any]:
+        """
+        Résout les niveaux de nombreuses attributions d'XP en une fois, sans modifier le joueur
+        
+        Pour les simulations (équilibrage, PNJ, sauts dans le temps). Avec numpy, la recherche
+        des niveaux est vectorisée (searchsorted); sinon une bisection par attribution.
+        
+        Args:
+            xp_amounts: XP attribuées (séquence ou tableau numpy)
+            current_xp: XP totale de départ (un nombre, ou une valeur par attribution)
+            current_levels: Niveaux de départ (déduits de l'XP si None); les niveaux ne descendent jamais
+            cumulative: Les attributions se suivent pour un même personnage (l'XP s'accumule)
+            
+        Returns:
+            Dictionnaire avec, pour chaque attribution, "xp" (XP totale), "levels" (niveau atteint),
+            "levels_gained", "attribute_points_gained" et "skill_points_gained"
+            (tableaux numpy si numpy est disponible, listes sinon)
+        """
+        attribute_pts = self.progression_data.get("attribute_points_per_level", 3)
+        skill_pts = self.progression_data.get("skill_points_per_level", 2)
+        
+        if np is not None:
+            amounts = np.asarray(xp_amounts, dtype=np.int64)
+            xp = (np.cumsum(amounts) if cumulative else amounts) + np.asarray(current_xp, dtype=np.int64)
+            if xp.size:
+                # Étendre les seuils jusqu'à la plus grande XP à placer
+                self.level_for_xp(max(int(xp.max()), int(np.max(current_xp))))
+            if self._xp_array is None:
+                self._xp_array = np.asarray(self.xp_thresholds, dtype=np.int64)
+            
+            levels = np.maximum(np.searchsorted(self._xp_array, xp, side="right"), 1)
+            if current_levels is None:
+                start = np.maximum(np.searchsorted(self._xp_array, np.asarray(current_xp, dtype=np.int64), side="right"), 1)
+            else:
+                start = np.asarray(current_levels, dtype=np.int64)
+            levels = np.maximum(levels, start)
+            if cumulative:
+                levels = np.maximum.accumulate(levels)
+                gained = np.diff(levels, prepend=start)
+            else:
+                gained = levels - start
+        else:
+            amounts = list(xp_amounts)
+            if cumulative:
+                xp = list(itertools.accumulate(amounts, initial=current_xp))[1:]
+                previous = self.level_for_xp(current_xp) if current_levels is None else current_levels
+                if xp:
+                    self.level_for_xp(max(xp))
+                thresholds = self.xp_thresholds
+                levels, gained = [], []
+                for total in xp:
+                    # Seuil du niveau suivant à l'index previous: la plupart des attributions ne font
+                    # pas monter de niveau, la bisection ne commence qu'au niveau actuel sinon
+                    level = previous
+                    if previous < len(thresholds) and total >= thresholds[previous]:
+                        level = bisect.bisect_right(thresholds, total, previous)
+                    levels.append(level)
+                    gained.append(level - previous)
+                    previous = level
+            else:
+                starts_xp = list(current_xp) if isinstance(current_xp, (list, tuple)) else [current_xp] * len(amounts)
+                xp = [start_xp + amount for start_xp, amount in zip(starts_xp, amounts)]
+                if current_levels is None:
+                    starts = [self.level_for_xp(start_xp) for start_xp in starts_xp]
+                else:
+                    starts = list(current_levels) if isinstance(current_levels, (list, tuple)) else [current_levels] * len(amounts)
+                levels = [max(level_start, self.level_for_xp(total)) for level_start, total in zip(starts, xp)]
+                gained = [level - level_start for level, level_start in zip(levels, starts)]
+            
+            return {
+                "success": True,
+                "xp": xp,
+                "levels": levels,
+                "levels_gained": gained,
+                "attribute_points_gained": [count * attribute_pts for count in gained],
+                "skill_points_gained": [count * skill_pts for count in gained]
+            }
+        
+        return {
+            "success": True,
+            "xp": xp,
+            "levels": levels,
+            "levels_gained": gained,
+            "attribute_points_gained": gained * attribute_pts,
+            "skill_points_gained": gained * skill_pts
         }
     
     def check_skill_unlocks(self, level: int) -> List[Dict[str, Any]]:
@@ -166,18 +354,15 @@ class CharacterProgression:
             
         unlocked_skills = []
         
-        # Parcourir toutes les compétences
-        for skill_id, skill_data in self.skills_data.get("skills", {}).items():
-            requirements = skill_data.get("requirements", {})
-            
-            # Vérifier si la compétence nécessite ce niveau exact
-            if requirements.get("level", 0) == level:
-                unlocked_skills.append({
-                    "id": skill_id,
-                    "name": skill_data.get("name", "Unknown Skill"),
-                    "description": skill_data.get("description", ""),
-                    "category": skill_data.get("category", "general")
-                })
+        # Compétences nécessitant ce niveau exact (index trié par niveau requis)
+        for skill_id in self.skill_catalog.unlocked_at_level(level):
+            skill_data = self.skill_catalog.get(skill_id)
+            unlocked_skills.append({
+                "id": skill_id,
+                "name": skill_data.get("name", "Unknown Skill"),
+                "description": skill_data.get("description", ""),
+                "category": skill_data.get("category", "general")
+            })
         
         # Mettre en cache les résultats
         self.skill_unlock_cache[level] = unlocked_skills
@@ -339,7 +524,7 @@ class CharacterProgression:
         available_points = player.get("skill_points", 0)
         
         # Vérifier si la compétence existe
-        skill_data = self.skills_data.get("skills", {}).get(skill_id)
+        skill_data = self.skill_catalog.get(skill_id)
         if not skill_data:
             return {"success": False, "message": f"Skill {skill_id} does not exist"}
             
@@ -362,11 +547,11 @@ class CharacterProgression:
             if player.get("attributes", {}).get(attr, 0) < value:
                 return {"success": False, "message": f"{attr.capitalize()} {value} required for this skill"}
                 
-        # Compétences prérequises
-        for req_skill in requirements.get("prerequisite_skills", []):
-            if req_skill not in player.get("learned_skills", {}):
-                req_skill_name = self.skills_data.get("skills", {}).get(req_skill, {}).get("name", req_skill)
-                return {"success": False, "message": f"Prerequisite skill {req_skill_name} required"}
+        # Compétences prérequises (avec niveau minimal)
+        for req_skill, req_level in requirements.get("prerequisite_skills", {}).items():
+            if player["learned_skills"].get(req_skill, {}).get("level", 0) < req_level:
+                req_skill_name = self.skill_catalog.get(req_skill).get("name", req_skill)
+                return {"success": False, "message": f"Prerequisite skill {req_skill_name} (level {req_level}) required"}
                 
         # Vérifier le coût en points
         skill_cost = skill_data.get("cost", 1)
@@ -465,7 +650,7 @@ class CharacterProgression:
             skill["mastery"] = min(1.0, skill.get("mastery", 0) + 0.1)
             
             # Obtenir les données de la compétence
-            skill_data = self.skills_data.get("skills", {}).get(skill_id, {})
+            skill_data = self.skill_catalog.get(skill_id)
             
             # Si c'est une compétence passive, mettre à jour ses effets
             if skill_data.get("type") == "passive":
@@ -501,6 +686,13 @@ class CharacterProgression:
         
         return int(base_skill_xp * (level ** skill_scaling))
     
+    def _get_skill_tracker(self, player: Dict[str, Any]):
+        """Retourne le suivi des compétences disponibles, recréé si le joueur a changé"""
+        if self.skill_tracker is None or self._tracked_player is not player:
+            self.skill_tracker = self.skill_catalog.create_tracker()
+            self._tracked_player = player
+        return self.skill_tracker
+    
     def get_available_skills(self, player_level: int = None, attributes: Dict[str, int] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Obtient la liste des compétences disponibles pour le joueur
@@ -522,41 +714,21 @@ class CharacterProgression:
         current_attributes = attributes if attributes is not None else player.get("attributes", {})
         learned_skills = player.get("learned_skills", {})
         
+        if player_level is None and attributes is None:
+            # Situation réelle du joueur: seules les compétences touchées par un changement sont réexaminées
+            tracker = self._get_skill_tracker(player)
+            tracker.sync(current_level, current_attributes, learned_skills)
+            skill_ids = tracker.available
+        else:
+            # Situation hypothétique: calcul ponctuel à partir des index
+            skill_ids = set(self.skill_catalog.query_available(current_level, current_attributes, learned_skills))
+        
         available_skills = {}
         
-        # Parcourir toutes les compétences
-        for skill_id, skill_data in self.skills_data.get("skills", {}).items():
-            # Ignorer les compétences déjà apprises
-            if skill_id in learned_skills:
-                continue
-                
-            # Vérifier les prérequis
-            requirements = skill_data.get("requirements", {})
+        # Les prérequis sont présentés avant les compétences qui en dépendent
+        for skill_id in sorted(skill_ids, key=self.skill_catalog.topological_rank.get):
+            skill_data = self.skill_catalog.get(skill_id)
             
-            # Niveau requis
-            if current_level < requirements.get("level", 0):
-                continue
-                
-            # Attributs requis
-            meets_attr_requirements = True
-            for attr, value in requirements.get("attributes", {}).items():
-                if current_attributes.get(attr, 0) < value:
-                    meets_attr_requirements = False
-                    break
-                    
-            if not meets_attr_requirements:
-                continue
-                
-            # Compétences prérequises
-            meets_skill_requirements = True
-            for req_skill in requirements.get("prerequisite_skills", []):
-                if req_skill not in learned_skills:
-                    meets_skill_requirements = False
-                    break
-                    
-            if not meets_skill_requirements:
-                continue
-                
             # La compétence est disponible, l'ajouter à la catégorie appropriée
             category = skill_data.get("category", "general")
             
@@ -590,8 +762,8 @@ class CharacterProgression:
         player = self.game.player
         
         # Obtenir les données du sort
-        spell_data = self.skills_data.get("skills", {}).get(spell_id, {})
-        if not spell_data or spell_data.get("type") != "spell":
+        spell_data = self.skill_catalog.get(spell_id)
+        if not spell_data or spell_data.get("kind") != "spell":
             return {"damage": 0, "error": f"Invalid spell ID: {spell_id}"}
             
         # Vérifier si le joueur connaît ce sort
@@ -630,7 +802,7 @@ class CharacterProgression:
             "skill_level": skill_level,
             "spell_name": spell_data.get("name", spell_id),
             "element": spell_data.get("element", "neutral"),
-            "mp_cost": spell_data.get("mp_cost", 10)
+            "mp_cost": spell_data.get("mp_cost", spell_data.get("resource_cost", {}).get("mana", 10))
         }
     
     def calculate_attack_damage(self, weapon_id: str = None) -> Dict[str, Any]:
@@ -659,16 +831,16 @@ class CharacterProgression:
         # Si une arme est spécifiée
         if weapon_id:
             # Obtenir les données de l'arme
-            weapon_data = self.game.item_data.get("items", {}).get(weapon_id, {})
+            weapon_data = self.game.item_catalog.get(weapon_id)
             if not weapon_data or weapon_data.get("type") != "weapon":
                 return {"damage": base_damage, "error": f"Invalid weapon ID: {weapon_id}"}
                 
             # Utiliser les dégâts de l'arme
-            base_damage = weapon_data.get("damage", 5)
+            base_damage = self.game.item_catalog.average_damage(weapon_id)
             
             # Déterminer l'attribut à utiliser selon le type d'arme
-            weapon_type = weapon_data.get("weapon_type", "melee")
-            if weapon_type in ["bow", "crossbow", "thrown"]:
+            weapon_type = weapon_data.get("weapon_type", weapon_data.get("subtype", "melee"))
+            if weapon_type in ["ranged", "bow", "crossbow", "thrown"]:
                 stat_modifier = dexterity - 10
         
         # Calculer les dégâts finaux
@@ -677,12 +849,12 @@ class CharacterProgression:
         # Bonus de compétences
         weapon_skill = None
         if weapon_id:
-            weapon_data = self.game.item_data.get("items", {}).get(weapon_id, {})
-            weapon_type = weapon_data.get("weapon_type", "melee")
+            weapon_data = self.game.item_catalog.get(weapon_id)
+            weapon_type = weapon_data.get("weapon_type", weapon_data.get("subtype", "melee"))
             
             # Trouver la compétence correspondant au type d'arme
             for skill_id, skill_data in player.get("learned_skills", {}).items():
-                skill_info = self.skills_data.get("skills", {}).get(skill_id, {})
+                skill_info = self.skill_catalog.get(skill_id)
                 if skill_info.get("weapon_type") == weapon_type:
                     weapon_skill = skill_id
                     break
@@ -704,7 +876,7 @@ class CharacterProgression:
             "stat_modifier": stat_modifier * 2,
             "skill_bonus": skill_bonus,
             "critical_chance": player.get("critical_chance", 5),
-            "weapon_name": self.game.item_data.get("items", {}).get(weapon_id, {}).get("name", "Unarmed")
+            "weapon_name": self.game.item_catalog.get(weapon_id).get("name", "Unarmed")
         }
     
     def get_class_specializations(self, player_class: str) -> List[Dict[str, Any]]:
@@ -781,7 +953,7 @@ class CharacterProgression:
             
         # Donner les compétences bonus
         for skill_id in spec_data.get("bonus_skills", []):
-            if skill_id not in self.skills_data.get("skills", {}):
+            if skill_id not in self.skill_catalog:
                 continue
                 
             if "learned_skills" not in player:
@@ -805,7 +977,7 @@ class CharacterProgression:
             "specialization_description": spec_data.get('description', ''),
             "bonus_attributes": spec_data.get('bonus_attributes', {}),
             "bonus_skills": [
-                self.skills_data.get("skills", {}).get(skill_id, {}).get("name", skill_id)
+                self.skill_catalog.get(skill_id).get("name", skill_id)
                 for skill_id in spec_data.get("bonus_skills", [])
             ]
         }
@@ -826,7 +998,7 @@ class CharacterProgression:
         total_points = 0
         for skill_id, skill_data in player.get("learned_skills", {}).items():
             # Obtenir le coût de la compétence
-            skill_info = self.skills_data.get("skills", {}).get(skill_id, {})
+            skill_info = self.skill_catalog.get(skill_id)
             total_points += skill_info.get("cost", 1)
             
         # Réinitialiser les compétences
@@ -0,0 +1,317 @@
+# data_bundle.py - Paquet de données en lecture seule projeté en mémoire (mmap) pour MUSKO TENSEI RP
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+import logging
+
+logger = logging.getLogger("musko_tensei")
+
+# Format du fichier (entiers little-endian):
+#   en-tête:   MAGIC, version (u16), nombre de sections (u16)
+#   sections:  longueur du nom (u16), nom (utf-8), SECTION_ENTRY
+#   par section, à index_offset:
+#       record_count entrées RECORD_ENTRY dans l'ordre d'origine du fichier JSON
+#       record_count positions (u32) de ces entrées, triées par clé (recherche dichotomique)
+#   clés et valeurs (JSON compact utf-8) à la suite
+MAGIC = b"MKDB"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+SECTION_ENTRY = struct.Struct("<QIqq")    # index_offset, record_count, mtime_ns source, taille source
+RECORD_ENTRY = struct.Struct("<QIQI")     # key_offset, key_length, value_offset, value_length
+POSITION = struct.Struct("<I")
+
+DEFAULT_BUNDLE_NAME = "game_data.bundle"
+
+
+class BundleSection(Mapping):
+    """
+    Vue en lecture seule d'un fichier de données du paquet
+
+    Les clés de premier niveau sont les enregistrements: seule la valeur demandée est
+    décodée, les autres restent dans le cache de pages partagé entre les processus.
+    """
+
+    def __init__(self, buffer: mmap.mmap, name: str, index_offset: int, record_count: int):
+        self.buffer = buffer
+        self.name = name
+        self.index_offset = index_offset
+        self.record_count = record_count
+        self.positions_offset = index_offset + record_count * RECORD_ENTRY.size
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        """Lit l'entrée d'index d'un enregistrement (position dans l'ordre d'origine)"""
+        return RECORD_ENTRY.unpack_from(self.buffer, self.index_offset + position * RECORD_ENTRY.size)
+
+    def _key_bytes(self, position: int) -> bytes:
+        key_offset, key_length, _, _ = self._entry(position)
+        return self.buffer[key_offset:key_offset + key_length]
+
+    def _find(self, key: Any) -> int:
+        """Recherche dichotomique d'une clé (-1 si absente)"""
+        if not isinstance(key, str):
+            return -1
+        target = key.encode("utf-8")
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            position = POSITION.unpack_from(self.buffer, self.positions_offset + middle * POSITION.size)[0]
+            current = self._key_bytes(position)
+            if current < target:
+                low = middle + 1
+            elif current > target:
+                high = middle
+            else:
+                return position
+        return -1
+
+    def __getitem__(self, key: str) -> Any:
+        position = self._find(key)
+        if position < 0:
+            raise KeyError(key)
+        _, _, value_offset, value_length = self._entry(position)
+        return json.loads(self.buffer[value_offset:value_offset + value_length])
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self.record_count):
+            yield self._key_bytes(position).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def __repr__(self) -> str:
+        return f"BundleSection({self.name!r}, {self.record_count} enregistrements)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Décode toute la section en dictionnaire classique"""
+        return {key: self[key] for key in self}
+
+
+class BundleOverlay(MutableMapping):
+    """
+    Vue modifiable d'une section du paquet, propre au processus
+
+    Chaque enregistrement lu est décodé une seule fois puis conservé: les modifications de ses
+    valeurs imbriquées persistent. Les ajouts et suppressions restent dans la surcouche, la
+    section projetée en mémoire n'est jamais modifiée. Seuls les enregistrements réellement
+    utilisés sont donc décodés.
+    """
+
+    def __init__(self, base: Mapping):
+        self.base = base
+        self.values = {}
+        self.deleted = set()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.values:
+            return self.values[key]
+        if key in self.deleted:
+            raise KeyError(key)
+        value = self.base[key]
+        self.values[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.values[key] = value
+        self.deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.values.pop(key, None)
+        if key in self.base:
+            self.deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.values:
+            return True
+        return key not in self.deleted and key in self.base
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.base:
+            if key not in self.deleted:
+                yield key
+        for key in self.values:
+            if key not in self.base:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"BundleOverlay({self.base!r}, {len(self.values)} enregistrements décodés)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Décode toute la vue en dictionnaire classique"""
+        return {key: self[key] for key in self}
+
+
+def writable(data: Any) -> Any:
+    """
+    Retourne une version modifiable des données d'un fichier
+
+    Une section du paquet est enveloppée dans une BundleOverlay; un dictionnaire classique
+    (fichier JSON analysé) est retourné tel quel.
+    """
+    if isinstance(data, BundleSection):
+        return BundleOverlay(data)
+    return data
+
+
+class DataBundle:
+    def __init__(self, path: str):
+        """
+        Ouvre un paquet de données en lecture seule
+
+        Args:
+            path: Chemin du fichier .bundle
+
+        Raises:
+            ValueError: Si le fichier n'est pas un paquet valide
+        """
+        self.path = path
+        self.sections = {}
+        self.sources = {}
+
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, section_count = HEADER.unpack_from(self.buffer, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} n'est pas un paquet de données valide")
+
+            offset = HEADER.size
+            for _ in range(section_count):
+                name_length = struct.unpack_from("<H", self.buffer, offset)[0]
+                offset += 2
+                name = self.buffer[offset:offset + name_length].decode("utf-8")
+                offset += name_length
+                index_offset, record_count, mtime_ns, size = SECTION_ENTRY.unpack_from(self.buffer, offset)
+                offset += SECTION_ENTRY.size
+
+                self.sections[name] = BundleSection(self.buffer, name, index_offset, record_count)
+                self.sources[name] = (mtime_ns, size)
+        except (struct.error, UnicodeDecodeError) as e:
+            self.buffer.close()
+            raise ValueError(f"{path} est corrompu: {e}")
+        except ValueError:
+            self.buffer.close()
+            raise
+
+    def get(self, name: str) -> Optional[BundleSection]:
+        """Retourne la section d'un fichier de données (None si absente)"""
+        return self.sections.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def is_fresh(self, name: str, signature: Optional[Tuple[int, int]]) -> bool:
+        """
+        Vérifie qu'une section correspond toujours à son fichier source
+
+        Args:
+            name: Nom de la donnée (ex: "npcs")
+            signature: Signature actuelle (mtime_ns, taille) du fichier JSON
+        """
+        return name in self.sources and self.sources[name] == signature
+
+    def close(self) -> None:
+        """Ferme la projection en mémoire"""
+        self.sections = {}
+        self.buffer.close()
+
+    @staticmethod
+    def build(data_dir: str, filenames: List[str], output_path: str = None) -> str:
+        """
+        Construit un paquet à partir des fichiers JSON d'un dossier
+
+        Seuls les fichiers dont le contenu est un objet JSON sont ajoutés; chacune de leurs
+        clés de premier niveau devient un enregistrement décodable séparément.
+
+        Args:
+            data_dir: Dossier contenant les fichiers JSON
+            filenames: Noms des fichiers à inclure (ex: "locations.json")
+            output_path: Chemin du paquet (par défaut data_dir/game_data.bundle)
+
+        Returns:
+            Chemin du paquet créé
+        """
+        output_path = output_path or os.path.join(data_dir, DEFAULT_BUNDLE_NAME)
+
+        sections = []
+        for filename in filenames:
+            file_path = os.path.join(data_dir, filename)
+            if not os.path.exists(file_path):
+                logger.warning(f"⚠️ Le fichier {filename} n'existe pas, il ne sera pas ajouté au paquet.")
+                continue
+
+            stat = os.stat(file_path)
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+            data = json.loads(content) if content else {}
+            if not isinstance(data, dict):
+                logger.warning(f"⚠️ {filename} ne contient pas un objet JSON, il ne sera pas ajouté au paquet.")
+                continue
+
+            records = [
+                (key.encode("utf-8"), json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                for key, value in data.items()
+            ]
+            sections.append((os.path.splitext(filename)[0].encode("utf-8"), stat, records))
+
+        # Taille de l'en-tête et du répertoire des sections
+        offset = HEADER.size + sum(2 + len(name) + SECTION_ENTRY.size for name, _, _ in sections)
+
+        header = [HEADER.pack(MAGIC, VERSION, len(sections))]
+        body = []
+        for name, stat, records in sections:
+            index_offset = offset
+            blob_offset = index_offset + len(records) * (RECORD_ENTRY.size + POSITION.size)
+
+            entries = []
+            blobs = []
+            for key, value in records:
+                key_offset = blob_offset
+                value_offset = key_offset + len(key)
+                entries.append(RECORD_ENTRY.pack(key_offset, len(key), value_offset, len(value)))
+                blobs.append(key)
+                blobs.append(value)
+                blob_offset = value_offset + len(value)
+
+            order = sorted(range(len(records)), key=lambda position: records[position][0])
+            body.extend(entries)
+            body.extend(POSITION.pack(position) for position in order)
+            body.extend(blobs)
+
+            header.append(struct.pack("<H", len(name)) + name)
+            header.append(SECTION_ENTRY.pack(index_offset, len(records), stat.st_mtime_ns, stat.st_size))
+            offset = blob_offset
+
+        # Écriture dans un fichier temporaire puis remplacement pour ne jamais exposer un paquet incomplet
+        temp_path = output_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(b"".join(header))
+            f.write(b"".join(body))
+        os.replace(temp_path, output_path)
+
+        logger.info(f"✅ Paquet de données créé: {output_path} ({len(sections)} fichiers)")
+        return output_path
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Utilisation: python data_bundle.py [dossier data] [fichier de sortie]
+    project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_path, "data")
+    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    filenames = sorted(name for name in os.listdir(data_dir) if name.endswith(".json"))
+    print(DataBundle.build(data_dir, filenames, output_path))
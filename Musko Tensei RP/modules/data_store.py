@@ -0,0 +1,239 @@
+# data_store.py - Stockage partagé des données du jeu avec rechargement à chaud pour MUSKO TENSEI RP
+import json
+import os
+import threading
+from typing import Dict, List, Any, Callable, Optional, Tuple
+import logging
+
+try:
+    from .data_bundle import DataBundle, BundleSection, writable
+except ImportError:
+    from data_bundle import DataBundle, BundleSection, writable
+
+logger = logging.getLogger("musko_tensei")
+
+class DataStore:
+    def __init__(self, data_dir: str, filenames: List[str], bundle_path: str = None):
+        """
+        Initialise le stockage et charge tous les fichiers de données
+
+        Args:
+            data_dir: Dossier contenant les fichiers JSON
+            filenames: Noms des fichiers à charger (ex: "locations.json")
+            bundle_path: Paquet de données projeté en mémoire à utiliser s'il existe et
+                         correspond encore aux fichiers JSON (voir data_bundle.py)
+        """
+        self.data_dir = data_dir
+        self.filenames = list(filenames)
+        self.bundle = self._open_bundle(bundle_path)
+
+        # Données actuelles: nom (sans extension) -> contenu
+        self.data = {}
+
+        # Signature (mtime, taille) de chaque fichier lors du dernier chargement
+        self.signatures = {}
+
+        # Nouvelles versions analysées par la surveillance, en attente d'application
+        self.pending = {}
+        self.lock = threading.Lock()
+
+        # Abonnés aux changements: nom -> [callback(ancien contenu, nouveau contenu)]
+        self.listeners = {}
+
+        self.watch_thread = None
+        self.stop_event = threading.Event()
+
+        for filename in self.filenames:
+            name = self._get_name(filename)
+            self.signatures[name] = self._get_signature(filename)
+            if self.bundle and self.bundle.is_fresh(name, self.signatures[name]):
+                # Lecture paresseuse: les enregistrements sont décodés à la demande
+                self.data[name] = self.bundle.get(name)
+            else:
+                self.data[name] = self._parse(filename, {})
+
+    def _open_bundle(self, bundle_path: Optional[str]) -> Optional[DataBundle]:
+        """Ouvre le paquet de données s'il existe (None sinon ou s'il est invalide)"""
+        if not bundle_path or not os.path.exists(bundle_path):
+            return None
+        try:
+            bundle = DataBundle(bundle_path)
+            logger.info(f"✅ Paquet de données ouvert: {bundle_path}")
+            return bundle
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Paquet de données ignoré: {e}")
+            return None
+
+    @staticmethod
+    def _get_name(filename: str) -> str:
+        """Nom de la donnée associée à un fichier (sans extension)"""
+        return os.path.splitext(filename)[0]
+
+    def _get_signature(self, filename: str) -> Optional[Tuple[int, int]]:
+        """Signature d'un fichier (None s'il n'existe pas)"""
+        try:
+            stat = os.stat(os.path.join(self.data_dir, filename))
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _parse(self, filename: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Lit et analyse un fichier JSON
+
+        Args:
+            filename: Nom du fichier
+            fallback: Valeur retournée si le fichier est absent, vide ou invalide
+
+        Returns:
+            Contenu du fichier
+        """
+        file_path = os.path.join(self.data_dir, filename)
+        name = self._get_name(filename)
+
+        if not os.path.exists(file_path):
+            logger.warning(f"⚠️ Le fichier {filename} n'existe pas.")
+            return fallback
+
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+
+            if not content:
+                logger.warning(f"⚠️ Le fichier {filename} est vide.")
+                return fallback
+
+            data = json.loads(content)
+            logger.info(f"✅ Données {name} chargées.")
+            return data
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ Erreur JSON dans {filename}: {e}")
+            logger.debug(f"   Début du fichier: {repr(content[:50])}")
+            return fallback
+        except Exception as e:
+            logger.error(f"❌ Erreur lors du chargement de {filename}: {e}")
+            return fallback
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """Retourne le contenu actuel d'un fichier de données"""
+        return self.data.get(name, {})
+
+    def get_writable(self, name: str) -> Dict[str, Any]:
+        """
+        Retourne le contenu actuel d'un fichier de données, modifiable
+
+        Une section du paquet (lecture seule) est enveloppée dans une vue qui conserve les
+        enregistrements décodés et les modifications; un fichier JSON analysé est retourné tel quel.
+        """
+        return writable(self.get(name))
+
+    def release(self, name: str) -> None:
+        """
+        Libère le contenu analysé d'un fichier dont le jeu n'utilise plus que les index
+
+        Une section du paquet est conservée: ses pages sont partagées, pas copiées. Les
+        rechargements à chaud continuent de prévenir les abonnés avec le nouveau contenu.
+        """
+        if name in self.data and not isinstance(self.data[name], BundleSection):
+            # Nouvel ensemble: les abonnés en cours de notification gardent leur version
+            data = dict(self.data)
+            data[name] = {}
+            self.data = data
+
+    def subscribe(self, name: str, callback: Callable[[Dict[str, Any], Dict[str, Any]], None]) -> None:
+        """
+        Enregistre une fonction appelée quand un fichier de données change
+
+        Args:
+            name: Nom de la donnée (ex: "locations")
+            callback: Fonction recevant l'ancien et le nouveau contenu
+        """
+        self.listeners.setdefault(name, []).append(callback)
+
+    def poll(self) -> List[str]:
+        """
+        Vérifie les dates de modification et analyse uniquement les fichiers modifiés
+
+        Les nouvelles versions sont mises en attente jusqu'au prochain apply_pending().
+        Un fichier invalide (écriture en cours, erreur de syntaxe) est ignoré et sera relu
+        à sa prochaine modification.
+
+        Returns:
+            Noms des données mises en attente
+        """
+        changed = []
+        for filename in self.filenames:
+            name = self._get_name(filename)
+            signature = self._get_signature(filename)
+            if signature is None or signature == self.signatures.get(name):
+                continue
+
+            self.signatures[name] = signature
+            data = self._parse(filename, None)
+            if data is None:
+                continue
+
+            with self.lock:
+                self.pending[name] = data
+            changed.append(name)
+        return changed
+
+    def apply_pending(self) -> List[str]:
+        """
+        Remplace les données modifiées et prévient les abonnés
+
+        À appeler depuis la boucle de jeu, à un moment où aucune donnée n'est en cours d'utilisation.
+
+        Returns:
+            Noms des données remplacées
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+
+        if not pending:
+            return []
+
+        # Remplacer l'ensemble en une seule affectation
+        old_data = self.data
+        new_data = dict(old_data)
+        new_data.update(pending)
+        self.data = new_data
+
+        for name in pending:
+            logger.info(f"🔄 Données {name} rechargées.")
+            for callback in self.listeners.get(name, []):
+                try:
+                    callback(old_data.get(name, {}), new_data[name])
+                except Exception as e:
+                    logger.error(f"❌ Erreur lors de la mise à jour après le rechargement de {name}: {e}")
+
+        return list(pending)
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """
+        Démarre la surveillance des fichiers dans un thread d'arrière-plan
+
+        Args:
+            interval: Délai entre deux vérifications (en secondes)
+        """
+        if self.watch_thread and self.watch_thread.is_alive():
+            return
+
+        self.stop_event.clear()
+        self.watch_thread = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+        self.watch_thread.start()
+
+    def stop_watching(self) -> None:
+        """Arrête la surveillance des fichiers"""
+        self.stop_event.set()
+        if self.watch_thread:
+            self.watch_thread.join(timeout=5)
+            self.watch_thread = None
+
+    def _watch(self, interval: float) -> None:
+        """Boucle du thread de surveillance"""
+        while not self.stop_event.wait(interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"❌ Erreur lors de la surveillance des fichiers de données: {e}")
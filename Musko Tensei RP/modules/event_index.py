@@ -0,0 +1,232 @@
+# event_index.py - Index des événements scénarisés pour MUSKO TENSEI RP
+import bisect
+from typing import Dict, List, Any, Iterable, Set
+
+class EventIndex:
+    # Prérequis d'attributs qui restreignent en fait la tranche d'âge
+    AGE_KEYS = ("age_min", "age_max")
+
+    def __init__(self, events_data: Dict[str, Any] = None):
+        """
+        Initialise l'index des événements
+
+        Args:
+            events_data: Contenu de events.json
+        """
+        self.events = {}
+
+        # Tranche d'âge de chaque événement: id -> (âge minimum, âge maximum inclus)
+        self.windows = {}
+
+        # Bornes triées des tranches d'âge et événements actifs dans chaque segment [bornes[i], bornes[i+1])
+        self.boundaries = []
+        self.segments = []
+
+        # Prérequis: événement -> événements requis, événement requis -> événements dépendants
+        self.prerequisites = {}
+        self.dependents = {}
+
+        # Seuils d'attributs: attribut -> (seuils triés, IDs correspondants)
+        self.attribute_thresholds = {}
+
+        if events_data:
+            self.build(events_data)
+
+    def build(self, events_data: Dict[str, Any]) -> None:
+        """
+        Construit l'index
+
+        Args:
+            events_data: Contenu de events.json
+        """
+        self.events = {}
+        for event_id, data in events_data.get("events", {}).items():
+            self.events[data.get("id", event_id)] = data
+
+        # Quelques événements sont déclarés directement à la racine du fichier
+        for event_id, data in events_data.items():
+            if isinstance(data, dict) and "required_year_min" in data:
+                self.events.setdefault(data.get("id", event_id), data)
+
+        self.windows = {}
+        self.prerequisites = {}
+        self.dependents = {}
+        thresholds = {}
+
+        for event_id, data in self.events.items():
+            attributes = data.get("prerequisite_attributes", {})
+            age_min = max(data.get("required_year_min", 0), attributes.get("age_min", 0))
+            age_max = min(data.get("required_year_max", float("inf")), attributes.get("age_max", float("inf")))
+            self.windows[event_id] = (age_min, age_max)
+
+            self.prerequisites[event_id] = list(data.get("prerequisite_events", []))
+            for required_id in self.prerequisites[event_id]:
+                self.dependents.setdefault(required_id, []).append(event_id)
+
+            for attr, value in attributes.items():
+                if attr not in self.AGE_KEYS:
+                    thresholds.setdefault(attr, []).append((value, event_id))
+
+        self.attribute_thresholds = {}
+        for attr, entries in thresholds.items():
+            entries.sort()
+            self.attribute_thresholds[attr] = ([value for value, _ in entries], [event_id for _, event_id in entries])
+
+        self._build_segments()
+
+    def _build_segments(self) -> None:
+        """Découpe l'axe des âges en segments où l'ensemble des événements actifs est constant"""
+        # Un âge maximum est inclusif (âge en années entières): la fenêtre couvre [min, max + 1)
+        points = set()
+        for age_min, age_max in self.windows.values():
+            points.add(age_min)
+            if age_max != float("inf"):
+                points.add(age_max + 1)
+        self.boundaries = sorted(points)
+        self.segments = [[] for _ in self.boundaries]
+
+        for event_id, (age_min, age_max) in self.windows.items():
+            for index in self.segment_span(age_min, age_max):
+                self.segments[index].append(event_id)
+
+    def segment_of(self, age: float) -> int:
+        """Retourne l'indice du segment contenant un âge (-1 si avant toute borne)"""
+        return bisect.bisect_right(self.boundaries, age) - 1
+
+    def segment_span(self, age_min: float, age_max: float) -> range:
+        """Retourne les indices des segments couverts par une tranche d'âge"""
+        start = bisect.bisect_left(self.boundaries, age_min)
+        if age_max == float("inf"):
+            end = len(self.boundaries)
+        else:
+            end = bisect.bisect_left(self.boundaries, age_max + 1)
+        return range(start, end)
+
+    def active_at(self, age: float) -> List[str]:
+        """Retourne les événements dont la tranche d'âge contient l'âge donné"""
+        index = self.segment_of(age)
+        if index < 0:
+            return []
+        return list(self.segments[index])
+
+    def get(self, event_id: str) -> Dict[str, Any]:
+        """Retourne les données d'un événement (dictionnaire vide s'il est inconnu)"""
+        return self.events.get(event_id, {})
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def create_tracker(self) -> "EventEligibility":
+        """Crée un suivi incrémental des événements déclenchables"""
+        return EventEligibility(self)
+
+
+class EventEligibility:
+    """Suivi incrémental des événements dont les prérequis sont remplis"""
+
+    def __init__(self, index: EventIndex):
+        """
+        Initialise le suivi (aucun événement terminé, aucun attribut)
+
+        Args:
+            index: Index des événements
+        """
+        self.index = index
+        self.completed = set()
+        self.attributes = {}
+
+        # Nombre de prérequis non remplis par événement (événements requis et seuils d'attributs)
+        self.unmet = {}
+
+        # Événements prêts, rangés par segment d'âge
+        self.ready_by_segment = [set() for _ in index.boundaries]
+
+        for event_id in index.events:
+            self.unmet[event_id] = len(index.prerequisites[event_id])
+        # Les attributs partent de 0: seuls les seuils positifs sont initialement non remplis
+        for attr, (values, event_ids) in index.attribute_thresholds.items():
+            for value, event_id in zip(values, event_ids):
+                if value > 0:
+                    self.unmet[event_id] += 1
+        for event_id, count in self.unmet.items():
+            if count == 0:
+                self._set_ready(event_id, True)
+
+    def _set_ready(self, event_id: str, ready: bool) -> None:
+        """Ajoute ou retire un événement des segments couverts par sa tranche d'âge"""
+        age_min, age_max = self.index.windows[event_id]
+        for segment in self.index.segment_span(age_min, age_max):
+            if ready:
+                self.ready_by_segment[segment].add(event_id)
+            else:
+                self.ready_by_segment[segment].discard(event_id)
+
+    def _adjust(self, event_id: str, delta: int) -> None:
+        """Modifie le compteur d'un événement et met à jour son état"""
+        was_ready = self.unmet[event_id] == 0 and event_id not in self.completed
+        self.unmet[event_id] += delta
+        is_ready = self.unmet[event_id] == 0 and event_id not in self.completed
+        if was_ready != is_ready:
+            self._set_ready(event_id, is_ready)
+
+    def on_completed(self, event_id: str) -> None:
+        """
+        Enregistre un événement terminé (ses dépendants perdent un prérequis non rempli)
+
+        Args:
+            event_id: ID de l'événement terminé
+        """
+        if event_id not in self.index.events or event_id in self.completed:
+            return
+        self.completed.add(event_id)
+        self._set_ready(event_id, False)
+        for dependent_id in self.index.dependents.get(event_id, []):
+            self._adjust(dependent_id, -1)
+
+    def sync(self, completed_events: Iterable[str], attributes: Dict[str, Any] = None) -> None:
+        """
+        Met à jour les compteurs à partir des changements depuis la dernière synchronisation
+
+        Args:
+            completed_events: Événements terminés par le joueur
+            attributes: Attributs du joueur
+        """
+        completed = {event_id for event_id in completed_events if event_id in self.index.events}
+
+        for event_id in completed - self.completed:
+            self.on_completed(event_id)
+
+        for event_id in self.completed - completed:
+            self.completed.discard(event_id)
+            for dependent_id in self.index.dependents.get(event_id, []):
+                self._adjust(dependent_id, 1)
+            if self.unmet[event_id] == 0:
+                self._set_ready(event_id, True)
+
+        if attributes is not None:
+            for attr in self.index.attribute_thresholds:
+                old_value = self.attributes.get(attr, 0)
+                new_value = attributes.get(attr, 0)
+                if old_value == new_value:
+                    continue
+                values, event_ids = self.index.attribute_thresholds[attr]
+                low, high = min(old_value, new_value), max(old_value, new_value)
+                delta = -1 if new_value > old_value else 1
+                for event_id in event_ids[bisect.bisect_right(values, low):bisect.bisect_right(values, high)]:
+                    self._adjust(event_id, delta)
+            self.attributes = {attr: attributes.get(attr, 0) for attr in self.index.attribute_thresholds}
+
+    def eligible(self, age: float) -> Set[str]:
+        """
+        Retourne les événements pouvant se déclencher à cet âge
+
+        Args:
+            age: Âge du joueur (en années)
+
+        Returns:
+            Ensemble des IDs d'événements prêts
+        """
+        segment = self.index.segment_of(age)
+        if segment < 0:
+            return set()
+        return set(self.ready_by_segment[segment])
@@ -0,0 +1,248 @@
+# game_state.py - État du jeu copié à l'écriture (instantanés à partage de structure) pour MUSKO TENSEI RP
+from typing import Any, List
+
+# Un instantané ("figé") est fait de dict et de list ordinaires qui ne sont plus jamais modifiés:
+# deux instantanés successifs partagent toutes les parties de l'état qui n'ont pas changé.
+#
+# TrackedDict et TrackedList se comportent comme dict et list mais signalent chaque
+# modification à leurs conteneurs parents. freeze() ne reconstruit que les conteneurs
+# modifiés depuis l'instantané précédent (le chemin de la racine jusqu'aux modifications)
+# et réutilise les autres tels quels: le coût d'un instantané dépend de ce qui a changé,
+# pas de la taille de l'état.
+#
+# Un dict ou une list ordinaire placé dans un conteneur suivi est converti: il faut ensuite
+# le modifier à travers le conteneur (self.player["skills"].append(...)), pas par l'objet d'origine.
+
+
+class _Tracked:
+    """Suivi des modifications commun à TrackedDict et TrackedList"""
+    __slots__ = ()
+
+    def _touch(self) -> None:
+        """Invalide l'instantané du conteneur et de tous ses parents"""
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            # Un conteneur déjà modifié a déjà invalidé ses parents
+            if node._frozen is None:
+                continue
+            node._frozen = None
+            pending.extend(node._parents)
+
+    def _adopt(self, value: Any) -> Any:
+        """Prépare une valeur insérée dans ce conteneur (conversion et lien vers le parent)"""
+        value = track(value)
+        if isinstance(value, _Tracked) and not any(parent is self for parent in value._parents):
+            value._parents.append(self)
+        return value
+
+
+class TrackedDict(_Tracked, dict):
+    """Dictionnaire dont les modifications (y compris imbriquées) sont suivies"""
+    __slots__ = ("_parents", "_frozen")
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self)
+        self._parents: List[_Tracked] = []
+        self._frozen = None
+        for key, value in dict(*args, **kwargs).items():
+            dict.__setitem__(self, key, self._adopt(value))
+
+    def freeze(self) -> dict:
+        """Instantané du dictionnaire (réutilisé tant qu'il n'est pas modifié)"""
+        if self._frozen is None:
+            self._frozen = {key: freeze(value) for key, value in dict.items(self)}
+        return self._frozen
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, self._adopt(value))
+        self._touch()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._touch()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            dict.__setitem__(self, key, self._adopt(value))
+        self._touch()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, *args):
+        result = dict.pop(self, *args)
+        self._touch()
+        return result
+
+    def popitem(self):
+        result = dict.popitem(self)
+        self._touch()
+        return result
+
+    def clear(self):
+        dict.clear(self)
+        self._touch()
+
+    def __reduce__(self):
+        # Copies (copy, pickle) sans les liens vers les parents
+        return (TrackedDict, (dict(self),))
+
+
+class TrackedList(_Tracked, list):
+    """Liste dont les modifications (y compris imbriquées) sont suivies"""
+    __slots__ = ("_parents", "_frozen")
+
+    def __init__(self, iterable=()):
+        list.__init__(self)
+        self._parents: List[_Tracked] = []
+        self._frozen = None
+        list.extend(self, (self._adopt(value) for value in iterable))
+
+    def freeze(self) -> list:
+        """Instantané de la liste (réutilisé tant qu'elle n'est pas modifiée)"""
+        if self._frozen is None:
+            self._frozen = [freeze(value) for value in list.__iter__(self)]
+        return self._frozen
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._adopt(item) for item in value]
+        else:
+            value = self._adopt(value)
+        list.__setitem__(self, index, value)
+        self._touch()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._touch()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, count):
+        list.__imul__(self, count)
+        self._touch()
+        return self
+
+    def append(self, value):
+        list.append(self, self._adopt(value))
+        self._touch()
+
+    def extend(self, iterable):
+        list.extend(self, [self._adopt(value) for value in iterable])
+        self._touch()
+
+    def insert(self, index, value):
+        list.insert(self, index, self._adopt(value))
+        self._touch()
+
+    def pop(self, *args):
+        result = list.pop(self, *args)
+        self._touch()
+        return result
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._touch()
+
+    def clear(self):
+        list.clear(self)
+        self._touch()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._touch()
+
+    def reverse(self):
+        list.reverse(self)
+        self._touch()
+
+    def __reduce__(self):
+        return (TrackedList, (list(self),))
+
+
+def track(value: Any) -> Any:
+    """
+    Convertit une valeur en conteneurs suivis (les conteneurs déjà suivis sont gardés tels quels)
+
+    Args:
+        value: Valeur à suivre (les valeurs autres que dict et list sont retournées telles quelles)
+    """
+    if isinstance(value, _Tracked):
+        return value
+    if isinstance(value, dict):
+        return TrackedDict(value)
+    if isinstance(value, list):
+        return TrackedList(value)
+    return value
+
+
+def freeze(value: Any) -> Any:
+    """
+    Instantané d'une valeur: dict et list ordinaires qui ne doivent plus être modifiés
+
+    Les conteneurs suivis réutilisent leur instantané s'ils n'ont pas changé; les
+    conteneurs ordinaires sont copiés en profondeur.
+    """
+    if isinstance(value, _Tracked):
+        return value.freeze()
+    if isinstance(value, dict):
+        return {key: freeze(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [freeze(item) for item in value]
+    return value
+
+
+def thaw(frozen: Any) -> Any:
+    """
+    Reconstitue un état modifiable à partir d'un instantané (l'instantané reste intact)
+
+    Les conteneurs créés gardent l'instantané comme cache: le prochain freeze() est immédiat.
+    """
+    if isinstance(frozen, dict):
+        node = TrackedDict()
+        for key, value in frozen.items():
+            dict.__setitem__(node, key, node._adopt(thaw(value)))
+    elif isinstance(frozen, list):
+        node = TrackedList()
+        list.extend(node, [node._adopt(thaw(value)) for value in frozen])
+    else:
+        return frozen
+    node._frozen = frozen
+    return node
+
+
+class TrackedAttribute:
+    """
+    Attribut de classe dont les valeurs affectées sont converties en conteneurs suivis
+
+    Utilisation:
+        class MuskoTenseiRP:
+            player = TrackedAttribute()
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.storage_name = f"_tracked_{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.storage_name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.storage_name] = track(value)
+
+    def __delete__(self, instance):
+        instance.__dict__.pop(self.storage_name, None)
@@ -0,0 +1,267 @@
+# item_catalog.py - Catalogue plat des objets pour MUSKO TENSEI RP
+import bisect
+import re
+from typing import Dict, List, Any, Iterable
+
+try:
+    from .records import ItemRecord
+except ImportError:
+    from records import ItemRecord
+
+class ItemCatalog:
+    # Tranches de prix: (prix minimum, nom de la tranche)
+    PRICE_BANDS = [
+        (0, "cheap"),
+        (25, "affordable"),
+        (100, "expensive"),
+        (500, "luxury")
+    ]
+
+    # Type des objets dont le groupe ne suffit pas à déduire le type
+    CATEGORY_TYPES = {
+        "set_items": "set_piece"
+    }
+
+    DEFAULT_PRICE = 10
+
+    def __init__(self, item_data: Dict[str, Any] = None):
+        """
+        Initialise le catalogue des objets
+
+        Args:
+            item_data: Données des objets (contenu de items.json, imbriqué par catégorie)
+        """
+        # Index principal: id -> objet
+        self.items = {}
+
+        # Index secondaires: clé -> liste d'IDs triés par prix
+        self.by_category = {}
+        self.by_type = {}
+        self.by_rarity = {}
+        self.by_band = {}
+
+        # Index des prix (triés) pour les recherches par intervalle
+        self.sorted_prices = []
+        self.sorted_ids = []
+
+        if item_data:
+            self.build(item_data)
+
+    def build(self, item_data: Dict[str, Any]) -> None:
+        """
+        Construit le catalogue et ses index
+
+        Args:
+            item_data: Données des objets (contenu de items.json)
+        """
+        self.items = {}
+        self._collect(item_data, [])
+
+        # Trier une seule fois par prix pour que tous les index le soient aussi
+        ordered = sorted(self.items.values(), key=lambda item: (item["price"], item["id"]))
+        self.sorted_prices = [item["price"] for item in ordered]
+        self.sorted_ids = [item["id"] for item in ordered]
+
+        self.by_category = {}
+        self.by_type = {}
+        self.by_rarity = {}
+        self.by_band = {}
+        for item in ordered:
+            self.by_category.setdefault(item["category"], []).append(item["id"])
+            self.by_type.setdefault(item["type"], []).append(item["id"])
+            self.by_rarity.setdefault(item["rarity"], []).append(item["id"])
+            self.by_band.setdefault(item["price_band"], []).append(item["id"])
+
+    def _collect(self, node: Dict[str, Any], path: List[str]) -> None:
+        """Parcourt les données imbriquées et ajoute chaque objet au catalogue"""
+        for key, value in node.items():
+            if not isinstance(value, dict):
+                continue
+            if "id" in value and "name" in value:
+                self.items[value["id"]] = self._make_record(value, path)
+            else:
+                self._collect(value, path + [key])
+
+    def _make_record(self, data: Dict[str, Any], path: List[str]) -> ItemRecord:
+        """Crée l'entrée du catalogue (enregistrement compact enrichi de la catégorie et du prix)"""
+        record = dict(data)
+        category = path[0] if path else "misc"
+
+        record["category"] = category
+        record["group"] = path[1] if len(path) > 1 else category
+        if len(path) > 2:
+            record["subtype"] = path[2]
+
+        if "type" not in data:
+            record["type"] = self.CATEGORY_TYPES.get(category, self._singular(record["group"]))
+
+        record["rarity"] = data.get("rarity", "common")
+        record["price"] = data.get("value", data.get("price", self.DEFAULT_PRICE))
+        record["price_band"] = self.get_price_band(record["price"])
+        return ItemRecord(record)
+
+    @staticmethod
+    def _singular(name: str) -> str:
+        """Transforme un nom de groupe au singulier (weapons -> weapon)"""
+        if name.endswith("s") and not name.endswith("ss"):
+            return name[:-1]
+        return name
+
+    def get_price_band(self, price: float) -> str:
+        """Retourne la tranche de prix correspondant à un prix"""
+        thresholds = [threshold for threshold, _ in self.PRICE_BANDS]
+        index = bisect.bisect_right(thresholds, price) - 1
+        return self.PRICE_BANDS[max(0, index)][1]
+
+    def get(self, item_id: str) -> Dict[str, Any]:
+        """Retourne les données d'un objet (dictionnaire vide s'il est inconnu)"""
+        return self.items.get(item_id, {})
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def price_of(self, item_id: str, default: int = None) -> int:
+        """Retourne le prix de base d'un objet"""
+        item = self.items.get(item_id)
+        if item is None:
+            return self.DEFAULT_PRICE if default is None else default
+        return item["price"]
+
+    def in_price_range(self, min_price: float = None, max_price: float = None) -> List[str]:
+        """
+        Retourne les objets dont le prix est compris dans l'intervalle (bornes incluses)
+
+        Args:
+            min_price: Prix minimum (aucun si None)
+            max_price: Prix maximum (aucun si None)
+
+        Returns:
+            Liste d'IDs triés par prix
+        """
+        start = 0 if min_price is None else bisect.bisect_left(self.sorted_prices, min_price)
+        end = len(self.sorted_prices) if max_price is None else bisect.bisect_right(self.sorted_prices, max_price)
+        return self.sorted_ids[start:end]
+
+    def find(self, category: str = None, item_type: str = None, rarity: str = None,
+             band: str = None, min_price: float = None, max_price: float = None) -> List[str]:
+        """
+        Recherche des objets en combinant les index
+
+        Args:
+            category: Catégorie (equipment, consumables, ...)
+            item_type: Type (weapon, potion, ...)
+            rarity: Rareté (common, rare, ...)
+            band: Tranche de prix (cheap, affordable, expensive, luxury)
+            min_price: Prix minimum
+            max_price: Prix maximum
+
+        Returns:
+            Liste d'IDs triés par prix
+        """
+        candidates = []
+        if category is not None:
+            candidates.append(self.by_category.get(category, []))
+        if item_type is not None:
+            candidates.append(self.by_type.get(item_type, []))
+        if rarity is not None:
+            candidates.append(self.by_rarity.get(rarity, []))
+        if band is not None:
+            candidates.append(self.by_band.get(band, []))
+        if min_price is not None or max_price is not None:
+            candidates.append(self.in_price_range(min_price, max_price))
+
+        if not candidates:
+            return list(self.sorted_ids)
+
+        # Partir de l'index le plus petit et filtrer avec les autres
+        candidates.sort(key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            other_ids = set(other)
+            result = [item_id for item_id in result if item_id in other_ids]
+        return list(result)
+
+    def expand(self, entries: Iterable[str]) -> List[str]:
+        """
+        Transforme une liste d'IDs, de catégories ou de types en liste d'IDs d'objets
+
+        Args:
+            entries: Éléments d'une liste de marchandises (ex: "antidote", "potion", "weapons")
+
+        Returns:
+            Liste d'IDs d'objets sans doublons
+        """
+        result = []
+        seen = set()
+        for entry in entries:
+            if entry in self.items:
+                ids = [entry]
+            elif entry in self.by_type:
+                ids = self.by_type[entry]
+            elif self._singular(entry) in self.by_type:
+                ids = self.by_type[self._singular(entry)]
+            else:
+                ids = self.by_category.get(entry, [])
+
+            for item_id in ids:
+                if item_id not in seen:
+                    seen.add(item_id)
+                    result.append(item_id)
+        return result
+
+    def average_damage(self, item_id: str, default: int = 5) -> int:
+        """Calcule les dégâts moyens d'une arme à partir de sa formule de dés (ex: 1d6+2)"""
+        item = self.items.get(item_id, {})
+        if "damage" in item and isinstance(item["damage"], (int, float)):
+            return int(item["damage"])
+
+        formula = item.get("attributes", {}).get("damage", {}).get("base")
+        if not isinstance(formula, str):
+            return default
+
+        match = re.fullmatch(r"\s*(\d+)d(\d+)\s*([+-]\s*\d+)?\s*", formula)
+        if not match:
+            return default
+
+        count, sides = int(match.group(1)), int(match.group(2))
+        bonus = int(match.group(3).replace(" ", "")) if match.group(3) else 0
+        return int(count * (sides + 1) / 2 + bonus)
+
+    def inventory_entry(self, item_id: str, count: int = 1) -> Dict[str, Any]:
+        """
+        Crée l'entrée d'inventaire d'un objet
+
+        Args:
+            item_id: ID de l'objet
+            count: Quantité
+
+        Returns:
+            Entrée d'inventaire, ou dictionnaire vide si l'objet est inconnu
+        """
+        item = self.items.get(item_id)
+        if item is None:
+            return {}
+
+        entry = {
+            "id": item_id,
+            "name": item.get("name", item_id),
+            "description": item.get("description", ""),
+            "type": item["type"],
+            "category": item["category"],
+            "rarity": item["rarity"],
+            "count": count
+        }
+
+        # Effets immédiats utilisables en combat
+        instant = item.get("effects", {}).get("instant", {})
+        if "health_restore" in instant:
+            entry["effect"] = "heal"
+            entry["effect_value"] = instant["health_restore"]
+        elif "mana_restore" in instant:
+            entry["effect"] = "mana"
+            entry["effect_value"] = instant["mana_restore"]
+
+        return entry
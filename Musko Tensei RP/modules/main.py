@@ -14,10 +14,24 @@ from modules.save_manager import SaveManager
 from ai_manager import AIManager
 from modules.character_progression import CharacterProgression 
 from modules.interface_cli import InterfaceCLI
+from modules.world_map import WorldMap
+from modules.item_catalog import ItemCatalog
+from modules.game_state import TrackedAttribute
 
 class MuskoTenseiRP:
     """Classe principale du jeu MUSKO TENSEI RP"""
     
+    # État suivi: un instantané (sauvegarde, retour en arrière) ne copie que ce qui a changé
+    player = TrackedAttribute()
+    discovered_locations = TrackedAttribute()
+    active_quests = TrackedAttribute()
+    completed_quests = TrackedAttribute()
+    failed_quests = TrackedAttribute()
+    quest_states = TrackedAttribute()
+    relationships = TrackedAttribute()
+    game_flags = TrackedAttribute()
+    game_time = TrackedAttribute()
+    
     def __init__(self):
         """Initialise le jeu et charge les données nécessaires"""
         self.version = "1.0.0"
@@ -41,6 +55,7 @@ class MuskoTenseiRP:
         self.current_location = "starting_town"
         self.time_of_day = "day"
         self.day_count = 1
+        self.game_time = {"hour": 8, "minute": 0}
         self.season = "spring"
         self.weather = "clear"
         self.discovered_locations = ["starting_town"]
@@ -93,43 +108,50 @@ class MuskoTenseiRP:
         
         # Drapeaux de jeu (pour suivre les choix et événements)
         self.game_flags = {}
-    
-def load_game_data(self):
-    """Charge toutes les données statiques du jeu"""
-    try:
-        # Chemin vers le dossier data (un niveau au-dessus du dossier modules)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        data_dir = os.path.join(base_dir, "data")
-        
-        # Charger les données des lieux
-        with open(os.path.join(data_dir, "locations.json"), "r", encoding="utf-8") as f:
-            self.location_data = json.load(f)
-        
-        # Charger les données des PNJ
-        with open(os.path.join(data_dir, "npcs.json"), "r", encoding="utf-8") as f:
-            self.npc_data = json.load(f)
         
-        # Charger les données des objets
-        with open(os.path.join(data_dir, "items.json"), "r", encoding="utf-8") as f:
-            self.item_data = json.load(f)
-        
-        # Charger les données des compétences
-        with open(os.path.join(data_dir, "skills.json"), "r", encoding="utf-8") as f:
-            self.skills_data = json.load(f)
-        
-        # Charger les données des quêtes
-        with open(os.path.join(data_dir, "quests.json"), "r", encoding="utf-8") as f:
-            self.quests_data = json.load(f)
+        # Nombre de commandes jouées (instantanés de la ligne de temps)
+        self.turn_count = 0
+    
+    def load_game_data(self):
+        """Charge toutes les données statiques du jeu"""
+        try:
+            # Chemin vers le dossier data (un niveau au-dessus du dossier modules)
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, "data")
             
-        # Charger les données de combat
-        with open(os.path.join(data_dir, "combat.json"), "r", encoding="utf-8") as f:
-            self.combat_data = json.load(f)
+            # Charger les données des lieux
+            with open(os.path.join(data_dir, "locations.json"), "r", encoding="utf-8") as f:
+                self.location_data = json.load(f)
             
-        print("Toutes les données du jeu ont été chargées avec succès!")
-        
-    except Exception as e:
-        print(f"Erreur lors du chargement des données: {e}")
-        sys.exit(1)
+            # Charger les données des PNJ
+            with open(os.path.join(data_dir, "npcs.json"), "r", encoding="utf-8") as f:
+                self.npc_data = json.load(f)
+            
+            # Charger les données des objets
+            with open(os.path.join(data_dir, "items.json"), "r", encoding="utf-8") as f:
+                self.item_data = json.load(f)
+            self.item_catalog = ItemCatalog(self.item_data)
+            
+            # Charger les données des compétences
+            with open(os.path.join(data_dir, "skills.json"), "r", encoding="utf-8") as f:
+                self.skills_data = json.load(f)
+            
+            # Charger les données des quêtes
+            with open(os.path.join(data_dir, "quests.json"), "r", encoding="utf-8") as f:
+                self.quests_data = json.load(f)
+                
+            # Charger les données de combat
+            with open(os.path.join(data_dir, "combat.json"), "r", encoding="utf-8") as f:
+                self.combat_data = json.load(f)
+            
+            # Construire le graphe de voyage entre les lieux
+            self.world_map = WorldMap(self.location_data)
+                
+            print("Toutes les données du jeu ont été chargées avec succès!")
+            
+        except Exception as e:
+            print(f"Erreur lors du chargement des données: {e}")
+            sys.exit(1)
     
     def start(self):
         """Démarre le jeu"""
@@ -500,6 +522,9 @@ Remerciements:
         # Afficher la description initiale
         self.display_current_location()
         
+        # Point de départ de la ligne de temps (retour en arrière)
+        self.save_manager.record_turn()
+        
         while self.running:
             # Afficher les informations de base
             self.ui.print_player_stats()
@@ -525,12 +550,33 @@ Remerciements:
                 self.save_game()
             elif command.lower() in ["load", "charger"]:
                 self.load_game_menu()
+            elif command.lower() in ["qs", "quicksave"]:
+                self.save_manager.quick_save()
+                self.ui.display_notification("Sauvegarde rapide effectuée.", type="success")
+            elif command.lower() in ["ql", "quickload"]:
+                result = self.save_manager.quick_load()
+                self.ui.display_notification(result["message"], type="success" if result["success"] else "error")
+            elif command.lower() in ["undo", "annuler"]:
+                result = self.save_manager.rewind(1)
+                self.ui.display_notification(result["message"], type="info" if result["success"] else "warning")
+            elif command.lower() in ["fsck", "verifier", "vérifier"]:
+                self.verify_saves()
+            elif command.lower() in ["taille", "savesize"]:
+                self.show_save_size()
             else:
                 # Analyser l'intention de la commande
                 self.process_command(command)
+                self.save_manager.autosave_scheduler.record_action()
+                
+                # Instantané de fin de tour (retour en arrière sans relire le disque)
+                self.turn_count += 1
+                self.save_manager.record_turn()
             
-            # Auto-sauvegarde périodique (toutes les 10 minutes de jeu par exemple)
-            # À implémenter plus tard
+            # Auto-sauvegarde selon la politique (temps de jeu, actions, événements), en arrière-plan
+            self.save_manager.autosave_scheduler.tick()
+        
+        # Terminer l'écriture d'une auto-sauvegarde en cours avant de quitter la partie
+        self.save_manager.wait_for_autosave(timeout=30)
     
     def process_command(self, command: str):
         """
@@ -614,7 +660,8 @@ Remerciements:
                 break
         
         if not destination_id:
-            self.ui.display_notification(f"Vous ne pouvez pas aller à '{destination}' depuis ici.", type="warning")
+            # Destination lointaine: chercher l'itinéraire le plus rapide sur la carte
+            self.travel_to(destination)
             return
             
         # Vérifier les conditions éventuelles (à implémenter plus tard)
@@ -633,6 +680,55 @@ Remerciements:
         # Afficher la description du nouveau lieu
         self.display_current_location()
     
+    def travel_to(self, destination: str) -> bool:
+        """
+        Voyage vers un lieu non adjacent en suivant l'itinéraire le plus rapide
+        
+        Args:
+            destination: ID ou nom du lieu de destination
+            
+        Returns:
+            True si le voyage a eu lieu, False sinon
+        """
+        destination_id = self.world_map.resolve(destination)
+        route = None
+        if destination_id and destination_id != self.current_location:
+            route = self.world_map.shortest_path(self.current_location, destination_id)
+        
+        if not route:
+            self.ui.display_notification(f"Vous ne pouvez pas aller à '{destination}' depuis ici.", type="warning")
+            return False
+        
+        destination_name = self.world_map.get_location(destination_id).get("name", destination_id)
+        self.ui.display_loading_screen(f"Vous vous rendez à {destination_name}...")
+        
+        # Les lieux traversés en chemin sont découverts
+        for step in route["steps"]:
+            if step["to"] not in self.discovered_locations:
+                self.discovered_locations.append(step["to"])
+        
+        self.game_stats["distance_traveled"] += len(route["steps"])
+        
+        # Faire avancer le temps selon la durée du trajet
+        self.advance_time(route["minutes"])
+        
+        self.current_location = destination_id
+        self.display_current_location()
+        return True
+    
+    def advance_time(self, minutes: int) -> None:
+        """
+        Fait avancer l'horloge du jeu (minutes reportées sur les heures, puis sur les jours)
+        
+        Args:
+            minutes: Durée écoulée en minutes
+        """
+        total = self.game_time.get("hour", 8) * 60 + self.game_time.get("minute", 0) + int(minutes)
+        days, total = divmod(total, 24 * 60)
+        self.day_count += days
+        self.game_time["hour"], self.game_time["minute"] = divmod(total, 60)
+        self.time_of_day = "day" if 6 <= self.game_time["hour"] <= 18 else "night"
+    
     def handle_dialogue(self, intent: Dict[str, Any], command: str):
         """
         Gère les dialogues avec les PNJ
@@ -748,6 +844,9 @@ Remerciements:
         enemy_data = self.npc_data.get(enemy_id, {})
         enemy_name = enemy_data.get("name", "Ennemi")
         
+        # Sauvegarder avant le combat
+        self.save_manager.autosave_scheduler.before_risky("combat")
+        
         # Créer les stats de combat de l'ennemi
         enemy_stats = {
             "name": enemy_name,
@@ -852,6 +951,7 @@ Remerciements:
         # Gérer les récompenses si le joueur a gagné
         if enemy_stats["current_hp"] <= 0:
             self._handle_combat_rewards(enemy_data)
+            self.save_manager.autosave_scheduler.notify("combat_end")
         elif self.player["current_hp"] <= 0:
             self._handle_player_defeat()
     
@@ -1219,7 +1319,7 @@ Remerciements:
                 count = drop.get("count", 1)
                 
                 if item_id:
-                    item_data = self.item_data.get("items", {}).get(item_id, {})
+                    item_data = self.item_catalog.get(item_id)
                     
                     if item_data:
                         # Ajouter l'objet à l'inventaire
@@ -1260,6 +1360,7 @@ Remerciements:
             
             # Afficher la montée de niveau
             self.ui.display_level_up(level_before, new_level, gained_stats)
+            self.save_manager.autosave_scheduler.notify("level_up")
     
     def _handle_player_defeat(self):
         """Gère la défaite du joueur"""
@@ -1301,18 +1402,10 @@ Remerciements:
                 return
         
         # Sinon, ajouter le nouvel objet
-        item_data = self.item_data.get("items", {}).get(item_id, {})
-        
-        if item_data:
-            self.player["inventory"].append({
-                "id": item_id,
-                "name": item_data.get("name", item_id),
-                "description": item_data.get("description", ""),
-                "type": item_data.get("type", "misc"),
-                "category": item_data.get("category", "Divers"),
-                "rarity": item_data.get("rarity", "common"),
-                "count": count
-            })
+        entry = self.item_catalog.inventory_entry(item_id, count)
+        
+        if entry:
+            self.player["inventory"].append(entry)
     
     def handle_examine(self, intent: Dict[str, Any], command: str):
         """
@@ -1388,10 +1481,31 @@ Remerciements:
         result = self.save_manager.save_game(slot, save_name)
         
         if result["success"]:
+            self.save_manager.autosave_scheduler.mark_saved()
             self.ui.display_notification("Partie sauvegardée avec succès!", type="success")
         else:
             self.ui.display_notification(f"Erreur lors de la sauvegarde: {result['message']}", type="error")
     
+    def verify_saves(self):
+        """Vérifie toutes les sauvegardes et affiche celles qui sont endommagées"""
+        self.ui.display_notification("Vérification des sauvegardes...", type="info")
+        result = self.save_manager.verify_saves()
+        for problem in result.get("problems", []):
+            self.ui.display_notification(f"{problem['path']}: {problem['error']}", type="error")
+        self.ui.display_notification(result["message"], type="success" if result["success"] else "warning")
+    
+    def show_save_size(self):
+        """Affiche la taille de la prochaine sauvegarde, par section"""
+        result = self.save_manager.save_size_report()
+        if not result["success"]:
+            self.ui.display_notification(result["message"], type="error")
+            return
+        for name, size in result["sections"].items():
+            self.ui.display_notification(f"{name}: {size['encoded'] / 1024:.1f} Ko ({size['json'] / 1024:.1f} Ko de JSON)", type="info")
+        for path, dropped in result["retention"].items():
+            self.ui.display_notification(f"Rétention {path}: {dropped} entrée(s)", type="info")
+        self.ui.display_notification(result["message"], type="success")
+    
     def load_game_menu(self):
         """Menu de chargement de partie"""
         save_slots = self.save_manager.list_saves()
@@ -1436,6 +1550,10 @@ Remerciements:
             "j, journal, quêtes": "Afficher votre journal de quêtes",
             "save, sauvegarder": "Sauvegarder la partie",
             "load, charger": "Charger une partie sauvegardée",
+            "qs, quicksave / ql, quickload": "Sauvegarde et chargement rapides",
+            "undo, annuler": "Annuler la dernière action",
+            "fsck, vérifier": "Vérifier l'intégrité des sauvegardes",
+            "taille, savesize": "Afficher la taille de la sauvegarde par section",
             "h, help, aide": "Afficher cette aide",
             "q, quit, exit": "Quitter le jeu"
         }
@@ -1520,12 +1638,12 @@ Remerciements:
             self.ui.display_notification(f"{merchant_name} n'a rien à vendre pour le moment.", type="info")
             return
             
-        # Préparer la liste des objets à vendre
+        # Préparer la liste des objets à vendre (IDs, types ou catégories d'objets)
         items_for_sale = []
-        for item_id in for_sale:
-            item_data = self.item_data.get("items", {}).get(item_id, {})
+        for item_id in self.item_catalog.expand(for_sale):
+            item_data = self.item_catalog.get(item_id)
             if item_data:
-                base_price = item_data.get("price", 10)
+                base_price = item_data["price"]
                 
                 # Ajuster le prix selon le charisme du joueur et la réputation
                 charisma_mod = self.player.get("attributes", {}).get("charisma", 10) - 10
@@ -1603,10 +1721,10 @@ Remerciements:
         items_to_sell = []
         for item in inventory:
             item_id = item.get("id")
-            item_data = self.item_data.get("items", {}).get(item_id, {})
+            item_data = self.item_catalog.get(item_id)
             
             if item_data:
-                base_price = item_data.get("price", 10)
+                base_price = item_data["price"]
                 
                 # Le prix de vente est généralement inférieur au prix d'achat
                 sell_price = max(1, int(base_price * 0.5))
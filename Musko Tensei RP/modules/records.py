@@ -0,0 +1,244 @@
+# records.py - Enregistrements compacts en lecture seule pour les données statiques de MUSKO TENSEI RP
+import sys
+from collections.abc import Mapping
+from enum import Enum
+from typing import Dict, Any, Iterator
+
+# Les chaînes courtes (IDs, catégories, noms) sont internées; les longues descriptions sont uniques
+INTERN_MAX_LENGTH = 64
+
+class ItemCategory(Enum):
+    EQUIPMENT = "equipment"
+    CONSUMABLES = "consumables"
+    CRAFTING_MATERIALS = "crafting_materials"
+    MAGICAL_ITEMS = "magical_items"
+    TOOLS = "tools"
+    CONTAINERS = "containers"
+    BOOKS_AND_DOCUMENTS = "books_and_documents"
+    MOUNTS_AND_PETS = "mounts_and_pets"
+    QUEST_ITEMS = "quest_items"
+    ARTIFACTS = "artifacts"
+    SET_ITEMS = "set_items"
+    MISC = "misc"
+
+class Rarity(Enum):
+    COMMON = "common"
+    UNCOMMON = "uncommon"
+    RARE = "rare"
+    EPIC = "epic"
+    LEGENDARY = "legendary"
+
+class SkillCategory(Enum):
+    MAGIC = "magic"
+    COMBAT = "combat"
+    SOCIAL = "social"
+    SURVIVAL = "survival"
+    CRAFTING = "crafting"
+    KNOWLEDGE = "knowledge"
+    MOVEMENT = "movement"
+    DETECTION = "detection"
+    SUPPORT = "support"
+    STEALTH = "stealth"
+    GENERAL = "general"
+
+class SkillKind(Enum):
+    SKILL = "skill"
+    ABILITY = "ability"
+    SPELL = "spell"
+
+class LocationLevel(Enum):
+    CONTINENT = "continent"
+    REGION = "region"
+    LOCATION = "location"
+    POINT_OF_INTEREST = "point_of_interest"
+
+
+class FrozenDict(dict):
+    """Dictionnaire en lecture seule (valeurs imbriquées des enregistrements), sans surcoût mémoire"""
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("FrozenDict est en lecture seule")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def compact(value: Any) -> Any:
+    """
+    Convertit une valeur JSON en forme compacte et immuable
+
+    Les chaînes courtes sont internées (partagées entre tous les enregistrements),
+    les listes deviennent des tuples et les dictionnaires des FrozenDict.
+    """
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= INTERN_MAX_LENGTH else value
+    if isinstance(value, list):
+        return tuple(compact(item) for item in value)
+    if isinstance(value, dict):
+        return FrozenDict((sys.intern(key), compact(item)) for key, item in value.items())
+    return value
+
+
+def _encode(enum_class: type, value: Any) -> Any:
+    """Code une valeur par son membre d'énumération (valeur internée si elle est inconnue)"""
+    if value is None:
+        return None
+    try:
+        return enum_class(value)
+    except ValueError:
+        return compact(value)
+
+
+def _plain(value: Any) -> Any:
+    """Reconvertit une valeur compacte en structure JSON classique"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, Record):
+        return value.to_dict()
+    return value
+
+
+class Record(Mapping):
+    """
+    Enregistrement en lecture seule, stocké dans des __slots__
+
+    Se comporte comme un dictionnaire (record["name"], record.get("name")) pour que le code
+    existant puisse l'utiliser sans modification pendant la migration.
+    """
+    __slots__ = ("extra",)
+
+    # Champs stockés dans des slots (les autres clés vont dans "extra")
+    FIELDS = ()
+
+    # Champs codés par une énumération: nom du champ -> classe d'énumération
+    ENUM_FIELDS = {}
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Crée l'enregistrement à partir des données JSON brutes
+
+        Args:
+            data: Données brutes de l'objet
+        """
+        for field in self.FIELDS:
+            value = data.get(field)
+            if field in self.ENUM_FIELDS:
+                value = _encode(self.ENUM_FIELDS[field], value)
+            else:
+                value = compact(value)
+            object.__setattr__(self, field, value)
+
+        extra = FrozenDict((sys.intern(key), compact(value)) for key, value in data.items() if key not in self.FIELDS)
+        object.__setattr__(self, "extra", extra or None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} est en lecture seule")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} est en lecture seule")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value.value if isinstance(value, Enum) else value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+    def __reduce__(self):
+        return (type(self), (self.to_dict(),))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retourne une copie modifiable au format JSON d'origine"""
+        return {key: _plain(self[key]) for key in self}
+
+
+class NPCRecord(Record):
+    __slots__ = ("id", "name", "race", "gender", "origin", "birth_year_offset")
+    FIELDS = __slots__
+
+
+class ItemRecord(Record):
+    __slots__ = ("id", "name", "description", "category", "group", "subtype", "type",
+                 "rarity", "price", "price_band", "weight")
+    FIELDS = __slots__
+    ENUM_FIELDS = {"category": ItemCategory, "rarity": Rarity}
+
+
+class SkillRecord(Record):
+    __slots__ = ("id", "name", "description", "category", "kind", "type", "parent", "cost", "max_level", "requirements")
+    FIELDS = __slots__
+    ENUM_FIELDS = {"category": SkillCategory, "kind": SkillKind}
+
+
+class LocationRecord(Record):
+    __slots__ = ("id", "name", "description", "type", "level", "parent")
+    FIELDS = __slots__
+    ENUM_FIELDS = {"level": LocationLevel}
+
+
+class RecordTable(Mapping):
+    """Table en lecture seule d'enregistrements indexés par ID internés"""
+    __slots__ = ("records",)
+
+    def __init__(self, records: Dict[str, Record] = None):
+        object.__setattr__(self, "records", {sys.intern(key): record for key, record in (records or {}).items()})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("RecordTable est en lecture seule")
+
+    def __getitem__(self, key: str) -> Record:
+        return self.records[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.records
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retourne une copie modifiable au format JSON d'origine"""
+        return {key: record.to_dict() for key, record in self.records.items()}
+
+
+def build_npc_table(npcs_data: Dict[str, Any]) -> RecordTable:
+    """
+    Construit la table des PNJ à partir de npcs.json
+
+    Args:
+        npcs_data: Contenu de npcs.json (id -> données)
+
+    Returns:
+        Table des enregistrements de PNJ
+    """
+    records = {}
+    for npc_id, data in npcs_data.items():
+        if isinstance(data, dict):
+            records[npc_id] = NPCRecord(dict(data, id=npc_id))
+    return RecordTable(records)
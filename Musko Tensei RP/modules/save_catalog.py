@@ -0,0 +1,276 @@
+# save_catalog.py - Index persistant des sauvegardes (métadonnées, taille, date) pour MUSKO TENSEI RP
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Optional
+import logging
+
+logger = logging.getLogger("musko_tensei")
+
+CATALOG_VERSION = 1
+CATALOG_NAME = "catalog.json"
+
+
+class SaveCatalog:
+    """
+    Index des fichiers de sauvegarde de chaque slot
+
+    Le catalogue garde pour chaque fichier .mkrp ses métadonnées, sa taille et sa date de
+    modification: lister, trier et élaguer les sauvegardes ne demande plus d'ouvrir ni de
+    consulter chaque fichier. Il est mis à jour à chaque écriture ou suppression et réécrit
+    de façon atomique.
+
+    Un slot modifié sans passer par le catalogue (copie manuelle, import, restauration)
+    est détecté par la date de modification de son répertoire et réindexé au prochain
+    accès; seuls les fichiers nouveaux ou modifiés sont alors relus.
+
+    Format:
+        {"version": 1, "slots": {slot: {"mtime_ns": date du répertoire,
+                                        "files": {fichier: {"size", "mtime_ns", "metadata" ou "error"}}}}}
+    """
+
+    def __init__(self, save_directory: str, read_info: Callable[[str], Dict[str, Any]]):
+        """
+        Initialise le catalogue
+
+        Args:
+            save_directory: Répertoire racine des sauvegardes
+            read_info: Fonction lisant l'en-tête d'un fichier (SaveManager._get_save_info)
+        """
+        self.save_directory = save_directory
+        self.catalog_path = os.path.join(save_directory, CATALOG_NAME)
+        self.read_info = read_info
+        self.lock = threading.RLock()
+        self.slots = None
+
+        # Transactions imbriquées en cours et modifications à écrire à leur fin
+        self.depth = 0
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        """Charge le catalogue depuis le disque (une seule fois)"""
+        if self.slots is None:
+            self.slots = {}
+            try:
+                with open(self.catalog_path, "r", encoding="utf-8") as f:
+                    catalog = json.load(f)
+                if catalog.get("version") == CATALOG_VERSION:
+                    self.slots = catalog.get("slots", {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Catalogue des sauvegardes illisible, il sera reconstruit: {e}")
+        return self.slots
+
+    def _write(self) -> None:
+        """Écrit le catalogue de façon atomique (fichier temporaire puis remplacement)"""
+        os.makedirs(self.save_directory, exist_ok=True)
+        # Fichier temporaire propre au processus: plusieurs sessions peuvent partager les sauvegardes
+        temp_path = f"{self.catalog_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CATALOG_VERSION, "slots": self.slots}, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_path, self.catalog_path)
+            self.dirty = False
+        except OSError as e:
+            logger.error(f"❌ Impossible d'écrire le catalogue des sauvegardes: {e}")
+
+    @staticmethod
+    def _directory_mtime(slot_path: str) -> Optional[int]:
+        try:
+            return os.stat(slot_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _index_file(self, slot_path: str, file_name: str, previous: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Indexe un fichier (réutilise l'entrée précédente si taille et date n'ont pas changé)
+
+        Args:
+            slot_path: Répertoire du slot
+            file_name: Nom du fichier .mkrp
+            previous: Entrée actuelle du catalogue
+
+        Returns:
+            Entrée du catalogue pour ce fichier
+        """
+        file_path = os.path.join(slot_path, file_name)
+        stat = os.stat(file_path)
+        if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+            return previous
+
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        info = self.read_info(file_path)
+        if "error" in info:
+            entry["error"] = info["error"]
+        else:
+            entry["metadata"] = info.get("metadata", {})
+        return entry
+
+    def _scan_slot(self, slot_name: str) -> bool:
+        """
+        Réindexe un slot dont le répertoire a changé depuis la dernière mise à jour
+
+        Returns:
+            True si le catalogue a été modifié
+        """
+        slot_path = os.path.join(self.save_directory, slot_name)
+        mtime = self._directory_mtime(slot_path)
+        slot = self.slots.get(slot_name)
+        if slot is not None and slot.get("mtime_ns") == mtime:
+            return False
+
+        if mtime is None:
+            self.slots.pop(slot_name, None)
+            return slot is not None
+
+        previous = slot.get("files", {}) if slot else {}
+        files = {}
+        for file_name in os.listdir(slot_path):
+            if not file_name.endswith(".mkrp"):
+                continue
+            try:
+                files[file_name] = self._index_file(slot_path, file_name, previous.get(file_name))
+            except OSError:
+                # Fichier supprimé entre le listage et la lecture
+                continue
+
+        self.slots[slot_name] = {"mtime_ns": mtime, "files": files}
+        return True
+
+    def _sync(self, slot_name: str = None) -> None:
+        """Met à jour les slots modifiés hors du catalogue (un seul slot si précisé)"""
+        self._load()
+        if slot_name is not None:
+            slot_names = [slot_name]
+        else:
+            slot_names = set(self.slots)
+            if os.path.isdir(self.save_directory):
+                slot_names.update(
+                    name for name in os.listdir(self.save_directory)
+                    if os.path.isdir(os.path.join(self.save_directory, name))
+                )
+
+        changed = False
+        for name in slot_names:
+            changed = self._scan_slot(name) or changed
+        if changed:
+            self._commit()
+
+    def files(self, slot_name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne les fichiers indexés d'un slot
+
+        Args:
+            slot_name: Nom du slot
+
+        Returns:
+            Nom du fichier -> {"size", "mtime_ns", "metadata" ou "error"}
+        """
+        with self.lock:
+            self._sync(slot_name)
+            return dict(self.slots.get(slot_name, {}).get("files", {}))
+
+    def all_files(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Retourne les fichiers indexés de tous les slots: slot -> fichier -> entrée"""
+        with self.lock:
+            self._sync()
+            return {name: dict(slot.get("files", {})) for name, slot in self.slots.items()}
+
+    def _update(self, save_path: str, entry: Optional[Dict[str, Any]]) -> None:
+        """
+        Applique une écriture (entry) ou une suppression (None) faite par le gestionnaire
+
+        Si le contenu du répertoire ne correspond pas au catalogue ainsi modifié, le slot
+        a aussi changé par ailleurs: il est réindexé.
+        """
+        slot_path, file_name = os.path.split(save_path)
+        slot_name = os.path.basename(slot_path)
+        with self.lock:
+            self._load()
+            slot = self.slots.get(slot_name)
+            if slot is not None:
+                expected = set(slot["files"]) - {file_name}
+                if entry is not None:
+                    expected.add(file_name)
+                try:
+                    present = {name for name in os.listdir(slot_path) if name.endswith(".mkrp")}
+                except OSError:
+                    present = set()
+
+            if slot is None or present != expected:
+                if slot is not None:
+                    slot["mtime_ns"] = None
+                self._scan_slot(slot_name)
+            else:
+                slot["mtime_ns"] = self._directory_mtime(slot_path)
+
+            slot = self.slots.get(slot_name)
+            if slot is not None:
+                if entry is None:
+                    slot["files"].pop(file_name, None)
+                else:
+                    slot["files"][file_name] = entry
+            self._commit()
+
+    def record(self, save_path: str, metadata: Dict[str, Any]) -> None:
+        """
+        Ajoute ou met à jour un fichier qui vient d'être écrit
+
+        Args:
+            save_path: Chemin du fichier écrit
+            metadata: Métadonnées écrites dans son en-tête
+        """
+        stat = os.stat(save_path)
+        self._update(save_path, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "metadata": metadata})
+
+    def forget(self, save_path: str) -> None:
+        """
+        Retire un fichier qui vient d'être supprimé
+
+        Args:
+            save_path: Chemin du fichier supprimé
+        """
+        self._update(save_path, None)
+
+    @contextmanager
+    def transaction(self):
+        """Regroupe plusieurs mises à jour en une seule réécriture du catalogue"""
+        with self.lock:
+            self.depth += 1
+            try:
+                yield self
+            finally:
+                self.depth -= 1
+                if self.depth == 0 and self.dirty:
+                    self._write()
+
+    def _commit(self) -> None:
+        """Écrit le catalogue, ou le marque à écrire à la fin de la transaction en cours"""
+        if self.depth:
+            self.dirty = True
+        else:
+            self._write()
+
+    def invalidate(self, slot_name: str = None) -> None:
+        """
+        Oublie les entrées d'un slot (ou de tous) pour qu'il soit relu au prochain accès
+
+        Nécessaire quand des fichiers sont remplacés sur place: écraser un fichier existant
+        ne change pas la date de modification de son répertoire.
+        """
+        with self.lock:
+            self._load()
+            if slot_name is None:
+                self.slots.clear()
+            else:
+                self.slots.pop(slot_name, None)
+            self._commit()
+
+    def rebuild(self) -> None:
+        """Reconstruit entièrement le catalogue en relisant tous les fichiers"""
+        with self.lock:
+            self.slots = {}
+            self._sync()
+            self._commit()
@@ -0,0 +1,620 @@
+# save_codecs.py - Chaîne d'encodage des sauvegardes (JSON -> compression -> obfuscation) pour MUSKO TENSEI RP
+import codecs
+import gzip
+import json
+import lzma
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+SIGNATURE = b"MKRP"
+
+# Une taille de métadonnées de 0xFFFFFFFF signale l'en-tête étendu (jamais atteinte par l'ancien format)
+EXTENDED_SENTINEL = 0xFFFFFFFF
+
+# Versions de l'en-tête étendu: 1 = données en un seul bloc, 2 = sections avec table des matières,
+# 3 = sections avec sommes de contrôle CRC32 (métadonnées, table des matières et chaque section)
+SINGLE_BLOCK_VERSION = 1
+SECTIONED_VERSION = 2
+CHECKSUMMED_VERSION = 3
+HEADER_VERSION = CHECKSUMMED_VERSION
+
+# En-tête étendu après la signature et la sentinelle:
+#   version (u16), compression (u8), niveau (u8), options (u8), taille des métadonnées (u32)
+#   compression zdict seulement: identifiant du dictionnaire (u32, DICTIONARY_ID)
+EXTENDED_HEADER = struct.Struct("<HBBBI")
+DICTIONARY_ID = struct.Struct("<I")
+LEGACY_HEADER_SIZE = 8
+
+FLAG_OBFUSCATED = 0x01
+
+# Découpage du JSON: profondeur des conteneurs découpés et taille des tranches de listes
+SPLIT_MAX_DEPTH = 4
+LIST_CHUNK_SIZE = 256
+
+# Lecture en flux: taille des morceaux lus, désobfusqués et décompressés un par un
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+class TruncatedSaveError(ValueError):
+    """Le fichier de sauvegarde se termine avant la fin annoncée par son en-tête"""
+
+
+class CorruptedSaveError(ValueError):
+    """Les données de la sauvegarde ne correspondent pas à leur somme de contrôle"""
+
+
+class UnsupportedVersionError(ValueError):
+    """L'en-tête de la sauvegarde annonce une version que ce jeu ne sait pas lire"""
+
+
+def xor_bytes(data: bytes, key: bytes) -> bytes:
+    """
+    XOR à clé répétée sur l'ensemble des données en une seule opération
+
+    Les données et la clé répétée sont converties en grands entiers: le XOR est alors
+    effectué en C sur des mots machine au lieu d'une boucle Python octet par octet.
+
+    Args:
+        data: Données à (dés)obfusquer
+        key: Clé répétée sur toute la longueur
+
+    Returns:
+        Données transformées (la même opération les restaure)
+    """
+    length = len(data)
+    if not length or not key:
+        return bytes(data)
+    keystream = (key * (length // len(key) + 1))[:length]
+    value = int.from_bytes(data, "little") ^ int.from_bytes(keystream, "little")
+    return value.to_bytes(length, "little")
+
+
+def iter_json(data: Any, depth: int = 0) -> Iterator[str]:
+    """
+    Produit le JSON d'une structure par petits fragments
+
+    Les dictionnaires et les grandes listes des premiers niveaux sont découpés et chaque
+    fragment est encodé par l'encodeur JSON natif (json.dumps, bien plus rapide que
+    iterencode). Un appel natif garde le GIL: des fragments courts laissent le thread du
+    jeu s'exécuter pendant une sauvegarde en arrière-plan. La concaténation des fragments
+    est identique à json.dumps(data).
+
+    Args:
+        data: Données à encoder
+        depth: Profondeur actuelle (usage interne)
+
+    Yields:
+        Fragments de texte JSON
+    """
+    if depth < SPLIT_MAX_DEPTH and isinstance(data, dict) and data:
+        separator = "{"
+        for key, value in data.items():
+            # Encoder la clé dans un dictionnaire conserve la conversion des clés de json.dumps
+            yield separator + json.dumps({key: None})[1:-len(": null}")] + ": "
+            yield from iter_json(value, depth + 1)
+            separator = ", "
+        yield "}"
+    elif depth < SPLIT_MAX_DEPTH and isinstance(data, list) and len(data) > LIST_CHUNK_SIZE:
+        separator = "["
+        for start in range(0, len(data), LIST_CHUNK_SIZE):
+            yield separator + json.dumps(data[start:start + LIST_CHUNK_SIZE])[1:-1]
+            separator = ", "
+        yield "]"
+    else:
+        yield json.dumps(data)
+
+
+class _NoCompressor:
+    """Compresseur identité (pour les sauvegardes non compressées)"""
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _NoDecompressor:
+    """Décompresseur identité"""
+
+    eof = True
+
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(data)
+
+
+# États de l'analyse JSON en flux
+_VALUE, _AFTER_VALUE, _KEY, _COLON, _KEY_OR_END, _VALUE_OR_END = range(6)
+_WHITESPACE = " \t\n\r"
+_NUMBER_CONTINUATION = "0123456789.eE+-"
+
+
+class StreamDecoder:
+    """
+    Décodage incrémental de données produites par SaveCodec.encode()
+
+    Chaque morceau est désobfusqué (clé décalée selon sa position dans le flux),
+    décompressé par tranches de STREAM_CHUNK_SIZE au plus, puis analysé au fil de l'eau:
+    les conteneurs des premiers niveaux (jusqu'à SPLIT_MAX_DEPTH, comme iter_json) qui ne
+    sont pas encore complets sont ouverts et remplis valeur par valeur, chaque valeur étant
+    analysée d'un coup par le décodeur JSON natif. Seuls l'arbre construit et une tranche
+    de texte sont en mémoire: ni les données encodées, ni le JSON complet (octets ou texte).
+    Le résultat est identique à json.loads.
+
+    json.loads partage les chaînes des clés identiques au sein d'un appel; ici les valeurs
+    sont analysées en plusieurs appels, les clés sont donc partagées par self.keys (sans quoi
+    chaque entrée d'une longue liste garderait sa propre copie de ses clés).
+    """
+
+    def __init__(self, codec: "SaveCodec"):
+        self.key = codec.key if codec.obfuscate else b""
+        self.decompressor = codec._decompressor()
+        self.position = 0
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.keys = {}
+        self.raw_decode = json.JSONDecoder(object_pairs_hook=self._object).raw_decode
+        self.batch_decode = json.JSONDecoder().raw_decode
+
+        # Texte reçu mais pas encore analysé: self.text[self.index:] puis self.pending
+        self.text = ""
+        self.index = 0
+        self.pending = []
+        self.pending_size = 0
+        # Valeur incomplète en attente: taille de texte à atteindre avant de réessayer
+        self.wait = 0
+
+        # Conteneurs ouverts: [conteneur, clé en attente, analyse par lots encore possible]
+        self.stack = []
+        self.state = _VALUE
+        self.done = False
+        self.result = None
+
+    def _decompressed(self, chunk) -> Iterator[bytes]:
+        """Décompresse un morceau par tranches bornées (un morceau très compressé ne sort pas d'un bloc)"""
+        decompressor = self.decompressor
+        if hasattr(decompressor, "unconsumed_tail"):
+            yield decompressor.decompress(chunk, STREAM_CHUNK_SIZE)
+            while decompressor.unconsumed_tail:
+                yield decompressor.decompress(decompressor.unconsumed_tail, STREAM_CHUNK_SIZE)
+        elif hasattr(decompressor, "needs_input"):
+            yield decompressor.decompress(chunk, STREAM_CHUNK_SIZE)
+            while not decompressor.needs_input and not decompressor.eof:
+                yield decompressor.decompress(b"", STREAM_CHUNK_SIZE)
+        else:
+            yield decompressor.decompress(chunk)
+
+    def feed(self, chunk) -> None:
+        """Ajoute un morceau de données encodées (bytes ou memoryview)"""
+        if self.key:
+            offset = self.position % len(self.key)
+            chunk = xor_bytes(chunk, self.key[offset:] + self.key[:offset])
+        self.position += len(chunk)
+        for data in self._decompressed(chunk):
+            self._receive(self.text_decoder.decode(data), False)
+
+    def finish(self) -> Any:
+        """
+        Termine la décompression et l'analyse
+
+        Returns:
+            Données décodées
+
+        Raises:
+            zlib.error, lzma.LZMAError: Si le flux compressé est incomplet
+            json.JSONDecodeError: Si le JSON est invalide ou incomplet
+        """
+        if hasattr(self.decompressor, "flush"):
+            self._receive(self.text_decoder.decode(self.decompressor.flush()), False)
+        if not self.decompressor.eof:
+            raise zlib.error("Flux compressé incomplet")
+        self._receive(self.text_decoder.decode(b"", True), True)
+        if not self.done or self.stack:
+            raise json.JSONDecodeError("JSON incomplet", self.text, len(self.text))
+        return self.result
+
+    def _receive(self, text: str, final: bool) -> None:
+        if text:
+            self.pending.append(text)
+            self.pending_size += len(text)
+        if not final and len(self.text) - self.index + self.pending_size < self.wait:
+            return
+        self.text = self.text[self.index:] + "".join(self.pending)
+        self.index = 0
+        self.pending = []
+        self.pending_size = 0
+        self.wait = 0
+        self._parse(final)
+
+    def _object(self, pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        keys = self.keys
+        return {keys.setdefault(key, key): value for key, value in pairs}
+
+    def _attach(self, value: Any) -> None:
+        """Place une valeur analysée dans le conteneur ouvert (ou en résultat final)"""
+        if not self.stack:
+            self.result = value
+            self.done = True
+            return
+        container, key, _ = self.stack[-1]
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+
+    def _parse(self, final: bool) -> None:
+        """Analyse le texte disponible; s'arrête sur une valeur incomplète (sauf si final)"""
+        text = self.text
+        length = len(text)
+        index = self.index
+        stack = self.stack
+        state = self.state
+        raw_decode = self.raw_decode
+        while True:
+            while index < length and text[index] in _WHITESPACE:
+                index += 1
+            if index == length:
+                break
+            char = text[index]
+
+            if state == _VALUE:
+                if char == "{" and stack and stack[-1][2] and isinstance(stack[-1][0], list):
+                    # Liste de dictionnaires: analyser d'un coup toutes les entrées complètes du texte
+                    # reçu. Le lot s'arrête à la dernière séparation "}, {": si elle n'est pas entre deux
+                    # entrées (chaîne, liste imbriquée), le lot n'est pas un JSON valide et la liste
+                    # continue entrée par entrée.
+                    cut = text.rfind("}, {", index, length)
+                    if cut > index:
+                        try:
+                            batch, end = self.batch_decode("[" + text[index:cut + 1] + "]")
+                        except json.JSONDecodeError:
+                            end = None
+                        if end == cut + 3 - index:
+                            stack[-1][0].extend(batch)
+                            index = cut + 3
+                            continue
+                        stack[-1][2] = False
+                try:
+                    value, end = raw_decode(text, index)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    if char in "{[" and len(stack) < SPLIT_MAX_DEPTH:
+                        # Conteneur incomplet: l'ouvrir et analyser ses valeurs une par une
+                        container = {} if char == "{" else []
+                        self._attach(container)
+                        stack.append([container, None, True])
+                        state = _KEY_OR_END if char == "{" else _VALUE_OR_END
+                        index += 1
+                        continue
+                    self.wait = 2 * (length - index)
+                    break
+                if not final and (end == length or text[end] in _NUMBER_CONTINUATION):
+                    # Un nombre coupé en fin de texte ("1." de "1.5") continue dans le morceau suivant
+                    self.wait = length - index + 1
+                    break
+                self._attach(value)
+                index = end
+                state = _AFTER_VALUE
+                if stack and isinstance(stack[-1][0], list):
+                    # Suite d'une liste au format de json.dumps (", "): sans repasser par les états
+                    append = stack[-1][0].append
+                    while text.startswith(", ", index):
+                        try:
+                            value, end = raw_decode(text, index + 2)
+                        except json.JSONDecodeError:
+                            break
+                        if not final and (end == length or text[end] in _NUMBER_CONTINUATION):
+                            break
+                        append(value)
+                        index = end
+            elif state == _AFTER_VALUE:
+                if not stack:
+                    raise json.JSONDecodeError("Données après la fin du JSON", text, index)
+                is_dict = isinstance(stack[-1][0], dict)
+                if char == ",":
+                    state = _KEY if is_dict else _VALUE
+                elif char == ("}" if is_dict else "]"):
+                    stack.pop()
+                else:
+                    raise json.JSONDecodeError("Séparateur attendu", text, index)
+                index += 1
+            elif state == _KEY_OR_END or state == _VALUE_OR_END:
+                if char == ("}" if state == _KEY_OR_END else "]"):
+                    stack.pop()
+                    state = _AFTER_VALUE
+                    index += 1
+                else:
+                    state = _KEY if state == _KEY_OR_END else _VALUE
+            elif state == _KEY:
+                if char != '"':
+                    raise json.JSONDecodeError("Clé attendue", text, index)
+                try:
+                    key, end = raw_decode(text, index)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    self.wait = 2 * (length - index)
+                    break
+                stack[-1][1] = self.keys.setdefault(key, key)
+                index = end
+                state = _COLON
+            else:
+                if char != ":":
+                    raise json.JSONDecodeError("':' attendu", text, index)
+                index += 1
+                state = _VALUE
+        self.index = index
+        self.state = state
+
+
+# Compressions disponibles: nom -> (identifiant d'en-tête, niveaux valides, niveau par défaut)
+# zdict: deflate brut (sans en-tête ni somme zlib, couverts par l'en-tête et les CRC32 v3)
+# avec un dictionnaire préchargé, entraîné sur des sauvegardes (voir save_dictionary)
+COMPRESSIONS = {
+    "none": (0, range(0, 1), 0),
+    "zlib": (1, range(0, 10), 6),
+    "gzip": (2, range(0, 10), 6),
+    "lzma": (3, range(0, 10), 6),
+    "zdict": (4, range(0, 10), 9)
+}
+COMPRESSION_NAMES = {ident: name for name, (ident, _, _) in COMPRESSIONS.items()}
+
+
+class SaveCodec:
+    def __init__(self, compression: str = "zlib", level: int = None, obfuscate: bool = True,
+                 key: bytes = b"musko_tensei_rp", dictionary: bytes = None):
+        """
+        Initialise un codec de sauvegarde
+
+        Args:
+            compression: Algorithme de compression ("none", "zlib", "gzip", "lzma" ou "zdict")
+            level: Niveau de compression (0-9, niveau par défaut de l'algorithme si None)
+            obfuscate: Applique le XOR à clé répétée après la compression
+            key: Clé d'obfuscation
+            dictionary: Dictionnaire préchargé (obligatoire pour zdict)
+
+        Raises:
+            ValueError: Si la compression ou le niveau est invalide
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Compression inconnue: {compression}")
+
+        _, levels, default_level = COMPRESSIONS[compression]
+        level = default_level if level is None else level
+        if level not in levels:
+            raise ValueError(f"Niveau de compression invalide pour {compression}: {level}")
+
+        if compression == "zdict" and not dictionary:
+            raise ValueError("La compression zdict demande un dictionnaire")
+
+        self.compression = compression
+        self.level = level
+        self.obfuscate = obfuscate
+        self.key = key
+        self.dictionary = dictionary if compression == "zdict" else None
+        self.dictionary_id = zlib.crc32(dictionary) if self.dictionary else 0
+
+    def __repr__(self) -> str:
+        dictionary = f", dictionary={self.dictionary_id:08x}" if self.dictionary else ""
+        return f"SaveCodec({self.compression!r}, level={self.level}, obfuscate={self.obfuscate}{dictionary})"
+
+    def _compressor(self):
+        """Crée un compresseur incrémental"""
+        if self.compression == "zlib":
+            return zlib.compressobj(self.level)
+        if self.compression == "gzip":
+            # wbits=31: flux zlib avec en-tête et pied gzip
+            return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        if self.compression == "lzma":
+            return lzma.LZMACompressor(preset=self.level)
+        if self.compression == "zdict":
+            return zlib.compressobj(self.level, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, self.dictionary)
+        return _NoCompressor()
+
+    def _decompressor(self):
+        """Crée un décompresseur incrémental"""
+        if self.compression == "zlib":
+            return zlib.decompressobj()
+        if self.compression == "gzip":
+            return zlib.decompressobj(31)
+        if self.compression == "lzma":
+            return lzma.LZMADecompressor()
+        if self.compression == "zdict":
+            return zlib.decompressobj(-15, self.dictionary)
+        return _NoDecompressor()
+    
+    def _decompress(self, data: bytes) -> bytes:
+        if self.compression == "zlib":
+            return zlib.decompress(data)
+        if self.compression == "gzip":
+            return gzip.decompress(data)
+        if self.compression == "lzma":
+            return lzma.decompress(data)
+        if self.compression == "zdict":
+            decompressor = zlib.decompressobj(-15, self.dictionary)
+            result = decompressor.decompress(data) + decompressor.flush()
+            # Le deflate brut n'a pas de somme zlib: un flux incomplet doit être signalé ici
+            if not decompressor.eof:
+                raise zlib.error("Flux zdict incomplet")
+            return result
+        return data
+
+    def encode_bytes(self, data: bytes) -> bytes:
+        """Compresse puis obfusque des octets"""
+        compressor = self._compressor()
+        compressed = compressor.compress(data) + compressor.flush()
+        return xor_bytes(compressed, self.key) if self.obfuscate else compressed
+
+    def decode_bytes(self, data: bytes) -> bytes:
+        """Désobfusque puis décompresse des octets"""
+        if self.obfuscate:
+            data = xor_bytes(data, self.key)
+        return self._decompress(data)
+
+    def encode(self, data: Any) -> bytes:
+        """
+        Encode une structure JSON sans construire la chaîne JSON complète
+
+        Les fragments produits par iter_json sont transmis directement au compresseur:
+        le texte JSON complet n'est jamais présent en mémoire.
+
+        Args:
+            data: Données de sauvegarde
+
+        Returns:
+            Données compressées (et obfusquées)
+        """
+        compressor = self._compressor()
+        output = []
+        for fragment in iter_json(data):
+            output.append(compressor.compress(fragment.encode("utf-8")))
+        output.append(compressor.flush())
+
+        compressed = b"".join(output)
+        return xor_bytes(compressed, self.key) if self.obfuscate else compressed
+
+    def decode(self, data: bytes) -> Any:
+        """Décode des données produites par encode() (par morceaux au-delà de STREAM_CHUNK_SIZE)"""
+        if len(data) <= STREAM_CHUNK_SIZE:
+            # Petites données (métadonnées): les copies intermédiaires ne coûtent rien
+            return json.loads(self.decode_bytes(data))
+        decoder = StreamDecoder(self)
+        view = memoryview(data)
+        for start in range(0, len(view), STREAM_CHUNK_SIZE):
+            decoder.feed(view[start:start + STREAM_CHUNK_SIZE])
+        return decoder.finish()
+
+    def decode_stream(self, f: BinaryIO, length: int = None, checksum: Optional[int] = None,
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> Any:
+        """
+        Lit et décode des données encodées directement depuis un fichier, par morceaux
+
+        Les morceaux sont lus dans un tampon réutilisé (readinto) et transmis au décodeur
+        par memoryview: les données encodées ne sont jamais lues en entier.
+
+        Args:
+            f: Fichier ouvert en lecture binaire, positionné au début des données
+            length: Taille des données encodées (jusqu'à la fin du fichier si None)
+            checksum: CRC32 attendu des données encodées (non vérifié si None)
+            chunk_size: Taille des morceaux lus
+
+        Returns:
+            Données décodées
+
+        Raises:
+            TruncatedSaveError: Si le fichier se termine avant length octets
+            CorruptedSaveError: Si la somme de contrôle est fausse
+        """
+        decoder = StreamDecoder(self)
+        buffer = bytearray(chunk_size if length is None else min(chunk_size, max(length, 1)))
+        view = memoryview(buffer)
+        remaining = length
+        crc = 0
+        error = None
+        while remaining is None or remaining > 0:
+            count = f.readinto(view if remaining is None or remaining >= len(view) else view[:remaining])
+            if not count:
+                break
+            chunk = view[:count]
+            if checksum is not None:
+                crc = zlib.crc32(chunk, crc)
+            if remaining is not None:
+                remaining -= count
+            if error is None:
+                try:
+                    decoder.feed(chunk)
+                except (zlib.error, lzma.LZMAError) as e:
+                    # Continuer la lecture: une somme de contrôle fausse explique mieux l'erreur
+                    if checksum is None:
+                        raise
+                    error = e
+        if remaining:
+            raise TruncatedSaveError("Données de sauvegarde tronquées")
+        if checksum is not None and crc != checksum:
+            raise CorruptedSaveError("Données de sauvegarde corrompues (somme de contrôle)")
+        if error is not None:
+            raise error
+        return decoder.finish()
+
+    def header(self, meta_size: int, version: int = SINGLE_BLOCK_VERSION) -> bytes:
+        """
+        Construit l'en-tête étendu d'un fichier de sauvegarde
+
+        Args:
+            meta_size: Taille des métadonnées encodées
+            version: Organisation des données (SINGLE_BLOCK_VERSION, SECTIONED_VERSION ou CHECKSUMMED_VERSION)
+
+        Returns:
+            Signature, sentinelle et description du codec
+        """
+        flags = FLAG_OBFUSCATED if self.obfuscate else 0
+        header = (SIGNATURE + struct.pack("<I", EXTENDED_SENTINEL)
+                  + EXTENDED_HEADER.pack(version, COMPRESSIONS[self.compression][0], self.level, flags, meta_size))
+        if self.dictionary:
+            header += DICTIONARY_ID.pack(self.dictionary_id)
+        return header
+
+
+def legacy_codec(key: bytes = b"musko_tensei_rp") -> SaveCodec:
+    """Codec des sauvegardes écrites avant l'en-tête étendu (gzip niveau 9 + XOR)"""
+    return SaveCodec("gzip", 9, True, key)
+
+
+def read_header(f: BinaryIO, key: bytes = b"musko_tensei_rp") -> Tuple[SaveCodec, int, int, int]:
+    """
+    Lit l'en-tête d'un fichier de sauvegarde (ancien format ou format étendu)
+
+    Args:
+        f: Fichier ouvert en lecture binaire, positionné au début
+        key: Clé d'obfuscation
+
+    Returns:
+        (codec, taille des métadonnées, taille de l'en-tête, version: 0 pour l'ancien format)
+
+    Raises:
+        ValueError: Si le fichier n'est pas une sauvegarde valide
+        TruncatedSaveError: Si l'en-tête est incomplet
+        UnsupportedVersionError: Si la version de l'en-tête est plus récente que ce jeu
+                                 ou si son dictionnaire de compression n'est pas disponible
+    """
+    signature = f.read(4)
+    if signature != SIGNATURE:
+        raise ValueError("Format de fichier de sauvegarde invalide")
+
+    size_bytes = f.read(4)
+    if len(size_bytes) != 4:
+        raise TruncatedSaveError("En-tête de sauvegarde tronqué")
+    meta_size = struct.unpack("<I", size_bytes)[0]
+
+    if meta_size != EXTENDED_SENTINEL:
+        return legacy_codec(key), meta_size, LEGACY_HEADER_SIZE, 0
+
+    extended = f.read(EXTENDED_HEADER.size)
+    if len(extended) != EXTENDED_HEADER.size:
+        raise TruncatedSaveError("En-tête de sauvegarde tronqué")
+    version, compression_id, level, flags, meta_size = EXTENDED_HEADER.unpack(extended)
+    if version > HEADER_VERSION:
+        raise UnsupportedVersionError(f"Version d'en-tête de sauvegarde non prise en charge: {version}")
+    if compression_id not in COMPRESSION_NAMES:
+        raise ValueError(f"Compression de sauvegarde inconnue: {compression_id}")
+
+    header_size = LEGACY_HEADER_SIZE + EXTENDED_HEADER.size
+    compression = COMPRESSION_NAMES[compression_id]
+    dictionary = None
+    if compression == "zdict":
+        ident_bytes = f.read(DICTIONARY_ID.size)
+        if len(ident_bytes) != DICTIONARY_ID.size:
+            raise TruncatedSaveError("En-tête de sauvegarde tronqué")
+        header_size += DICTIONARY_ID.size
+        ident = DICTIONARY_ID.unpack(ident_bytes)[0]
+        try:
+            from .save_dictionary import dictionaries
+        except ImportError:
+            from save_dictionary import dictionaries
+        dictionary = dictionaries.get(ident)
+        if dictionary is None:
+            raise UnsupportedVersionError(f"Dictionnaire de compression non disponible: {ident:08x}")
+
+    codec = SaveCodec(compression, level, bool(flags & FLAG_OBFUSCATED), key, dictionary)
+    return codec, meta_size, header_size, version
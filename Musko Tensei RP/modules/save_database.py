@@ -0,0 +1,552 @@
+# save_database.py - Stockage des sauvegardes dans une base SQLite embarquée pour MUSKO TENSEI RP
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+
+try:
+    from .save_codecs import SaveCodec, read_header, CHECKSUMMED_VERSION, CorruptedSaveError, UnsupportedVersionError
+    from .save_sections import split_sections, join_sections
+except ImportError:
+    from save_codecs import SaveCodec, read_header, CHECKSUMMED_VERSION, CorruptedSaveError, UnsupportedVersionError
+    from save_sections import split_sections, join_sections
+
+# Base des sauvegardes, à la racine du répertoire des sauvegardes (sa présence choisit ce stockage)
+DATABASE_FILE = "saves.db"
+SCHEMA_VERSION = 1
+
+# Une ligne par sauvegarde (métadonnées en JSON clair, comme le catalogue des fichiers) et une ligne
+# par section compressée avec le codec de la sauvegarde. Le codec est enregistré sous la forme de
+# l'en-tête étendu des fichiers .mkrp: read_header le relit, dictionnaire zdict compris.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    id INTEGER PRIMARY KEY,
+    slot TEXT NOT NULL,
+    name TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    player_level INTEGER,
+    turn INTEGER,
+    game_version TEXT,
+    codec BLOB NOT NULL,
+    metadata TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    UNIQUE (slot, name)
+);
+CREATE INDEX IF NOT EXISTS saves_slot_time ON saves (slot, saved_at);
+CREATE INDEX IF NOT EXISTS saves_time ON saves (saved_at);
+CREATE INDEX IF NOT EXISTS saves_level ON saves (player_level);
+CREATE TABLE IF NOT EXISTS sections (
+    save_id INTEGER NOT NULL REFERENCES saves (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    crc INTEGER NOT NULL,
+    PRIMARY KEY (save_id, name)
+) WITHOUT ROWID;
+"""
+
+# Colonnes retournées par list()
+LIST_COLUMNS = "slot, name, saved_at, player_level, turn, metadata, size"
+
+
+class SaveDatabase:
+    """
+    Sauvegardes stockées dans une base SQLite (une ligne par sauvegarde, une par section)
+
+    Les sauvegardes sont identifiées par (slot, nom). Lister, élaguer un slot et lire
+    quelques sections sont des requêtes uniques sur des index, sans parcourir de fichiers.
+    Plusieurs sessions peuvent partager la base: les écritures sont des transactions
+    IMMEDIATE (mode WAL: les lectures ne sont pas bloquées).
+    """
+
+    def __init__(self, database_path: str, key: bytes = b"musko_tensei_rp", timeout: float = 30.0):
+        """
+        Ouvre (ou crée) la base des sauvegardes
+
+        Args:
+            database_path: Chemin du fichier de la base
+            key: Clé d'obfuscation des sections
+            timeout: Attente maximale d'une écriture d'une autre session (secondes)
+
+        Raises:
+            UnsupportedVersionError: Si la base a été créée par une version plus récente du jeu
+        """
+        self.database_path = database_path
+        self.key = key
+        self.codecs: Dict[bytes, SaveCodec] = {}
+
+        # Une connexion partagée par le thread du jeu et l'auto-sauvegarde en arrière-plan
+        self.lock = threading.RLock()
+        self.depth = 0
+        directory = os.path.dirname(database_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(database_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self.connection.close()
+            raise UnsupportedVersionError(f"Version de la base de sauvegardes non prise en charge: {version}")
+        if version < SCHEMA_VERSION:
+            with self.transaction():
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        self.connection.execute(statement)
+                self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Ferme la connexion"""
+        with self.lock:
+            self.connection.close()
+
+    def backup(self, dest_path: str) -> None:
+        """
+        Copie la base dans un autre fichier (API de sauvegarde en ligne de SQLite)
+
+        La copie est cohérente, pages du journal WAL comprises, même si une autre session écrit.
+
+        Args:
+            dest_path: Fichier de destination (remplacé s'il existe)
+        """
+        destination = sqlite3.connect(dest_path)
+        try:
+            with self.lock:
+                self.connection.backup(destination)
+        finally:
+            destination.close()
+
+    @contextmanager
+    def transaction(self):
+        """Regroupe plusieurs écritures en une seule transaction (réentrant)"""
+        with self.lock:
+            if self.depth:
+                self.depth += 1
+                try:
+                    yield
+                finally:
+                    self.depth -= 1
+                return
+
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.depth = 1
+            try:
+                yield
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            else:
+                self.connection.execute("COMMIT")
+            finally:
+                self.depth = 0
+
+    def _codec(self, header: bytes) -> SaveCodec:
+        """Codec d'une sauvegarde à partir de son en-tête enregistré"""
+        codec = self.codecs.get(header)
+        if codec is None:
+            codec = self.codecs[header] = read_header(io.BytesIO(header), self.key)[0]
+        return codec
+
+    def _free_name(self, slot: str, name: str) -> str:
+        """Premier nom libre du slot (suffixe _2, _3...), dans la transaction en cours"""
+        candidate, suffix = name, 1
+        while self.connection.execute("SELECT 1 FROM saves WHERE slot = ? AND name = ?", (slot, candidate)).fetchone():
+            suffix += 1
+            candidate = f"{name}_{suffix}"
+        return candidate
+
+    def write(self, slot: str, name: str, codec: SaveCodec, save_data: Dict[str, Any],
+              unique: bool = False, saved_at: float = None) -> str:
+        """
+        Enregistre une sauvegarde (remplace celle du même nom, sauf si unique)
+
+        Les sections sont compressées avant d'ouvrir la transaction: la base n'est
+        verrouillée que pendant les insertions.
+
+        Args:
+            slot: Nom du slot
+            name: Nom de la sauvegarde
+            codec: Codec des sections
+            save_data: Données complètes (doivent contenir "metadata")
+            unique: Ajoute un suffixe au nom s'il est déjà pris au lieu de remplacer
+            saved_at: Date de la sauvegarde (maintenant si None)
+
+        Returns:
+            Nom utilisé
+        """
+        blobs = [(section, codec.encode(value)) for section, value in split_sections(save_data).items()]
+        header = codec.header(0, CHECKSUMMED_VERSION)
+        metadata = save_data["metadata"]
+        player = save_data.get("player")
+        level = player.get("level") if isinstance(player, dict) else None
+        saved_at = time.time() if saved_at is None else saved_at
+
+        with self.transaction():
+            if unique:
+                requested, name = name, self._free_name(slot, name)
+                if name != requested:
+                    metadata = dict(metadata, save_name=name)
+            else:
+                self.connection.execute("DELETE FROM saves WHERE slot = ? AND name = ?", (slot, name))
+            cursor = self.connection.execute(
+                "INSERT INTO saves (slot, name, saved_at, player_level, turn, game_version, codec, metadata, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (slot, name, saved_at, level, metadata.get("turn"), metadata.get("game_version"), header,
+                 json.dumps(metadata, ensure_ascii=False), sum(len(blob) for _, blob in blobs))
+            )
+            self.connection.executemany(
+                "INSERT INTO sections (save_id, name, data, crc) VALUES (?, ?, ?, ?)",
+                [(cursor.lastrowid, section, blob, zlib.crc32(blob)) for section, blob in blobs]
+            )
+        return name
+
+    def _decode_section(self, codec: SaveCodec, slot: str, name: str, section: str, data: bytes, crc: int) -> Any:
+        if zlib.crc32(data) != crc:
+            raise CorruptedSaveError(f"Section {section} de {slot}/{name} corrompue (somme de contrôle)")
+        return codec.decode(data)
+
+    def read(self, slot: str, name: str) -> Dict[str, Any]:
+        """
+        Lit une sauvegarde complète
+
+        Raises:
+            ValueError: Si la sauvegarde n'existe pas
+            CorruptedSaveError: Si une section ne correspond pas à sa somme de contrôle
+        """
+        metadata, sections, _ = self.read_sections(slot, name)
+        return join_sections(metadata, sections)
+
+    def read_sections(self, slot: str, name: str,
+                      names: Iterable[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any], bool]:
+        """
+        Lit les métadonnées et certaines sections d'une sauvegarde (une seule requête)
+
+        Args:
+            slot: Nom du slot
+            name: Nom de la sauvegarde
+            names: Sections à lire (toutes si None); les sections absentes sont ignorées
+
+        Returns:
+            (métadonnées, nom de section -> valeur, le journal est une section séparée)
+
+        Raises:
+            ValueError: Si la sauvegarde n'existe pas
+            CorruptedSaveError: Si une section ne correspond pas à sa somme de contrôle
+        """
+        query = ("SELECT v.codec, v.metadata,"
+                 " EXISTS (SELECT 1 FROM sections j WHERE j.save_id = v.id AND j.name = 'journal'),"
+                 " s.name, s.data, s.crc"
+                 " FROM saves v LEFT JOIN sections s ON s.save_id = v.id")
+        params: List[Any] = []
+        if names is not None:
+            names = list(names)
+            query += f" AND s.name IN ({', '.join('?' * len(names))})"
+            params.extend(names)
+        query += " WHERE v.slot = ? AND v.name = ?"
+        params.extend((slot, name))
+
+        with self.lock:
+            rows = self.connection.execute(query, params).fetchall()
+        if not rows:
+            raise ValueError(f"Sauvegarde introuvable: {slot}/{name}")
+
+        codec = self._codec(rows[0][0])
+        sections = {
+            section: self._decode_section(codec, slot, name, section, data, crc)
+            for _, _, _, section, data, crc in rows if section is not None
+        }
+        return json.loads(rows[0][1]), sections, bool(rows[0][2])
+
+    def exists(self, slot: str, name: str) -> bool:
+        """Indique si une sauvegarde existe"""
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM saves WHERE slot = ? AND name = ?", (slot, name)).fetchone() is not None
+
+    def info(self, slot: str, name: str) -> Optional[Dict[str, Any]]:
+        """Ligne d'une sauvegarde (voir list), None si elle n'existe pas"""
+        with self.lock:
+            row = self.connection.execute(f"SELECT {LIST_COLUMNS} FROM saves WHERE slot = ? AND name = ?", (slot, name)).fetchone()
+        return self._row(row) if row else None
+
+    @staticmethod
+    def _row(row: tuple) -> Dict[str, Any]:
+        slot, name, saved_at, level, turn, metadata, size = row
+        return {"slot": slot, "name": name, "saved_at": saved_at, "player_level": level,
+                "turn": turn, "metadata": json.loads(metadata), "size": size}
+
+    def list(self, slot: str = None, min_level: int = None) -> List[Dict[str, Any]]:
+        """
+        Liste les sauvegardes, les plus récentes en premier (sans lire les sections)
+
+        Args:
+            slot: Slot à lister (tous si None)
+            min_level: Niveau minimum du personnage
+
+        Returns:
+            Lignes: slot, name, saved_at, player_level, turn, metadata, size
+        """
+        conditions, params = [], []
+        if slot is not None:
+            conditions.append("slot = ?")
+            params.append(slot)
+        if min_level is not None:
+            conditions.append("player_level >= ?")
+            params.append(min_level)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock:
+            rows = self.connection.execute(f"SELECT {LIST_COLUMNS} FROM saves{where} ORDER BY saved_at DESC, id DESC", params).fetchall()
+        return [self._row(row) for row in rows]
+
+    def slots(self) -> List[str]:
+        """Noms des slots qui contiennent au moins une sauvegarde"""
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT DISTINCT slot FROM saves ORDER BY slot")]
+
+    def count(self) -> int:
+        """Nombre total de sauvegardes"""
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM saves").fetchone()[0]
+
+    def delete(self, slot: str, name: str) -> bool:
+        """Supprime une sauvegarde et ses sections; retourne False si elle n'existait pas"""
+        with self.transaction():
+            return self.connection.execute("DELETE FROM saves WHERE slot = ? AND name = ?", (slot, name)).rowcount > 0
+
+    def prune(self, slot: str, limit: int) -> int:
+        """
+        Garde les limit sauvegardes les plus récentes d'un slot (une seule requête)
+
+        Returns:
+            Nombre de sauvegardes supprimées
+        """
+        with self.transaction():
+            return self.connection.execute(
+                "DELETE FROM saves WHERE id IN (SELECT id FROM saves WHERE slot = ?"
+                " ORDER BY saved_at DESC, id DESC LIMIT -1 OFFSET ?)", (slot, max(0, limit))
+            ).rowcount
+
+    def verify(self, deep: bool = False) -> Dict[str, Any]:
+        """
+        Vérifie la base (structure SQLite) et la somme de contrôle de chaque section
+
+        Args:
+            deep: Décode aussi chaque section
+
+        Returns:
+            Bilan au format de save_fsck.fsck_tree (problèmes: slot, name, status, error)
+        """
+        summary = {"total": 0, "ok": 0, "corrupt": 0, "problems": [], "bytes": 0}
+        start = time.perf_counter()
+        with self.lock:
+            integrity = self.connection.execute("PRAGMA quick_check").fetchone()[0]
+            if integrity != "ok":
+                summary["problems"].append({"slot": None, "name": None, "status": "corrupt", "error": integrity})
+            cursor = self.connection.execute(
+                "SELECT v.id, v.slot, v.name, v.codec, s.name, s.data, s.crc FROM saves v"
+                " LEFT JOIN sections s ON s.save_id = v.id ORDER BY v.id"
+            )
+            current, errors = None, []
+            for save_id, slot, name, header, section, data, crc in cursor:
+                if current is None or save_id != current[0]:
+                    if current:
+                        self._record(summary, current, errors)
+                    current, errors = (save_id, slot, name), []
+                if section is None:
+                    errors.append("aucune section")
+                    continue
+                summary["bytes"] += len(data)
+                try:
+                    if zlib.crc32(data) != crc:
+                        raise CorruptedSaveError(f"Section {section}: somme de contrôle incorrecte")
+                    if deep:
+                        self._codec(header).decode(data)
+                except Exception as e:
+                    errors.append(str(e))
+            if current:
+                self._record(summary, current, errors)
+
+        summary["duration"] = time.perf_counter() - start
+        summary["mb_per_second"] = summary["bytes"] / 1024 / 1024 / summary["duration"] if summary["duration"] else 0.0
+        return summary
+
+    @staticmethod
+    def _record(summary: Dict[str, Any], save: tuple, errors: List[str]) -> None:
+        summary["total"] += 1
+        if errors:
+            summary["corrupt"] += 1
+            summary["problems"].append({"slot": save[1], "name": save[2], "status": "corrupt", "error": "; ".join(errors)})
+        else:
+            summary["ok"] += 1
+
+
+def database_path(save_directory: str) -> str:
+    """Chemin de la base des sauvegardes d'un répertoire de sauvegardes"""
+    return os.path.join(save_directory, DATABASE_FILE)
+
+
+def migrate_storage(save_directory: str, target: str, keep: bool = False,
+                    progress: Callable[[int, int, Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    """
+    Convertit les sauvegardes d'un répertoire entre les fichiers .mkrp et la base SQLite
+
+    Vers "sqlite", chaque chaîne (sauvegarde complète et deltas) devient une sauvegarde
+    complète de la base, datée de son dernier fichier. Vers "files", chaque ligne devient un
+    fichier .mkrp daté de la sauvegarde, puis la base est supprimée (ou renommée en
+    saves_<date>.db avec keep, pour que le jeu n'ouvre plus le stockage SQLite). Les
+    sauvegardes de secours (saves/backup) ne sont pas concernées.
+
+    Args:
+        save_directory: Répertoire racine des sauvegardes
+        target: Stockage cible ("sqlite" ou "files")
+        keep: Conserve la source après la conversion (fichiers, ou base renommée)
+        progress: Fonction appelée après chaque sauvegarde (traitées, total, résultat)
+
+    Returns:
+        Bilan: sauvegardes converties, erreurs, durée, débit (et kept_database, chemin
+        de la base conservée)
+    """
+    try:
+        from .save_manager import SaveManager
+        from .save_catalog import SaveCatalog
+    except ImportError:
+        from save_manager import SaveManager
+        from save_catalog import SaveCatalog
+
+    if target not in ("sqlite", "files"):
+        raise ValueError(f"Stockage inconnu: {target}")
+
+    manager = SaveManager(None, save_directory=save_directory)
+    manager.set_storage("files")
+    key = manager.encryption_key.encode('utf-8')
+    summary = {"total": 0, "converted": 0, "error": 0, "errors": []}
+    start = time.perf_counter()
+
+    if target == "sqlite":
+        # Sauvegardes de base des slots, avec le dernier fichier de leur chaîne
+        chains = []
+        for rel_path in manager._list_save_files():
+            slot, file_name = os.path.split(rel_path)
+            if not slot or os.path.dirname(slot) or manager._split_delta_name(file_name)[1]:
+                continue
+            base_path = os.path.join(save_directory, rel_path)
+            chains.append((slot, base_path, [base_path] + [path for _, path in manager._list_deltas(base_path)]))
+        summary["total"] = len(chains)
+
+        database = SaveDatabase(database_path(save_directory), key)
+        try:
+            with database.transaction():
+                for done, (slot, base_path, files) in enumerate(chains, 1):
+                    result = {"path": files[-1], "status": "converted"}
+                    try:
+                        save_data, _, _ = manager._load_chain(files[-1])
+                        if not save_data or "metadata" not in save_data:
+                            raise ValueError("Données de sauvegarde corrompues ou invalides")
+                        name = os.path.basename(base_path)[:-len('.mkrp')]
+                        database.write(slot, name, manager.codec, save_data, saved_at=os.path.getmtime(files[-1]))
+                    except Exception as e:
+                        result.update(status="error", error=str(e))
+                    summary[result["status"]] += 1
+                    if result["status"] == "error":
+                        summary["errors"].append(result)
+                    if progress:
+                        progress(done, len(chains), result)
+        finally:
+            database.close()
+
+        if not keep:
+            failed = {result["path"] for result in summary["errors"]}
+            for _, _, files in chains:
+                if files[-1] not in failed:
+                    for path in files:
+                        os.remove(path)
+    else:
+        path = database_path(save_directory)
+        if not os.path.exists(path):
+            raise ValueError(f"Aucune base de sauvegardes dans {save_directory}")
+        database = SaveDatabase(path, key)
+        try:
+            rows = database.list()
+            summary["total"] = len(rows)
+            for done, row in enumerate(rows, 1):
+                save_path = os.path.join(save_directory, row["slot"], f"{row['name']}.mkrp")
+                result = {"path": save_path, "status": "converted"}
+                try:
+                    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                    manager._write_save_file(save_path, database.read(row["slot"], row["name"]), catalog=False)
+                    os.utime(save_path, (row["saved_at"], row["saved_at"]))
+                except Exception as e:
+                    result.update(status="error", error=str(e))
+                summary[result["status"]] += 1
+                if result["status"] == "error":
+                    summary["errors"].append(result)
+                if progress:
+                    progress(done, len(rows), result)
+        finally:
+            database.close()
+
+        # La base n'est retirée que si toutes les sauvegardes sont redevenues des fichiers. Conservée,
+        # elle est renommée: saves.db ouvrirait à nouveau le stockage SQLite au prochain lancement
+        if not summary["error"]:
+            kept_path = os.path.join(save_directory, f"saves_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
+            for suffix in ("", "-wal", "-shm"):
+                if not os.path.exists(path + suffix):
+                    continue
+                if keep:
+                    os.replace(path + suffix, kept_path + suffix)
+                else:
+                    os.remove(path + suffix)
+            if keep:
+                summary["kept_database"] = kept_path
+
+    # Les fichiers des slots ont changé: le catalogue doit les relire
+    SaveCatalog(save_directory, lambda path: {}).invalidate()
+
+    summary["duration"] = time.perf_counter() - start
+    summary["saves_per_second"] = summary["total"] / summary["duration"] if summary["duration"] else 0.0
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Conversion du stockage en ligne de commande
+
+    Utilisation: python save_database.py [dossier saves] --to sqlite|files [--keep]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convertit le stockage des sauvegardes MUSKO TENSEI RP (fichiers .mkrp ou SQLite)")
+    parser.add_argument("save_directory", nargs="?", default="saves", help="Répertoire racine des sauvegardes")
+    parser.add_argument("--to", dest="target", choices=("sqlite", "files"), required=True, help="Stockage cible")
+    parser.add_argument("--keep", action="store_true", help="Conserve les fichiers d'origine (ou la base, renommée en saves_<date>.db)")
+    args = parser.parse_args(argv)
+
+    def show_progress(done: int, total: int, result: Dict[str, Any]) -> None:
+        if result["status"] == "error":
+            print(f"\n❌ {result['path']}: {result['error']}")
+        if done == total or done % 500 == 0:
+            print(f"\r🔄 {done}/{total} sauvegardes converties", end="", flush=True)
+
+    try:
+        summary = migrate_storage(args.save_directory, args.target, args.keep, show_progress)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ {e}")
+        return 1
+    print()
+    print(f"{'✅' if not summary['error'] else '⚠️'} {summary['converted']} converties, {summary['error']} en erreur "
+          f"sur {summary['total']} sauvegardes (stockage: {args.target})")
+    print(f"   {summary['duration']:.2f} s, {summary['saves_per_second']:.0f} sauvegardes/s")
+    if summary.get("kept_database"):
+        print(f"   Base d'origine conservée: {summary['kept_database']}")
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
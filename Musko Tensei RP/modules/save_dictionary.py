@@ -0,0 +1,226 @@
+# save_dictionary.py - Dictionnaires de compression (zlib zdict) entraînés sur des sauvegardes pour MUSKO TENSEI RP
+import heapq
+import os
+import sys
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# Une petite sauvegarde compressée seule repart de zéro: les clés JSON ("player", "relationships",
+# "affinity"...) et les textes récurrents sont écrits en clair avant de pouvoir être référencés.
+# Un dictionnaire préchargé (zdict) contient ces fragments: le compresseur les référence dès le
+# premier octet. Le dictionnaire est identifié dans l'en-tête par son CRC32: un dictionnaire
+# livré ne doit jamais être modifié ni supprimé, sinon les sauvegardes qui l'utilisent deviennent illisibles.
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DICTIONARY_DIRECTORY = os.path.join(project_path, "data", "save_dictionaries")
+DICTIONARY_EXTENSION = ".zdict"
+# Fichier texte contenant l'identifiant (hexadécimal) du dictionnaire des nouvelles sauvegardes
+DEFAULT_FILE = "default"
+
+# zlib ne référence que les 32 derniers Ko: un dictionnaire plus grand serait inutile
+MAX_DICTIONARY_SIZE = 32 * 1024
+DEFAULT_DICTIONARY_SIZE = 16 * 1024
+
+# Entraînement: segments candidats de SEGMENT_SIZE octets, notés par les k-grammes qu'ils couvrent
+SEGMENT_SIZE = 64
+KMER_SIZE = 8
+
+
+def dictionary_id(dictionary: bytes) -> int:
+    """Identifiant d'un dictionnaire (CRC32 de son contenu, enregistré dans l'en-tête des sauvegardes)"""
+    return zlib.crc32(dictionary)
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = DEFAULT_DICTIONARY_SIZE,
+                     segment_size: int = SEGMENT_SIZE, k: int = KMER_SIZE) -> bytes:
+    """
+    Construit un dictionnaire à partir d'exemples (méthode de couverture des k-grammes)
+
+    Chaque k-gramme est noté par le nombre d'exemples qui le contiennent. Les segments des
+    exemples qui couvrent le plus de k-grammes fréquents, pas encore couverts, sont choisis
+    un à un jusqu'à la taille voulue. Les segments les plus utiles sont placés à la fin du
+    dictionnaire: zlib code les références proches sur moins de bits.
+
+    Args:
+        samples: Exemples (JSON des sections de sauvegardes réelles)
+        size: Taille maximale du dictionnaire (au plus MAX_DICTIONARY_SIZE)
+        segment_size: Taille des segments candidats
+        k: Taille des k-grammes
+
+    Returns:
+        Dictionnaire (vide si les exemples n'ont rien en commun)
+    """
+    size = min(size, MAX_DICTIONARY_SIZE)
+    samples = [sample for sample in samples if len(sample) >= k]
+
+    # Fréquence documentaire: un fragment répété dans un seul exemple n'aide pas les autres sauvegardes
+    frequencies = Counter()
+    for sample in samples:
+        frequencies.update({sample[i:i + k] for i in range(len(sample) - k + 1)})
+
+    def kmers(segment: bytes) -> set:
+        return {segment[i:i + k] for i in range(len(segment) - k + 1)}
+
+    def score(segment: bytes) -> int:
+        return sum(frequencies[kmer] for kmer in kmers(segment) if frequencies[kmer] > 1)
+
+    # File de priorité des segments candidats (chevauchement d'un quart de segment)
+    step = max(1, segment_size // 4)
+    candidates = []
+    for sample in samples:
+        for start in range(0, max(1, len(sample) - segment_size + 1), step):
+            segment = sample[start:start + segment_size]
+            candidates.append((-score(segment), len(candidates), segment))
+    heapq.heapify(candidates)
+
+    chosen: List[bytes] = []
+    total = 0
+    while candidates and total < size:
+        stale, index, segment = heapq.heappop(candidates)
+        if stale >= 0:
+            break
+        # Les notes sont recalculées à la sortie de la file: les k-grammes déjà couverts ne comptent plus
+        current = score(segment)
+        if current <= 0:
+            continue
+        if candidates and current < -candidates[0][0]:
+            heapq.heappush(candidates, (-current, index, segment))
+            continue
+        segment = segment[:size - total]
+        chosen.append(segment)
+        total += len(segment)
+        for kmer in kmers(segment):
+            frequencies[kmer] = 0
+
+    # Le premier segment choisi (le plus utile) termine le dictionnaire
+    return b"".join(reversed(chosen))
+
+
+class DictionaryRegistry:
+    """Dictionnaires de compression disponibles, chargés à la demande depuis le dossier des dictionnaires"""
+
+    def __init__(self, directory: str = DICTIONARY_DIRECTORY):
+        self.directory = directory
+        self.loaded: Optional[Dict[int, bytes]] = None
+
+    def _load(self) -> Dict[int, bytes]:
+        if self.loaded is None:
+            loaded = {}
+            if os.path.isdir(self.directory):
+                for file_name in sorted(os.listdir(self.directory)):
+                    if file_name.endswith(DICTIONARY_EXTENSION):
+                        with open(os.path.join(self.directory, file_name), 'rb') as f:
+                            dictionary = f.read()
+                        loaded[dictionary_id(dictionary)] = dictionary
+            self.loaded = loaded
+        return self.loaded
+
+    def get(self, ident: int) -> Optional[bytes]:
+        """Dictionnaire correspondant à un identifiant d'en-tête (None s'il n'est pas disponible)"""
+        return self._load().get(ident)
+
+    def register(self, dictionary: bytes) -> int:
+        """Rend un dictionnaire disponible pour la lecture sans l'écrire dans le dossier; retourne son identifiant"""
+        ident = dictionary_id(dictionary)
+        self._load()[ident] = dictionary
+        return ident
+
+    def default(self) -> Optional[bytes]:
+        """Dictionnaire des nouvelles sauvegardes (None si aucun n'est désigné ou disponible)"""
+        try:
+            with open(os.path.join(self.directory, DEFAULT_FILE), 'r', encoding='utf-8') as f:
+                ident = int(f.read().strip(), 16)
+        except (OSError, ValueError):
+            return None
+        return self.get(ident)
+
+    def add(self, dictionary: bytes, make_default: bool = True) -> str:
+        """
+        Enregistre un dictionnaire dans le dossier (nommé d'après son identifiant)
+
+        Args:
+            dictionary: Dictionnaire entraîné
+            make_default: Utilise ce dictionnaire pour les nouvelles sauvegardes
+
+        Returns:
+            Chemin du fichier écrit
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        ident = f"{dictionary_id(dictionary):08x}"
+        path = os.path.join(self.directory, f"{ident}{DICTIONARY_EXTENSION}")
+        with open(path, 'wb') as f:
+            f.write(dictionary)
+        if make_default:
+            with open(os.path.join(self.directory, DEFAULT_FILE), 'w', encoding='utf-8') as f:
+                f.write(ident + "\n")
+        self.register(dictionary)
+        return path
+
+
+# Registre utilisé par les codecs de sauvegarde
+dictionaries = DictionaryRegistry()
+
+
+def collect_samples(save_directory: str) -> List[bytes]:
+    """
+    Extrait les exemples d'entraînement d'une arborescence de sauvegardes
+
+    Chaque section (et les métadonnées) est compressée séparément: les exemples sont
+    le JSON de chaque section, tel que le codec le compresse.
+    """
+    try:
+        from .save_manager import SaveManager
+        from .save_sections import split_sections
+        from .save_codecs import iter_json
+    except ImportError:
+        from save_manager import SaveManager
+        from save_sections import split_sections
+        from save_codecs import iter_json
+
+    manager = SaveManager(None, save_directory=save_directory)
+    samples = []
+    for root, _, files in os.walk(save_directory):
+        for file_name in sorted(files):
+            if not file_name.endswith(".mkrp") or SaveManager._split_delta_name(file_name)[1]:
+                continue
+            try:
+                save_data = manager._read_save_file(os.path.join(root, file_name))
+            except (OSError, ValueError):
+                continue
+            if not save_data:
+                continue
+            values = [save_data.get("metadata", {})] + list(split_sections(save_data).values())
+            samples.extend("".join(iter_json(value)).encode("utf-8") for value in values)
+    return samples
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entraînement d'un dictionnaire en ligne de commande
+
+    Utilisation: python save_dictionary.py [dossier saves] [--size OCTETS] [--output DOSSIER]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Entraîne un dictionnaire de compression sur des sauvegardes MUSKO TENSEI RP")
+    parser.add_argument("save_directory", nargs="?", default="saves", help="Répertoire racine des sauvegardes d'exemple")
+    parser.add_argument("--size", type=int, default=DEFAULT_DICTIONARY_SIZE, help="Taille du dictionnaire en octets")
+    parser.add_argument("--output", default=DICTIONARY_DIRECTORY, help="Dossier des dictionnaires")
+    args = parser.parse_args(argv)
+
+    samples = collect_samples(args.save_directory)
+    if not samples:
+        print(f"❌ Aucune sauvegarde lisible dans {args.save_directory}")
+        return 1
+    dictionary = train_dictionary(samples, args.size)
+    if not dictionary:
+        print("❌ Les sauvegardes n'ont aucun fragment en commun")
+        return 1
+    path = DictionaryRegistry(args.output).add(dictionary)
+    print(f"✅ Dictionnaire de {len(dictionary)} octets ({len(samples)} exemples): {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# save_fsck.py - Vérification de l'intégrité d'une arborescence de sauvegardes pour MUSKO TENSEI RP
+import os
+import sys
+import time
+import zlib
+from typing import Dict, Any, Callable, List, Tuple
+
+try:
+    from .save_codecs import read_header, SECTIONED_VERSION, CHECKSUMMED_VERSION, TruncatedSaveError, CorruptedSaveError, UnsupportedVersionError
+    from .save_sections import read_toc, read_section_blob
+except ImportError:
+    from save_codecs import read_header, SECTIONED_VERSION, CHECKSUMMED_VERSION, TruncatedSaveError, CorruptedSaveError, UnsupportedVersionError
+    from save_sections import read_toc, read_section_blob
+
+# États possibles d'un fichier vérifié
+STATUSES = ("ok", "corrupt", "truncated", "unknown_version", "invalid", "error")
+
+
+def check_file(task: Tuple[str, bytes, bool]) -> Dict[str, Any]:
+    """
+    Vérifie un fichier de sauvegarde (processus de travail de fsck_tree)
+
+    Les sauvegardes v3 sont vérifiées par leurs sommes de contrôle CRC32, sans
+    décompression (sauf en mode approfondi). Les anciens formats n'ont pas de somme
+    de contrôle: ils sont entièrement décodés.
+
+    Args:
+        task: (chemin du fichier, clé d'obfuscation, décodage complet même avec sommes de contrôle)
+
+    Returns:
+        Résultat: chemin, état (voir STATUSES), version, octets lus, message d'erreur éventuel
+    """
+    save_path, key, deep = task
+    result = {"path": save_path, "status": "ok", "version": None, "checksummed": False, "bytes": 0}
+    try:
+        result["bytes"] = file_size = os.path.getsize(save_path)
+        with open(save_path, 'rb') as f:
+            codec, meta_size, _, version = read_header(f, key)
+            result["version"] = version
+            result["checksummed"] = version >= CHECKSUMMED_VERSION
+            encoded_metadata = f.read(meta_size)
+            if len(encoded_metadata) != meta_size:
+                raise TruncatedSaveError("Métadonnées tronquées")
+
+            if version >= SECTIONED_VERSION:
+                toc, data_start = read_toc(f, version, encoded_metadata)
+                if not result["checksummed"] or deep:
+                    codec.decode(encoded_metadata)
+
+                data_end = data_start
+                for name in sorted(toc, key=lambda section: toc[section][0]):
+                    blob = read_section_blob(f, name, toc[name])
+                    if not result["checksummed"] or deep:
+                        codec.decode(blob)
+                    data_end = max(data_end, toc[name][0] + toc[name][1])
+                if file_size > data_end:
+                    raise CorruptedSaveError(f"{file_size - data_end} octets inattendus après la dernière section")
+            else:
+                # Un seul bloc sans somme de contrôle: seul le décodage complet le vérifie
+                codec.decode(encoded_metadata)
+                data = f.read()
+                if not data:
+                    raise TruncatedSaveError("Données de la sauvegarde absentes")
+                codec.decode(data)
+    except TruncatedSaveError as e:
+        result["status"] = "truncated"
+        result["error"] = str(e)
+    except UnsupportedVersionError as e:
+        result["status"] = "unknown_version"
+        result["error"] = str(e)
+    except (CorruptedSaveError, zlib.error, EOFError, UnicodeDecodeError) as e:
+        result["status"] = "corrupt"
+        result["error"] = str(e)
+    except ValueError as e:
+        # Signature absente, table des matières illisible, JSON invalide, compression inconnue
+        result["status"] = "corrupt" if result["version"] is not None else "invalid"
+        result["error"] = str(e)
+    except Exception as e:
+        # lzma.LZMAError, erreurs d'entrée/sortie...
+        result["status"] = "corrupt" if result["version"] is not None else "error"
+        result["error"] = str(e)
+    return result
+
+
+def find_save_files(save_directory: str) -> List[str]:
+    """Liste tous les fichiers de sauvegarde (complets et deltas) d'une arborescence"""
+    paths = []
+    for root, _, files in os.walk(save_directory):
+        for file_name in sorted(files):
+            if file_name.endswith(".mkrp"):
+                paths.append(os.path.join(root, file_name))
+    return paths
+
+
+def fsck_tree(save_directory: str, workers: int = None, deep: bool = False,
+              key: bytes = b"musko_tensei_rp",
+              progress: Callable[[int, int, Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    """
+    Vérifie toutes les sauvegardes d'une arborescence avec un groupe de processus
+
+    Args:
+        save_directory: Répertoire racine des sauvegardes
+        workers: Nombre de processus (nombre de processeurs si None, 1 = sans processus fils)
+        deep: Décode aussi les sauvegardes protégées par des sommes de contrôle
+        key: Clé d'obfuscation des sauvegardes
+        progress: Fonction appelée après chaque fichier (traités, total, résultat)
+
+    Returns:
+        Bilan: nombre de fichiers par état, problèmes détectés, durée, débit
+    """
+    tasks = [(path, key, deep) for path in find_save_files(save_directory)]
+    summary = {status: 0 for status in STATUSES}
+    summary.update({"total": len(tasks), "checksummed": 0, "problems": [], "bytes": 0})
+
+    start = time.perf_counter()
+    if workers == 1 or len(tasks) < 2:
+        results = map(check_file, tasks)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(check_file, tasks, chunksize=max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 8)))
+
+    try:
+        for done, result in enumerate(results, 1):
+            summary[result["status"]] += 1
+            summary["bytes"] += result["bytes"]
+            if result["checksummed"]:
+                summary["checksummed"] += 1
+            if result["status"] != "ok":
+                summary["problems"].append(result)
+            if progress:
+                progress(done, len(tasks), result)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    summary["problems"].sort(key=lambda problem: problem["path"])
+    summary["duration"] = time.perf_counter() - start
+    summary["files_per_second"] = summary["total"] / summary["duration"] if summary["duration"] else 0.0
+    summary["mb_per_second"] = summary["bytes"] / 1024 / 1024 / summary["duration"] if summary["duration"] else 0.0
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Vérification en ligne de commande
+
+    Utilisation: python save_fsck.py [dossier saves] [--deep] [--workers N]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vérifie l'intégrité des sauvegardes MUSKO TENSEI RP")
+    parser.add_argument("save_directory", nargs="?", default="saves", help="Répertoire racine des sauvegardes")
+    parser.add_argument("--deep", action="store_true", help="Décode aussi les sauvegardes protégées par des sommes de contrôle")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut: nombre de processeurs)")
+    args = parser.parse_args(argv)
+
+    labels = {
+        "corrupt": "corrompue",
+        "truncated": "tronquée",
+        "unknown_version": "version inconnue",
+        "invalid": "pas une sauvegarde",
+        "error": "illisible"
+    }
+
+    def show_progress(done: int, total: int, result: Dict[str, Any]) -> None:
+        if result["status"] != "ok":
+            print(f"\n❌ {result['path']}: {labels[result['status']]} ({result['error']})")
+        if done == total or done % 200 == 0:
+            print(f"\r🔄 {done}/{total} fichiers vérifiés", end="", flush=True)
+
+    summary = fsck_tree(args.save_directory, args.workers, args.deep, progress=show_progress)
+    print()
+    problems = len(summary["problems"])
+    print(f"{'✅' if not problems else '⚠️'} {summary['ok']} intactes, {summary['corrupt']} corrompues, "
+          f"{summary['truncated']} tronquées, {summary['unknown_version']} de version inconnue, "
+          f"{summary['invalid'] + summary['error']} illisibles sur {summary['total']} fichiers "
+          f"({summary['checksummed']} avec sommes de contrôle)")
+    print(f"   {summary['duration']:.2f} s, {summary['files_per_second']:.0f} fichiers/s, "
+          f"{summary['mb_per_second']:.1f} Mo/s")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,70 @@
 # save_manager.py
-import json
 import os
 import time
-import gzip
-import base64
+import re
+import hashlib
+import threading
 import shutil
-import pickle
+import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    from .save_codecs import SaveCodec, xor_bytes, read_header, iter_json
+    from .autosave import AutoSaveWorker
+    from .autosave_scheduler import AutoSaveScheduler
+    from .save_catalog import SaveCatalog
+    from .save_codecs import SECTIONED_VERSION, CHECKSUMMED_VERSION
+    from .save_sections import split_sections, join_sections, select_sections, encode_sections, read_toc, read_sections
+    from .save_migrations import migrations, CURRENT_SAVE_VERSION
+    from .backup_store import BackupStore
+    from .save_fsck import fsck_tree
+    from .save_dictionary import dictionaries
+    from .slot_lock import SlotLocks
+    from .save_database import SaveDatabase, database_path, DATABASE_FILE
+    from .save_retention import SaveRetention
+    from .game_state import freeze, thaw
+    from .state_timeline import StateTimeline
+except ImportError:
+    from save_codecs import SaveCodec, xor_bytes, read_header, iter_json
+    from autosave import AutoSaveWorker
+    from autosave_scheduler import AutoSaveScheduler
+    from save_catalog import SaveCatalog
+    from save_codecs import SECTIONED_VERSION, CHECKSUMMED_VERSION
+    from save_sections import split_sections, join_sections, select_sections, encode_sections, read_toc, read_sections
+    from save_migrations import migrations, CURRENT_SAVE_VERSION
+    from backup_store import BackupStore
+    from save_fsck import fsck_tree
+    from save_dictionary import dictionaries
+    from slot_lock import SlotLocks
+    from save_database import SaveDatabase, database_path, DATABASE_FILE
+    from save_retention import SaveRetention
+    from game_state import freeze, thaw
+    from state_timeline import StateTimeline
+
+# Nombre de fichiers lus à l'avance lors de l'écriture d'une archive d'exportation
+ARCHIVE_BATCH_SIZE = 64
+
 class SaveManager:
-    def __init__(self, game_instance=None):
+    # Sections toujours réécrites dans un delta (elles changent à chaque sauvegarde)
+    DELTA_VOLATILE_SECTIONS = ("metadata", "save_timestamp", "game_version")
+    
+    # Nom des fichiers delta: <sauvegarde de base>.delta<numéro>.mkrp
+    DELTA_NAME_PATTERN = re.compile(r"^(?P<base>.+)\.delta(?P<sequence>\d+)\.mkrp$")
+    
+    def __init__(self, game_instance=None, save_directory: str = "saves"):
         """
         Initialise le gestionnaire de sauvegarde
         
         Args:
             game_instance: Instance du jeu principal (MuskoTenseiRP)
+            save_directory: Répertoire racine des sauvegardes
         """
         self.game = game_instance
-        self.save_directory = "saves"
+        self.save_directory = save_directory
         self.auto_save_directory = os.path.join(self.save_directory, "auto")
         self.quick_save_path = os.path.join(self.save_directory, "quicksave")
         self.max_auto_saves = 5
@@ -28,16 +73,69 @@ class SaveManager:
         # Cryptage simple (pour obfusquer légèrement les sauvegardes)
         self.encryption_key = "musko_tensei_rp"
         
+        # Codec des nouvelles sauvegardes (les anciennes sont lues avec le codec de leur en-tête):
+        # dictionnaire préchargé livré avec le jeu (petites sauvegardes bien plus compactes), sinon zlib
+        self.codec = self._default_codec()
+        
+        # Format v2: sections compressées séparément derrière une table des matières,
+        # lisibles une à une (load_sections) sans décompresser toute la sauvegarde
+        self.sectioned_saves = True
+        
+        # Sauvegardes incrémentales: seules les sections modifiées depuis la dernière sauvegarde
+        # complète sont écrites, jusqu'à max_deltas fichiers ou max_delta_bytes octets
+        self.delta_saves = False
+        self.max_deltas = 10
+        self.max_delta_bytes = 512 * 1024
+        
+        # Chaîne en cours de chaque slot: slot -> fichier de base, numéro et taille cumulée des deltas, empreintes
+        self.delta_chains = {}
+        
+        # Les écritures peuvent venir du thread du jeu ou de l'auto-sauvegarde en arrière-plan
+        self.save_lock = threading.RLock()
+        self.autosave_worker = None
+        
+        # Dernière partie monotone attribuée à un nom horodaté (voir _unique_save_name)
+        self.last_name_ns = 0
+        
+        # Plusieurs processus peuvent partager le répertoire des sauvegardes: verrou par slot
+        # pendant les changements de ses fichiers, fsync des répertoires regroupés en fin d'opération
+        self.slot_locks = SlotLocks(self.save_directory)
+        self.batch_depth = 0
+        self.pending_directory_syncs = set()
+        
+        # Rétention des mémoires de l'IA et de l'historique narratif dans les données écrites
+        # (limites, fenêtres d'âge, résumés): la taille des sauvegardes ne suit plus le temps de jeu
+        self.retention = SaveRetention()
+        self.last_retention_report = {}
+        
+        # Instantanés en mémoire des derniers tours: sauvegarde rapide et retour en arrière
+        self.timeline = StateTimeline(max_turns=50)
+        
+        # Quand écrire les auto-sauvegardes (temps de jeu, actions, événements), écrites en arrière-plan
+        self.autosave_scheduler = AutoSaveScheduler(
+            lambda reasons: self.auto_save(background=True), self.state_fingerprint, self._game_minutes
+        )
+        
         # S'assurer que les répertoires existent
         self._ensure_directories()
         
+        # Index des sauvegardes: lister et élaguer sans ouvrir chaque fichier
+        self.catalog = SaveCatalog(self.save_directory, self._get_save_info)
+        
+        # Stockage: un fichier .mkrp par sauvegarde, ou une base SQLite si saves/saves.db existe
+        # (créée par set_storage ou l'outil de conversion save_database.py)
+        self.storage = "files"
+        self.database = None
+        if os.path.exists(database_path(self.save_directory)):
+            self.set_storage("sqlite")
+        
         # Métadonnées de la sauvegarde actuelle
         self.current_save_metadata = {
             "save_name": None,
             "save_slot": None,
             "last_save_time": None,
             "play_time": 0,  # En secondes
-            "game_version": "1.0.0"
+            "game_version": CURRENT_SAVE_VERSION
         }
         
         # Compteur de temps de jeu
@@ -63,6 +161,11 @@ class SaveManager:
         """
         Récupère toutes les données à sauvegarder
         
+        Les données retournées sont un instantané figé (game_state.freeze), cohérent et
+        jamais modifié par le jeu: il peut être écrit depuis un autre thread. Les parties
+        de l'état suivies (TrackedDict/TrackedList) qui n'ont pas changé depuis l'instantané
+        précédent sont partagées au lieu d'être copiées.
+        
         Returns:
             Dictionnaire contenant toutes les données de sauvegarde
         """
@@ -75,14 +178,15 @@ class SaveManager:
         # Structure de base des données de sauvegarde
         save_data = {
             "metadata": self.current_save_metadata.copy(),
-            "player": self.game.player.copy() if hasattr(self.game, "player") else {},
+            "player": getattr(self.game, "player", {}),
             "world_state": {
                 "current_location": getattr(self.game, "current_location", ""),
                 "discovered_locations": getattr(self.game, "discovered_locations", []),
                 "time_of_day": getattr(self.game, "time_of_day", "day"),
                 "day_count": getattr(self.game, "day_count", 1),
                 "season": getattr(self.game, "season", "spring"),
-                "weather": getattr(self.game, "weather", "clear")
+                "weather": getattr(self.game, "weather", "clear"),
+                "game_time": getattr(self.game, "game_time", {})
             },
             "quests": {
                 "active_quests": getattr(self.game, "active_quests", []),
@@ -111,12 +215,15 @@ class SaveManager:
             "game_version": self.current_save_metadata["game_version"]
         }
         
+        # Nombre de tours joués: point de départ du rejeu du journal des actions
+        save_data["metadata"]["turn"] = getattr(self.game, "turn_count", 0)
+        
         # Ajouter des données spécifiques au jeu si nécessaire
         if hasattr(self.game, "get_additional_save_data"):
             additional_data = self.game.get_additional_save_data()
             save_data.update(additional_data)
         
-        return save_data
+        return {key: freeze(value) for key, value in save_data.items()}
     
     def _get_ai_memory(self) -> Dict[str, Any]:
         """Récupère les données de mémoire de l'IA qui doivent être sauvegardées"""
@@ -126,8 +233,9 @@ class SaveManager:
             ai_manager = self.game.ai_manager
             
             # Sauvegarder uniquement les informations essentielles de l'IA
+            # (les listes sont limitées à l'écriture par self.retention)
             ai_memory = {
-                "conversation_history": getattr(ai_manager, "conversation_history", [])[-20:],  # Limiter à 20 entrées
+                "conversation_history": getattr(ai_manager, "conversation_history", []),
                 "memory_by_character": getattr(ai_manager, "memory_by_character", {}),
                 "world_state_memory": getattr(ai_manager, "world_state_memory", {}),
                 "player_personality": getattr(ai_manager, "player_personality", {})
@@ -150,6 +258,125 @@ class SaveManager:
         
         return mature_settings
     
+    def _default_codec(self) -> SaveCodec:
+        """Codec par défaut: zdict avec le dictionnaire livré s'il est disponible, sinon zlib 6"""
+        key = self.encryption_key.encode('utf-8')
+        dictionary = dictionaries.default()
+        if dictionary:
+            return SaveCodec("zdict", 9, True, key, dictionary)
+        return SaveCodec("zlib", 6, True, key)
+    
+    def set_codec(self, compression: str = "zlib", level: int = None, obfuscate: bool = True) -> Dict[str, Any]:
+        """
+        Choisit l'encodage des prochaines sauvegardes
+        
+        Args:
+            compression: Algorithme de compression ("none", "zlib", "gzip", "lzma" ou "zdict"
+                         avec le dictionnaire livré)
+            level: Niveau de compression (0-9, niveau par défaut de l'algorithme si None)
+            obfuscate: Obfusque les données compressées
+            
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec du changement
+        """
+        try:
+            dictionary = dictionaries.default() if compression == "zdict" else None
+            self.codec = SaveCodec(compression, level, obfuscate, self.encryption_key.encode('utf-8'), dictionary)
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": str(e)
+            }
+        
+        return {
+            "success": True,
+            "message": f"Encodage des sauvegardes: {compression} (niveau {self.codec.level})"
+        }
+    
+    def set_storage(self, storage: str = "files") -> Dict[str, Any]:
+        """
+        Choisit le stockage des sauvegardes
+        
+        Les sauvegardes existantes ne sont pas déplacées: voir migrate_storage (save_database.py).
+        
+        Args:
+            storage: "files" (un fichier .mkrp par sauvegarde) ou "sqlite" (base saves/saves.db)
+            
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec du changement
+        """
+        if storage not in ("files", "sqlite"):
+            return {
+                "success": False,
+                "message": f"Stockage inconnu: {storage}"
+            }
+        
+        with self.save_lock:
+            if storage == "sqlite" and not self.database:
+                try:
+                    self.database = SaveDatabase(database_path(self.save_directory), self.encryption_key.encode('utf-8'))
+                except Exception as e:
+                    return {
+                        "success": False,
+                        "message": f"Impossible d'ouvrir la base des sauvegardes: {str(e)}"
+                    }
+            elif storage == "files" and self.database:
+                self.database.close()
+                self.database = None
+            self.storage = storage
+            # Les chaînes de deltas n'existent que dans le stockage en fichiers
+            self.delta_chains = {}
+        
+        return {
+            "success": True,
+            "message": f"Stockage des sauvegardes: {storage}"
+        }
+    
+    def _reopen_database(self) -> None:
+        """
+        Rouvre la base des sauvegardes si saves.db existe (après une restauration)
+        
+        Raises:
+            ValueError: Si la base restaurée ne peut pas être ouverte
+        """
+        self.storage = "files"
+        if os.path.exists(database_path(self.save_directory)):
+            result = self.set_storage("sqlite")
+            if not result["success"]:
+                raise ValueError(result["message"])
+    
+    def _database_key(self, save_path: str) -> Tuple[str, str]:
+        """(slot, nom) d'une sauvegarde de la base à partir de son chemin <saves>/<slot>/<nom>.mkrp"""
+        name = os.path.basename(save_path)
+        if name.endswith('.mkrp'):
+            name = name[:-len('.mkrp')]
+        return os.path.basename(os.path.dirname(save_path)), name
+    
+    def _database_save_path(self, slot_name: str, save_name: str) -> str:
+        """Chemin qui désigne une sauvegarde de la base (aucun fichier n'existe à cet endroit)"""
+        return os.path.join(self.save_directory, slot_name, f"{save_name}.mkrp")
+    
+    def _save_exists(self, save_path: str) -> bool:
+        """Indique si une sauvegarde existe dans le stockage actuel"""
+        if self.database:
+            return self.database.exists(*self._database_key(save_path))
+        return os.path.exists(save_path)
+    
+    def _database_info(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Informations d'une sauvegarde de la base au format de list_saves"""
+        save_path = self._database_save_path(row["slot"], row["name"])
+        return {
+            "metadata": row["metadata"],
+            "file_path": save_path,
+            "file_size": row["size"],
+            "last_modified": datetime.fromtimestamp(row["saved_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "slot_name": row["slot"],
+            "base_path": save_path,
+            "chain_length": 1,
+            "path": save_path,
+            "name": row["metadata"].get("save_name") or row["name"]
+        }
+    
     def _encrypt_data(self, data: bytes) -> bytes:
         """
         Chiffre légèrement les données avec un XOR simple (non cryptographiquement sûr)
@@ -160,14 +387,7 @@ class SaveManager:
         Returns:
             Données chiffrées
         """
-        key_bytes = self.encryption_key.encode('utf-8')
-        key_len = len(key_bytes)
-        encrypted = bytearray(len(data))
-        
-        for i in range(len(data)):
-            encrypted[i] = data[i] ^ key_bytes[i % key_len]
-            
-        return bytes(encrypted)
+        return xor_bytes(data, self.encryption_key.encode('utf-8'))
     
     def _decrypt_data(self, data: bytes) -> bytes:
         """
@@ -182,46 +402,33 @@ class SaveManager:
         # Le même algorithme XOR fonctionne pour déchiffrer
         return self._encrypt_data(data)
     
-    def _compress_data(self, data_dict: Dict) -> bytes:
+    def _compress_data(self, data_dict: Dict, codec: SaveCodec = None) -> bytes:
         """
         Compresse et chiffre les données de sauvegarde
         
         Args:
             data_dict: Données à compresser
+            codec: Codec à utiliser (codec actuel si None)
             
         Returns:
             Données compressées et chiffrées
         """
-        # Convertir en JSON
-        json_data = json.dumps(data_dict)
-        
-        # Compresser
-        compressed = gzip.compress(json_data.encode('utf-8'), compresslevel=9)
-        
-        # Chiffrer légèrement (obfuscation)
-        encrypted = self._encrypt_data(compressed)
-        
-        return encrypted
+        # Le JSON est transmis au compresseur au fur et à mesure de son encodage
+        return (codec or self.codec).encode(data_dict)
     
-    def _decompress_data(self, data: bytes) -> Dict:
+    def _decompress_data(self, data: bytes, codec: SaveCodec = None) -> Dict:
         """
         Déchiffre et décompresse les données de sauvegarde
         
         Args:
             data: Données compressées et chiffrées
+            codec: Codec indiqué par l'en-tête du fichier (codec actuel si None)
             
         Returns:
             Dictionnaire de données décompressé
         """
         try:
-            # Déchiffrer
-            decrypted = self._decrypt_data(data)
-            
-            # Décompresser
-            decompressed = gzip.decompress(decrypted).decode('utf-8')
-            
-            # Convertir en dictionnaire
-            return json.loads(decompressed)
+            return (codec or self.codec).decode(data)
         except Exception as e:
             print(f"Erreur lors de la décompression des données: {e}")
             return {}
@@ -239,22 +446,14 @@ class SaveManager:
         try:
             # Lire les premiers ko du fichier pour extraire uniquement les métadonnées
             with open(save_path, 'rb') as f:
-                # Lire les 4 premiers octets pour vérifier la signature
-                signature = f.read(4)
-                if signature != b'MKRP':
+                # Vérifier la signature et lire le codec et la taille des métadonnées
+                try:
+                    codec, meta_size, _, _ = read_header(f, self.encryption_key.encode('utf-8'))
+                except ValueError:
                     return {"error": "Invalid save file format"}
                 
-                # Lire la taille des métadonnées
-                meta_size_bytes = f.read(4)
-                meta_size = int.from_bytes(meta_size_bytes, byteorder='little')
-                
-                # Lire et déchiffrer les métadonnées
-                encrypted_meta = f.read(meta_size)
-                decrypted_meta = self._decrypt_data(encrypted_meta)
-                
-                # Décompresser et charger les métadonnées
-                meta_json = gzip.decompress(decrypted_meta).decode('utf-8')
-                metadata = json.loads(meta_json)
+                # Lire, déchiffrer et décompresser uniquement les métadonnées
+                metadata = codec.decode(f.read(meta_size))
                 
                 return {
                     "metadata": metadata,
@@ -268,106 +467,772 @@ class SaveManager:
                 "file_path": save_path
             }
     
-    def save_game(self, slot_name: str = "default", save_name: str = None) -> Dict[str, Any]:
+    def save_game(self, slot_name: str = "default", save_name: str = None, delta: bool = None) -> Dict[str, Any]:
         """
         Sauvegarde l'état actuel du jeu
         
         Args:
             slot_name: Nom du slot de sauvegarde
             save_name: Nom spécifique de la sauvegarde (si non fourni, utilise la date/heure)
+            delta: Écrit uniquement les changements depuis la dernière sauvegarde complète du slot
+                   (utilise self.delta_saves si None)
             
         Returns:
             Dictionnaire indiquant le succès ou l'échec de la sauvegarde
         """
         try:
-            # Définir le nom de la sauvegarde si non fourni
-            if not save_name:
-                save_name = f"save_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            return self._write_save(self._prepare_save(slot_name, save_name, delta))
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de la sauvegarde: {str(e)}"
+            }
+    
+    def _prepare_save(self, slot_name: str, save_name: str = None, delta: bool = None,
+                      unique_name: bool = False) -> Dict[str, Any]:
+        """
+        Prépare une sauvegarde depuis le thread du jeu: métadonnées et données à écrire
+        
+        Les données sont un instantané figé: la tâche peut être écrite depuis un autre thread.
+        
+        Args:
+            slot_name: Nom du slot de sauvegarde
+            save_name: Nom de la sauvegarde (date/heure si non fourni)
+            delta: Sauvegarde incrémentale (utilise self.delta_saves si None)
+            unique_name: Rend le nom unique dans le temps (noms horodatés, voir _unique_save_name)
             
-            # Mettre à jour les métadonnées
-            self.current_save_metadata["save_name"] = save_name
-            self.current_save_metadata["save_slot"] = slot_name
-            self.current_save_metadata["last_save_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        Returns:
+            Tâche de sauvegarde à passer à _write_save
+        """
+        # Définir le nom de la sauvegarde si non fourni (rendu unique à l'écriture)
+        unique_name = unique_name or not save_name
+        if not save_name:
+            save_name = f"save_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        # Mettre à jour les métadonnées
+        self.current_save_metadata["save_name"] = save_name
+        self.current_save_metadata["save_slot"] = slot_name
+        self.current_save_metadata["last_save_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Récupérer les données de sauvegarde, compactées selon les politiques de rétention
+        save_data, self.last_retention_report = self.retention.apply(self._get_save_data())
+        
+        # Réinitialiser le compteur de temps de jeu pour la prochaine session
+        self._reset_play_time_counter()
+        
+        return {
+            "slot_name": slot_name,
+            "save_name": save_name,
+            "unique_name": unique_name,
+            "delta": self.delta_saves if delta is None else delta,
+            "save_data": save_data
+        }
+    
+    def _write_save(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Écrit une sauvegarde préparée par _prepare_save (appelable depuis un thread d'arrière-plan)
+        
+        Args:
+            job: Tâche de sauvegarde
             
-            # Récupérer les données de sauvegarde
-            save_data = self._get_save_data()
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec de la sauvegarde
+        """
+        if self.database:
+            return self._write_database_save(job)
+        
+        with self._metadata_batch():
+            slot_name = job["slot_name"]
+            save_name = job["save_name"]
+            use_delta = job["delta"]
+            save_data = job["save_data"]
+            
+            # Prolonger la chaîne du slot, sauf si elle doit être compactée en une nouvelle sauvegarde complète
+            chain = self.delta_chains.get(slot_name) if use_delta else None
+            if chain and (not os.path.exists(chain["base_path"]) or self._chain_needs_compaction(chain)):
+                chain = None
+            
+            # Une sauvegarde incrémentale garde le nom de la sauvegarde de base de sa chaîne
+            if chain:
+                save_name = chain["save_name"]
+                save_data["metadata"]["save_name"] = save_name
+                self.current_save_metadata["save_name"] = save_name
             
             # Créer le répertoire du slot s'il n'existe pas
             slot_dir = os.path.join(self.save_directory, slot_name)
             os.makedirs(slot_dir, exist_ok=True)
             
-            # Chemin du fichier de sauvegarde
-            save_path = os.path.join(slot_dir, f"{save_name}.mkrp")
+            fingerprints = self._section_fingerprints(save_data) if use_delta else None
             
-            # Extraire les métadonnées pour en-tête rapide
-            metadata = save_data["metadata"]
-            meta_json = json.dumps(metadata).encode('utf-8')
-            compressed_meta = gzip.compress(meta_json, compresslevel=9)
-            encrypted_meta = self._encrypt_data(compressed_meta)
-            meta_size = len(encrypted_meta)
+            if chain:
+                # Écrire uniquement les changements depuis le dernier fichier de la chaîne
+                sequence = chain["sequence"] + 1
+                base_file = os.path.basename(chain["base_path"])
+                save_path = os.path.join(slot_dir, f"{base_file[:-len('.mkrp')]}.delta{sequence:03d}.mkrp")
+                
+                delta_data = {section: save_data[section] for section in self.DELTA_VOLATILE_SECTIONS if section in save_data}
+                delta_data["delta"] = {"base": base_file, "sequence": sequence}
+                delta_data["changes"] = self._compute_delta(save_data, fingerprints, chain["fingerprints"])
+                self._write_save_file(save_path, delta_data)
+                
+                chain["sequence"] = sequence
+                chain["bytes"] += os.path.getsize(save_path)
+                chain["fingerprints"] = fingerprints
+            else:
+                # Sauvegarde complète (et nouvelle base de chaîne en mode incrémental)
+                temp_path = None
+                if job.get("unique_name"):
+                    # Nom horodaté unique dans le temps, même si un autre processus écrit dans le slot
+                    save_path, temp_path = self._reserve_save_path(slot_dir, save_name)
+                    save_name = os.path.basename(save_path)[:-len('.mkrp')]
+                    save_data["metadata"]["save_name"] = save_name
+                    self.current_save_metadata["save_name"] = save_name
+                else:
+                    save_path = os.path.join(slot_dir, f"{save_name}.mkrp")
+                self._write_save_file(save_path, save_data, temp_path=temp_path)
+                
+                # Les deltas d'une ancienne sauvegarde du même nom ne s'appliquent plus
+                with self.slot_locks.lock(slot_dir):
+                    self._delete_deltas(save_path)
+                self._sync_directory(slot_dir)
+                
+                if use_delta:
+                    self.delta_chains[slot_name] = {
+                        "slot": slot_name,
+                        "save_name": save_name,
+                        "base_path": save_path,
+                        "sequence": 0,
+                        "bytes": 0,
+                        "fingerprints": fingerprints
+                    }
+                else:
+                    self.delta_chains.pop(slot_name, None)
             
-            # Compresser et chiffrer toutes les données
-            compressed_data = self._compress_data(save_data)
+            # Gérer les versions de sauvegarde (limiter le nombre par slot)
+            self._manage_save_versions(slot_dir)
+            if job.get("auto"):
+                self._manage_auto_saves()
             
-            # Écrire le fichier avec signature et métadonnées séparées
-            with open(save_path, 'wb') as f:
-                # Signature du format de fichier (4 octets)
-                f.write(b'MKRP')
-                
-                # Taille des métadonnées (4 octets)
-                f.write(meta_size.to_bytes(4, byteorder='little'))
+            return {
+                "success": True,
+                "message": f"Jeu sauvegardé avec succès dans le slot {slot_name}",
+                "save_path": save_path,
+                "save_name": save_name,
+                "save_time": save_data["metadata"].get("last_save_time"),
+                "turn": save_data["metadata"].get("turn", 0),
+                "delta": bool(chain)
+            }
+    
+    def _write_database_save(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Écrit une sauvegarde préparée par _prepare_save dans la base (toujours complète)
+        
+        Args:
+            job: Tâche de sauvegarde
+            
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec de la sauvegarde
+        """
+        slot_name = job["slot_name"]
+        save_data = job["save_data"]
+        with self.save_lock:
+            save_name = job["save_name"]
+            if job.get("unique_name"):
+                save_name = self._unique_save_name(save_name)
+            save_name = self.database.write(slot_name, save_name, self.codec, save_data, job.get("unique_name", False))
+            if save_name != job["save_name"]:
+                save_data["metadata"]["save_name"] = save_name
+                self.current_save_metadata["save_name"] = save_name
+            
+            # Élagage: une requête par slot
+            self._manage_save_versions(os.path.join(self.save_directory, slot_name))
+            if job.get("auto"):
+                self._manage_auto_saves()
+        
+        return {
+            "success": True,
+            "message": f"Jeu sauvegardé avec succès dans le slot {slot_name}",
+            "save_path": self._database_save_path(slot_name, save_name),
+            "save_name": save_name,
+            "save_time": save_data["metadata"].get("last_save_time"),
+            "turn": save_data["metadata"].get("turn", 0),
+            "delta": False
+        }
+    
+    def _write_save_file(self, save_path: str, save_data: Dict[str, Any], catalog: bool = True,
+                         temp_path: str = None) -> None:
+        """
+        Écrit un fichier de sauvegarde (en-tête, métadonnées puis données complètes)
+        
+        L'encodage et l'écriture se font dans un fichier temporaire propre à cet écrivain;
+        seul le renommage final a lieu sous le verrou du slot.
+        
+        Args:
+            save_path: Chemin du fichier
+            save_data: Données à écrire (doivent contenir "metadata")
+            catalog: Met à jour le catalogue (False depuis un processus de migration par lots)
+            temp_path: Fichier temporaire réservé par _reserve_save_path (créé ici si None)
+        """
+        # Extraire les métadonnées pour en-tête rapide
+        codec = self.codec
+        encrypted_meta = codec.encode(save_data["metadata"])
+        meta_size = len(encrypted_meta)
+        
+        # Compresser et chiffrer les données: section par section avec sommes de contrôle (v3) ou en un seul bloc
+        if self.sectioned_saves:
+            version = CHECKSUMMED_VERSION
+            compressed_data = encode_sections(codec, split_sections(save_data), encrypted_meta, version)
+        else:
+            version = 1
+            compressed_data = self._compress_data(save_data, codec)
+        
+        # Écrire dans un fichier temporaire: un arrêt brutal ne laisse jamais de sauvegarde tronquée
+        # (nom propre au processus et au thread: deux écrivains du même fichier ne se mélangent pas)
+        temp_path = temp_path or f"{save_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                # Signature, sentinelle du format étendu, codec et taille des métadonnées
+                f.write(codec.header(meta_size, version))
                 
                 # Métadonnées chiffrées
                 f.write(encrypted_meta)
                 
                 # Données complètes chiffrées et compressées
                 f.write(compressed_data)
+                
+                # Le contenu doit être sur le disque avant que le fichier ne prenne le nom final
+                f.flush()
+                os.fsync(f.fileno())
+            
+            # Remplacement atomique de l'ancienne version
+            with self.slot_locks.lock(os.path.dirname(save_path)):
+                os.replace(temp_path, save_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        self._sync_directory(os.path.dirname(save_path))
+        if catalog:
+            self.catalog.record(save_path, save_data["metadata"])
+    
+    def _unique_save_name(self, save_name: str) -> str:
+        """
+        Complète un nom horodaté à la seconde par ses nanosecondes, strictement croissantes
+        
+        Un nom n'est jamais réattribué après l'élagage de sa sauvegarde: un chemin retenu
+        ailleurs (liste d'une autre session, base du journal des actions) ne peut pas désigner
+        une sauvegarde plus récente.
+        
+        Args:
+            save_name: Nom horodaté (ex: autosave_20240101_120000)
+        """
+        with self.save_lock:
+            self.last_name_ns = max(time.time_ns(), self.last_name_ns + 1)
+            return f"{save_name}_{self.last_name_ns % 10 ** 9:09d}"
+    
+    def _reserve_save_path(self, slot_dir: str, save_name: str) -> Tuple[str, str]:
+        """
+        Choisit un nom de fichier libre, même si d'autres processus écrivent dans le même slot
+        
+        Le fichier temporaire du nom est créé en exclusivité (O_EXCL): un seul écrivain peut
+        le réserver. Le nom est ensuite vérifié libre, ce qui couvre un écrivain qui vient de
+        publier ce nom. Chaque essai reçoit un nouveau nom (voir _unique_save_name).
+        
+        Args:
+            slot_dir: Répertoire du slot
+            save_name: Nom souhaité (horodaté)
             
-            # Gérer les versions de sauvegarde (limiter le nombre par slot)
-            self._manage_save_versions(slot_dir)
+        Returns:
+            (chemin du fichier de sauvegarde, chemin du fichier temporaire réservé)
+        """
+        while True:
+            save_path = os.path.join(slot_dir, f"{self._unique_save_name(save_name)}.mkrp")
+            temp_path = f"{save_path}.tmp"
+            try:
+                os.close(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            except FileExistsError:
+                continue
+            if not os.path.exists(save_path):
+                return save_path, temp_path
+            os.remove(temp_path)
+    
+    @contextmanager
+    def _metadata_batch(self):
+        """
+        Regroupe les mises à jour de métadonnées d'une opération d'écriture
+        
+        Les fsync des répertoires modifiés et la réécriture du catalogue sont faits une seule
+        fois, à la fin de l'opération et hors des verrous de slot.
+        """
+        with self.save_lock, self.catalog.transaction():
+            self.batch_depth += 1
+            try:
+                yield
+            finally:
+                self.batch_depth -= 1
+                if not self.batch_depth:
+                    directories, self.pending_directory_syncs = self.pending_directory_syncs, set()
+                    for directory in directories:
+                        self._fsync_directory(directory)
+    
+    def _sync_directory(self, directory: str) -> None:
+        """Force l'écriture des renommages et suppressions sur le disque (à la fin de l'opération en cours)"""
+        if self.batch_depth:
+            self.pending_directory_syncs.add(directory)
+        else:
+            self._fsync_directory(directory)
+    
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        """fsync d'un répertoire (sans effet sous Windows)"""
+        if os.name != 'posix':
+            return
+        try:
+            fd = os.open(directory or ".", os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def _read_save_file(self, save_path: str) -> Dict[str, Any]:
+        """
+        Lit un fichier de sauvegarde (complet ou delta) sans appliquer sa chaîne
+        
+        Args:
+            save_path: Chemin du fichier
             
-            # Réinitialiser le compteur de temps de jeu pour la prochaine session
-            self._reset_play_time_counter()
+        Returns:
+            Données du fichier (dictionnaire vide si elles sont illisibles)
+            
+        Raises:
+            ValueError: Si le fichier n'est pas une sauvegarde valide
+        """
+        with open(save_path, 'rb') as f:
+            # Vérifier la signature et lire le codec utilisé par ce fichier
+            codec, meta_size, header_size, version = read_header(f, self.encryption_key.encode('utf-8'))
+            
+            if version >= SECTIONED_VERSION:
+                # Format v2/v3: métadonnées de l'en-tête puis toutes les sections (sommes de contrôle vérifiées en v3)
+                encoded_metadata = f.read(meta_size)
+                toc, _ = read_toc(f, version, encoded_metadata)
+                metadata = codec.decode(encoded_metadata)
+                return join_sections(metadata, read_sections(f, codec, toc))
+            
+            # Sauter les métadonnées, on les récupérera avec les données complètes
+            f.seek(header_size + meta_size)
+            
+            # Lire, déchiffrer et décompresser les données complètes par morceaux
+            try:
+                return codec.decode_stream(f)
+            except Exception as e:
+                print(f"Erreur lors de la décompression des données: {e}")
+                return {}
+    
+    def load_sections(self, save_path: str, sections: List[str]) -> Dict[str, Any]:
+        """
+        Lit seulement certaines sections d'une sauvegarde, sans restaurer l'état du jeu
+        
+        Avec le format v2, seules les sections demandées sont lues et décompressées.
+        Les anciens formats et les deltas (qui doivent rejouer leur chaîne) sont lus en entier.
+        
+        Args:
+            save_path: Chemin du fichier de sauvegarde
+            sections: Sections voulues ("player", "world_state", "quests", "relationships",
+                      "ai_memory", "journal" ou "core" pour les autres données)
             
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec, avec les métadonnées et les sections lues
+        """
+        try:
+            if not self._save_exists(save_path):
+                return {
+                    "success": False,
+                    "message": f"Fichier de sauvegarde introuvable: {save_path}"
+                }
+            
+            if self.database:
+                # Métadonnées et sections demandées en une seule requête
+                metadata, loaded, journal_split = self.database.read_sections(*self._database_key(save_path), sections)
+                if migrations.needs_migration(metadata.get("game_version", "0.0.0")):
+                    metadata, loaded = migrations.migrate_sections(metadata, loaded)
+                return {
+                    "success": True,
+                    "metadata": metadata,
+                    "sections": select_sections(loaded, sections, journal_split)
+                }
+            
+            with open(save_path, 'rb') as f:
+                codec, meta_size, _, version = read_header(f, self.encryption_key.encode('utf-8'))
+                encoded_metadata = f.read(meta_size)
+                metadata = codec.decode(encoded_metadata)
+                if version >= SECTIONED_VERSION and not self._split_delta_name(os.path.basename(save_path))[1]:
+                    toc, _ = read_toc(f, version, encoded_metadata)
+                    loaded = read_sections(f, codec, toc, sections)
+                    
+                    # Seules les sections lues sont migrées
+                    if migrations.needs_migration(metadata.get("game_version", "0.0.0")):
+                        metadata, loaded = migrations.migrate_sections(metadata, loaded)
+                    return {
+                        "success": True,
+                        "metadata": metadata,
+                        "sections": select_sections(loaded, sections, "journal" in toc)
+                    }
+            
+            save_data, _, _ = self._load_chain(save_path)
+            save_data = migrations.migrate(save_data)
+            split = split_sections(save_data)
             return {
                 "success": True,
-                "message": f"Jeu sauvegardé avec succès dans le slot {slot_name}",
-                "save_path": save_path,
-                "save_name": save_name,
-                "save_time": self.current_save_metadata["last_save_time"]
+                "metadata": save_data.get("metadata", metadata),
+                "sections": select_sections(split, sections, "journal" in split)
             }
         except Exception as e:
             return {
                 "success": False,
-                "message": f"Erreur lors de la sauvegarde: {str(e)}"
+                "message": f"Erreur lors de la lecture des sections: {str(e)}"
             }
     
+    @classmethod
+    def _split_delta_name(cls, file_name: str) -> Tuple[str, int]:
+        """
+        Décompose le nom d'un fichier de sauvegarde
+        
+        Returns:
+            (nom du fichier de base, numéro du delta ou 0 pour une sauvegarde complète)
+        """
+        match = cls.DELTA_NAME_PATTERN.match(file_name)
+        if not match:
+            return file_name, 0
+        return f"{match.group('base')}.mkrp", int(match.group("sequence"))
+    
+    def _list_deltas(self, base_path: str) -> List[Tuple[int, str]]:
+        """Liste les deltas d'une sauvegarde complète, triés par numéro: [(numéro, chemin)]"""
+        directory = os.path.dirname(base_path)
+        base_file = os.path.basename(base_path)
+        deltas = []
+        if os.path.isdir(directory):
+            for file_name in os.listdir(directory):
+                delta_base, sequence = self._split_delta_name(file_name)
+                if sequence and delta_base == base_file:
+                    deltas.append((sequence, os.path.join(directory, file_name)))
+        deltas.sort()
+        return deltas
+    
+    def _delete_deltas(self, base_path: str, from_sequence: int = 1) -> None:
+        """Supprime les deltas d'une sauvegarde à partir d'un numéro donné"""
+        for sequence, delta_path in self._list_deltas(base_path):
+            if sequence >= from_sequence:
+                os.remove(delta_path)
+                self.catalog.forget(delta_path)
+    
+    @staticmethod
+    def _fingerprint(value: Any) -> bytes:
+        """Empreinte courte d'une valeur JSON"""
+        digest = hashlib.blake2b(digest_size=16)
+        for fragment in iter_json(value):
+            digest.update(fragment.encode('utf-8'))
+        return digest.digest()
+    
+    def _section_fingerprints(self, save_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calcule les empreintes des sections (et de chaque clé des sections dictionnaires)
+        
+        Args:
+            save_data: Données de sauvegarde complètes
+            
+        Returns:
+            Section -> empreinte, ou section -> {clé: empreinte}
+        """
+        fingerprints = {}
+        for section, value in save_data.items():
+            if section in self.DELTA_VOLATILE_SECTIONS:
+                continue
+            if isinstance(value, dict):
+                fingerprints[section] = {str(key): self._fingerprint(item) for key, item in value.items()}
+            else:
+                fingerprints[section] = self._fingerprint(value)
+        return fingerprints
+    
+    def _compute_delta(self, save_data: Dict[str, Any], fingerprints: Dict[str, Any],
+                       previous: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Détermine les sections et clés modifiées depuis la sauvegarde précédente de la chaîne
+        
+        Args:
+            save_data: Données de sauvegarde actuelles
+            fingerprints: Empreintes des données actuelles
+            previous: Empreintes de la sauvegarde précédente
+            
+        Returns:
+            Changements à appliquer: sections remplacées, clés remplacées, clés et sections supprimées
+        """
+        changes = {"set": {}, "set_keys": {}, "removed_keys": {}, "removed": []}
+        
+        for section, current in fingerprints.items():
+            old = previous.get(section)
+            if isinstance(current, dict) and isinstance(old, dict):
+                values = {str(key): item for key, item in save_data[section].items()}
+                changed = {key: values[key] for key, fingerprint in current.items() if old.get(key) != fingerprint}
+                removed = [key for key in old if key not in current]
+                if changed:
+                    changes["set_keys"][section] = changed
+                if removed:
+                    changes["removed_keys"][section] = removed
+            elif current != old:
+                changes["set"][section] = save_data[section]
+        
+        changes["removed"] = [section for section in previous if section not in fingerprints]
+        return changes
+    
+    def _apply_delta(self, save_data: Dict[str, Any], delta_data: Dict[str, Any]) -> None:
+        """Applique un fichier delta sur les données reconstruites jusqu'au delta précédent"""
+        changes = delta_data.get("changes", {})
+        
+        for section in changes.get("removed", []):
+            save_data.pop(section, None)
+        for section, value in changes.get("set", {}).items():
+            save_data[section] = value
+        for section, values in changes.get("set_keys", {}).items():
+            if not isinstance(save_data.get(section), dict):
+                save_data[section] = {}
+            save_data[section].update(values)
+        for section, keys in changes.get("removed_keys", {}).items():
+            for key in keys:
+                save_data.get(section, {}).pop(key, None)
+        
+        for section in self.DELTA_VOLATILE_SECTIONS:
+            if section in delta_data:
+                save_data[section] = delta_data[section]
+    
+    def _load_chain(self, save_path: str) -> Tuple[Dict[str, Any], str, int]:
+        """
+        Reconstruit l'état d'une sauvegarde en rejouant sa chaîne de deltas
+        
+        Args:
+            save_path: Sauvegarde complète ou delta (la chaîne est rejouée jusqu'à ce delta)
+            
+        Returns:
+            (données reconstruites, chemin de la sauvegarde de base, numéro du dernier delta appliqué)
+            
+        Raises:
+            ValueError: Si un fichier de la chaîne est manquant ou invalide
+        """
+        if self.database:
+            return self.database.read(*self._database_key(save_path)), save_path, 0
+        
+        # Verrou partagé: un autre processus ne peut pas élaguer la chaîne pendant sa lecture
+        with self.slot_locks.lock(os.path.dirname(save_path), shared=True):
+            return self._replay_chain(save_path)
+    
+    def _replay_chain(self, save_path: str) -> Tuple[Dict[str, Any], str, int]:
+        """Rejoue la chaîne de deltas d'une sauvegarde (voir _load_chain)"""
+        file_data = self._read_save_file(save_path)
+        if "delta" not in file_data:
+            return file_data, save_path, 0
+        
+        sequence = file_data["delta"].get("sequence", 0)
+        base_path = os.path.join(os.path.dirname(save_path), file_data["delta"].get("base", ""))
+        if not os.path.exists(base_path):
+            raise ValueError(f"Sauvegarde de base introuvable: {os.path.basename(base_path)}")
+        
+        save_data = self._read_save_file(base_path)
+        deltas = dict(self._list_deltas(base_path))
+        for number in range(1, sequence + 1):
+            if number not in deltas:
+                raise ValueError(f"Chaîne de sauvegarde incomplète: delta {number} manquant")
+            delta_data = file_data if number == sequence else self._read_save_file(deltas[number])
+            if delta_data.get("delta", {}).get("sequence") != number:
+                raise ValueError(f"Chaîne de sauvegarde invalide au delta {number}")
+            self._apply_delta(save_data, delta_data)
+        
+        return save_data, base_path, sequence
+    
+    def _chain_needs_compaction(self, chain: Dict[str, Any]) -> bool:
+        """Indique si la prochaine sauvegarde doit être complète (trop de deltas ou deltas trop volumineux)"""
+        return chain["sequence"] >= self.max_deltas or chain["bytes"] >= self.max_delta_bytes
+    
     def quick_save(self) -> Dict[str, Any]:
         """
         Effectue une sauvegarde rapide
         
+        L'instantané est gardé en mémoire (quick_load immédiat) puis écrit sur le disque
+        en arrière-plan.
+        
         Returns:
             Dictionnaire indiquant le succès ou l'échec de la sauvegarde rapide
         """
-        return self.save_game("quicksave", "quicksave")
+        try:
+            job = self._prepare_save("quicksave", "quicksave")
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de la sauvegarde: {str(e)}"
+            }
+        
+        turn = job["save_data"]["metadata"].get("turn", 0)
+        self.timeline.set_quick(turn, job["save_data"])
+        self._get_autosave_worker().submit(job)
+        return {
+            "success": True,
+            "message": "Sauvegarde rapide effectuée",
+            "save_name": "quicksave",
+            "turn": turn,
+            "pending": True
+        }
+    
+    def record_turn(self, turn: int = None) -> None:
+        """
+        Garde l'instantané de fin de tour dans la ligne de temps en mémoire (retour en arrière)
+        
+        Args:
+            turn: Numéro du tour terminé (turn_count du jeu si None)
+        """
+        if not self.game:
+            return
+        if turn is None:
+            turn = getattr(self.game, "turn_count", None)
+        if turn is None:
+            turn = self.timeline.turns[-1]["turn"] + 1 if self.timeline.turns else 0
+        self.timeline.record(turn, self._get_save_data())
+    
+    def rewind(self, steps: int = 1) -> Dict[str, Any]:
+        """
+        Revient à l'état de fin d'un tour précédent, sans lire le disque
+        
+        Args:
+            steps: Nombre de tours à annuler
+            
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec, avec le tour retrouvé
+        """
+        entry = self.timeline.rewind(steps)
+        if entry is None:
+            return {
+                "success": False,
+                "message": f"Impossible de revenir {steps} tour(s) en arrière ({max(0, len(self.timeline) - 1)} disponible(s))"
+            }
+        
+        self._restore_snapshot(entry["snapshot"])
+        return {
+            "success": True,
+            "message": f"Retour au tour {entry['turn']}",
+            "turn": entry["turn"]
+        }
+    
+    def _restore_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Restaure l'état du jeu depuis un instantané en mémoire (l'instantané reste intact)"""
+        self.current_save_metadata = dict(snapshot["metadata"])
+        self._reset_play_time_counter()
+        if self.game:
+            self._restore_game_state(thaw(snapshot))
+    
+    def auto_save(self, background: bool = False) -> Dict[str, Any]:
+        """
+        Effectue une sauvegarde automatique
+        
+        Args:
+            background: Fige l'état puis sérialise, compresse et écrit dans un thread
+                        d'arrière-plan (la partie continue pendant l'écriture)
+        
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec de la sauvegarde automatique
+            (en arrière-plan: indique seulement que la sauvegarde est programmée)
+        """
+        # Créer un nom unique pour l'auto-sauvegarde
+        auto_save_name = f"autosave_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        if background:
+            try:
+                job = self._prepare_save("auto", auto_save_name, unique_name=True)
+            except Exception as e:
+                return {
+                    "success": False,
+                    "message": f"Erreur lors de la sauvegarde: {str(e)}"
+                }
+            job["auto"] = True
+            
+            # Une seule écriture à la fois: un instantané plus récent remplace celui en attente
+            self._get_autosave_worker().submit(job)
+            return {
+                "success": True,
+                "message": "Sauvegarde automatique en cours...",
+                "save_name": auto_save_name,
+                "pending": True
+            }
+        
+        # Sauvegarder dans le répertoire d'auto-sauvegarde (plusieurs sessions peuvent
+        # créer une auto-sauvegarde dans la même seconde: le nom est rendu unique)
+        try:
+            result = self._write_save(self._prepare_save("auto", auto_save_name, unique_name=True))
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de la sauvegarde: {str(e)}"
+            }
+        
+        # Gérer le nombre d'auto-sauvegardes
+        self._manage_auto_saves()
+        
+        return result
+    
+    def state_fingerprint(self) -> Dict[str, Any]:
+        """
+        Empreinte de l'état du jeu à sauvegarder (hors métadonnées et horodatage)
+        
+        Sert à ignorer une auto-sauvegarde quand rien n'a changé depuis la précédente.
+        L'empreinte est l'instantané figé lui-même: les parties suivies et inchangées sont
+        les mêmes objets d'un instantané à l'autre, la comparaison s'arrête à leur identité.
+        
+        Returns:
+            Instantané de l'état, comparable avec ==
+        """
+        save_data = self._get_save_data()
+        return {key: value for key, value in save_data.items() if key not in self.DELTA_VOLATILE_SECTIONS}
+    
+    def _game_minutes(self) -> int:
+        """Temps de jeu écoulé en minutes (horloge game_time, ou nombre de jours à défaut)"""
+        day_count = getattr(self.game, "day_count", 1)
+        game_time = getattr(self.game, "game_time", None)
+        if isinstance(game_time, dict) and game_time:
+            # main.py garde le jour dans day_count et seulement l'heure dans game_time
+            return game_time.get("day", day_count) * 1440 + game_time.get("hour", 0) * 60 + game_time.get("minute", 0)
+        return day_count * 1440
+    
+    def _get_autosave_worker(self) -> AutoSaveWorker:
+        """Retourne le thread d'auto-sauvegarde (créé à la première utilisation)"""
+        if self.autosave_worker is None:
+            self.autosave_worker = AutoSaveWorker(self._write_save)
+        return self.autosave_worker
+    
+    def add_autosave_listener(self, callback) -> None:
+        """
+        Enregistre une fonction appelée à chaque changement d'état de l'auto-sauvegarde
+        
+        Args:
+            callback: Fonction recevant l'état ("saving", "saved" ou "error") et le résultat
+                      (appelée depuis le thread d'arrière-plan pour "saved" et "error")
+        """
+        self._get_autosave_worker().add_listener(callback)
+    
+    def get_autosave_status(self) -> str:
+        """Retourne l'état de l'auto-sauvegarde en arrière-plan ("idle", "saving", "saved" ou "error")"""
+        return self.autosave_worker.status if self.autosave_worker else "idle"
     
-    def auto_save(self) -> Dict[str, Any]:
+    def wait_for_autosave(self, timeout: float = None) -> bool:
         """
-        Effectue une sauvegarde automatique
+        Attend la fin de l'auto-sauvegarde en cours (à appeler avant de quitter)
         
         Returns:
-            Dictionnaire indiquant le succès ou l'échec de la sauvegarde automatique
+            True si aucune sauvegarde n'est plus en attente
         """
-        # Créer un nom unique pour l'auto-sauvegarde
-        auto_save_name = f"autosave_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        # Sauvegarder dans le répertoire d'auto-sauvegarde
-        result = self.save_game("auto", auto_save_name)
-        
-        # Gérer le nombre d'auto-sauvegardes
-        self._manage_auto_saves()
-        
-        return result
+        if self.autosave_worker is None:
+            return True
+        return self.autosave_worker.flush(timeout)
     
     def _manage_save_versions(self, slot_dir: str) -> None:
         """
@@ -376,38 +1241,65 @@ class SaveManager:
         Args:
             slot_dir: Répertoire du slot à gérer
         """
-        # Lister les fichiers du slot
-        if not os.path.exists(slot_dir):
-            return
-            
-        save_files = [f for f in os.listdir(slot_dir) if f.endswith('.mkrp')]
-        
-        # Si le nombre de sauvegardes dépasse la limite, supprimer les plus anciennes
-        if len(save_files) > self.max_saves_per_slot:
-            # Trier par date de modification
-            save_files.sort(key=lambda x: os.path.getmtime(os.path.join(slot_dir, x)))
-            
-            # Supprimer les plus anciennes
-            for i in range(len(save_files) - self.max_saves_per_slot):
-                os.remove(os.path.join(slot_dir, save_files[i]))
+        self._prune_saves(slot_dir, self.max_saves_per_slot)
     
     def _manage_auto_saves(self) -> None:
         """Limite le nombre d'auto-sauvegardes"""
+        self._prune_saves(self.auto_save_directory, self.max_auto_saves)
+    
+    def _group_chains(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Regroupe les fichiers d'un slot par sauvegarde logique
+        
+        Args:
+            files: Fichiers du slot dans le catalogue
+        
+        Returns:
+            Nom du fichier de base -> fichiers de la chaîne (base puis deltas)
+        """
+        chains = {}
+        for file_name in sorted(files):
+            base_file, _ = self._split_delta_name(file_name)
+            chains.setdefault(base_file, []).append(file_name)
+        return chains
+    
+    def _prune_saves(self, directory: str, limit: int) -> None:
+        """
+        Supprime les sauvegardes les plus anciennes d'un répertoire au-delà d'une limite
+        
+        Une chaîne (sauvegarde complète et ses deltas) compte pour une seule sauvegarde
+        et est supprimée en entier.
+        
+        Args:
+            directory: Répertoire du slot
+            limit: Nombre maximum de sauvegardes logiques
+        """
+        if self.database:
+            self.database.prune(os.path.basename(directory), limit)
+            return
+        
         # Vérifier si le répertoire existe
-        if not os.path.exists(self.auto_save_directory):
+        if not os.path.exists(directory):
             return
-            
-        # Lister les auto-sauvegardes
-        auto_saves = [f for f in os.listdir(self.auto_save_directory) if f.endswith('.mkrp')]
         
-        # Si le nombre dépasse la limite, supprimer les plus anciennes
-        if len(auto_saves) > self.max_auto_saves:
-            # Trier par date de modification
-            auto_saves.sort(key=lambda x: os.path.getmtime(os.path.join(self.auto_save_directory, x)))
-            
-            # Supprimer les plus anciennes
-            for i in range(len(auto_saves) - self.max_auto_saves):
-                os.remove(os.path.join(self.auto_save_directory, auto_saves[i]))
+        # Sous verrou: le catalogue est relu après les publications des autres processus
+        with self._metadata_batch(), self.slot_locks.lock(directory):
+            catalog_files = self.catalog.files(os.path.basename(directory))
+            chains = self._group_chains(catalog_files)
+            
+            # Si le nombre de sauvegardes dépasse la limite, supprimer les plus anciennes
+            if len(chains) > limit:
+                # Trier par date de modification du fichier le plus récent de chaque chaîne (dates du catalogue)
+                ordered = sorted(chains.values(), key=lambda files: max(catalog_files[f]["mtime_ns"] for f in files))
+                
+                # Supprimer les plus anciennes
+                for files in ordered[:len(chains) - limit]:
+                    for file_name in files:
+                        file_path = os.path.join(directory, file_name)
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                        self.catalog.forget(file_path)
+                self._sync_directory(directory)
     
     def load_game(self, save_path: str) -> Dict[str, Any]:
         """
@@ -421,34 +1313,20 @@ class SaveManager:
         """
         try:
             # Vérifier que le fichier existe
-            if not os.path.exists(save_path):
+            if not self._save_exists(save_path):
                 return {
                     "success": False,
                     "message": f"Fichier de sauvegarde introuvable: {save_path}"
                 }
             
-            # Lire le fichier
-            with open(save_path, 'rb') as f:
-                # Vérifier la signature
-                signature = f.read(4)
-                if signature != b'MKRP':
-                    return {
-                        "success": False,
-                        "message": "Format de fichier de sauvegarde invalide"
-                    }
-                
-                # Lire la taille des métadonnées
-                meta_size_bytes = f.read(4)
-                meta_size = int.from_bytes(meta_size_bytes, byteorder='little')
-                
-                # Sauter les métadonnées, on les récupérera avec les données complètes
-                f.seek(8 + meta_size)  # 4 (signature) + 4 (taille) + meta_size
-                
-                # Lire les données complètes
-                compressed_data = f.read()
-            
-            # Décompresser et déchiffrer les données
-            save_data = self._decompress_data(compressed_data)
+            # Lire le fichier et rejouer sa chaîne de deltas le cas échéant
+            try:
+                save_data, base_path, sequence = self._load_chain(save_path)
+            except ValueError as e:
+                return {
+                    "success": False,
+                    "message": str(e)
+                }
             
             # Vérifier que les données sont valides
             if not save_data or "metadata" not in save_data:
@@ -457,20 +1335,51 @@ class SaveManager:
                     "message": "Données de sauvegarde corrompues ou invalides"
                 }
             
+            # Mettre à jour les sauvegardes des versions précédentes
+            save_version = save_data["metadata"].get("game_version", "0.0.0")
+            migrated = False
+            if migrations.needs_migration(save_version):
+                try:
+                    save_data = migrations.migrate(save_data)
+                    migrated = True
+                except ValueError as e:
+                    print(f"Avertissement: sauvegarde v{save_version} chargée sans migration ({e})")
+            
             # Mettre à jour les métadonnées actuelles
             self.current_save_metadata = save_data["metadata"]
             
+            # Les prochains deltas prolongent la chaîne seulement si on a chargé son dernier fichier
+            deltas = [] if self.database else self._list_deltas(base_path)
+            slot_name = os.path.basename(os.path.dirname(base_path))
+            # (une sauvegarde migrée repart d'une sauvegarde complète à la nouvelle version)
+            if self.delta_saves and not self.database and not migrated and (not deltas or deltas[-1][0] == sequence):
+                self.delta_chains[slot_name] = {
+                    "slot": slot_name,
+                    "save_name": save_data["metadata"].get("save_name") or os.path.basename(base_path)[:-len('.mkrp')],
+                    "base_path": base_path,
+                    "sequence": sequence,
+                    "bytes": sum(os.path.getsize(path) for _, path in deltas),
+                    "fingerprints": self._section_fingerprints(save_data)
+                }
+            else:
+                self.delta_chains.pop(slot_name, None)
+            
             # Réinitialiser le compteur de temps de jeu pour la nouvelle session
             self._reset_play_time_counter()
             
             # Si un objet de jeu est connecté, restaurer son état
             if self.game:
                 self._restore_game_state(save_data)
+                
+                # Nouvelle ligne de temps: on ne revient pas en arrière au-delà de la partie chargée
+                self.timeline.clear()
+                self.record_turn()
             
             return {
                 "success": True,
                 "message": f"Jeu chargé avec succès depuis {os.path.basename(save_path)}",
-                "save_data": save_data
+                "save_data": save_data,
+                "migrated": migrated
             }
         except Exception as e:
             return {
@@ -485,6 +1394,25 @@ class SaveManager:
         Returns:
             Dictionnaire indiquant le succès ou l'échec du chargement
         """
+        # Sauvegarde rapide de cette session: restaurée depuis la mémoire
+        if self.timeline.quick:
+            self._restore_snapshot(self.timeline.quick["snapshot"])
+            self.timeline.record(self.timeline.quick["turn"], self.timeline.quick["snapshot"])
+            return {
+                "success": True,
+                "message": "Sauvegarde rapide chargée",
+                "turn": self.timeline.quick["turn"]
+            }
+        
+        if self.database:
+            quick_saves = self.database.list("quicksave")
+            if not quick_saves:
+                return {
+                    "success": False,
+                    "message": "Aucune sauvegarde rapide disponible"
+                }
+            return self.load_game(self._database_save_path("quicksave", quick_saves[0]["name"]))
+        
         quick_save_dir = os.path.join(self.save_directory, "quicksave")
         
         # Vérifier que le répertoire existe
@@ -495,7 +1423,8 @@ class SaveManager:
             }
         
         # Lister les sauvegardes rapides
-        quick_saves = [f for f in os.listdir(quick_save_dir) if f.endswith('.mkrp')]
+        catalog_files = self.catalog.files("quicksave")
+        quick_saves = list(catalog_files)
         
         if not quick_saves:
             return {
@@ -504,7 +1433,7 @@ class SaveManager:
             }
         
         # Trier par date de modification (la plus récente en premier)
-        quick_saves.sort(key=lambda x: os.path.getmtime(os.path.join(quick_save_dir, x)), reverse=True)
+        quick_saves.sort(key=lambda x: catalog_files[x]["mtime_ns"], reverse=True)
         
         # Charger la sauvegarde la plus récente
         return self.load_game(os.path.join(quick_save_dir, quick_saves[0]))
@@ -526,6 +1455,10 @@ class SaveManager:
             if hasattr(self.game, key):
                 setattr(self.game, key, value)
         
+        # Reprendre le décompte des tours de la sauvegarde
+        if hasattr(self.game, "turn_count"):
+            self.game.turn_count = save_data.get("metadata", {}).get("turn", 0)
+        
         # Restaurer les quêtes
         quests = save_data.get("quests", {})
         if hasattr(self.game, "active_quests"):
@@ -599,35 +1532,22 @@ class SaveManager:
         saves_info = []
         
         try:
+            if self.database:
+                # Une requête sur l'index (slot, date), sans lire les sections
+                saves_info = [self._database_info(row) for row in self.database.list(slot_name or None)]
+                saves_info.sort(key=lambda x: x.get("metadata", {}).get("last_save_time", ""), reverse=True)
+                return saves_info
+            
             # Si un slot spécifique est demandé
             if slot_name:
-                slot_path = os.path.join(self.save_directory, slot_name)
-                if os.path.exists(slot_path) and os.path.isdir(slot_path):
-                    save_files = [f for f in os.listdir(slot_path) if f.endswith('.mkrp')]
-                    
-                    for save_file in save_files:
-                        save_path = os.path.join(slot_path, save_file)
-                        save_info = self._get_save_info(save_path)
-                        save_info["slot_name"] = slot_name
-                        saves_info.append(save_info)
-            # Sinon, lister toutes les sauvegardes
+                slots = {slot_name: self.catalog.files(slot_name)}
+            # Sinon, lister toutes les sauvegardes (slots connus du catalogue)
             else:
-                # Parcourir tous les slots
-                for item in os.listdir(self.save_directory):
-                    slot_path = os.path.join(self.save_directory, item)
-                    
-                    # Ignorer les fichiers, ne traiter que les répertoires
-                    if not os.path.isdir(slot_path):
-                        continue
-                    
-                    # Lister les sauvegardes de ce slot
-                    save_files = [f for f in os.listdir(slot_path) if f.endswith('.mkrp')]
-                    
-                    for save_file in save_files:
-                        save_path = os.path.join(slot_path, save_file)
-                        save_info = self._get_save_info(save_path)
-                        save_info["slot_name"] = item
-                        saves_info.append(save_info)
+                slots = self.catalog.all_files()
+            
+            for item, catalog_files in slots.items():
+                slot_path = os.path.join(self.save_directory, item)
+                saves_info.extend(self._list_slot_saves(slot_path, item, catalog_files))
             
             # Trier par date de modification (la plus récente en premier)
             saves_info.sort(key=lambda x: x.get("metadata", {}).get("last_save_time", ""), reverse=True)
@@ -638,6 +1558,54 @@ class SaveManager:
             print(f"Erreur lors du listage des sauvegardes: {e}")
             return []
     
+    def _list_slot_saves(self, slot_path: str, slot_name: str,
+                         catalog_files: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Liste les sauvegardes logiques d'un slot
+        
+        Une sauvegarde complète et ses deltas forment une seule entrée: ses métadonnées sont
+        celles du dernier delta, qui est aussi le fichier à charger ("path").
+        
+        Args:
+            slot_path: Répertoire du slot
+            slot_name: Nom du slot
+            catalog_files: Fichiers du slot dans le catalogue
+            
+        Returns:
+            Liste des informations sur les sauvegardes du slot
+        """
+        saves_info = []
+        for base_file, files in self._group_chains(catalog_files).items():
+            # Des deltas sans leur sauvegarde de base ne peuvent pas être chargés
+            if base_file not in files:
+                continue
+            
+            deltas = sorted((self._split_delta_name(f)[1], f) for f in files if f != base_file)
+            tip_file = deltas[-1][1] if deltas else base_file
+            
+            save_info = self._catalog_info(os.path.join(slot_path, tip_file), catalog_files[tip_file])
+            save_info["slot_name"] = slot_name
+            save_info["base_path"] = os.path.join(slot_path, base_file)
+            save_info["chain_length"] = len(files)
+            save_info["path"] = save_info["file_path"]
+            save_info["name"] = save_info.get("metadata", {}).get("save_name") or base_file[:-len('.mkrp')]
+            if "error" not in save_info:
+                save_info["file_size"] = sum(catalog_files[f]["size"] for f in files)
+            saves_info.append(save_info)
+        return saves_info
+    
+    @staticmethod
+    def _catalog_info(save_path: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Informations d'une sauvegarde au format de _get_save_info, depuis son entrée du catalogue"""
+        if "error" in entry:
+            return {"error": entry["error"], "file_path": save_path}
+        return {
+            "metadata": entry.get("metadata", {}),
+            "file_path": save_path,
+            "file_size": entry["size"],
+            "last_modified": datetime.fromtimestamp(entry["mtime_ns"] / 1e9).strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
     def delete_save(self, save_path: str) -> Dict[str, Any]:
         """
         Supprime une sauvegarde
@@ -650,14 +1618,31 @@ class SaveManager:
         """
         try:
             # Vérifier que le fichier existe
-            if not os.path.exists(save_path):
+            if not self._save_exists(save_path):
                 return {
                     "success": False,
                     "message": f"Fichier de sauvegarde introuvable: {save_path}"
                 }
             
-            # Supprimer le fichier
-            os.remove(save_path)
+            if self.database:
+                self.database.delete(*self._database_key(save_path))
+                return {
+                    "success": True,
+                    "message": f"Sauvegarde supprimée: {os.path.basename(save_path)}"
+                }
+            
+            # Supprimer le fichier et les deltas qui en dépendent
+            base_file, sequence = self._split_delta_name(os.path.basename(save_path))
+            with self._metadata_batch(), self.slot_locks.lock(os.path.dirname(save_path)):
+                self._delete_deltas(os.path.join(os.path.dirname(save_path), base_file), sequence + 1)
+                os.remove(save_path)
+                self.catalog.forget(save_path)
+                self._sync_directory(os.path.dirname(save_path))
+            
+            slot_name = os.path.basename(os.path.dirname(save_path))
+            chain = self.delta_chains.get(slot_name)
+            if chain and os.path.basename(chain["base_path"]) == base_file:
+                del self.delta_chains[slot_name]
             
             return {
                 "success": True,
@@ -669,10 +1654,20 @@ class SaveManager:
                 "message": f"Erreur lors de la suppression: {str(e)}"
             }
     
+    def _chain_files(self, save_path: str) -> List[str]:
+        """Fichiers nécessaires pour charger une sauvegarde: sa base puis les deltas jusqu'à elle"""
+        directory = os.path.dirname(save_path)
+        base_file, sequence = self._split_delta_name(os.path.basename(save_path))
+        base_path = os.path.join(directory, base_file)
+        return [base_path] + [path for number, path in self._list_deltas(base_path) if number <= sequence]
+    
     def export_save(self, save_path: str, export_path: str = None) -> Dict[str, Any]:
         """
         Exporte une sauvegarde vers un fichier externe
         
+        Une sauvegarde incrémentale est exportée avec sa chaîne (sauvegarde de base et
+        deltas) dans une archive ZIP, que import_save sait relire.
+        
         Args:
             save_path: Chemin du fichier de sauvegarde à exporter
             export_path: Chemin du fichier d'exportation (si non fourni, utilise le nom du fichier)
@@ -682,19 +1677,36 @@ class SaveManager:
         """
         try:
             # Vérifier que le fichier source existe
-            if not os.path.exists(save_path):
+            if not self._save_exists(save_path):
                 return {
                     "success": False,
                     "message": f"Fichier de sauvegarde introuvable: {save_path}"
                 }
             
-            # Si aucun chemin d'exportation n'est fourni, créer un nom dans le répertoire courant
-            if not export_path:
-                base_name = os.path.basename(save_path)
-                export_path = f"export_{base_name}"
+            if self.database:
+                # Une sauvegarde de la base est exportée en fichier .mkrp (lisible par import_save)
+                export_path = export_path or f"export_{os.path.basename(save_path)}"
+                save_data, _, _ = self._load_chain(save_path)
+                self._write_save_file(export_path, save_data, catalog=False)
+                return {
+                    "success": True,
+                    "message": f"Sauvegarde exportée vers: {export_path}",
+                    "export_path": export_path
+                }
             
-            # Copier le fichier
-            shutil.copy2(save_path, export_path)
+            chain = self._chain_files(save_path)
+            if len(chain) == 1:
+                # Si aucun chemin d'exportation n'est fourni, créer un nom dans le répertoire courant
+                if not export_path:
+                    base_name = os.path.basename(save_path)
+                    export_path = f"export_{base_name}"
+                
+                # Copier le fichier
+                shutil.copy2(save_path, export_path)
+            else:
+                if not export_path:
+                    export_path = f"export_{os.path.basename(chain[0])[:-len('.mkrp')]}.zip"
+                self._write_archive(export_path, chain)
             
             return {
                 "success": True,
@@ -707,13 +1719,113 @@ class SaveManager:
                 "message": f"Erreur lors de l'exportation: {str(e)}"
             }
     
-    def import_save(self, import_path: str, slot_name: str = "imported") -> Dict[str, Any]:
+    def export_slot(self, slot_name: str, export_path: str = None, workers: int = None) -> Dict[str, Any]:
+        """
+        Exporte toutes les sauvegardes d'un slot dans une archive ZIP
+        
+        Args:
+            slot_name: Slot à exporter
+            export_path: Chemin de l'archive (export_<slot>.zip si non fourni)
+            workers: Nombre de threads de lecture (valeur par défaut de ThreadPoolExecutor si None)
+            
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec de l'exportation
+        """
+        try:
+            export_path = export_path or f"export_{slot_name}.zip"
+            if self.database:
+                return self._export_database_slot(slot_name, export_path, workers)
+            
+            slot_dir = os.path.join(self.save_directory, slot_name)
+            files = [os.path.join(slot_dir, file_name) for file_name in sorted(self.catalog.files(slot_name))]
+            if not files:
+                return {
+                    "success": False,
+                    "message": f"Aucune sauvegarde dans le slot {slot_name}"
+                }
+            
+            with self.save_lock:
+                self._write_archive(export_path, files, workers)
+            
+            return {
+                "success": True,
+                "message": f"Slot {slot_name} exporté vers: {export_path} ({len(files)} fichiers)",
+                "export_path": export_path,
+                "file_count": len(files)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de l'exportation: {str(e)}"
+            }
+    
+    def _export_database_slot(self, slot_name: str, export_path: str, workers: int = None) -> Dict[str, Any]:
+        """
+        Exporte les sauvegardes d'un slot de la base (voir export_slot)
+        
+        Chaque ligne est écrite en fichier .mkrp daté de la sauvegarde dans un dossier
+        temporaire, puis l'archive est construite comme pour le stockage en fichiers.
+        """
+        rows = self.database.list(slot_name)
+        if not rows:
+            return {
+                "success": False,
+                "message": f"Aucune sauvegarde dans le slot {slot_name}"
+            }
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files = []
+            for row in rows:
+                file_path = os.path.join(temp_dir, f"{row['name']}.mkrp")
+                self._write_save_file(file_path, self.database.read(slot_name, row["name"]), catalog=False)
+                os.utime(file_path, (row["saved_at"], row["saved_at"]))
+                files.append(file_path)
+            self._write_archive(export_path, sorted(files), workers)
+        
+        return {
+            "success": True,
+            "message": f"Slot {slot_name} exporté vers: {export_path} ({len(files)} fichiers)",
+            "export_path": export_path,
+            "file_count": len(files)
+        }
+    
+    @staticmethod
+    def _write_archive(archive_path: str, files: List[str], workers: int = None) -> None:
+        """
+        Écrit une archive ZIP de fichiers de sauvegarde (à plat, par nom de fichier)
+        
+        Les fichiers sont lus par un groupe de threads, par lots pour borner la mémoire,
+        pendant que l'archive est écrite. Les .mkrp étant déjà compressés, ils sont stockés tels quels.
+        """
+        def read(path: str) -> Tuple[str, bytes, float]:
+            with open(path, 'rb') as f:
+                return path, f.read(), os.path.getmtime(path)
+        
+        temp_path = f"{archive_path}.tmp"
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor, \
+                    zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_STORED) as zipf:
+                for start in range(0, len(files), ARCHIVE_BATCH_SIZE):
+                    for path, content, mtime in executor.map(read, files[start:start + ARCHIVE_BATCH_SIZE]):
+                        info = zipfile.ZipInfo(os.path.basename(path), datetime.fromtimestamp(mtime).timetuple()[:6])
+                        zipf.writestr(info, content)
+            os.replace(temp_path, archive_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def import_save(self, import_path: str, slot_name: str = "imported", workers: int = None) -> Dict[str, Any]:
         """
         Importe une sauvegarde depuis un fichier externe
         
+        Accepte un fichier .mkrp ou une archive ZIP produite par export_save ou export_slot
+        (ses fichiers sont extraits en parallèle directement dans le slot).
+        
         Args:
             import_path: Chemin du fichier de sauvegarde à importer
             slot_name: Nom du slot où importer la sauvegarde
+            workers: Nombre de threads d'extraction pour une archive
             
         Returns:
             Dictionnaire indiquant le succès ou l'échec de l'importation
@@ -726,6 +1838,26 @@ class SaveManager:
                     "message": f"Fichier à importer introuvable: {import_path}"
                 }
             
+            if self.database:
+                return self._import_into_database(import_path, slot_name, workers)
+            
+            # Créer le répertoire du slot s'il n'existe pas
+            slot_dir = os.path.join(self.save_directory, slot_name)
+            
+            if zipfile.is_zipfile(import_path):
+                os.makedirs(slot_dir, exist_ok=True)
+                with self.save_lock:
+                    restored = self._extract_archive(
+                        import_path, lambda name, _: os.path.join(slot_dir, os.path.basename(name)), workers
+                    )
+                    self._manage_save_versions(slot_dir)
+                return {
+                    "success": True,
+                    "message": f"{restored} fichiers importés dans le slot {slot_name}",
+                    "import_path": slot_dir,
+                    "imported_files": restored
+                }
+            
             # Vérifier que c'est bien un fichier de sauvegarde valide
             with open(import_path, 'rb') as f:
                 signature = f.read(4)
@@ -735,8 +1867,6 @@ class SaveManager:
                         "message": "Format de fichier de sauvegarde invalide"
                     }
             
-            # Créer le répertoire du slot s'il n'existe pas
-            slot_dir = os.path.join(self.save_directory, slot_name)
             os.makedirs(slot_dir, exist_ok=True)
             
             # Nom du fichier importé
@@ -760,41 +1890,146 @@ class SaveManager:
                 "message": f"Erreur lors de l'importation: {str(e)}"
             }
     
-    def create_backup(self) -> Dict[str, Any]:
+    def _import_into_database(self, import_path: str, slot_name: str, workers: int = None) -> Dict[str, Any]:
+        """
+        Importe un fichier .mkrp ou une archive ZIP dans la base (voir import_save)
+        
+        Les fichiers de l'archive sont extraits dans un dossier temporaire; chaque chaîne
+        (sauvegarde complète et deltas) devient une sauvegarde de la base, datée de son dernier fichier.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if zipfile.is_zipfile(import_path):
+                self._extract_archive(import_path, lambda name, _: os.path.join(temp_dir, os.path.basename(name)), workers)
+                chains = []
+                for file_name in sorted(os.listdir(temp_dir)):
+                    if file_name.endswith('.mkrp') and not self._split_delta_name(file_name)[1]:
+                        base_path = os.path.join(temp_dir, file_name)
+                        deltas = self._list_deltas(base_path)
+                        chains.append((file_name[:-len('.mkrp')], deltas[-1][1] if deltas else base_path))
+            else:
+                chains = [(f"imported_{datetime.now().strftime('%Y%m%d_%H%M%S')}", import_path)]
+            
+            with self.save_lock:
+                imported = []
+                with self.database.transaction():
+                    for name, last_path in chains:
+                        save_data, _, _ = self._replay_chain(last_path)
+                        if not save_data or "metadata" not in save_data:
+                            raise ValueError(f"Données de sauvegarde corrompues ou invalides: {os.path.basename(last_path)}")
+                        imported.append(self.database.write(slot_name, name, self.codec, save_data, unique=True,
+                                                            saved_at=os.path.getmtime(last_path)))
+                self._manage_save_versions(os.path.join(self.save_directory, slot_name))
+        
+        if not imported:
+            return {
+                "success": False,
+                "message": "Aucune sauvegarde à importer"
+            }
+        return {
+            "success": True,
+            "message": f"{len(imported)} sauvegardes importées dans le slot {slot_name}",
+            "import_path": self._database_save_path(slot_name, imported[-1]),
+            "imported_files": len(imported)
+        }
+    
+    def _extract_archive(self, archive_path: str, destination, workers: int = None) -> int:
+        """
+        Extrait les fichiers .mkrp d'une archive ZIP directement à leur emplacement final
+        
+        Chaque thread ouvre sa propre lecture de l'archive: les membres compressés sont
+        décompressés en parallèle (zlib libère le GIL).
+        
+        Args:
+            archive_path: Archive ZIP
+            destination: Fonction (nom du membre, date du membre) -> chemin de destination,
+                         ou None pour ignorer le membre
+            workers: Nombre de threads (valeur par défaut de ThreadPoolExecutor si None)
+            
+        Returns:
+            Nombre de fichiers extraits
+        """
+        local = threading.local()
+        
+        def extract(item: Tuple[zipfile.ZipInfo, str]) -> None:
+            member, dest_path = item
+            if not hasattr(local, "zipf"):
+                local.zipf = zipfile.ZipFile(archive_path, 'r')
+                opened.append(local.zipf)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            temp_path = f"{dest_path}.{threading.get_ident()}.tmp"
+            with local.zipf.open(member) as source, open(temp_path, 'wb') as target:
+                shutil.copyfileobj(source, target)
+            mtime = datetime(*member.date_time).timestamp()
+            os.utime(temp_path, (mtime, mtime))
+            os.replace(temp_path, dest_path)
+        
+        with zipfile.ZipFile(archive_path, 'r') as zipf:
+            members = []
+            for member in zipf.infolist():
+                if member.is_dir() or not member.filename.endswith('.mkrp'):
+                    continue
+                dest_path = destination(member.filename, datetime(*member.date_time))
+                if dest_path:
+                    members.append((member, dest_path))
+        
+        opened = []
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(extract, members))
+        finally:
+            for zipf in opened:
+                zipf.close()
+        return len(members)
+    
+    def _backup_store(self) -> BackupStore:
+        """Stockage des sauvegardes de secours (saves/backup)"""
+        return BackupStore(os.path.join(self.save_directory, "backup"))
+    
+    def _list_save_files(self) -> List[str]:
+        """Chemins relatifs de tous les fichiers de sauvegarde (hors sauvegardes de secours)"""
+        excluded = {os.path.join(self.save_directory, "backup"), os.path.join(self.save_directory, "temp_restore")}
+        rel_paths = []
+        for root, dirs, files in os.walk(self.save_directory):
+            # Ignorer le répertoire backup lui-même pour éviter la récursion
+            dirs[:] = [d for d in dirs if os.path.join(root, d) not in excluded]
+            for file in files:
+                if file.endswith('.mkrp'):
+                    rel_paths.append(os.path.relpath(os.path.join(root, file), self.save_directory))
+        return sorted(rel_paths)
+    
+    def create_backup(self, workers: int = None) -> Dict[str, Any]:
         """
-        Crée une sauvegarde de tous les fichiers de sauvegarde
+        Crée une sauvegarde de secours de tous les fichiers de sauvegarde
+        
+        Seuls les fichiers nouveaux ou modifiés depuis la précédente sauvegarde de secours
+        sont copiés (stockage dédupliqué par empreinte du contenu). Avec le stockage SQLite,
+        la sauvegarde de secours contient une copie cohérente de la base (saves.db).
+        
+        Args:
+            workers: Nombre de threads de copie (valeur par défaut de ThreadPoolExecutor si None)
         
         Returns:
             Dictionnaire indiquant le succès ou l'échec de la sauvegarde
         """
         try:
-            # Créer un dossier de backup s'il n'existe pas
-            backup_dir = os.path.join(self.save_directory, "backup")
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # Nom du fichier de sauvegarde
-            backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-            backup_path = os.path.join(backup_dir, backup_name)
-            
-            # Créer une archive ZIP de toutes les sauvegardes
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Ajouter tous les fichiers de sauvegarde
-                for root, _, files in os.walk(self.save_directory):
-                    # Ignorer le répertoire backup lui-même pour éviter la récursion
-                    if root == backup_dir:
-                        continue
-                        
-                    for file in files:
-                        if file.endswith('.mkrp'):
-                            file_path = os.path.join(root, file)
-                            # Ajouter le fichier à l'archive avec un chemin relatif
-                            arcname = os.path.relpath(file_path, self.save_directory)
-                            zipf.write(file_path, arcname)
-            
+            # Pas d'écriture de sauvegarde pendant la copie: chaque chaîne de deltas reste cohérente
+            with self.save_lock:
+                if self.database:
+                    with tempfile.TemporaryDirectory() as temp_dir:
+                        self.database.backup(os.path.join(temp_dir, DATABASE_FILE))
+                        summary = self._backup_store().create(temp_dir, [DATABASE_FILE], workers=workers)
+                else:
+                    summary = self._backup_store().create(self.save_directory, self._list_save_files(), workers=workers)
+            
+            backup_name = os.path.basename(summary["manifest_path"])[:-len('.json')]
             return {
                 "success": True,
-                "message": f"Sauvegarde créée: {backup_name}",
-                "backup_path": backup_path
+                "message": f"Sauvegarde créée: {backup_name} ({summary['new_files']} fichiers copiés, "
+                           f"{summary['reused_files']} inchangés)",
+                "backup_path": summary["manifest_path"],
+                "new_files": summary["new_files"],
+                "reused_files": summary["reused_files"],
+                "bytes_written": summary["bytes_written"]
             }
         except Exception as e:
             return {
@@ -802,53 +2037,101 @@ class SaveManager:
                 "message": f"Erreur lors de la création de la sauvegarde: {str(e)}"
             }
     
-    def restore_backup(self, backup_path: str) -> Dict[str, Any]:
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """
+        Liste les sauvegardes de secours (la plus récente en premier)
+        
+        Returns:
+            Liste de {"name", "backup_path", "created", "file_count", "total_size"}
+        """
+        store = self._backup_store()
+        backups = []
+        for manifest_path in reversed(store.list_manifests()):
+            try:
+                manifest = store.read_manifest(manifest_path)
+            except ValueError:
+                continue
+            backups.append({
+                "name": os.path.basename(manifest_path)[:-len('.json')],
+                "backup_path": manifest_path,
+                "created": manifest.get("created"),
+                "file_count": len(manifest["files"]),
+                "total_size": sum(entry["size"] for entry in manifest["files"].values())
+            })
+        return backups
+    
+    def delete_backup(self, backup_path: str) -> Dict[str, Any]:
         """
-        Restaure une sauvegarde à partir d'une archive
+        Supprime une sauvegarde de secours et les fichiers qu'elle seule conservait
         
         Args:
-            backup_path: Chemin du fichier de sauvegarde à restaurer
+            backup_path: Manifeste (chemin ou nom de la sauvegarde de secours)
             
         Returns:
-            Dictionnaire indiquant le succès ou l'échec de la restauration
+            Dictionnaire indiquant le succès ou l'échec de la suppression
         """
         try:
-            # Vérifier que le fichier existe
-            if not os.path.exists(backup_path):
-                return {
-                    "success": False,
-                    "message": f"Fichier de sauvegarde introuvable: {backup_path}"
-                }
+            removed = self._backup_store().delete(backup_path)
+            return {
+                "success": True,
+                "message": f"Sauvegarde de secours supprimée ({removed} fichiers libérés)"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de la suppression: {str(e)}"
+            }
+    
+    def restore_backup(self, backup_path: str, slots: List[str] = None, since=None, until=None,
+                       workers: int = None) -> Dict[str, Any]:
+        """
+        Restaure une sauvegarde de secours, entièrement ou en partie
+        
+        Les fichiers sont écrits en parallèle directement à leur emplacement final. Les
+        anciennes archives ZIP (backup_*.zip) sont lues membre par membre, sans extraction préalable.
+        Une copie de la base SQLite (saves.db) n'est restaurée que si aucun slot n'est précisé;
+        elle remplace alors la base en entier et le stockage redevient "sqlite".
+        
+        Args:
+            backup_path: Manifeste (chemin ou nom) ou ancienne archive ZIP
+            slots: Slots à restaurer (tous si None)
+            since: Restaure seulement les fichiers modifiés à partir de cette date
+                   (datetime ou "AAAA-MM-JJ[ HH:MM:SS]")
+            until: Restaure seulement les fichiers modifiés jusqu'à cette date
+            workers: Nombre de threads (valeur par défaut de ThreadPoolExecutor si None)
             
-            # Créer un répertoire temporaire pour l'extraction
-            temp_dir = os.path.join(self.save_directory, "temp_restore")
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            os.makedirs(temp_dir)
-            
-            # Extraire l'archive
-            with zipfile.ZipFile(backup_path, 'r') as zipf:
-                zipf.extractall(temp_dir)
-            
-            # Copier les fichiers extraits vers les slots appropriés
-            restored_files = 0
-            for root, _, files in os.walk(temp_dir):
-                for file in files:
-                    if file.endswith('.mkrp'):
-                        # Déterminer le chemin source et destination
-                        src_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(src_path, temp_dir)
-                        
-                        # Créer le répertoire de destination s'il n'existe pas
-                        dest_dir = os.path.dirname(os.path.join(self.save_directory, rel_path))
-                        os.makedirs(dest_dir, exist_ok=True)
-                        
-                        # Copier le fichier
-                        shutil.copy2(src_path, os.path.join(self.save_directory, rel_path))
-                        restored_files += 1
-            
-            # Supprimer le répertoire temporaire
-            shutil.rmtree(temp_dir)
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec de la restauration
+        """
+        try:
+            selected = self._backup_filter(slots, since, until)
+            with self.save_lock:
+                if backup_path.endswith('.zip'):
+                    # Vérifier que le fichier existe
+                    if not os.path.exists(backup_path):
+                        return {
+                            "success": False,
+                            "message": f"Fichier de sauvegarde introuvable: {backup_path}"
+                        }
+                    restored_files = self._restore_zip(backup_path, selected, workers)
+                else:
+                    # Une copie de la base remplace saves.db: la connexion est rouverte ensuite
+                    if self.database:
+                        self.database.close()
+                        self.database = None
+                    try:
+                        restored = self._backup_store().restore(
+                            backup_path, self.save_directory,
+                            lambda rel_path, entry: selected(rel_path, entry["mtime_ns"] / 1e9),
+                            workers
+                        )
+                    finally:
+                        self._reopen_database()
+                    restored_files = len(restored)
+                
+                # Les fichiers écrasés gardent leur nom: le catalogue doit les relire
+                self.catalog.invalidate()
+                self.delta_chains = {}
             
             return {
                 "success": True,
@@ -861,6 +2144,152 @@ class SaveManager:
                 "message": f"Erreur lors de la restauration: {str(e)}"
             }
     
+    @staticmethod
+    def _parse_date(value) -> Optional[float]:
+        """Convertit une date (datetime ou "AAAA-MM-JJ[ HH:MM:SS]") en horodatage"""
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.timestamp()
+        for date_format in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+            try:
+                return datetime.strptime(value, date_format).timestamp()
+            except ValueError:
+                continue
+        raise ValueError(f"Date invalide: {value}")
+    
+    def _backup_filter(self, slots: List[str] = None, since=None, until=None):
+        """
+        Construit le filtre de restauration (chemin relatif, date de modification) -> bool
+        
+        Args:
+            slots: Slots à restaurer (tous si None)
+            since: Date minimale de modification
+            until: Date maximale de modification
+        """
+        since, until = self._parse_date(since), self._parse_date(until)
+        slots = set(slots) if slots else None
+        
+        def selected(rel_path: str, mtime: float) -> bool:
+            slot = rel_path.replace('\\', '/').split('/')[0]
+            if slots is not None and slot not in slots:
+                return False
+            if since is not None and mtime < since:
+                return False
+            if until is not None and mtime > until:
+                return False
+            return True
+        return selected
+    
+    def _restore_zip(self, backup_path: str, selected, workers: int = None) -> int:
+        """
+        Restaure une ancienne archive ZIP membre par membre
+        
+        Args:
+            backup_path: Archive ZIP
+            selected: Filtre (chemin relatif, date de modification) -> bool
+            workers: Nombre de threads
+        
+        Returns:
+            Nombre de fichiers restaurés
+        """
+        save_root = os.path.abspath(self.save_directory)
+        
+        def destination(name: str, modified: datetime) -> Optional[str]:
+            # Ignorer les chemins qui sortiraient du répertoire des sauvegardes
+            dest_path = os.path.abspath(os.path.join(save_root, name))
+            if not dest_path.startswith(save_root + os.sep) or not selected(name, modified.timestamp()):
+                return None
+            return dest_path
+        
+        return self._extract_archive(backup_path, destination, workers)
+    
+    def save_size_report(self, save_path: str = None) -> Dict[str, Any]:
+        """
+        Répartition de la taille d'une sauvegarde par section
+        
+        Args:
+            save_path: Sauvegarde à analyser (état actuel du jeu, après rétention, si None)
+            
+        Returns:
+            Dictionnaire indiquant le succès ou l'échec, avec par section la taille JSON et la
+            taille encodée (codec actuel), le détail de la mémoire de l'IA et les entrées retirées
+            par la rétention (état actuel seulement)
+        """
+        try:
+            if save_path:
+                save_data, _, _ = self._load_chain(save_path)
+                retention = {}
+            else:
+                if not self.game:
+                    return {
+                        "success": False,
+                        "message": "Aucune partie en cours"
+                    }
+                save_data, retention = self.retention.apply(self._get_save_data())
+            
+            def sizes(value: Any) -> Dict[str, int]:
+                return {
+                    "json": len("".join(iter_json(value)).encode('utf-8')),
+                    "encoded": len(self.codec.encode(value))
+                }
+            
+            sections = {"metadata": sizes(save_data.get("metadata", {}))}
+            sections.update((name, sizes(value)) for name, value in split_sections(save_data).items())
+            ai_memory = save_data.get("ai_memory") if isinstance(save_data.get("ai_memory"), dict) else {}
+            report = {
+                "success": True,
+                "sections": dict(sorted(sections.items(), key=lambda item: item[1]["encoded"], reverse=True)),
+                "ai_memory": {name: sizes(value) for name, value in ai_memory.items()},
+                "total_json": sum(size["json"] for size in sections.values()),
+                "total_encoded": sum(size["encoded"] for size in sections.values()),
+                "retention": retention
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de l'analyse de la sauvegarde: {str(e)}"
+            }
+        
+        dropped = sum(retention.values())
+        report["message"] = (f"{report['total_encoded'] / 1024:.1f} Ko encodés ({report['total_json'] / 1024:.1f} Ko de JSON)"
+                             + (f", {dropped} entrée(s) résumée(s) ou retirée(s) par la rétention" if dropped else ""))
+        return report
+    
+    def verify_saves(self, workers: int = None, deep: bool = False) -> Dict[str, Any]:
+        """
+        Vérifie l'intégrité de toutes les sauvegardes (sommes de contrôle, fichiers tronqués, versions)
+        
+        Args:
+            workers: Nombre de processus (nombre de processeurs si None)
+            deep: Décode aussi les sauvegardes protégées par des sommes de contrôle
+            
+        Returns:
+            Dictionnaire indiquant si toutes les sauvegardes sont intactes, avec le bilan de fsck_tree
+        """
+        try:
+            # Une auto-sauvegarde en cours d'écriture n'est pas un fichier corrompu
+            self.wait_for_autosave()
+            if self.database:
+                summary = self.database.verify(deep)
+                for problem in summary["problems"]:
+                    problem["path"] = self._database_save_path(problem["slot"], problem["name"]) if problem["slot"] else self.database.database_path
+            else:
+                summary = fsck_tree(self.save_directory, workers, deep, self.encryption_key.encode('utf-8'))
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de la vérification des sauvegardes: {str(e)}"
+            }
+        
+        problems = len(summary["problems"])
+        summary["success"] = not problems
+        if problems:
+            summary["message"] = f"{problems} sauvegarde(s) endommagée(s) sur {summary['total']}"
+        else:
+            summary["message"] = f"{summary['total']} sauvegardes intactes ({summary['mb_per_second']:.1f} Mo/s)"
+        return summary
+    
     def is_save_compatible(self, save_path: str) -> Dict[str, Any]:
         """
         Vérifie si une sauvegarde est compatible avec la version actuelle du jeu
@@ -873,7 +2302,11 @@ class SaveManager:
         """
         try:
             # Extraire les informations de la sauvegarde
-            save_info = self._get_save_info(save_path)
+            if self.database:
+                row = self.database.info(*self._database_key(save_path))
+                save_info = self._database_info(row) if row else {"error": f"Sauvegarde introuvable: {save_path}"}
+            else:
+                save_info = self._get_save_info(save_path)
             
             # Vérifier s'il y a eu une erreur
             if "error" in save_info:
@@ -893,6 +2326,14 @@ class SaveManager:
                     "message": "La sauvegarde est compatible avec la version actuelle du jeu."
                 }
             
+            # Une sauvegarde plus ancienne est compatible si une migration mène à la version actuelle
+            if migrations.needs_migration(save_version) and migrations.can_migrate(save_version):
+                return {
+                    "compatible": True,
+                    "message": f"La sauvegarde (v{save_version}) sera mise à jour vers la version actuelle (v{current_version}) au chargement.",
+                    "migration": True
+                }
+            
             # Vérifier si la sauvegarde est d'une version antérieure
             # (ici, une comparaison simpliste - dans un vrai jeu, utilisez la sémantique des versions)
             save_v = [int(x) for x in save_version.split('.')]
@@ -0,0 +1,327 @@
+# save_migrations.py - Migration des sauvegardes des anciennes versions pour MUSKO TENSEI RP
+import os
+import sys
+import time
+from typing import Dict, Any, Callable, List, Tuple
+import logging
+
+try:
+    from .save_sections import split_sections, join_sections
+except ImportError:
+    from save_sections import split_sections, join_sections
+
+logger = logging.getLogger("musko_tensei")
+
+# Version des sauvegardes écrites par cette version du jeu
+CURRENT_SAVE_VERSION = "1.1.0"
+
+
+def parse_version(version: str) -> Tuple[int, ...]:
+    """Convertit "1.2.3" en (1, 2, 3) pour comparer les versions"""
+    try:
+        return tuple(int(part) for part in str(version).split("."))
+    except ValueError:
+        return (0,)
+
+
+class MigrationRegistry:
+    """
+    Registre des étapes de migration entre versions du format de sauvegarde
+
+    Chaque étape fait passer une sauvegarde d'une version à la suivante et déclare une
+    fonction par section concernée ("metadata", "player", "world_state", ..., "core").
+    Les sections sont migrées indépendamment: une lecture partielle (load_sections) ne
+    migre que les sections lues.
+    """
+
+    def __init__(self, current_version: str = CURRENT_SAVE_VERSION):
+        self.current_version = current_version
+        # Version de départ -> (version d'arrivée, section -> fonctions)
+        self.steps: Dict[str, Tuple[str, Dict[str, List[Callable]]]] = {}
+
+    def register(self, from_version: str, to_version: str, section: str):
+        """
+        Décorateur enregistrant la migration d'une section entre deux versions
+
+        La fonction reçoit la valeur de la section et le contexte {"sections": sections
+        disponibles, "metadata": métadonnées} et retourne la valeur migrée.
+
+        Args:
+            from_version: Version des sauvegardes à migrer
+            to_version: Version obtenue après cette étape
+            section: Section concernée
+        """
+        if parse_version(to_version) <= parse_version(from_version):
+            raise ValueError(f"Migration invalide: {from_version} -> {to_version}")
+
+        def decorator(function: Callable[[Any, Dict[str, Any]], Any]) -> Callable:
+            target, handlers = self.steps.setdefault(from_version, (to_version, {}))
+            if target != to_version:
+                raise ValueError(f"Migration en conflit depuis {from_version}: {target} et {to_version}")
+            handlers.setdefault(section, []).append(function)
+            return function
+        return decorator
+
+    def path(self, version: str) -> List[Tuple[str, str, Dict[str, List[Callable]]]]:
+        """
+        Retourne les étapes menant d'une version à la version actuelle
+
+        Args:
+            version: Version de la sauvegarde
+
+        Returns:
+            Liste de (version de départ, version d'arrivée, fonctions par section)
+
+        Raises:
+            ValueError: Si aucune migration ne mène à la version actuelle
+        """
+        steps = []
+        current = version
+        while parse_version(current) < parse_version(self.current_version):
+            if current not in self.steps:
+                raise ValueError(f"Aucune migration depuis la version {current}")
+            target, handlers = self.steps[current]
+            steps.append((current, target, handlers))
+            current = target
+        return steps
+
+    def needs_migration(self, version: str) -> bool:
+        """Indique si une sauvegarde de cette version doit être migrée"""
+        return parse_version(version) < parse_version(self.current_version)
+
+    def can_migrate(self, version: str) -> bool:
+        """Indique si une sauvegarde de cette version peut être lue par cette version du jeu"""
+        try:
+            self.path(version)
+        except ValueError:
+            return False
+        return True
+
+    def migrate_sections(self, metadata: Dict[str, Any], sections: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Migre des sections (toutes ou une partie) vers la version actuelle
+
+        Args:
+            metadata: Métadonnées de la sauvegarde (game_version indique la version de départ)
+            sections: Nom de section -> valeur
+
+        Returns:
+            (métadonnées migrées, sections migrées)
+
+        Raises:
+            ValueError: Si la version de la sauvegarde ne peut pas être migrée
+        """
+        version = metadata.get("game_version", "0.0.0")
+        steps = self.path(version)
+        if not steps:
+            return metadata, sections
+
+        metadata = dict(metadata)
+        sections = dict(sections)
+        for _, target, handlers in steps:
+            context = {"sections": sections, "metadata": metadata}
+            for name, functions in handlers.items():
+                for function in functions:
+                    if name == "metadata":
+                        metadata = function(metadata, context)
+                        context["metadata"] = metadata
+                    elif name in sections:
+                        sections[name] = function(sections[name], context)
+            metadata["game_version"] = target
+            if isinstance(sections.get("core"), dict) and "game_version" in sections["core"]:
+                sections["core"] = dict(sections["core"], game_version=target)
+        return metadata, sections
+
+    def migrate(self, save_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Migre des données de sauvegarde complètes vers la version actuelle
+
+        Args:
+            save_data: Données de sauvegarde
+
+        Returns:
+            Données migrées (les mêmes données si elles sont déjà à jour)
+        """
+        metadata = save_data.get("metadata", {})
+        if not self.needs_migration(metadata.get("game_version", "0.0.0")):
+            return save_data
+        metadata, sections = self.migrate_sections(metadata, split_sections(save_data))
+        return join_sections(metadata, sections)
+
+
+# Registre utilisé par le gestionnaire de sauvegarde
+migrations = MigrationRegistry()
+
+
+@migrations.register("1.0.0", "1.1.0", "world_state")
+def _add_game_time(world_state: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """1.1.0 sauvegarde l'horloge du jeu: la déduire du jour et du moment de la journée"""
+    if "game_time" in world_state:
+        return world_state
+    return dict(world_state, game_time={
+        "day": world_state.get("day_count", 1),
+        "hour": 8 if world_state.get("time_of_day", "day") == "day" else 20,
+        "minute": 0,
+        "weather": world_state.get("weather", "clear")
+    })
+
+
+@migrations.register("1.0.0", "1.1.0", "metadata")
+def _add_turn_count(metadata: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """1.1.0 compte les tours joués (point de départ du journal des actions)"""
+    return dict(metadata, turn=metadata.get("turn", 0))
+
+
+def _migrate_file(task: Tuple[str, bool]) -> Dict[str, Any]:
+    """
+    Migre une sauvegarde (processus de travail du mode par lots)
+
+    Une chaîne de deltas est rejouée puis réécrite en une seule sauvegarde complète
+    à l'emplacement de sa base.
+
+    Args:
+        task: (chemin de la sauvegarde de base, simulation sans écriture)
+
+    Returns:
+        Résultat: chemin, état ("migrated", "up_to_date" ou "error"), versions, octets lus
+    """
+    base_path, dry_run = task
+    try:
+        from .save_manager import SaveManager
+    except ImportError:
+        from save_manager import SaveManager
+
+    result = {"path": base_path, "status": "up_to_date", "bytes": 0}
+    try:
+        slot_dir = os.path.dirname(base_path)
+        manager = SaveManager(None, save_directory=os.path.dirname(slot_dir))
+        deltas = manager._list_deltas(base_path)
+        tip_path = deltas[-1][1] if deltas else base_path
+        result["bytes"] = os.path.getsize(base_path) + sum(os.path.getsize(path) for _, path in deltas)
+
+        save_data, _, _ = manager._load_chain(tip_path)
+        version = save_data.get("metadata", {}).get("game_version", "0.0.0")
+        result["from"] = version
+        if not migrations.needs_migration(version):
+            return result
+
+        migrated = migrations.migrate(save_data)
+        result["to"] = migrated["metadata"]["game_version"]
+        result["status"] = "migrated"
+        if dry_run:
+            return result
+
+        # Conserver la date de la sauvegarde: l'ordre des versions et des auto-sauvegardes ne change pas
+        mtime = os.path.getmtime(tip_path)
+        manager._write_save_file(base_path, migrated, catalog=False)
+        for _, delta_path in deltas:
+            os.remove(delta_path)
+        os.utime(base_path, (mtime, mtime))
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    return result
+
+
+def find_saves(save_directory: str) -> List[str]:
+    """Liste les sauvegardes de base (une par chaîne) d'une arborescence de sauvegardes"""
+    try:
+        from .save_manager import SaveManager
+    except ImportError:
+        from save_manager import SaveManager
+
+    # Les deltas sont migrés avec leur base; des deltas orphelins ne peuvent pas être chargés
+    base_paths = []
+    for root, _, files in os.walk(save_directory):
+        for file_name in sorted(files):
+            if file_name.endswith(".mkrp") and not SaveManager._split_delta_name(file_name)[1]:
+                base_paths.append(os.path.join(root, file_name))
+    return base_paths
+
+
+def migrate_tree(save_directory: str, workers: int = None, dry_run: bool = False,
+                 progress: Callable[[int, int, Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    """
+    Migre toutes les sauvegardes d'une arborescence avec un groupe de processus
+
+    Args:
+        save_directory: Répertoire racine des sauvegardes
+        workers: Nombre de processus (nombre de processeurs si None, 1 = sans processus fils)
+        dry_run: Analyse seulement, sans rien écrire
+        progress: Fonction appelée après chaque sauvegarde (traitées, total, résultat)
+
+    Returns:
+        Bilan: nombre de sauvegardes par état, erreurs, durée, débit
+    """
+    base_paths = find_saves(save_directory)
+    tasks = [(path, dry_run) for path in base_paths]
+    summary = {"total": len(tasks), "migrated": 0, "up_to_date": 0, "error": 0, "errors": [], "bytes": 0}
+
+    start = time.perf_counter()
+    if workers == 1 or len(tasks) < 2:
+        results = map(_migrate_file, tasks)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(_migrate_file, tasks, chunksize=max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 8)))
+
+    try:
+        for done, result in enumerate(results, 1):
+            summary[result["status"]] += 1
+            summary["bytes"] += result.get("bytes", 0)
+            if result["status"] == "error":
+                summary["errors"].append(result)
+            if progress:
+                progress(done, len(tasks), result)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    # Les fichiers ont été réécrits par d'autres processus: le catalogue doit les relire
+    if not dry_run and summary["migrated"]:
+        try:
+            from .save_catalog import SaveCatalog
+        except ImportError:
+            from save_catalog import SaveCatalog
+        SaveCatalog(save_directory, lambda path: {}).invalidate()
+
+    summary["duration"] = time.perf_counter() - start
+    summary["saves_per_second"] = summary["total"] / summary["duration"] if summary["duration"] else 0.0
+    summary["mb_per_second"] = summary["bytes"] / 1024 / 1024 / summary["duration"] if summary["duration"] else 0.0
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Migration par lots en ligne de commande
+
+    Utilisation: python save_migrations.py [dossier saves] [--dry-run] [--workers N]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migre les sauvegardes MUSKO TENSEI RP vers la version actuelle")
+    parser.add_argument("save_directory", nargs="?", default="saves", help="Répertoire racine des sauvegardes")
+    parser.add_argument("--dry-run", action="store_true", help="Analyse sans rien écrire")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut: nombre de processeurs)")
+    args = parser.parse_args(argv)
+
+    def show_progress(done: int, total: int, result: Dict[str, Any]) -> None:
+        if result["status"] == "error":
+            print(f"\n❌ {result['path']}: {result['error']}")
+        if done == total or done % 50 == 0:
+            print(f"\r🔄 {done}/{total} sauvegardes traitées", end="", flush=True)
+
+    summary = migrate_tree(args.save_directory, args.workers, args.dry_run, show_progress)
+    print()
+    action = "à migrer" if args.dry_run else "migrées"
+    print(f"✅ {summary['migrated']} {action}, {summary['up_to_date']} à jour, {summary['error']} en erreur "
+          f"sur {summary['total']} sauvegardes (version {CURRENT_SAVE_VERSION})")
+    print(f"   {summary['duration']:.2f} s, {summary['saves_per_second']:.0f} sauvegardes/s, "
+          f"{summary['mb_per_second']:.1f} Mo/s")
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# save_retention.py - Rétention des mémoires de l'IA et de l'historique narratif dans les sauvegardes pour MUSKO TENSEI RP
+import time
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Les mémoires de l'IA (événements du monde, événements par personnage) et l'historique narratif
+# grandissent à chaque tour: sans limite, la taille des sauvegardes augmente avec le temps de jeu.
+# Une politique de rétention s'applique à une liste d'entrées au moment de la sauvegarde: limite
+# du nombre d'entrées, fenêtre d'âge, et résumé des entrées retirées. Le résumé est une entrée
+# {"retention_summary": {...}} placée en tête de la liste: les résumés successifs sont fusionnés,
+# il garde le nombre d'entrées retirées, leur période et les valeurs les plus fréquentes.
+#
+# L'état du jeu n'est jamais modifié: seules les données écrites sont compactées (les listes
+# inchangées restent partagées avec l'instantané).
+
+SUMMARY_KEY = "retention_summary"
+
+# Valeurs comptées dans les résumés (au premier niveau de l'entrée ou dans son "data")
+TALLY_KEYS = ("type", "character_id", "location")
+# Nombre de valeurs gardées par clé comptée
+MAX_TALLIES = 20
+
+
+class RetentionPolicy:
+    """Règles de rétention d'une liste d'entrées"""
+
+    def __init__(self, max_entries: int = None, max_age: float = None, summarize: bool = True,
+                 time_key: str = "timestamp", tally_keys: Iterable[str] = TALLY_KEYS):
+        """
+        Initialise la politique
+
+        Args:
+            max_entries: Nombre maximum d'entrées gardées (les plus récentes; illimité si None)
+            max_age: Âge maximum des entrées en secondes (illimité si None); les entrées
+                     sans date sont gardées
+            summarize: Remplace les entrées retirées par un résumé au lieu de les oublier
+            time_key: Clé de la date des entrées (secondes, time.time())
+            tally_keys: Clés dont les valeurs sont comptées dans le résumé
+        """
+        if max_entries is not None and max_entries < 0:
+            raise ValueError(f"Nombre maximum d'entrées invalide: {max_entries}")
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.summarize = summarize
+        self.time_key = time_key
+        self.tally_keys = tuple(tally_keys)
+
+    def __repr__(self) -> str:
+        return (f"RetentionPolicy(max_entries={self.max_entries}, max_age={self.max_age}, "
+                f"summarize={self.summarize})")
+
+    def _timestamp(self, entry: Any) -> Optional[float]:
+        if isinstance(entry, dict):
+            value = entry.get(self.time_key)
+            if isinstance(value, (int, float)):
+                return value
+        return None
+
+    def _summarize(self, summary: Optional[Dict[str, Any]], dropped: List[Any]) -> Dict[str, Any]:
+        """Fusionne les entrées retirées dans le résumé existant"""
+        summary = dict(summary or {"count": 0})
+        summary["count"] = summary.get("count", 0) + len(dropped)
+
+        timestamps = [timestamp for timestamp in map(self._timestamp, dropped) if timestamp is not None]
+        if timestamps:
+            summary["from"] = min(timestamps + ([summary["from"]] if "from" in summary else []))
+            summary["to"] = max(timestamps + ([summary["to"]] if "to" in summary else []))
+
+        tallies = {key: Counter(values) for key, values in summary.get("by", {}).items()}
+        for entry in dropped:
+            if not isinstance(entry, dict):
+                continue
+            data = entry.get("data") if isinstance(entry.get("data"), dict) else {}
+            for key in self.tally_keys:
+                value = entry.get(key, data.get(key))
+                if isinstance(value, str):
+                    tallies.setdefault(key, Counter())[value] += 1
+        if tallies:
+            summary["by"] = {key: dict(counter.most_common(MAX_TALLIES)) for key, counter in tallies.items()}
+        return summary
+
+    def apply(self, entries: List[Any], now: float = None) -> Tuple[List[Any], int]:
+        """
+        Applique la politique à une liste (la liste d'origine n'est pas modifiée)
+
+        Args:
+            entries: Entrées, de la plus ancienne à la plus récente
+            now: Date de référence pour l'âge (maintenant si None)
+
+        Returns:
+            (liste compactée, ou la liste d'origine si rien n'est retiré; nombre d'entrées retirées)
+        """
+        summary = None
+        body = entries
+        if entries and isinstance(entries[0], dict) and SUMMARY_KEY in entries[0]:
+            summary, body = entries[0][SUMMARY_KEY], entries[1:]
+
+        kept = body
+        if self.max_age is not None:
+            cutoff = (time.time() if now is None else now) - self.max_age
+            kept = [entry for entry in kept if self._timestamp(entry) is None or self._timestamp(entry) >= cutoff]
+        if self.max_entries is not None and len(kept) > self.max_entries:
+            kept = kept[len(kept) - self.max_entries:] if self.max_entries else []
+
+        dropped_count = len(body) - len(kept)
+        if not dropped_count:
+            return entries, 0
+
+        if not self.summarize:
+            return ([entries[0]] if summary is not None else []) + kept, dropped_count
+
+        kept_ids = {id(entry) for entry in kept}
+        dropped = [entry for entry in body if id(entry) not in kept_ids]
+        return [{SUMMARY_KEY: self._summarize(summary, dropped)}] + kept, dropped_count
+
+
+# Politiques par défaut: chemin dans les données de sauvegarde ("*" = chaque clé d'un dictionnaire)
+DEFAULT_POLICIES = {
+    # Limite historique (les 20 derniers échanges), sans résumé
+    "ai_memory.conversation_history": RetentionPolicy(max_entries=20, summarize=False),
+    "ai_memory.memory_by_character.*.conversations": RetentionPolicy(max_entries=20, summarize=False),
+    "ai_memory.memory_by_character.*.events": RetentionPolicy(max_entries=50),
+    "ai_memory.world_state_memory.*": RetentionPolicy(max_entries=100),
+    "player.narrative_history": RetentionPolicy(max_entries=200)
+}
+
+
+class SaveRetention:
+    """Politiques de rétention appliquées aux données de sauvegarde, par chemin"""
+
+    def __init__(self, policies: Dict[str, RetentionPolicy] = None):
+        """
+        Initialise les politiques
+
+        Args:
+            policies: Chemin -> politique (DEFAULT_POLICIES si None)
+        """
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+
+    def set_policy(self, path: str, policy: Optional[RetentionPolicy]) -> None:
+        """Définit la politique d'un chemin ("a.b.*.c"), ou la retire si policy est None"""
+        if policy is None:
+            self.policies.pop(path, None)
+        else:
+            self.policies[path] = policy
+
+    def _apply_path(self, value: Any, parts: List[str], policy: RetentionPolicy, now: float,
+                    prefix: str, report: Dict[str, int]) -> Any:
+        """Applique une politique sous value en suivant le chemin (copie seulement les conteneurs modifiés)"""
+        if not parts:
+            if not isinstance(value, list):
+                return value
+            compacted, dropped = policy.apply(value, now)
+            if dropped:
+                report[prefix] = report.get(prefix, 0) + dropped
+            return compacted
+
+        if not isinstance(value, dict):
+            return value
+        part, rest = parts[0], parts[1:]
+        keys = list(value) if part == "*" else ([part] if part in value else [])
+        changed = {}
+        for key in keys:
+            child = value[key]
+            compacted = self._apply_path(child, rest, policy, now, f"{prefix}.{key}" if prefix else str(key), report)
+            if compacted is not child:
+                changed[key] = compacted
+        if not changed:
+            return value
+        return {key: changed.get(key, child) for key, child in value.items()}
+
+    def apply(self, save_data: Dict[str, Any], now: float = None) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """
+        Applique toutes les politiques aux données d'une sauvegarde
+
+        Args:
+            save_data: Données de sauvegarde (instantané figé, jamais modifié)
+            now: Date de référence pour l'âge des entrées (maintenant si None)
+
+        Returns:
+            (données compactées, chemin concret -> nombre d'entrées retirées)
+        """
+        now = time.time() if now is None else now
+        report: Dict[str, int] = {}
+        for path, policy in self.policies.items():
+            save_data = self._apply_path(save_data, path.split("."), policy, now, "", report)
+        return save_data, report
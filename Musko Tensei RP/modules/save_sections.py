@@ -0,0 +1,266 @@
+# save_sections.py - Format de sauvegarde v2 en sections indépendantes pour MUSKO TENSEI RP
+import struct
+import zlib
+from typing import Dict, Any, BinaryIO, Iterable, List, Optional, Tuple
+
+try:
+    from .save_codecs import SaveCodec, SECTIONED_VERSION, CHECKSUMMED_VERSION, TruncatedSaveError, CorruptedSaveError
+except ImportError:
+    from save_codecs import SaveCodec, SECTIONED_VERSION, CHECKSUMMED_VERSION, TruncatedSaveError, CorruptedSaveError
+
+# Sections compressées séparément; les autres clés de la sauvegarde vont dans "core"
+SECTION_NAMES = ("player", "world_state", "quests", "relationships", "ai_memory", "journal")
+CORE_SECTION = "core"
+
+# Le journal est extrait de player: sa clé reste dans player avec cette valeur pour garder l'ordre des clés
+JOURNAL_PLACEHOLDER = None
+
+# Table des matières (après les métadonnées):
+#   taille de la table (u32), nombre de sections (u16)
+#   v3: CRC32 des métadonnées encodées (u32), CRC32 des entrées de la table (u32)
+#   par section: longueur du nom (u16), nom (utf-8), TOC_ENTRY (v3: TOC_ENTRY_CHECKSUMMED)
+# Les positions sont relatives au début des données, juste après la table.
+# Les CRC32 portent sur les octets écrits (encodés): la vérification ne décompresse rien.
+TOC_HEADER = struct.Struct("<IH")
+TOC_HEADER_CHECKSUMMED = struct.Struct("<IHII")
+TOC_ENTRY = struct.Struct("<QQ")                # position, taille encodée
+TOC_ENTRY_CHECKSUMMED = struct.Struct("<QQI")   # position, taille encodée, CRC32
+
+
+def split_sections(save_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Répartit les données d'une sauvegarde en sections (les métadonnées restent dans l'en-tête)
+
+    Args:
+        save_data: Données complètes de la sauvegarde
+
+    Returns:
+        Nom de section -> valeur
+    """
+    sections = {}
+    player = save_data.get("player")
+    if isinstance(player, dict) and "journal" in player:
+        sections["player"] = {key: (JOURNAL_PLACEHOLDER if key == "journal" else value) for key, value in player.items()}
+        sections["journal"] = player["journal"]
+    elif "player" in save_data:
+        sections["player"] = player
+
+    for name in SECTION_NAMES:
+        if name not in ("player", "journal") and name in save_data:
+            sections[name] = save_data[name]
+
+    sections[CORE_SECTION] = {
+        key: value for key, value in save_data.items()
+        if key != "metadata" and key not in SECTION_NAMES
+    }
+    return sections
+
+
+def join_sections(metadata: Dict[str, Any], sections: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reconstitue des données de sauvegarde à partir de sections (toutes ou une partie)
+
+    Args:
+        metadata: Métadonnées de l'en-tête
+        sections: Sections décodées
+
+    Returns:
+        Données de sauvegarde (sans les sections non fournies)
+    """
+    save_data = {"metadata": metadata}
+    for name, value in sections.items():
+        if name == CORE_SECTION:
+            save_data.update(value)
+        elif name != "journal":
+            save_data[name] = value
+
+    player = save_data.get("player")
+    if isinstance(player, dict) and "journal" in player:
+        if "journal" in sections:
+            save_data["player"] = dict(player, journal=sections["journal"])
+        else:
+            # Journal non chargé: ne pas exposer la valeur de remplacement
+            save_data["player"] = {key: value for key, value in player.items() if key != "journal"}
+    return save_data
+
+
+def select_sections(sections: Dict[str, Any], names: Iterable[str], journal_split: bool) -> Dict[str, Any]:
+    """
+    Retourne les sections demandées telles que présentées à l'appelant
+
+    Args:
+        sections: Sections décodées (ou produites par split_sections)
+        names: Sections voulues
+        journal_split: Le journal est une section séparée (la clé "journal" de player
+                       n'est alors qu'une valeur de remplacement, retirée ici)
+
+    Returns:
+        Nom de section -> valeur
+    """
+    names = set(names)
+    selected = {name: value for name, value in sections.items() if name in names}
+    player = selected.get("player")
+    if journal_split and isinstance(player, dict) and "journal" in player:
+        selected["player"] = {key: value for key, value in player.items() if key != "journal"}
+    return selected
+
+
+def encode_sections(codec: SaveCodec, sections: Dict[str, Any], encoded_metadata: bytes = b"",
+                    version: int = CHECKSUMMED_VERSION) -> bytes:
+    """
+    Encode chaque section séparément, précédée de la table des matières
+
+    Args:
+        codec: Codec appliqué à chaque section
+        sections: Nom de section -> valeur
+        encoded_metadata: Métadonnées encodées écrites avant la table (couvertes par la somme de contrôle v3)
+        version: SECTIONED_VERSION (sans sommes de contrôle) ou CHECKSUMMED_VERSION
+
+    Returns:
+        Table des matières puis sections encodées
+    """
+    checksummed = version >= CHECKSUMMED_VERSION
+    entries = []
+    blobs = []
+    offset = 0
+    for name, value in sections.items():
+        blob = codec.encode(value)
+        encoded_name = name.encode("utf-8")
+        if checksummed:
+            entry = TOC_ENTRY_CHECKSUMMED.pack(offset, len(blob), zlib.crc32(blob))
+        else:
+            entry = TOC_ENTRY.pack(offset, len(blob))
+        entries.append(struct.pack("<H", len(encoded_name)) + encoded_name + entry)
+        blobs.append(blob)
+        offset += len(blob)
+
+    toc = b"".join(entries)
+    if checksummed:
+        header = TOC_HEADER_CHECKSUMMED.pack(len(toc), len(entries), zlib.crc32(encoded_metadata), zlib.crc32(toc))
+    else:
+        header = TOC_HEADER.pack(len(toc), len(entries))
+    return header + toc + b"".join(blobs)
+
+
+def read_toc(f: BinaryIO, version: int = SECTIONED_VERSION,
+             encoded_metadata: bytes = None) -> Tuple[Dict[str, Tuple[int, int, Optional[int]]], int]:
+    """
+    Lit la table des matières (le fichier doit être positionné juste après les métadonnées)
+
+    Args:
+        f: Fichier ouvert en lecture binaire
+        version: Version de l'en-tête du fichier
+        encoded_metadata: Métadonnées encodées lues avant la table (vérifiées en v3 si fournies)
+
+    Returns:
+        (nom de section -> (position absolue, taille, CRC32 ou None), position du début des données)
+
+    Raises:
+        TruncatedSaveError: Si la table des matières est tronquée
+        CorruptedSaveError: Si une somme de contrôle (métadonnées, table) est fausse
+        ValueError: Si la table des matières est invalide
+    """
+    checksummed = version >= CHECKSUMMED_VERSION
+    header_format = TOC_HEADER_CHECKSUMMED if checksummed else TOC_HEADER
+    entry_format = TOC_ENTRY_CHECKSUMMED if checksummed else TOC_ENTRY
+    header = f.read(header_format.size)
+    if len(header) != header_format.size:
+        raise TruncatedSaveError("Table des matières de la sauvegarde tronquée")
+    if checksummed:
+        toc_size, count, metadata_crc, toc_crc = header_format.unpack(header)
+    else:
+        toc_size, count = header_format.unpack(header)
+    toc = f.read(toc_size)
+    if len(toc) != toc_size:
+        raise TruncatedSaveError("Table des matières de la sauvegarde tronquée")
+    data_start = f.tell()
+
+    if checksummed:
+        if zlib.crc32(toc) != toc_crc:
+            raise CorruptedSaveError("Table des matières de la sauvegarde corrompue (somme de contrôle)")
+        if encoded_metadata is not None and zlib.crc32(encoded_metadata) != metadata_crc:
+            raise CorruptedSaveError("Métadonnées de la sauvegarde corrompues (somme de contrôle)")
+
+    sections = {}
+    position = 0
+    try:
+        for _ in range(count):
+            name_length = struct.unpack_from("<H", toc, position)[0]
+            position += 2
+            name = toc[position:position + name_length].decode("utf-8")
+            position += name_length
+            entry = entry_format.unpack_from(toc, position)
+            position += entry_format.size
+            sections[name] = (data_start + entry[0], entry[1], entry[2] if checksummed else None)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Table des matières de la sauvegarde invalide: {e}")
+    return sections, data_start
+
+
+def read_section_blob(f: BinaryIO, name: str, entry: Tuple[int, int, Optional[int]]) -> bytes:
+    """
+    Lit les octets encodés d'une section et vérifie leur somme de contrôle
+
+    Args:
+        f: Fichier ouvert en lecture binaire
+        name: Nom de la section (pour les messages d'erreur)
+        entry: Entrée de la table des matières (position, taille, CRC32 ou None)
+
+    Raises:
+        TruncatedSaveError: Si le fichier se termine avant la fin de la section
+        CorruptedSaveError: Si la somme de contrôle est fausse
+    """
+    offset, length, checksum = entry
+    f.seek(offset)
+    blob = f.read(length)
+    if len(blob) != length:
+        raise TruncatedSaveError(f"Section {name} tronquée")
+    if checksum is not None and zlib.crc32(blob) != checksum:
+        raise CorruptedSaveError(f"Section {name} corrompue (somme de contrôle)")
+    return blob
+
+
+def read_sections(f: BinaryIO, codec: SaveCodec, toc: Dict[str, Tuple[int, int, Optional[int]]],
+                  names: Iterable[str] = None) -> Dict[str, Any]:
+    """
+    Lit et décode des sections (seules les sections demandées sont décompressées)
+
+    Args:
+        f: Fichier ouvert en lecture binaire
+        codec: Codec du fichier
+        toc: Table des matières lue par read_toc
+        names: Sections à lire (toutes si None); les sections absentes sont ignorées
+
+    Returns:
+        Nom de section -> valeur
+    """
+    wanted: List[str] = list(toc) if names is None else [name for name in names if name in toc]
+    sections = {}
+    # Lire dans l'ordre du fichier pour des accès disque séquentiels
+    for name in sorted(wanted, key=lambda section: toc[section][0]):
+        sections[name] = decode_section(f, codec, name, toc[name])
+    return sections
+
+
+def decode_section(f: BinaryIO, codec: SaveCodec, name: str, entry: Tuple[int, int, Optional[int]]) -> Any:
+    """
+    Lit et décode une section en flux (somme de contrôle vérifiée au fil de la lecture)
+
+    Args:
+        f: Fichier ouvert en lecture binaire
+        codec: Codec du fichier
+        name: Nom de la section (pour les messages d'erreur)
+        entry: Entrée de la table des matières (position, taille, CRC32 ou None)
+
+    Raises:
+        TruncatedSaveError: Si le fichier se termine avant la fin de la section
+        CorruptedSaveError: Si la somme de contrôle est fausse
+    """
+    offset, length, checksum = entry
+    f.seek(offset)
+    try:
+        return codec.decode_stream(f, length, checksum)
+    except TruncatedSaveError:
+        raise TruncatedSaveError(f"Section {name} tronquée") from None
+    except CorruptedSaveError:
+        raise CorruptedSaveError(f"Section {name} corrompue (somme de contrôle)") from None
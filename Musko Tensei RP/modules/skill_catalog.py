@@ -0,0 +1,380 @@
+# skill_catalog.py - Catalogue unifié des compétences pour MUSKO TENSEI RP
+import bisect
+from collections import deque
+from typing import Dict, List, Any, Set, Tuple
+
+try:
+    from .records import SkillRecord
+except ImportError:
+    from records import SkillRecord
+
+class SkillCatalog:
+    # Conteneurs des capacités rattachées à une compétence dans skills.json
+    CHILD_KEYS = {
+        "abilities": "ability",
+        "spells": "spell"
+    }
+
+    def __init__(self, progression_data: Dict[str, Any] = None, skills_data: Dict[str, Any] = None):
+        """
+        Initialise le catalogue des compétences
+
+        Args:
+            progression_data: Contenu de progression.json (clé "skills")
+            skills_data: Contenu de skills.json (catégories > groupes > compétences)
+        """
+        self.skills = {}
+
+        # Index par niveau requis: liste triée des niveaux et IDs correspondants
+        self.level_keys = []
+        self.level_ids = []
+
+        # Index par attribut: attribut -> (seuils triés, IDs correspondants)
+        self.attribute_thresholds = {}
+
+        # Graphe des prérequis: compétence -> {prérequis: niveau}, prérequis -> [(compétence, niveau)]
+        self.prerequisites = {}
+        self.dependents = {}
+        self.topological_order = []
+        self.topological_rank = {}
+
+        self.build(progression_data or {}, skills_data or {})
+
+    def build(self, progression_data: Dict[str, Any], skills_data: Dict[str, Any]) -> None:
+        """
+        Fusionne les deux sources de compétences et construit les index
+
+        Args:
+            progression_data: Contenu de progression.json
+            skills_data: Contenu de skills.json
+        """
+        self.skills = {}
+        self.attribute_names = set(progression_data.get("attributes", {}).keys())
+
+        # Compétences de progression.json (ou ancien format plat de skills.json)
+        flat_skills = dict(skills_data.get("skills", {}))
+        flat_skills.update(progression_data.get("skills", {}))
+        for skill_id, data in flat_skills.items():
+            self._add_skill(skill_id, data, data.get("category", "general"), "skill")
+
+        # Compétences détaillées de skills.json (combat_skills > weapon_skills > sword)
+        for category_key, groups in skills_data.items():
+            if category_key == "skills" or not isinstance(groups, dict):
+                continue
+            category = category_key.replace("_skills", "")
+            for group_id, group in groups.items():
+                if not isinstance(group, dict):
+                    continue
+                if "id" in group:
+                    self._add_detailed_skill(group["id"], group, category)
+                else:
+                    for skill_id, data in group.items():
+                        if isinstance(data, dict):
+                            self._add_detailed_skill(skill_id, data, category)
+
+        self._build_indexes()
+
+        # Figer les compétences en enregistrements compacts une fois les prérequis résolus
+        # (les capacités et sorts étant des entrées du catalogue, le parent ne garde que leurs IDs)
+        for record in self.skills.values():
+            for child_key in self.CHILD_KEYS:
+                if isinstance(record.get(child_key), dict):
+                    record[child_key] = list(record[child_key])
+        self.skills = {skill_id: SkillRecord(record) for skill_id, record in self.skills.items()}
+
+    def _add_skill(self, skill_id: str, data: Dict[str, Any], category: str, kind: str) -> Dict[str, Any]:
+        """Ajoute (ou complète) une compétence avec des prérequis normalisés"""
+        record = self.skills.get(skill_id)
+        if record is None:
+            record = {
+                "id": skill_id,
+                "category": category,
+                "kind": kind,
+                "requirements": {"level": 0, "attributes": {}, "prerequisite_skills": {}}
+            }
+            self.skills[skill_id] = record
+
+        for key, value in data.items():
+            if key in ("requirements", "cost"):
+                continue
+            record.setdefault(key, value)
+
+        # Coût en points de compétence (les capacités ont un coût en ressources à la place)
+        cost = data.get("cost", 1)
+        if isinstance(cost, dict):
+            record.setdefault("resource_cost", cost)
+            cost = 1
+        record.setdefault("cost", cost)
+
+        self._merge_requirements(record["requirements"], data.get("requirements", {}))
+        return record
+
+    def _add_detailed_skill(self, skill_id: str, data: Dict[str, Any], category: str) -> None:
+        """Ajoute une compétence de skills.json ainsi que ses capacités et sorts"""
+        record = self._add_skill(skill_id, data, category, "skill")
+
+        # Les styles de combat nécessitent la maîtrise de l'arme correspondante
+        for weapon in data.get("weapon_requirements", []):
+            if weapon != "any":
+                record["requirements"]["prerequisite_skills"].setdefault(weapon, 1)
+
+        for child_key, kind in self.CHILD_KEYS.items():
+            for child_id, child_data in data.get(child_key, {}).items():
+                child = self._add_skill(child_id, child_data, record["category"], kind)
+                child["parent"] = skill_id
+                child["requirements"]["prerequisite_skills"].setdefault(skill_id, 1)
+
+    def _merge_requirements(self, target: Dict[str, Any], requirements: Dict[str, Any]) -> None:
+        """
+        Normalise les prérequis sous la forme {"level", "attributes", "prerequisite_skills"}
+
+        Les prérequis de skills.json mélangent niveaux de compétence et attributs
+        ({"sword": 3, "dexterity": 12}); ceux de l'ancien format sont déjà structurés.
+        """
+        for key, value in requirements.items():
+            if key == "level":
+                target["level"] = max(target["level"], value)
+            elif key == "attributes":
+                target["attributes"].update(value)
+            elif key == "prerequisite_skills":
+                if isinstance(value, dict):
+                    target["prerequisite_skills"].update(value)
+                else:
+                    for skill_id in value:
+                        target["prerequisite_skills"].setdefault(skill_id, 1)
+            elif key in self.attribute_names:
+                target["attributes"][key] = value
+            else:
+                # Niveau minimal dans une autre compétence (résolu après chargement)
+                target["prerequisite_skills"][key] = value
+
+    def _build_indexes(self) -> None:
+        """Construit les index par niveau, par attribut et le graphe des prérequis"""
+        # Un prérequis qui n'est pas une compétence connue est un attribut
+        for record in self.skills.values():
+            requirements = record["requirements"]
+            for key in list(requirements["prerequisite_skills"]):
+                if key not in self.skills:
+                    requirements["attributes"][key] = requirements["prerequisite_skills"].pop(key)
+
+        by_level = sorted((record["requirements"]["level"], skill_id) for skill_id, record in self.skills.items())
+        self.level_keys = [level for level, _ in by_level]
+        self.level_ids = [skill_id for _, skill_id in by_level]
+
+        thresholds = {}
+        for skill_id, record in self.skills.items():
+            for attr, value in record["requirements"]["attributes"].items():
+                thresholds.setdefault(attr, []).append((value, skill_id))
+        self.attribute_thresholds = {}
+        for attr, entries in thresholds.items():
+            entries.sort()
+            self.attribute_thresholds[attr] = ([value for value, _ in entries], [skill_id for _, skill_id in entries])
+
+        self.prerequisites = {}
+        self.dependents = {}
+        for skill_id, record in self.skills.items():
+            self.prerequisites[skill_id] = dict(record["requirements"]["prerequisite_skills"])
+            for required_id, required_level in self.prerequisites[skill_id].items():
+                self.dependents.setdefault(required_id, []).append((skill_id, required_level))
+
+        self.topological_order = self._sort_prerequisites()
+        self.topological_rank = {skill_id: rank for rank, skill_id in enumerate(self.topological_order)}
+
+    def _sort_prerequisites(self) -> List[str]:
+        """Ordonne les compétences de sorte que chaque prérequis précède ses dépendants"""
+        remaining = {skill_id: len(prereqs) for skill_id, prereqs in self.prerequisites.items()}
+        queue = deque(skill_id for skill_id, count in remaining.items() if count == 0)
+        order = []
+
+        while queue:
+            skill_id = queue.popleft()
+            order.append(skill_id)
+            for dependent_id, _ in self.dependents.get(skill_id, []):
+                remaining[dependent_id] -= 1
+                if remaining[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+        if len(order) < len(self.skills):
+            cyclic = sorted(set(self.skills) - set(order))
+            print(f"Attention: prérequis circulaires entre les compétences {', '.join(cyclic)}")
+            order.extend(cyclic)
+        return order
+
+    def get(self, skill_id: str) -> Dict[str, Any]:
+        """Retourne les données d'une compétence (dictionnaire vide si elle est inconnue)"""
+        return self.skills.get(skill_id, {})
+
+    def __contains__(self, skill_id: str) -> bool:
+        return skill_id in self.skills
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def unlocked_at_level(self, level: int) -> List[str]:
+        """Retourne les compétences dont le niveau requis est exactement celui donné"""
+        start = bisect.bisect_left(self.level_keys, level)
+        end = bisect.bisect_right(self.level_keys, level)
+        return self.level_ids[start:end]
+
+    def level_range(self, low: int, high: int) -> List[str]:
+        """Retourne les compétences dont le niveau requis est compris dans ]low, high]"""
+        start = bisect.bisect_right(self.level_keys, low)
+        end = bisect.bisect_right(self.level_keys, high)
+        return self.level_ids[start:end]
+
+    def attribute_range(self, attr: str, low: int, high: int) -> List[str]:
+        """Retourne les compétences dont le seuil de l'attribut est compris dans ]low, high]"""
+        if attr not in self.attribute_thresholds:
+            return []
+        values, skill_ids = self.attribute_thresholds[attr]
+        return skill_ids[bisect.bisect_right(values, low):bisect.bisect_right(values, high)]
+
+    def unmet_requirements(self, skill_id: str, level: int, attributes: Dict[str, int],
+                           learned_skills: Dict[str, Any]) -> int:
+        """Compte les conditions non remplies pour une compétence"""
+        requirements = self.skills[skill_id]["requirements"]
+        unmet = 1 if level < requirements["level"] else 0
+        for attr, value in requirements["attributes"].items():
+            if attributes.get(attr, 0) < value:
+                unmet += 1
+        for required_id, required_level in requirements["prerequisite_skills"].items():
+            if _skill_level(learned_skills, required_id) < required_level:
+                unmet += 1
+        return unmet
+
+    def query_available(self, level: int, attributes: Dict[str, int], learned_skills: Dict[str, Any]) -> List[str]:
+        """
+        Calcule les compétences disponibles sans état (pour des valeurs hypothétiques)
+
+        Args:
+            level: Niveau du joueur
+            attributes: Attributs du joueur
+            learned_skills: Compétences déjà apprises
+
+        Returns:
+            Liste d'IDs des compétences disponibles
+        """
+        end = bisect.bisect_right(self.level_keys, level)
+        return [
+            skill_id for skill_id in self.level_ids[:end]
+            if skill_id not in learned_skills
+            and self.unmet_requirements(skill_id, level, attributes, learned_skills) == 0
+        ]
+
+    def create_tracker(self) -> "SkillAvailability":
+        """Crée un suivi incrémental de la disponibilité des compétences"""
+        return SkillAvailability(self)
+
+
+def _skill_level(learned_skills: Dict[str, Any], skill_id: str) -> int:
+    """Niveau d'une compétence apprise (0 si elle ne l'est pas)"""
+    skill = learned_skills.get(skill_id)
+    if skill is None:
+        return 0
+    if isinstance(skill, dict):
+        return skill.get("level", 1)
+    return int(skill)
+
+
+class SkillAvailability:
+    """Suivi incrémental des compétences disponibles pour un joueur"""
+
+    def __init__(self, catalog: SkillCatalog):
+        """
+        Initialise le suivi
+
+        Args:
+            catalog: Catalogue des compétences
+        """
+        self.catalog = catalog
+        self.level = None
+        self.attributes = {}
+        self.learned_levels = {}
+
+        # Nombre de conditions non remplies par compétence
+        self.unmet = {}
+        self.available = set()
+
+    def sync(self, level: int, attributes: Dict[str, int], learned_skills: Dict[str, Any]) -> Set[str]:
+        """
+        Met à jour la disponibilité en ne réexaminant que les compétences concernées par les changements
+
+        Args:
+            level: Niveau actuel du joueur
+            attributes: Attributs actuels du joueur
+            learned_skills: Compétences apprises par le joueur
+
+        Returns:
+            Ensemble des compétences devenues disponibles depuis la dernière synchronisation
+        """
+        learned_levels = {skill_id: _skill_level(learned_skills, skill_id) for skill_id in learned_skills}
+
+        if self.level is None:
+            self._initialize(level, attributes, learned_levels)
+            return set(self.available)
+
+        previously_available = set(self.available)
+        touched = set()
+
+        if level != self.level:
+            touched.update(self._shift(self.catalog.level_range, (), self.level, level))
+            self.level = level
+
+        for attr in set(attributes) | set(self.attributes):
+            old_value = self.attributes.get(attr, 0)
+            new_value = attributes.get(attr, 0)
+            if old_value != new_value:
+                touched.update(self._shift(self.catalog.attribute_range, (attr,), old_value, new_value))
+        self.attributes = dict(attributes)
+
+        for skill_id in set(learned_levels) | set(self.learned_levels):
+            old_level = self.learned_levels.get(skill_id, 0)
+            new_level = learned_levels.get(skill_id, 0)
+            if old_level == new_level:
+                continue
+            touched.add(skill_id)
+            for dependent_id, required_level in self.catalog.dependents.get(skill_id, []):
+                if old_level < required_level <= new_level:
+                    self.unmet[dependent_id] -= 1
+                    touched.add(dependent_id)
+                elif new_level < required_level <= old_level:
+                    self.unmet[dependent_id] += 1
+                    touched.add(dependent_id)
+        self.learned_levels = learned_levels
+
+        for skill_id in touched:
+            self._refresh(skill_id)
+
+        return self.available - previously_available
+
+    def _initialize(self, level: int, attributes: Dict[str, int], learned_levels: Dict[str, int]) -> None:
+        """Calcul complet initial"""
+        self.level = level
+        self.attributes = dict(attributes)
+        self.learned_levels = learned_levels
+        self.unmet = {
+            skill_id: self.catalog.unmet_requirements(skill_id, level, attributes, learned_levels)
+            for skill_id in self.catalog.skills
+        }
+        self.available = set()
+        for skill_id in self.unmet:
+            self._refresh(skill_id)
+
+    def _shift(self, index_range, args: Tuple, old_value: int, new_value: int) -> List[str]:
+        """Ajuste le compteur des compétences dont le seuil est franchi entre deux valeurs"""
+        if new_value > old_value:
+            skill_ids = index_range(*args, old_value, new_value)
+            delta = -1
+        else:
+            skill_ids = index_range(*args, new_value, old_value)
+            delta = 1
+        for skill_id in skill_ids:
+            self.unmet[skill_id] += delta
+        return skill_ids
+
+    def _refresh(self, skill_id: str) -> None:
+        """Met à jour l'appartenance d'une compétence à l'ensemble des compétences disponibles"""
+        if self.unmet.get(skill_id, 1) == 0 and skill_id not in self.learned_levels:
+            self.available.add(skill_id)
+        else:
+            self.available.discard(skill_id)
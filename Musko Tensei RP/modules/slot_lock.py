@@ -0,0 +1,152 @@
+# slot_lock.py - Verrous consultatifs inter-processus des slots de sauvegarde pour MUSKO TENSEI RP
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Fichier de verrou d'un slot, à la racine des sauvegardes: saves/<slot>.lock
+# (hors du répertoire du slot, dont la date de modification sert au catalogue)
+LOCK_EXTENSION = ".lock"
+
+
+class SlotLocks:
+    """
+    Verrous des slots d'un répertoire de sauvegardes partagé par plusieurs processus
+
+    Un verrou exclusif protège les opérations qui changent les fichiers d'un slot
+    (publication d'une sauvegarde, suppression des deltas, élagage); un verrou partagé
+    protège la lecture d'une chaîne de deltas. Les verrous sont consultatifs (flock sous
+    POSIX, msvcrt.locking sous Windows, toujours exclusif): seuls les processus du jeu les
+    respectent. Ils sont réentrants pour un même thread.
+    """
+
+    def __init__(self, save_directory: str, timeout: float = 30.0, poll_interval: float = 0.005):
+        """
+        Initialise les verrous
+
+        Args:
+            save_directory: Répertoire racine des sauvegardes
+            timeout: Attente maximale d'un verrou tenu par un autre processus (secondes)
+            poll_interval: Intervalle entre deux tentatives
+        """
+        self.save_directory = os.path.abspath(save_directory)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.held = threading.local()
+
+        # Sans verrou de fichier disponible, les threads du processus restent exclus entre eux
+        self.thread_locks: Dict[str, threading.Lock] = {}
+        self.thread_locks_guard = threading.Lock()
+
+        self.stats = {"acquired": 0, "contended": 0, "wait_time": 0.0, "hold_time": 0.0, "max_hold_time": 0.0}
+
+    def _slot_name(self, slot_dir: str):
+        """Nom du slot d'un répertoire, ou None s'il n'est pas directement sous la racine des sauvegardes"""
+        slot_dir = os.path.abspath(slot_dir)
+        if os.path.dirname(slot_dir) != self.save_directory:
+            return None
+        return os.path.basename(slot_dir)
+
+    @staticmethod
+    def _try_lock(fd: int, shared: bool) -> bool:
+        try:
+            if fcntl:
+                fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _unlock(fd: int) -> None:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def _acquire(self, fd: int, slot_name: str, shared: bool) -> None:
+        """Attend le verrou du fichier (TimeoutError après self.timeout secondes)"""
+        if self._try_lock(fd, shared):
+            return
+        self.stats["contended"] += 1
+        start = time.monotonic()
+        while True:
+            time.sleep(self.poll_interval)
+            if self._try_lock(fd, shared):
+                self.stats["wait_time"] += time.monotonic() - start
+                return
+            if time.monotonic() - start > self.timeout:
+                raise TimeoutError(f"Slot {slot_name} verrouillé par un autre processus depuis plus de {self.timeout:.0f} s")
+
+    @contextmanager
+    def lock(self, slot_dir: str, shared: bool = False):
+        """
+        Verrouille un slot pendant le bloc with
+
+        Args:
+            slot_dir: Répertoire du slot (sans effet hors du répertoire des sauvegardes)
+            shared: Verrou partagé (lecture); exclusif sous Windows
+
+        Raises:
+            TimeoutError: Si le verrou reste tenu par un autre processus
+        """
+        slot_name = self._slot_name(slot_dir)
+        held = self.held.__dict__.setdefault("slots", {})
+        if slot_name is None or slot_name in held:
+            # Hors des slots, ou déjà tenu par ce thread
+            if slot_name is not None:
+                held[slot_name] += 1
+            try:
+                yield
+            finally:
+                if slot_name is not None:
+                    held[slot_name] -= 1
+            return
+
+        if not fcntl and not msvcrt:
+            with self.thread_locks_guard:
+                thread_lock = self.thread_locks.setdefault(slot_name, threading.Lock())
+            with thread_lock:
+                held[slot_name] = 1
+                try:
+                    yield
+                finally:
+                    del held[slot_name]
+            return
+
+        os.makedirs(self.save_directory, exist_ok=True)
+        fd = os.open(os.path.join(self.save_directory, slot_name + LOCK_EXTENSION), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._acquire(fd, slot_name, shared)
+            acquired = time.monotonic()
+            held[slot_name] = 1
+            try:
+                yield
+            finally:
+                del held[slot_name]
+                hold_time = time.monotonic() - acquired
+                self._unlock(fd)
+                self.stats["acquired"] += 1
+                self.stats["hold_time"] += hold_time
+                self.stats["max_hold_time"] = max(self.stats["max_hold_time"], hold_time)
+        finally:
+            os.close(fd)
+
+    def summary(self) -> Dict[str, Any]:
+        """Statistiques des verrous de ce processus (durée moyenne de détention en ms)"""
+        acquired = self.stats["acquired"]
+        return dict(self.stats, mean_hold_ms=self.stats["hold_time"] * 1000 / acquired if acquired else 0.0)
@@ -0,0 +1,66 @@
+# state_timeline.py - Instantanés en mémoire des derniers tours (retour en arrière) pour MUSKO TENSEI RP
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+class StateTimeline:
+    """
+    Anneau des instantanés des derniers tours joués, plus un emplacement de sauvegarde rapide
+
+    Les instantanés sont des états figés (game_state.freeze): deux tours successifs
+    partagent tout ce qui n'a pas changé, garder N tours coûte peu de mémoire.
+    """
+
+    def __init__(self, max_turns: int = 50):
+        """
+        Initialise la ligne de temps
+
+        Args:
+            max_turns: Nombre de tours conservés (les plus anciens sont oubliés)
+        """
+        self.turns = deque(maxlen=max_turns)
+        self.quick = None
+
+    def record(self, turn: int, snapshot: Dict[str, Any]) -> None:
+        """
+        Enregistre l'instantané de fin de tour
+
+        Args:
+            turn: Numéro du tour terminé
+            snapshot: État figé (données de sauvegarde)
+        """
+        # Un tour rejoué après un retour en arrière remplace l'ancienne suite
+        while self.turns and self.turns[-1]["turn"] >= turn:
+            self.turns.pop()
+        self.turns.append({"turn": turn, "time": time.time(), "snapshot": snapshot})
+
+    def rewind(self, steps: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Revient steps tours en arrière et oublie les tours suivants
+
+        Args:
+            steps: Nombre de tours à annuler
+
+        Returns:
+            Entrée {"turn", "time", "snapshot"} du tour retrouvé, ou None s'il n'est plus conservé
+        """
+        if steps < 1 or steps >= len(self.turns):
+            return None
+        for _ in range(steps):
+            self.turns.pop()
+        return self.turns[-1]
+
+    def set_quick(self, turn: int, snapshot: Dict[str, Any]) -> None:
+        """Remplace la sauvegarde rapide en mémoire"""
+        self.quick = {"turn": turn, "time": time.time(), "snapshot": snapshot}
+
+    def list_turns(self) -> List[Dict[str, Any]]:
+        """Tours conservés, du plus ancien au plus récent (sans les instantanés)"""
+        return [{"turn": entry["turn"], "time": entry["time"]} for entry in self.turns]
+
+    def clear(self) -> None:
+        """Oublie les tours conservés (partie chargée); la sauvegarde rapide est gardée"""
+        self.turns.clear()
+
+    def __len__(self) -> int:
+        return len(self.turns)
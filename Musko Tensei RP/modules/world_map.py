@@ -0,0 +1,284 @@
+# world_map.py - Graphe de voyage entre les lieux pour MUSKO TENSEI RP
+import heapq
+import unicodedata
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from .records import LocationRecord, LocationLevel
+except ImportError:
+    from records import LocationRecord, LocationLevel
+
+class WorldMap:
+    # Clés contenant des sous-lieux dans locations.json (continent > région > lieu > point d'intérêt)
+    CHILD_KEYS = ("regions", "locations", "points_of_interest")
+
+    # Clés contenant des liaisons directes entre lieux
+    CONNECTION_KEYS = ("connected_to", "connections")
+
+    # Temps de trajet (en minutes) entre deux lieux voisins, selon la profondeur dans la hiérarchie
+    TRAVEL_TIME_BY_DEPTH = {
+        0: 7 * 24 * 60,  # Entre continents
+        1: 24 * 60,      # Entre régions
+        2: 4 * 60,       # Entre lieux d'une même région
+        3: 15            # Entre points d'intérêt
+    }
+
+    # Temps (en minutes) pour entrer dans un sous-lieu ou en sortir, selon la profondeur de l'enfant
+    # (la moitié d'un trajet direct, pour que passer par le lieu parent ne soit jamais un raccourci)
+    HIERARCHY_TIME_BY_DEPTH = {
+        1: 12 * 60,
+        2: 2 * 60,
+        3: 10
+    }
+
+    DEFAULT_TRAVEL_TIME = 60
+
+    # Niveau hiérarchique selon la profondeur
+    LEVELS = [LocationLevel.CONTINENT, LocationLevel.REGION, LocationLevel.LOCATION, LocationLevel.POINT_OF_INTEREST]
+
+    def __init__(self, location_data: Dict[str, Any] = None):
+        """
+        Initialise le graphe de voyage
+
+        Args:
+            location_data: Données des lieux (contenu de locations.json)
+        """
+        # Index plat des lieux: id -> données
+        self.locations = {}
+        self.parents = {}
+        self.depths = {}
+
+        # Liste d'adjacence: id -> {voisin: temps de trajet en minutes}
+        self.edges = {}
+
+        # Index des noms pour retrouver un lieu à partir de la saisie du joueur
+        self.name_index = {}
+
+        # Cache des arbres de plus courts chemins (Dijkstra) par lieu de départ
+        self.route_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        if location_data:
+            self.build(location_data)
+
+    def build(self, location_data: Dict[str, Any]) -> None:
+        """
+        Construit l'index des lieux et le graphe de voyage
+
+        Args:
+            location_data: Données des lieux (contenu de locations.json)
+        """
+        self.locations = {}
+        self.parents = {}
+        self.depths = {}
+        self.edges = {}
+        self.name_index = {}
+        self.invalidate()
+
+        # Indexer tous les lieux de la hiérarchie
+        for location_id, data in location_data.items():
+            if isinstance(data, dict):
+                self._index_location(location_id, data, None, 0)
+
+        # Arêtes hiérarchiques (entrer dans un sous-lieu / en sortir)
+        for location_id, parent_id in self.parents.items():
+            if parent_id is None:
+                continue
+            travel_time = self.HIERARCHY_TIME_BY_DEPTH.get(self.depths[location_id], self.DEFAULT_TRAVEL_TIME)
+            self._add_edge(location_id, parent_id, travel_time)
+            self._add_edge(parent_id, location_id, travel_time)
+
+        # Arêtes de liaison (connected_to, connections, exits)
+        for location_id, data in self.locations.items():
+            for key in self.CONNECTION_KEYS:
+                for target_id in data.get(key, []) or []:
+                    if target_id not in self.locations:
+                        continue
+                    travel_time = self._get_travel_time(location_id, target_id)
+                    self._add_edge(location_id, target_id, travel_time)
+                    self._add_edge(target_id, location_id, travel_time)
+
+            # Les sorties (format de modules/main.py) sont orientées et peuvent préciser leur durée
+            exits = data.get("exits", {})
+            if isinstance(exits, dict):
+                for target_id, exit_data in exits.items():
+                    if target_id not in self.locations:
+                        continue
+                    travel_time = self._get_travel_time(location_id, target_id)
+                    if isinstance(exit_data, dict):
+                        travel_time = exit_data.get("travel_time", travel_time)
+                    self._add_edge(location_id, target_id, travel_time)
+
+    def _index_location(self, location_id: str, data: Dict[str, Any], parent_id: Optional[str], depth: int) -> None:
+        """Ajoute un lieu et ses sous-lieux à l'index plat"""
+        own_data = {key: value for key, value in data.items() if key not in self.CHILD_KEYS}
+        own_data.update({
+            "id": location_id,
+            "level": self.LEVELS[min(depth, len(self.LEVELS) - 1)].value,
+            "parent": parent_id
+        })
+        self.locations[location_id] = LocationRecord(own_data)
+        self.parents[location_id] = parent_id
+        self.depths[location_id] = depth
+        self.edges.setdefault(location_id, {})
+
+        self.name_index[self._normalize(location_id)] = location_id
+        name = data.get("name")
+        if isinstance(name, str):
+            self.name_index.setdefault(self._normalize(name), location_id)
+
+        for key in self.CHILD_KEYS:
+            children = data.get(key)
+            if not isinstance(children, dict):
+                continue
+            for child_id, child_data in children.items():
+                if isinstance(child_data, dict):
+                    self._index_location(child_id, child_data, location_id, depth + 1)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Normalise un nom de lieu (minuscules, sans accents, espaces pour les _)"""
+        text = unicodedata.normalize("NFKD", text.strip().lower().replace("_", " "))
+        return "".join(char for char in text if not unicodedata.combining(char))
+
+    def _add_edge(self, source: str, target: str, travel_time: int) -> None:
+        """Ajoute une arête en conservant le trajet le plus court"""
+        if source == target:
+            return
+        current = self.edges[source].get(target)
+        if current is None or travel_time < current:
+            self.edges[source][target] = travel_time
+
+    def _get_travel_time(self, source: str, target: str) -> int:
+        """Temps de trajet entre deux lieux voisins, selon le niveau le plus fin des deux"""
+        depth = max(self.depths.get(source, 0), self.depths.get(target, 0))
+        return self.TRAVEL_TIME_BY_DEPTH.get(depth, self.DEFAULT_TRAVEL_TIME)
+
+    def invalidate(self) -> None:
+        """Vide le cache des itinéraires"""
+        self.route_cache = {}
+
+    def changed_locations(self, other: "WorldMap") -> List[str]:
+        """
+        Compare deux versions de la carte
+
+        Args:
+            other: Nouvelle version de la carte
+
+        Returns:
+            IDs des lieux ajoutés, supprimés ou dont les données propres ont changé
+        """
+        changed = []
+        for location_id in set(self.locations) | set(other.locations):
+            if self.locations.get(location_id) != other.locations.get(location_id):
+                changed.append(location_id)
+        return changed
+
+    def get_location(self, location_id: str) -> Dict[str, Any]:
+        """Retourne les données d'un lieu, quel que soit son niveau dans la hiérarchie"""
+        return self.locations.get(location_id, {})
+
+    def get_neighbors(self, location_id: str) -> Dict[str, int]:
+        """Retourne les lieux directement accessibles et leur temps de trajet"""
+        return dict(self.edges.get(location_id, {}))
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        Retrouve l'ID d'un lieu à partir de son ID ou de son nom
+
+        Args:
+            query: ID ou nom (complet ou partiel) du lieu
+
+        Returns:
+            ID du lieu ou None s'il est introuvable
+        """
+        if not query:
+            return None
+        query = self._normalize(query)
+
+        if query in self.name_index:
+            return self.name_index[query]
+
+        # Correspondance partielle sur le nom
+        for name, location_id in self.name_index.items():
+            if query in name:
+                return location_id
+
+        return None
+
+    def _get_route_tree(self, source: str) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """Calcule (ou récupère en cache) les plus courts chemins depuis un lieu"""
+        if source in self.route_cache:
+            self.cache_hits += 1
+            return self.route_cache[source]
+
+        self.cache_misses += 1
+        distances = {source: 0}
+        previous = {}
+        queue = [(0, source)]
+
+        while queue:
+            distance, location_id = heapq.heappop(queue)
+            if distance > distances.get(location_id, float("inf")):
+                continue
+            for neighbor, travel_time in self.edges.get(location_id, {}).items():
+                new_distance = distance + travel_time
+                if new_distance < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = location_id
+                    heapq.heappush(queue, (new_distance, neighbor))
+
+        self.route_cache[source] = (distances, previous)
+        return distances, previous
+
+    def precompute_routes(self) -> None:
+        """Précalcule les plus courts chemins entre toutes les paires de lieux"""
+        for location_id in self.locations:
+            self._get_route_tree(location_id)
+
+    def shortest_path(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        """
+        Calcule l'itinéraire le plus rapide entre deux lieux
+
+        Args:
+            source: ID du lieu de départ
+            target: ID du lieu d'arrivée
+
+        Returns:
+            Dictionnaire contenant le chemin, les étapes et la durée totale, ou None si aucun chemin
+        """
+        if source not in self.locations or target not in self.locations:
+            return None
+
+        distances, previous = self._get_route_tree(source)
+        if target not in distances:
+            return None
+
+        # Reconstruire le chemin
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        path.reverse()
+
+        steps = []
+        for i in range(1, len(path)):
+            steps.append({
+                "from": path[i - 1],
+                "to": path[i],
+                "name": self.locations[path[i]].get("name", path[i]),
+                "minutes": self.edges[path[i - 1]][path[i]]
+            })
+
+        return {
+            "path": path,
+            "steps": steps,
+            "minutes": distances[target]
+        }
+
+    def travel_time(self, source: str, target: str) -> Optional[int]:
+        """Durée (en minutes) du trajet le plus rapide entre deux lieux"""
+        if source not in self.locations or target not in self.locations:
+            return None
+        distances, _ = self._get_route_tree(source)
+        return distances.get(target)
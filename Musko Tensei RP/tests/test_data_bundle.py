@@ -0,0 +1,107 @@
+# test_data_bundle.py - Paquet de données projeté en mémoire et vue modifiable des données du jeu
+#
+# Utilisation: python -m unittest discover tests
+import builtins
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_path)
+sys.path.insert(0, os.path.join(project_path, "modules"))
+
+from data_bundle import DataBundle, BundleSection, BundleOverlay
+from data_store import DataStore
+
+LOCATIONS = {
+    "buena": {"name": "Village de Buena", "connections": ["roa"]},
+    "roa": {"name": "Roa", "connections": ["buena"]}
+}
+
+
+class BundleOverlayTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, "locations.json"), "w", encoding="utf-8") as f:
+            json.dump(LOCATIONS, f)
+        bundle_path = DataBundle.build(self.temp_dir, ["locations.json"])
+        self.store = DataStore(self.temp_dir, ["locations.json"], bundle_path)
+
+    def tearDown(self):
+        self.store.bundle.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_writable_view_over_bundle(self):
+        self.assertIsInstance(self.store.get("locations"), BundleSection)
+        locations = self.store.get_writable("locations")
+        self.assertIsInstance(locations, BundleOverlay)
+        self.assertEqual(dict(locations), LOCATIONS)
+
+    def test_nested_changes_persist(self):
+        locations = self.store.get_writable("locations")
+        locations["buena"]["environment"] = {"type": "village"}
+        self.assertEqual(locations["buena"]["environment"], {"type": "village"})
+        self.assertNotIn("environment", self.store.get("locations")["buena"])
+
+    def test_added_and_deleted_records(self):
+        locations = self.store.get_writable("locations")
+        locations["village_depart"] = {"name": "Lieu inconnu"}
+        del locations["roa"]
+        self.assertEqual(list(locations), ["buena", "village_depart"])
+        self.assertEqual(len(locations), 2)
+        self.assertNotIn("roa", locations)
+        with self.assertRaises(KeyError):
+            locations["roa"]
+        self.assertIn("roa", self.store.get("locations"))
+
+    def test_only_used_records_are_decoded(self):
+        locations = self.store.get_writable("locations")
+        locations.get("roa")
+        self.assertEqual(list(locations.values), ["roa"])
+
+
+class PlayTurnWithBundleTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.previous_dir = os.getcwd()
+        data_dir = os.path.join(self.temp_dir, "data")
+        os.makedirs(data_dir)
+        source_dir = os.path.join(project_path, "data")
+        filenames = sorted(name for name in os.listdir(source_dir) if name.endswith(".json"))
+        for filename in filenames:
+            shutil.copy2(os.path.join(source_dir, filename), data_dir)
+        DataBundle.build(data_dir, filenames)
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        shutil.rmtree(self.temp_dir)
+
+    def test_play_turn(self):
+        import game_launcher
+
+        # Choix invalide: le tour se termine sans quitter la partie
+        with mock.patch.object(game_launcher, "project_path", self.temp_dir), \
+                mock.patch.object(builtins, "input", return_value="0"), \
+                mock.patch.object(builtins, "print"):
+            game = game_launcher.MuskoTenseiRP()
+            game.data_store.stop_watching()
+            try:
+                self.assertIsInstance(game.data_store.get("locations"), BundleSection)
+                self.assertNotIn(game.current_location, game.data_store.get("locations"))
+                self.assertTrue(game._play_turn())
+            finally:
+                game.data_store.bundle.close()
+
+        # Le lieu par défaut et son environnement restent dans la vue modifiable
+        location = game.locations_data[game.current_location]
+        self.assertIn("environment", location)
+        self.assertIs(game.locations_data[game.current_location], location)
+
+
+if __name__ == "__main__":
+    unittest.main()